@@ -0,0 +1,54 @@
+"""Compare per-call latency of one-shot ``requests.post`` against the pooled ``Client``.
+
+Runs against a local stand-in REDCap endpoint so the numbers only reflect
+connection setup and transport overhead::
+
+    python benchmarks/connection_pool.py --calls 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+
+import requests
+
+from redcaplite.http import Client
+from redcaplite.testing import FakeProject, FakeRedcapServer
+
+
+def _time_calls(send, calls: int) -> list[float]:
+    timings = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        send()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def _report(label: str, timings: list[float]) -> None:
+    mean_ms = statistics.mean(timings) * 1000
+    p95_ms = sorted(timings)[int(len(timings) * 0.95) - 1] * 1000
+    print(f"{label:<10} mean {mean_ms:7.3f} ms   p95 {p95_ms:7.3f} ms   total {sum(timings):6.2f} s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=300, help="Number of API calls per mode.")
+    args = parser.parse_args()
+
+    with FakeRedcapServer(FakeProject.generate(records=0)) as server:
+        url = server.url
+        payload = {"content": "version", "token": server.token}
+        unpooled = _time_calls(lambda: requests.post(url, data=payload), args.calls)
+        with Client(url, server.token) as client:
+            pooled = _time_calls(lambda: client.session.post(url, data=payload), args.calls)
+
+    _report("unpooled", unpooled)
+    _report("pooled", pooled)
+    print(f"speedup    {statistics.mean(unpooled) / statistics.mean(pooled):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+"""Track throughput and peak memory of the RedcapClient hot paths.
+
+Each case is timed over several repeats (the best run is reported) and
+then run once more under ``tracemalloc`` to record peak Python memory.
+Results are written as JSON under ``benchmarks/results/`` named after the
+installed redcaplite version, so runs from two releases can be compared::
+
+    python benchmarks/hot_paths.py
+    python benchmarks/hot_paths.py --quick -k csv_parse
+    python benchmarks/hot_paths.py --compare benchmarks/results/2.3.0.json
+
+End-to-end cases run against the local stand-in server from
+``redcaplite.testing``, so no REDCap instance is needed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+import requests
+
+from redcaplite import RedcapClient, api
+from redcaplite.arrow import parse_arrow_response
+from redcaplite.cli.sync import compare_metadata
+from redcaplite.metadata_ops.diff import diff_metadata_many
+from redcaplite.metadata_ops.lint import lint_metadata
+from redcaplite.metadata_ops.session import MetadataEditSession
+from redcaplite.http.handler import csv_handler, output_handler
+from redcaplite.testing import FakeProject, FakeRedcapServer
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+_CSV_HEADER = "record_id,name,age,dob,enrolled,site,weight,color___1,color___2,notes,form_1_complete\n"
+
+
+@dataclass
+class Case:
+    """One benchmark: ``setup`` builds the input outside the timed region, ``run`` is timed."""
+
+    name: str
+    items: int
+    setup: Callable[[], Any]
+    run: Callable[[Any], Any]
+    teardown: Optional[Callable[[Any], None]] = None
+
+
+def _csv_text(rows: int) -> str:
+    lines = [_CSV_HEADER]
+    for index in range(1, rows + 1):
+        lines.append(
+            f"{index},name_{index % 97},{index % 90},2024-{index % 12 + 1:02d}-{index % 28 + 1:02d},"
+            f"{index % 2},{index % 3 + 1},{index * 0.37:.2f},{index % 2},{(index + 1) % 2},"
+            f"free text {index % 11},{index % 3}\n"
+        )
+    return "".join(lines)
+
+
+def _csv_response(rows: int) -> requests.Response:
+    # A real Response so any body decoding is part of the measured cost.
+    response = requests.Response()
+    response.status_code = 200
+    response._content = _csv_text(rows).encode("utf-8")
+    response.encoding = "utf-8"
+    return response
+
+
+def _parse_csv(response: requests.Response):
+    parse = csv_handler(lambda obj, data, output_file=None: response)
+    return parse(None, {})
+
+
+def _saved_csv_response(rows: int):
+    directory = tempfile.TemporaryDirectory()
+    return _csv_response(rows), Path(directory.name) / "records.csv", directory
+
+
+def _parse_csv_to_file(state) -> pd.DataFrame:
+    response, output_file, _ = state
+    parse = csv_handler(output_handler(lambda obj, data: response))
+    return parse(None, {}, output_file=output_file)
+
+
+def _parse_csv_arrow(response: requests.Response):
+    return parse_arrow_response(response, {}, "pandas")
+
+
+def _records_frame(rows: int) -> pd.DataFrame:
+    return pd.read_csv(io.StringIO(_csv_text(rows)), dtype=str, keep_default_na=False)
+
+
+def _import_frame(rows: int) -> pd.DataFrame:
+    # ``field_1`` is a free-text field in every generated project.
+    return pd.DataFrame({"record_id": [str(index) for index in range(1, rows + 1)], "field_1": "updated"})
+
+
+def _metadata_pair(fields: int):
+    source = pd.DataFrame(FakeProject.generate(records=0, fields=fields, forms=50).metadata)
+    target = source.copy()
+    # About 5% relabelled, 1% removed from the target and 1% only in the target.
+    target.loc[target.index[::20], "field_label"] = "Changed label"
+    target = target.drop(target.index[1::100])
+    extra = source.iloc[2::100].copy()
+    extra["field_name"] = extra["field_name"] + "_new"
+    return source, pd.concat([target, extra], ignore_index=True)
+
+
+def _metadata_targets(fields: int, targets: int):
+    source, target = _metadata_pair(fields)
+    return source, {f"target_{index}": target for index in range(targets)}
+
+
+def _metadata_operations(fields: int):
+    metadata = pd.DataFrame(FakeProject.generate(records=0, fields=fields, forms=50).metadata)
+    names = list(metadata["field_name"][1:])
+    operations = [{"op": "edit", "field_name": name, "field_label": "Relabelled"} for name in names[::10]]
+    operations += [
+        {"op": "add", "field_name": f"{name}_copy", "form_name": form}
+        for name, form in zip(names[5::10], metadata["form_name"][6::10])
+    ]
+    return metadata, operations
+
+
+def _apply_metadata_operations(state) -> pd.DataFrame:
+    metadata, operations = state
+    session = MetadataEditSession(metadata)
+    session.apply(operations)
+    return session.to_frame()
+
+
+def _lint_metadata_input(fields: int) -> pd.DataFrame:
+    metadata = pd.DataFrame(FakeProject.generate(records=0, fields=fields, forms=50).metadata)
+    # Every third field gets branching logic on the field before it.
+    names = metadata["field_name"].tolist()
+    metadata["branching_logic"] = [
+        f"[{names[index - 1]}] <> ''" if index and index % 3 == 0 else "" for index in range(len(names))
+    ]
+    return metadata
+
+
+def _served_client(records: int):
+    server = FakeRedcapServer(FakeProject.generate(records=records, fields=20)).start()
+    return server, RedcapClient(server.url, server.token)
+
+
+def _stop_served_client(state) -> None:
+    server, client = state
+    client.close()
+    server.stop()
+
+
+def build_cases(quick: bool = False) -> List[Case]:
+    """Return the benchmark cases; ``quick`` shrinks inputs for a fast smoke run."""
+    csv_sizes = [10_000, 100_000] if quick else [10_000, 100_000, 1_000_000]
+    frame_rows = 10_000 if quick else 100_000
+    record_ids = 10_000 if quick else 100_000
+    metadata_fields = 1_000 if quick else 5_000
+    served_records = 1_000 if quick else 10_000
+
+    cases = [
+        Case(f"csv_parse[{rows}]", rows, lambda rows=rows: _csv_response(rows), _parse_csv)
+        for rows in csv_sizes
+    ]
+    cases.append(
+        Case(
+            f"csv_parse_output_file[{csv_sizes[0]}]",
+            csv_sizes[0],
+            lambda: _saved_csv_response(csv_sizes[0]),
+            _parse_csv_to_file,
+            lambda state: state[2].cleanup(),
+        )
+    )
+    if find_spec("pyarrow") is not None:
+        cases += [
+            Case(f"csv_parse_arrow[{rows}]", rows, lambda rows=rows: _csv_response(rows), _parse_csv_arrow)
+            for rows in csv_sizes
+        ]
+    cases += [
+        Case(
+            f"data_formatter_dataframe[{frame_rows}]",
+            frame_rows,
+            lambda: _records_frame(frame_rows),
+            lambda frame: api.import_records({"data": frame}),
+        ),
+        Case(
+            f"data_formatter_json[{frame_rows}]",
+            frame_rows,
+            lambda: _records_frame(frame_rows).to_dict(orient="records"),
+            lambda rows: api.import_records({"data": rows}),
+        ),
+        Case(
+            f"field_to_index[{record_ids}]",
+            record_ids,
+            lambda: [str(index) for index in range(record_ids)],
+            lambda ids: api.export_records({"records": ids}),
+        ),
+        Case(
+            f"payload_get_file[{record_ids}]",
+            record_ids,
+            lambda: [{"record": str(index), "field": "file_1"} for index in range(record_ids)],
+            lambda payloads: [api.get_file(data) for data in payloads],
+        ),
+        Case(
+            f"compare_metadata[{metadata_fields}]",
+            metadata_fields,
+            lambda: _metadata_pair(metadata_fields),
+            lambda pair: compare_metadata(*pair),
+        ),
+        Case(
+            f"diff_metadata_many[40x{metadata_fields}]",
+            40 * metadata_fields,
+            lambda: _metadata_targets(metadata_fields, 40),
+            lambda pair: diff_metadata_many(*pair),
+        ),
+        Case(
+            f"metadata_bulk_edit[{metadata_fields}]",
+            metadata_fields // 5,
+            lambda: _metadata_operations(metadata_fields),
+            _apply_metadata_operations,
+        ),
+        Case(
+            f"metadata_lint[{metadata_fields}]",
+            metadata_fields,
+            lambda: _lint_metadata_input(metadata_fields),
+            lint_metadata,
+        ),
+        Case(
+            f"export_records_e2e[{served_records}]",
+            served_records,
+            lambda: _served_client(served_records),
+            lambda state: state[1].export_records(),
+            _stop_served_client,
+        ),
+        Case(
+            f"import_records_e2e[{served_records}]",
+            served_records,
+            lambda: (*_served_client(served_records), _import_frame(served_records)),
+            lambda state: state[1].import_records(state[2]),
+            lambda state: _stop_served_client(state[:2]),
+        ),
+    ]
+    return cases
+
+
+def measure(case: Case, repeat: int) -> Dict[str, Any]:
+    """Time ``case`` ``repeat`` times, then record its peak traced memory in one more run."""
+    state = case.setup()
+    try:
+        timings = []
+        for _ in range(repeat):
+            gc.collect()
+            started = time.perf_counter()
+            case.run(state)
+            timings.append(time.perf_counter() - started)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            case.run(state)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    finally:
+        if case.teardown is not None:
+            case.teardown(state)
+    best = min(timings)
+    return {
+        "items": case.items,
+        "best_seconds": best,
+        "mean_seconds": sum(timings) / len(timings),
+        "items_per_second": case.items / best if best else None,
+        "peak_mib": peak / (1024 * 1024),
+    }
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], threshold: float) -> List[str]:
+    """Print the change against ``baseline`` and return the names of regressed cases.
+
+    A case regresses when its best time or its peak memory grew by more
+    than ``threshold`` (0.1 means 10%).
+    """
+    regressions = []
+    print(f"\n{'case':<36} {'time':>10} {'memory':>10}")
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            print(f"{name:<36} {'new':>10} {'new':>10}")
+            continue
+        time_change = result["best_seconds"] / previous["best_seconds"] - 1
+        memory_change = result["peak_mib"] / previous["peak_mib"] - 1 if previous["peak_mib"] else 0.0
+        flag = ""
+        if time_change > threshold or memory_change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<36} {time_change:>+10.1%} {memory_change:>+10.1%}{flag}")
+    return regressions
+
+
+def _environment(quick: bool) -> Dict[str, Any]:
+    try:
+        redcaplite_version = version("redcaplite")
+    except PackageNotFoundError:
+        redcaplite_version = "unknown"
+    return {
+        "redcaplite": redcaplite_version,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "quick": quick,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="Use smaller inputs (skips the 1M-row CSV case).")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case; the best is reported.")
+    parser.add_argument("-k", dest="keyword", default=None, help="Only run cases whose name contains this text.")
+    parser.add_argument("--output", type=Path, default=None, help="Results file. Defaults to benchmarks/results/<version>.json.")
+    parser.add_argument("--compare", type=Path, default=None, help="Earlier results file to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown or memory growth reported as a regression.")
+    args = parser.parse_args(argv)
+
+    environment = _environment(args.quick)
+    cases = [case for case in build_cases(args.quick) if not args.keyword or args.keyword in case.name]
+    results: Dict[str, Dict[str, Any]] = {}
+    print(f"{'case':<36} {'best':>10} {'items/s':>14} {'peak MiB':>10}")
+    for case in cases:
+        result = measure(case, args.repeat)
+        results[case.name] = result
+        print(
+            f"{case.name:<36} {result['best_seconds'] * 1000:>8.1f}ms "
+            f"{result['items_per_second'] or 0:>14,.0f} {result['peak_mib']:>10.1f}"
+        )
+
+    output = args.output or RESULTS_DIR / f"{environment['redcaplite']}{'-quick' if args.quick else ''}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({"environment": environment, "results": results}, indent=2) + "\n", encoding="utf-8")
+    print(f"\nSaved results to {output}")
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))["results"]
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""Compare per-call cost of the compiled payload builders against nested decorator wrappers.
+
+``redcaplite.api`` functions are declared with stacked ``optional_field`` /
+``field_to_index`` / ``require_field`` decorators, which are compiled into
+one flat builder per endpoint. This script rebuilds the same endpoints as
+the old chain of nested wrappers and times both on the per-record calls a
+loop over thousands of records makes::
+
+    python benchmarks/payload_builders.py --calls 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict
+
+from redcaplite import api
+
+
+def _nested(func: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Rebuild ``func`` (a compiled builder) as one wrapper per step, like the old decorators."""
+    spec = func.payload_spec
+    builder = spec.base
+    for kind, field, default in spec.steps:
+        builder = _wrap(builder, kind, field, default)
+    return builder
+
+
+def _wrap(inner, kind, field, default):
+    if kind == "optional":
+        def wrapper(data):
+            result = inner(data)
+            if (field in data and data[field] is not None) or default is not None:
+                result[field] = data.get(field, default)
+                if isinstance(result[field], datetime):
+                    result[field] = result[field].strftime("%Y-%m-%d %H:%M:%S")
+                elif isinstance(result[field], bool):
+                    result[field] = "true" if result[field] else "false"
+            return result
+    elif kind == "require":
+        def wrapper(data):
+            result = inner(data)
+            result[field] = data[field]
+            return result
+    elif kind in ("index", "index_required"):
+        required = kind == "index_required"
+
+        def wrapper(data):
+            result = inner(data)
+            for index, item in enumerate(data[field] if required else data.get(field, [])):
+                result[f"{field}[{index}]"] = str(item)
+            return result
+    else:
+        def wrapper(data):
+            return api.utils.format_data(inner(data), data)
+    return wrapper
+
+
+CASES = {
+    "get_file": (api.get_file, {"record": "1", "field": "file_1"}),
+    "export_records": (api.export_records, {"records": ["1"], "fields": ["record_id", "age"], "rawOrLabel": "raw"}),
+    "get_logs": (api.get_logs, {"beginTime": datetime(2024, 1, 1), "record": "1"}),
+}
+
+
+def _time_calls(build, data: Dict[str, Any], calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        build(data)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=100_000, help="Number of payloads built per case and mode.")
+    args = parser.parse_args()
+
+    for name, (compiled, data) in CASES.items():
+        nested = _nested(compiled)
+        assert nested(data) == compiled(data)
+        nested_s = min(_time_calls(nested, data, args.calls) for _ in range(5))
+        compiled_s = min(_time_calls(compiled, data, args.calls) for _ in range(5))
+        per_call = 1e6 / args.calls
+        print(
+            f"{name:<15} nested {nested_s * per_call:6.2f} us   compiled {compiled_s * per_call:6.2f} us"
+            f"   speedup {nested_s / compiled_s:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
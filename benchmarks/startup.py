@@ -0,0 +1,117 @@
+"""Measure ``rcl`` start-up time with ``python -X importtime``.
+
+Each command runs in a fresh interpreter against an empty temporary config
+directory. The script reports the import time (the sum of the top-level
+cumulative times in the ``-X importtime`` log), the wall time, and whether
+pandas was imported::
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --runs 10 --max-import-ms 150
+
+It exits with status 1 when a lightweight command (``--version``,
+``profiles``) imports pandas, or when ``--max-import-ms`` is exceeded, so
+it can gate start-up regressions in CI.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+# Commands that should start without pandas or the HTTP client.
+LIGHT_COMMANDS = (("--version",), ("profiles",))
+# Commands that load their full implementation, for comparison.
+HEAVY_COMMANDS = (("metadata", "demo", "--help"), ("sync", "--help"))
+
+_RUNNER = "import sys; from redcaplite.cli.main import main; raise SystemExit(main(sys.argv[1:]))"
+
+
+def parse_importtime(log: str) -> Dict[str, int]:
+    """Return the cumulative import time in microseconds of every top-level module in a ``-X importtime`` log."""
+    top_level = {}
+    for line in log.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit() or name[1:2] == " ":
+            continue
+        top_level[name.strip()] = int(cumulative)
+    return top_level
+
+
+def imported_modules(log: str) -> List[str]:
+    """Return every module named in a ``-X importtime`` log."""
+    return [line.rsplit("|", 1)[1].strip() for line in log.splitlines() if line.startswith("import time:") and "|" in line]
+
+
+def run_command(args: Sequence[str], env: Dict[str, str]) -> Dict[str, object]:
+    """Run ``rcl <args>`` once in a fresh interpreter and measure it."""
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _RUNNER, *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=False,
+    )
+    wall = time.perf_counter() - started
+    modules = imported_modules(completed.stderr)
+    return {
+        "import_ms": sum(parse_importtime(completed.stderr).values()) / 1000,
+        "wall_ms": wall * 1000,
+        "pandas": "pandas" in modules,
+        "requests": "requests" in modules,
+        "returncode": completed.returncode,
+    }
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Runs per command; the median is reported.")
+    parser.add_argument(
+        "--max-import-ms",
+        type=float,
+        default=None,
+        help="Fail when a lightweight command's median import time exceeds this budget.",
+    )
+    args = parser.parse_args(argv)
+
+    failures = []
+    with tempfile.TemporaryDirectory() as home:
+        env = {
+            **os.environ,
+            "HOME": home,
+            "XDG_CONFIG_HOME": str(Path(home) / ".config"),
+            "APPDATA": home,
+            "RCL_NO_CACHE": "1",
+        }
+        print(f"{'command':<24} {'import':>10} {'wall':>10}  pandas  requests")
+        for command in (*LIGHT_COMMANDS, *HEAVY_COMMANDS):
+            runs = [run_command(command, env) for _ in range(args.runs)]
+            import_ms = statistics.median(run["import_ms"] for run in runs)
+            wall_ms = statistics.median(run["wall_ms"] for run in runs)
+            name = " ".join(command)
+            print(
+                f"{name:<24} {import_ms:8.1f}ms {wall_ms:8.1f}ms  {'yes' if runs[0]['pandas'] else 'no':<6}  "
+                f"{'yes' if runs[0]['requests'] else 'no'}"
+            )
+            if command in LIGHT_COMMANDS:
+                if runs[0]["pandas"]:
+                    failures.append(f"rcl {name} imports pandas")
+                if args.max_import_ms is not None and import_ms > args.max_import_ms:
+                    failures.append(f"rcl {name} import time {import_ms:.1f}ms exceeds {args.max_import_ms:.1f}ms")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
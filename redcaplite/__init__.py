@@ -1 +1,28 @@
-from .redcap import RedcapClient  # noqa: F401
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .async_redcap import AsyncRedcapClient
+    from .redcap import RedcapClient
+
+__all__ = ["RedcapClient", "AsyncRedcapClient"]
+
+# The clients are imported on first access, so ``import redcaplite.config``
+# or ``rcl profiles`` do not pay for loading the HTTP stack.
+_LAZY_EXPORTS = {
+    "RedcapClient": ".redcap",
+    "AsyncRedcapClient": ".async_redcap",
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted([*globals(), *__all__])
@@ -1,62 +1,181 @@
 import json
+import sys
+from dataclasses import dataclass
 from datetime import datetime
-import pandas as pd
+from typing import Any, Callable, Dict, Optional, Tuple
 
+# Step kinds of a PayloadSpec, in the order the decorators are applied.
+REQUIRE = 'require'
+OPTIONAL = 'optional'
+INDEX = 'index'
+INDEX_REQUIRED = 'index_required'
+FORMAT = 'format'
 
-def data_formatter(func):
-    def wrapper(data):
-        result = func(data)
-
-        payload = data.get('data')
-        if isinstance(payload, pd.DataFrame):
-            result['data'] = payload.to_csv(index=False)
-            result['format'] = 'csv'
-        elif isinstance(payload, (dict, list)):
-            result['data'] = json.dumps(payload)
-            result['format'] = 'json'
-        else:
-            result['data'] = payload
-            result['format'] = result.get('format', data.get('format', 'json'))
+
+def format_value(value):
+    """Convert a datetime or bool parameter into the text REDCap expects."""
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value
+
+
+def is_dataframe(value) -> bool:
+    """Return whether ``value`` is a pandas DataFrame, without importing pandas.
+
+    A DataFrame can only exist once pandas has been imported, so callers
+    handling lists and dicts never pay for the pandas import.
+    """
+    pd = sys.modules.get('pandas')
+    return pd is not None and isinstance(value, pd.DataFrame)
+
+
+def format_data(result, data):
+    """Serialize ``data['data']`` into ``result`` and set the matching ``format``."""
+    payload = data.get('data')
+    if is_dataframe(payload):
+        result['data'] = payload.to_csv(index=False)
+        result['format'] = 'csv'
+    elif isinstance(payload, (dict, list)):
+        result['data'] = json.dumps(payload)
+        result['format'] = 'json'
+    else:
+        result['data'] = payload
+        result['format'] = result.get('format', data.get('format', 'json'))
+    return result
+
+
+@dataclass(frozen=True)
+class PayloadSpec:
+    """Declarative description of an API payload builder.
+
+    ``base`` returns the fixed part of the payload (``content``, ``action``,
+    ...). Each step then copies one parameter from the caller's data:
+    ``(REQUIRE, field, None)``, ``(OPTIONAL, field, default)``,
+    ``(INDEX, field, None)`` / ``(INDEX_REQUIRED, field, None)`` for lists
+    sent as ``field[0]``, ``field[1]``, ..., and ``(FORMAT, None, None)``
+    for the ``data``/``format`` serialization of ``data_formatter``.
+    """
+
+    base: Callable[[Dict[str, Any]], Dict[str, Any]]
+    steps: Tuple[Tuple[str, Optional[str], Any], ...] = ()
+
+    def add(self, kind: str, field: Optional[str] = None, default: Any = None) -> 'PayloadSpec':
+        """Return a copy of the spec with one more step."""
+        return PayloadSpec(self.base, self.steps + ((kind, field, default),))
+
+    def compile(self) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        """Return one flat builder function that runs every step."""
+        return compile_payload(self)
+
+
+def compile_payload(spec: PayloadSpec) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Compile ``spec`` into a builder with the same output as the stacked decorators.
+
+    The steps are prepared once into a tuple, and the builder is a single
+    loop over them, so a call runs no nested wrappers. Defaults are
+    converted once here, and values that are already ``str`` skip the
+    datetime/bool checks.
+    """
+    base = spec.base
+    steps = _prepare_steps(spec.steps)
+
+    def build(data):
+        result = base(data)
+        for kind, fields, extra in steps:
+            if kind is OPTIONAL:
+                for field in fields:
+                    if field in data:
+                        value = data[field]
+                        if value is not None:
+                            result[field] = value if value.__class__ is str else format_value(value)
+            elif kind is REQUIRE:
+                for field in fields:
+                    result[field] = data[field]
+            elif kind is _DEFAULTED:
+                if fields in data:
+                    value = data[fields]
+                    result[fields] = value if value is None or value.__class__ is str else format_value(value)
+                else:
+                    result[fields] = extra
+            elif kind is FORMAT:
+                format_data(result, data)
+            else:
+                items = data[fields] if kind is INDEX_REQUIRED else data.get(fields, ())
+                for index, item in enumerate(items):
+                    result[extra + str(index) + ']'] = str(item)
         return result
-    return wrapper
 
+    return _describe(build, spec)
 
-def field_to_index(field: str, required: bool = False):
-    def decorator(func):
-        def wrapper(data):
 
-            result = func(data)
+# An OPTIONAL step with a default, which is always written.
+_DEFAULTED = 'defaulted'
 
-            for index, item in enumerate(data[field] if required else data.get(field, [])):
-                result[f"{field}[{index}]"] = str(item)
-            return result
-        return wrapper
-    return decorator
+_STEP_KINDS = {kind: kind for kind in (REQUIRE, OPTIONAL, INDEX, INDEX_REQUIRED, FORMAT)}
 
 
-def require_field(field: str):
+def _prepare_steps(steps) -> Tuple[Tuple[str, Any, Any], ...]:
+    """Return ``(kind, fields, extra)`` steps ready for the builder loop.
+
+    Kinds are mapped to the module constants so the builder can compare
+    them with ``is``. Runs of REQUIRE steps and of OPTIONAL steps without a
+    default are merged into one step with a tuple of fields. A defaulted
+    OPTIONAL step carries its converted default and an INDEX step its
+    ``field[`` key prefix.
+    """
+    prepared: list = []
+    for kind, field, default in steps:
+        if kind not in _STEP_KINDS:
+            raise ValueError(f"Unknown payload step kind: {kind!r}")
+        kind = _STEP_KINDS[kind]
+        if kind is OPTIONAL and default is not None:
+            prepared.append((_DEFAULTED, field, format_value(default)))
+        elif kind is INDEX or kind is INDEX_REQUIRED:
+            prepared.append((kind, field, field + '['))
+        elif kind is FORMAT:
+            prepared.append((kind, None, None))
+        elif prepared and prepared[-1][0] is kind:
+            prepared[-1] = (kind, prepared[-1][1] + (field,), None)
+        else:
+            prepared.append((kind, (field,), None))
+    return tuple(prepared)
+
+
+def _describe(build, spec: PayloadSpec):
+    base = spec.base
+    build.__name__ = getattr(base, '__name__', build.__name__)
+    build.__qualname__ = getattr(base, '__qualname__', build.__qualname__)
+    build.__module__ = getattr(base, '__module__', build.__module__)
+    build.__doc__ = getattr(base, '__doc__', None)
+    build.payload_spec = spec
+    return build
+
+
+def _add_step(func, kind, field=None, default=None):
+    # Stacked decorators extend one spec instead of nesting wrappers.
+    spec = getattr(func, 'payload_spec', None) or PayloadSpec(func)
+    return compile_payload(spec.add(kind, field, default))
+
+
+def data_formatter(func):
+    return _add_step(func, FORMAT)
+
+
+def field_to_index(field: str, required: bool = False):
     def decorator(func):
-        def wrapper(data):
+        return _add_step(func, INDEX_REQUIRED if required else INDEX, field)
+    return decorator
 
-            result = func(data)
 
-            result[field] = data[field]
-            return result
-        return wrapper
+def require_field(field: str):
+    def decorator(func):
+        return _add_step(func, REQUIRE, field)
     return decorator
 
 
 def optional_field(field: str, default=None):
     def decorator(func):
-        def wrapper(data):
-
-            result = func(data)
-            if (field in data and data[field] is not None) or default is not None:
-                result[field] = data.get(field, default)
-                if isinstance(result[field], datetime):
-                    result[field] = result[field].strftime("%Y-%m-%d %H:%M:%S")
-                elif isinstance(result[field], bool):
-                    result[field] = "true" if result[field] else "false"
-            return result
-        return wrapper
+        return _add_step(func, OPTIONAL, field, default)
     return decorator
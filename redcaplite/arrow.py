@@ -0,0 +1,117 @@
+"""Arrow-native parsing and columnar output for CSV exports.
+
+Requires the optional ``pyarrow`` dependency (``pip install 'redcaplite[arrow]'``).
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Literal, Optional, Sequence, Union
+
+from .http.handler import is_blank
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+ArrowResult = Literal["table", "pandas"]
+
+# REDCap's csvDelimiter values mapped to the characters they stand for.
+_DELIMITERS = {"tab": "\t", ",": ",", ";": ";", "|": "|", "^": "^"}
+
+# Output suffixes written as columnar files; anything else gets the raw CSV bytes.
+PARQUET_SUFFIXES = {".parquet", ".pq"}
+FEATHER_SUFFIXES = {".feather", ".arrow", ".ipc"}
+
+
+def require_pyarrow():
+    """Import and return ``pyarrow``, with an install hint when it is missing."""
+    try:
+        import pyarrow
+        import pyarrow.csv  # noqa: F401
+    except ImportError as exc:  # pragma: no cover - exercised when pyarrow is unavailable
+        raise ImportError(
+            "Arrow exports require pyarrow. Install it with: pip install 'redcaplite[arrow]'"
+        ) from exc
+    return pyarrow
+
+
+def read_csv_table(
+    body: bytes,
+    delimiter: str = ",",
+    convert_options: Optional[Dict[str, Any]] = None,
+    empty_columns: Optional[Sequence[str]] = None,
+):
+    """Parse a CSV response body into a ``pyarrow.Table`` without decoding it to ``str``.
+
+    The reader works on the bytes in place and parses blocks on Arrow's
+    thread pool. ``convert_options`` are passed to
+    ``pyarrow.csv.ConvertOptions`` (for example ``column_types`` or
+    ``strings_can_be_null``). A blank body, which REDCap sends when nothing
+    matches, gives an empty table with ``empty_columns`` as string columns.
+    """
+    pa = require_pyarrow()
+    if is_blank(body):
+        return pa.table({name: pa.array([], type=pa.string()) for name in empty_columns or []})
+    return pa.csv.read_csv(
+        pa.BufferReader(body),
+        read_options=pa.csv.ReadOptions(use_threads=True),
+        parse_options=pa.csv.ParseOptions(delimiter=_DELIMITERS.get(delimiter, delimiter)),
+        convert_options=pa.csv.ConvertOptions(**(convert_options or {})),
+    )
+
+
+def table_to_pandas(table) -> pd.DataFrame:
+    """Return an Arrow-backed DataFrame that shares ``table``'s buffers where possible."""
+    import pandas as pd
+
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def write_output(
+    table,
+    body: bytes,
+    output_file: Union[str, os.PathLike[str]],
+) -> None:
+    """Save an export by ``output_file``'s suffix: Parquet, Feather, or the raw CSV bytes."""
+    output_path = Path(output_file)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    suffix = output_path.suffix.lower()
+    if suffix in PARQUET_SUFFIXES:
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, output_path)
+    elif suffix in FEATHER_SUFFIXES:
+        import pyarrow.feather as feather
+
+        feather.write_feather(table, output_path)
+    else:
+        output_path.write_bytes(body)
+
+
+def parse_arrow_response(
+    response,
+    data: Dict[str, Any],
+    arrow: ArrowResult = "table",
+    convert_options: Optional[Dict[str, Any]] = None,
+    output_file: Optional[Union[str, os.PathLike[str]]] = None,
+    empty_columns: Optional[Sequence[str]] = None,
+):
+    """Parse a CSV export response with Arrow, save ``output_file`` and return the result.
+
+    Returns a ``pyarrow.Table`` when ``arrow`` is ``"table"`` and an
+    Arrow-backed DataFrame when it is ``"pandas"``. The response bytes are
+    read once; neither parsing nor saving decodes them to text.
+    """
+    if arrow not in ("table", "pandas"):
+        raise ValueError('arrow must be "table" or "pandas".')
+    body = response.content
+    table = read_csv_table(
+        body,
+        delimiter=data.get("csvDelimiter") or ",",
+        convert_options=convert_options,
+        empty_columns=empty_columns,
+    )
+    if output_file is not None:
+        write_output(table, body, output_file)
+    return table if arrow == "table" else table_to_pandas(table)
@@ -0,0 +1,441 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from datetime import datetime, timedelta, tzinfo
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, Sequence, Union
+
+from .batch import (
+    BatchImportResult,
+    chunk_sequence,
+    collect_import_results,
+    concat_frames,
+    split_records,
+    unique_record_ids,
+)
+from .cache import MetadataCache
+from .file_export import FileExportPlan, FileExportResult, FileTask, open_part_file
+from .http.events import RequestObserver
+from .http.retry import RateLimiter, RetryPolicy
+from .http.async_client import DEFAULT_MAX_CONCURRENCY, AsyncClient
+from .http.handler import DEFAULT_DOWNLOAD_CHUNK_SIZE, get_download_file_name
+from .http.client import DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE
+from .log_export import LogWindow, build_log_export
+from . import api
+from .api.utils import is_dataframe
+from .redcap import _TEXT_READ_CSV_KWARGS, BaseRedcapClient
+from .snapshot import SnapshotPlan, SnapshotSyncResult
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class AsyncRedcapClient(BaseRedcapClient, AsyncClient):
+    """
+    An asyncio client for the REDCap API.
+
+    Every endpoint method of `RedcapClient` is available with the same
+    arguments and return values, but returns a coroutine. Requests share one
+    pooled `httpx.AsyncClient` and at most `max_concurrency` of them are in
+    flight at once, so hundreds of calls can be passed to `asyncio.gather`.
+    Use it with `async with`, or `await client.close()` when done.
+
+    The endpoints come from `BaseRedcapClient`, and the chunked, batched,
+    file and snapshot helpers share their planning and merging code with
+    `RedcapClient`; only the waiting is async. It is not a `RedcapClient`.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        token: str,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        transport=None,
+        metadata_cache: Optional[MetadataCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        request_observers: Optional[Sequence[RequestObserver]] = None,
+    ):
+        """
+        Initialize the AsyncRedcapClient.
+
+        Args:
+            url (str): The URL of the REDCap API.
+            token (str): The API token for authentication.
+            pool_connections (int): Accepted for parity with `RedcapClient`; httpx keeps one pool per host.
+            pool_maxsize (int): Maximum number of connections kept open.
+            pool_block (bool): Accepted for parity with `RedcapClient`; httpx always waits for a free connection.
+            keep_alive (bool): Whether to reuse connections between requests.
+            max_concurrency (int): Maximum number of requests in flight at once.
+            transport (Optional[httpx.AsyncBaseTransport]): Custom httpx transport, mainly for testing.
+            metadata_cache (Optional[MetadataCache]): On-disk cache for project structure exports. Disabled when None.
+            retry_policy (Optional[RetryPolicy]): When and how to retry transient failures (429 and 5xx responses, dropped connections). Requests fail immediately when None.
+            rate_limiter (Optional[RateLimiter]): Token bucket shared by every request, for example across clients and threads using the same API token.
+            request_observers (Optional[Sequence[RequestObserver]]): Callables receiving a `RequestEvent` (content, action, sizes, status and timings) after every request.
+        """
+        super().__init__(
+            url,
+            token,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            keep_alive=keep_alive,
+            max_concurrency=max_concurrency,
+            transport=transport,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            request_observers=request_observers,
+        )
+        self.metadata_cache = metadata_cache
+
+    async def _cached_export(self, name: str, params: Dict[str, Any], fetch):
+        """Await ``fetch()`` through the metadata cache when it is enabled."""
+        if self.metadata_cache is None or params.get("output_file") is not None:
+            return await fetch()
+        key = (name, sorted(params.items()))
+        cached = self.metadata_cache.get(self.url, self.token, key)
+        if cached is not None:
+            return cached
+        value = await fetch()
+        self.metadata_cache.set(self.url, self.token, key, value)
+        return value
+
+    async def _structure_change(self, send):
+        """Await ``send()``, dropping cached project structure before and after it."""
+        self.clear_metadata_cache()
+        try:
+            return await send()
+        finally:
+            self.clear_metadata_cache()
+
+    async def export_records(self, *args: Any, infer_dtypes: bool = False, **kwargs: Any):
+        """
+        Export records from the project.
+
+        Accepts the same arguments as `RedcapClient.export_records()`.
+        """
+        if infer_dtypes:
+            await self._load_record_metadata()
+        return await BaseRedcapClient.export_records(self, *args, infer_dtypes=infer_dtypes, **kwargs)
+
+    async def _load_record_metadata(self) -> pd.DataFrame:
+        """Fetch the metadata used for dtype inference unless it is already loaded."""
+        if self._record_metadata is None:
+            self._record_metadata = await self.get_metadata(format="csv")
+        return self._record_metadata
+
+    def _get_record_metadata(self) -> pd.DataFrame:
+        # Loaded by export_records() before the shared endpoint code asks for it.
+        return self._record_metadata
+
+    async def export_records_chunked(
+        self,
+        chunk_size: int = 1000,
+        max_workers: int = 4,
+        record_id_field: Optional[str] = None,
+        iterate: bool = False,
+        records: List[str] = [],
+        **export_kwargs: Any,
+    ):
+        """
+        Export records as CSV in record ID batches fetched concurrently.
+
+        Accepts the same filters as `export_records()` as keyword arguments.
+        See `RedcapClient.export_records_chunked()` for the batching rules.
+
+        Args:
+            chunk_size (int): Number of record IDs per batch request.
+            max_workers (int): Maximum number of batch requests in flight.
+            record_id_field (Optional[str]): The project's record ID field. Looked up with `get_field_names()` when omitted.
+            iterate (bool): Return an async iterator of per-batch DataFrames instead of a single DataFrame.
+            records (List[str]): Specific records to export. Skips the record ID lookup when provided.
+
+        Returns:
+            A single DataFrame with all batches in record ID order, or an async iterator of per-batch DataFrames when `iterate` is True.
+        """
+        export_kwargs["format"] = "csv"
+        if export_kwargs.get("infer_dtypes"):
+            await self._load_record_metadata()
+        record_ids = list(records) or await self._export_record_ids(
+            record_id_field,
+            events=export_kwargs.get("events", []),
+            filterLogic=export_kwargs.get("filterLogic"),
+            dateRangeBegin=export_kwargs.get("dateRangeBegin"),
+            dateRangeEnd=export_kwargs.get("dateRangeEnd"),
+        )
+        limit = asyncio.Semaphore(max_workers)
+
+        async def export_batch(batch):
+            async with limit:
+                return await self.export_records(records=batch, **export_kwargs)
+
+        batches = chunk_sequence(record_ids, chunk_size)
+        if iterate:
+            return _dataframes(_iter_in_order(export_batch, batches, max_workers))
+        return concat_frames(await asyncio.gather(*(export_batch(batch) for batch in batches)))
+
+    async def _export_record_ids(
+        self,
+        record_id_field: Optional[str] = None,
+        events: List[str] = [],
+        filterLogic: Optional[str] = None,
+        dateRangeBegin=None,
+        dateRangeEnd=None,
+    ) -> List[str]:
+        """Return the distinct record IDs matching the given filters, in export order."""
+        if record_id_field is None:
+            field_names = await self.get_field_names(format="json")
+            record_id_field = field_names[0]["original_field_name"]
+        ids = await self.export_records(
+            format="csv",
+            fields=[record_id_field],
+            events=events,
+            filterLogic=filterLogic,
+            dateRangeBegin=dateRangeBegin,
+            dateRangeEnd=dateRangeEnd,
+            pd_read_csv_kwargs=dict(_TEXT_READ_CSV_KWARGS),
+        )
+        return unique_record_ids(ids, record_id_field)
+
+    async def export_files(
+        self,
+        fields: Union[str, List[str]],
+        directory: Union[str, Path],
+        records: List[str] = [],
+        events: List[str] = [],
+        record_id_field: Optional[str] = None,
+        max_workers: int = 4,
+        manifest: Optional[Union[str, Path]] = None,
+        chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
+    ) -> FileExportResult:
+        """
+        Download every file stored in one or more File Upload fields concurrently.
+
+        See `RedcapClient.export_files()` for the file layout and resume rules.
+        """
+        fields = [fields] if isinstance(fields, str) else list(fields)
+        if record_id_field is None:
+            field_names = await self.get_field_names(format="json")
+            record_id_field = field_names[0]["original_field_name"]
+        export = await self.export_records(
+            format="csv",
+            records=records,
+            events=events,
+            fields=[record_id_field, *fields],
+            pd_read_csv_kwargs=dict(_TEXT_READ_CSV_KWARGS),
+        )
+        plan = FileExportPlan(export, fields, record_id_field, directory, manifest)
+        limit = asyncio.Semaphore(max_workers)
+
+        async def download(task: FileTask):
+            async with limit:
+                path, size = await self._download_file_task(task, directory, chunk_size)
+            return plan.finish(task, path, size)
+
+        outcomes = _raise_interruptions(await asyncio.gather(
+            *(download(task) for task in plan.pending),
+            return_exceptions=True,
+        ))
+        for task, outcome in zip(plan.pending, outcomes):
+            if isinstance(outcome, Exception):
+                plan.record(task, None, outcome)
+            else:
+                plan.record(task, outcome, None)
+        return plan.result
+
+    async def _download_file_task(self, task: FileTask, directory: Union[str, Path], chunk_size: int):
+        """Stream one File Upload value into its directory and return ``(path, size)``."""
+        response = await self.file_stream_api(
+            api.get_file(
+                {
+                    "record": task.record,
+                    "field": task.field,
+                    "event": task.event,
+                    "repeat_instance": task.repeat_instance,
+                }
+            )
+        )
+        try:
+            size = 0
+            with open_part_file(
+                task.target_dir(directory),
+                get_download_file_name(response, default=f"{task.field}.raw"),
+            ) as (part_file, path):
+                async for chunk in response.aiter_bytes(chunk_size):
+                    part_file.write(chunk)
+                    size += len(chunk)
+            return path, size
+        finally:
+            await response.aclose()
+
+    async def import_records_batched(
+        self,
+        data: Union[pd.DataFrame, List[Dict[str, Any]]],
+        batch_size: int = 500,
+        max_workers: int = 4,
+        record_id_field: Optional[str] = None,
+        format: Literal["json", "csv"] = "csv",
+        **import_kwargs: Any,
+    ) -> BatchImportResult:
+        """
+        Import records in record ID batches posted concurrently.
+
+        Accepts the same options as `import_records()` as keyword arguments.
+        See `RedcapClient.import_records_batched()` for the batching rules.
+
+        Args:
+            data (Union[pd.DataFrame, List[Dict[str, Any]]]): The records to import.
+            batch_size (int): Maximum number of records per batch request.
+            max_workers (int): Maximum number of batch requests in flight.
+            record_id_field (Optional[str]): Column holding the record ID. Defaults to the first column.
+            format (Literal["json", "csv"]): The format of the imported data.
+
+        Returns:
+            BatchImportResult: The merged `count` and `ids` of all successful batches, plus one `errors` entry per failed batch.
+        """
+        limit = asyncio.Semaphore(max_workers)
+
+        async def import_batch(rows):
+            async with limit:
+                return await self.import_records(rows, format=format, **import_kwargs)
+
+        batches = list(split_records(data, batch_size, record_id_field))
+        responses = _raise_interruptions(await asyncio.gather(
+            *(import_batch(rows) for _, rows in batches),
+            return_exceptions=True,
+        ))
+        return collect_import_results(
+            (batch_number, record_ids, None, response) if isinstance(response, Exception)
+            else (batch_number, record_ids, response, None)
+            for batch_number, ((record_ids, _), response) in enumerate(zip(batches, responses))
+        )
+
+    async def sync_snapshot(
+        self,
+        path: Union[str, Path],
+        full: bool = False,
+        overlap: timedelta = timedelta(minutes=5),
+        server_timezone: Union[str, tzinfo, None] = None,
+    ) -> SnapshotSyncResult:
+        """
+        Bring a local SQLite snapshot of the project's records up to date.
+
+        See `RedcapClient.sync_snapshot()` for the watermark, timezone and
+        deletion rules.
+        """
+        plan = SnapshotPlan.start(path, full, overlap, server_timezone)
+        records = await self.export_records(
+            format="csv",
+            dateRangeBegin=plan.since,
+            pd_read_csv_kwargs=dict(_TEXT_READ_CSV_KWARGS),
+        )
+        if plan.needs_full_export(records):
+            return await self.sync_snapshot(path, full=True, overlap=overlap, server_timezone=server_timezone)
+
+        delete_logs = None
+        if not plan.full:
+            delete_logs = await self.get_logs(
+                format="csv",
+                logtype="record_delete",
+                beginTime=plan.since,
+                pd_read_csv_kwargs=dict(_TEXT_READ_CSV_KWARGS),
+            )
+        return plan.apply(records, delete_logs)
+
+    async def export_logs_windowed(
+        self,
+        beginTime: datetime,
+        endTime: Optional[datetime] = None,
+        logtype: Optional[str] = None,
+        user: Optional[str] = None,
+        record: Optional[str] = None,
+        dag: Optional[str] = None,
+        window: timedelta = timedelta(hours=1),
+        min_window: timedelta = timedelta(minutes=1),
+        max_window: timedelta = timedelta(days=7),
+        target_rows: int = 50_000,
+        target_seconds: float = 30.0,
+        max_workers: int = 4,
+        output_file: Optional[Union[str, Path]] = None,
+        checkpoint: Optional[Union[str, Path]] = None,
+    ):
+        """
+        Export a long range of logs as consecutive time windows fetched concurrently.
+
+        See `RedcapClient.export_logs_windowed()` for the window sizing and
+        checkpoint rules.
+
+        Returns:
+            An async iterator of DataFrames (one per non-empty window), or a `LogExportResult` when `output_file` is set.
+        """
+        export = build_log_export(
+            beginTime,
+            endTime,
+            {"logtype": logtype, "user": user, "record": record, "dag": dag},
+            window=window,
+            min_window=min_window,
+            max_window=max_window,
+            target_rows=target_rows,
+            target_seconds=target_seconds,
+            output_file=output_file,
+            checkpoint=checkpoint,
+        )
+
+        async def fetch(log_window: LogWindow):
+            return await self.get_logs(
+                format="csv",
+                logtype=logtype,
+                user=user,
+                record=record,
+                dag=dag,
+                beginTime=log_window.begin,
+                endTime=log_window.end,
+                pd_read_csv_kwargs=dict(_TEXT_READ_CSV_KWARGS),
+            )
+
+        chunks = export.run_async(fetch, max_workers)
+        if output_file is None:
+            return chunks
+        async for _ in chunks:
+            pass
+        return export.result
+
+
+def _raise_interruptions(outcomes: List[Any]) -> List[Any]:
+    """Re-raise a cancellation among ``gather(return_exceptions=True)`` outcomes.
+
+    ``CancelledError``, ``KeyboardInterrupt`` and other ``BaseException``s
+    that are not ``Exception``s stop the whole call instead of being
+    recorded as one failed (or, worse, successful) batch.
+    """
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException) and not isinstance(outcome, Exception):
+            raise outcome
+    return outcomes
+
+
+async def _dataframes(chunks):
+    """Yield only the DataFrames among ``chunks``, like the sync chunked export."""
+    async for chunk in chunks:
+        if is_dataframe(chunk):
+            yield chunk
+
+
+async def _iter_in_order(func, items, max_workers):
+    """Run ``func`` over ``items`` with a bounded look-ahead and yield results in order."""
+    pending = deque()
+    try:
+        for item in items:
+            pending.append(asyncio.ensure_future(func(item)))
+            if len(pending) >= 2 * max_workers:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,188 @@
+"""Helpers for splitting REDCap API work into record batches."""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union
+
+from .api.utils import is_dataframe
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def chunk_sequence(items: Sequence[T], size: int) -> Iterator[List[T]]:
+    """Yield consecutive slices of ``items`` holding at most ``size`` entries."""
+    if size < 1:
+        raise ValueError("Batch size must be at least 1.")
+    for start in range(0, len(items), size):
+        yield list(items[start:start + size])
+
+
+def map_bounded(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: int,
+) -> Iterator[R]:
+    """Apply ``func`` to ``items`` on a thread pool and yield results in input order.
+
+    At most ``max_workers`` calls run at once and only ``2 * max_workers``
+    results are held before the caller consumes them, so slow consumers do
+    not make the whole result set pile up in memory.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1.")
+
+    iterator = iter(items)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for item in iterator:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= 2 * max_workers:
+                break
+        try:
+            while pending:
+                yield pending.popleft().result()
+                for item in iterator:
+                    pending.append(executor.submit(func, item))
+                    break
+        finally:
+            # Drop queued work when the consumer stops early or a batch fails.
+            for future in pending:
+                future.cancel()
+
+
+RecordData = Union["pd.DataFrame", List[Dict[str, Any]]]
+
+
+def concat_frames(chunks: Iterable[Any]) -> pd.DataFrame:
+    """Concatenate the DataFrames among ``chunks``, skipping empty or non-CSV responses."""
+    import pandas as pd
+
+    frames = [chunk for chunk in chunks if is_dataframe(chunk)]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def unique_record_ids(export: Any, record_id_field: str) -> List[str]:
+    """Return the distinct values of ``record_id_field`` in a record export, in export order."""
+    if not is_dataframe(export) or record_id_field not in export.columns:
+        return []
+    return list(export[record_id_field].drop_duplicates())
+
+
+@dataclass
+class BatchImportResult:
+    """Merged outcome of an import split across several batch requests."""
+
+    count: int = 0
+    ids: List[Any] = field(default_factory=list)
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """Return ``True`` when every batch was imported without an error."""
+        return not self.errors
+
+
+def split_records(
+    data: RecordData,
+    batch_size: int,
+    record_id_field: Optional[str] = None,
+) -> Iterator[Tuple[List[Any], RecordData]]:
+    """Yield ``(record_ids, rows)`` batches holding at most ``batch_size`` records.
+
+    Rows are grouped by record ID, so every event and repeat instance of a
+    record lands in the same batch. The record ID column defaults to the
+    first column (or first key), matching REDCap's import layout. Rows with
+    a missing or blank record ID raise ``ValueError`` before the first batch
+    is yielded, since they cannot be grouped with the rest of their record.
+    """
+    if batch_size < 1:
+        raise ValueError("Batch size must be at least 1.")
+
+    if is_dataframe(data):
+        import pandas as pd
+
+        if data.empty:
+            return
+        id_column = record_id_field or data.columns[0]
+        ids = data[id_column]
+        _check_record_ids(id_column, ids.isna() | (ids.astype(str).str.strip() == ""))
+        codes, unique_ids = pd.factorize(ids)
+        for batch_number, rows in data.groupby(codes // batch_size, sort=True):
+            start = int(batch_number) * batch_size
+            yield list(unique_ids[start:start + batch_size]), rows
+        return
+
+    if isinstance(data, list):
+        if not data:
+            return
+        id_key = record_id_field or next(iter(data[0]))
+        _check_record_ids(id_key, [_missing_record_id(row.get(id_key)) for row in data])
+        batches: Dict[Any, int] = {}
+        grouped: List[Tuple[List[Any], List[Dict[str, Any]]]] = []
+        for row in data:
+            record_id = row[id_key]
+            if record_id not in batches:
+                batches[record_id] = len(batches) // batch_size
+                if batches[record_id] == len(grouped):
+                    grouped.append(([], []))
+                grouped[batches[record_id]][0].append(record_id)
+            grouped[batches[record_id]][1].append(row)
+        yield from grouped
+        return
+
+    raise TypeError("Batched imports require a DataFrame or a list of record dictionaries.")
+
+
+def _missing_record_id(value: Any) -> bool:
+    return value is None or value != value or str(value).strip() == ""
+
+
+def _check_record_ids(id_field: str, missing: Iterable[bool]) -> None:
+    rows = [position for position, is_missing in enumerate(missing) if is_missing]
+    if rows:
+        shown = ", ".join(str(position) for position in rows[:10])
+        more = f" and {len(rows) - 10} more" if len(rows) > 10 else ""
+        raise ValueError(f"Rows {shown}{more} have no value in the record ID field {id_field!r}.")
+
+
+def collect_import_results(
+    outcomes: Iterable[Tuple[int, List[Any], Any, Optional[BaseException]]],
+) -> BatchImportResult:
+    """Merge ``(batch_number, record_ids, response, error)`` outcomes into one result.
+
+    Successful responses are folded in with ``merge_import_result``; each
+    failed batch becomes one ``errors`` entry.
+    """
+    result = BatchImportResult()
+    for batch_number, record_ids, response, error in outcomes:
+        if error is not None:
+            result.errors.append({"batch": batch_number, "records": record_ids, "error": str(error)})
+        else:
+            merge_import_result(result, response)
+    return result
+
+
+def merge_import_result(result: BatchImportResult, response: Any) -> None:
+    """Fold one batch's ``returnContent`` response into ``result``."""
+    if isinstance(response, dict) and "count" in response:
+        result.count += int(response["count"])
+    elif isinstance(response, list):
+        result.ids.extend(response)
+        result.count += len(response)
+    elif is_dataframe(response) and not response.empty:
+        if "count" in response.columns:
+            result.count += int(response["count"].sum())
+        else:
+            result.ids.extend(response.iloc[:, 0].tolist())
+            result.count += len(response.index)
+    elif isinstance(response, str) and response.strip().isdigit():
+        result.count += int(response.strip())
@@ -0,0 +1,97 @@
+"""On-disk cache for REDCap project structure exports."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import platform
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Hashable, Optional
+
+DEFAULT_CACHE_TTL = 3600.0
+
+_ENTRY_SUFFIX = ".pkl"
+
+
+def get_cache_path() -> Path:
+    """Return the OS-specific directory used for cached project metadata."""
+    system = platform.system()
+    if system == "Windows":
+        base_dir = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+        return base_dir / "redcaplite" / "Cache"
+    if system == "Darwin":
+        return Path.home() / "Library" / "Caches" / "redcaplite"
+    base_dir = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return base_dir / "redcaplite"
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+class MetadataCache:
+    """Pickle-backed cache of project structure exports with a time-to-live.
+
+    Entries are grouped per project, keyed by a hash of the API URL and
+    token so tokens never appear on disk, and expire ``ttl`` seconds after
+    they were written (``ttl=None`` keeps them until invalidated). Pickle
+    files are only ever read from the local cache directory; do not point
+    ``cache_dir`` at a location other users can write to.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        ttl: Optional[float] = DEFAULT_CACHE_TTL,
+    ) -> None:
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else get_cache_path() / "metadata"
+        self.ttl = ttl
+
+    def project_dir(self, url: str, token: str) -> Path:
+        """Return the directory holding every cached entry for one project."""
+        return self.cache_dir / _digest(f"{url}\0{token}")[:32]
+
+    def _entry_path(self, url: str, token: str, key: Hashable) -> Path:
+        return self.project_dir(url, token) / (_digest(repr(key)) + _ENTRY_SUFFIX)
+
+    def get(self, url: str, token: str, key: Hashable) -> Optional[Any]:
+        """Return the cached value for ``key``, or ``None`` when missing or expired."""
+        path = self._entry_path(url, token, key)
+        try:
+            with path.open("rb") as entry_file:
+                stored_at, value = pickle.load(entry_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+            # A truncated or foreign file is treated as a miss and dropped.
+            path.unlink(missing_ok=True)
+            return None
+        if self.ttl is not None and time.time() - stored_at > self.ttl:
+            path.unlink(missing_ok=True)
+            return None
+        return value
+
+    def set(self, url: str, token: str, key: Hashable, value: Any) -> None:
+        """Store ``value`` for ``key``, replacing any previous entry atomically."""
+        path = self._entry_path(url, token, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as entry_file:
+                pickle.dump((time.time(), value), entry_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_name, path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+
+    def invalidate(self, url: str, token: str) -> None:
+        """Drop every cached entry for one project."""
+        shutil.rmtree(self.project_dir(url, token), ignore_errors=True)
+
+    def clear(self) -> None:
+        """Drop every cached entry for every project."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
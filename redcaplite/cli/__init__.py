@@ -1,11 +1,9 @@
 """Command-line interface package for redcaplite."""
 
-from .helpers import (
-    ClientBootstrapError,
-    ProfileNotFoundError,
-    TokenNotFoundError,
-    build_client,
-)
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .helpers import ClientBootstrapError, ProfileNotFoundError, TokenNotFoundError, build_client
 
 __all__ = [
     "ClientBootstrapError",
@@ -13,3 +11,14 @@ __all__ = [
     "TokenNotFoundError",
     "build_client",
 ]
+
+
+def __getattr__(name):
+    # ``helpers`` pulls in the token store (and keyring), which ``rcl
+    # --version`` and ``rcl profiles`` never need, so it is imported on
+    # first access.
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from . import helpers
+
+    return getattr(helpers, name)
@@ -0,0 +1,124 @@
+"""Run one operation against several profiles at once."""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+import pandas as pd
+
+from redcaplite.fanout import DEFAULT_MAX_PER_HOST, DEFAULT_MAX_WORKERS, OPERATIONS, fan_out
+
+from .helpers import get_metadata_cache
+from .output import print_error, print_success, print_table
+
+
+def register_parser(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) -> None:
+    """Attach the ``fanout`` command parser to the CLI root."""
+    parser = subparsers.add_parser(
+        "fanout",
+        prog="rcl fanout",
+        help="Run one export against several profiles concurrently.",
+        description=(
+            "Run one export against several profiles concurrently.\n\n"
+            "Profiles may be names or quoted globs. Projects on the same REDCap\n"
+            "server share a connection pool.\n\n"
+            "Common usage patterns:\n"
+            "  rcl fanout version 'site_*'\n"
+            "  rcl fanout metadata site_a site_b --output-dir ./metadata\n"
+            "  rcl fanout records 'study_*' --max-per-host 2 --output-dir ./exports"
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("operation", choices=sorted(OPERATIONS), help="Export to run for each profile.")
+    parser.add_argument("profiles", metavar="<profile>", nargs="+", help="Profile names or globs.")
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help=f"Projects processed at once (default: {DEFAULT_MAX_WORKERS}).",
+    )
+    parser.add_argument(
+        "--max-per-host",
+        type=int,
+        default=DEFAULT_MAX_PER_HOST,
+        help=f"Projects processed at once against the same server (default: {DEFAULT_MAX_PER_HOST}).",
+    )
+    parser.add_argument(
+        "--output-dir",
+        metavar="DIR",
+        default=None,
+        help='Save each result as "<profile>_<operation>.csv" (or ".txt") in this directory.',
+    )
+    parser.set_defaults(handler=_handle_fanout)
+
+
+def summarize(result: Any) -> str:
+    """Return a one-line description of an operation result for the summary table."""
+    if isinstance(result, pd.DataFrame):
+        return f"{len(result.index)} rows"
+    if isinstance(result, (list, dict)):
+        return f"{len(result)} entries"
+    return str(result).strip()
+
+
+def save_result(result: Any, output_dir: Path, profile: str, operation: str) -> Path:
+    """Write one profile's result to ``output_dir`` and return the file path."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if isinstance(result, pd.DataFrame):
+        path = output_dir / f"{profile}_{operation}.csv"
+        result.to_csv(path, index=False)
+    else:
+        path = output_dir / f"{profile}_{operation}.txt"
+        path.write_text(str(result), encoding="utf-8")
+    return path
+
+
+def run_fanout(
+    operation: str,
+    profiles: Sequence[str],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_per_host: int = DEFAULT_MAX_PER_HOST,
+    output_dir: Optional[str] = None,
+) -> int:
+    """Run ``operation`` for every matching profile and print one row per profile."""
+    metadata_cache = get_metadata_cache() if operation == "metadata" else None
+    try:
+        outcome = fan_out(
+            profiles,
+            operation,
+            max_workers=max_workers,
+            max_per_host=max_per_host,
+            client_kwargs={"metadata_cache": metadata_cache} if metadata_cache is not None else None,
+        )
+    except ValueError as exc:
+        print_error(str(exc))
+        return 1
+
+    rows = []
+    for profile, result in outcome.results.items():
+        summary = summarize(result)
+        if output_dir is not None:
+            summary = f"{summary} -> {save_result(result, Path(output_dir), profile, operation)}"
+        rows.append({"profile": profile, "status": "ok", "result": summary})
+    for profile, error in outcome.errors.items():
+        rows.append({"profile": profile, "status": "error", "result": str(error)})
+    print_table(rows)
+
+    if not outcome.ok:
+        print_error(f"{len(outcome.errors)} of {len(rows)} profiles failed.")
+        return 1
+    print_success(f"Completed {operation} for {len(rows)} profiles.")
+    return 0
+
+
+def _handle_fanout(args: argparse.Namespace) -> int:
+    """CLI handler for ``fanout``."""
+    return run_fanout(
+        args.operation,
+        args.profiles,
+        max_workers=args.max_workers,
+        max_per_host=args.max_per_host,
+        output_dir=args.output_dir,
+    )
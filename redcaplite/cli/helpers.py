@@ -2,14 +2,18 @@
 
 from __future__ import annotations
 
-from typing import Callable, Optional
+import os
+from typing import TYPE_CHECKING, Callable, Optional
 
-from redcaplite import RedcapClient
 from redcaplite.auth import TokenStore
+from redcaplite.cache import MetadataCache
 from redcaplite.config import ProfileStore
 
+if TYPE_CHECKING:
+    from redcaplite import RedcapClient
 
-ClientFactory = Callable[[str, str], RedcapClient]
+
+ClientFactory = Callable[[str, str], "RedcapClient"]
 
 
 class ClientBootstrapError(ValueError):
@@ -24,13 +28,32 @@ class TokenNotFoundError(ClientBootstrapError):
     """Raised when a requested CLI profile has no stored token."""
 
 
+def redcap_client(url: str, token: str) -> RedcapClient:
+    """Build a ``RedcapClient``, importing the HTTP client stack on first use."""
+    from redcaplite import RedcapClient
+
+    return RedcapClient(url, token)
+
+
+def get_metadata_cache() -> Optional[MetadataCache]:
+    """Return the CLI's on-disk metadata cache, or ``None`` when ``RCL_NO_CACHE`` is set."""
+    if os.environ.get("RCL_NO_CACHE"):
+        return None
+    return MetadataCache()
+
+
 def build_client(
     profile_name: str,
     profile_store: Optional[ProfileStore] = None,
     token_store: Optional[TokenStore] = None,
-    client_factory: ClientFactory = RedcapClient,
+    client_factory: ClientFactory = redcap_client,
+    use_metadata_cache: bool = True,
 ) -> RedcapClient:
-    """Return a ready-to-use ``RedcapClient`` for the named stored profile."""
+    """Return a ready-to-use ``RedcapClient`` for the named stored profile.
+
+    Unless ``use_metadata_cache`` is false, the client reads project
+    structure exports through the shared on-disk metadata cache.
+    """
     active_profile_store = profile_store or ProfileStore()
     active_token_store = token_store or TokenStore()
 
@@ -47,4 +70,9 @@ def build_client(
             f'Run "rcl setup {profile_name}" first.'
         )
 
-    return client_factory(profile.url, token)
+    client = client_factory(profile.url, token)
+    if use_metadata_cache:
+        metadata_cache = get_metadata_cache()
+        if metadata_cache is not None:
+            client.metadata_cache = metadata_cache
+    return client
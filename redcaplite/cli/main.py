@@ -7,11 +7,15 @@ import sys
 from importlib.metadata import PackageNotFoundError, version
 from typing import Optional, Sequence
 
-from .registry import iter_command_modules
+from .registry import command_names, iter_command_modules
 
 
-def build_parser() -> argparse.ArgumentParser:
-    """Create the top-level parser for the ``rcl`` CLI."""
+def build_parser(commands: Optional[Sequence[str]] = None) -> argparse.ArgumentParser:
+    """Create the top-level parser for the ``rcl`` CLI.
+
+    ``commands`` limits the registered subcommands (and the modules imported
+    for them); by default every command is registered.
+    """
     parser = argparse.ArgumentParser(
         prog="rcl",
         description=(
@@ -20,7 +24,8 @@ def build_parser() -> argparse.ArgumentParser:
             "  rcl setup mysite\n"
             "  rcl profiles\n"
             "  rcl metadata mysite list --form demographics\n"
-            "  rcl sync source_profile target_profile --dry-run"
+            "  rcl sync source_profile target_profile --dry-run\n"
+            "  rcl fanout version 'site_*'"
         ),
         epilog=(
             "Example help lookups:\n"
@@ -34,7 +39,7 @@ def build_parser() -> argparse.ArgumentParser:
     subparsers = parser.add_subparsers(dest="command")
     subparsers.required = True
 
-    for module in iter_command_modules():
+    for module in iter_command_modules(commands):
         module.register_parser(subparsers)
 
     return parser
@@ -55,7 +60,10 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         print(f"rcl {get_version()}")
         return 0
 
-    parser = build_parser()
+    # Only the invoked command's module is imported; root help and unknown
+    # commands still see every command.
+    command = args_list[0] if args_list and args_list[0] in command_names() else None
+    parser = build_parser(None if command is None else [command])
     if not args_list:
         parser.print_help()
         return 0
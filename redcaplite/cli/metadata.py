@@ -4,11 +4,14 @@ from __future__ import annotations
 
 import argparse
 import json
+from dataclasses import asdict
 from datetime import datetime
+from pathlib import Path
 from types import SimpleNamespace
 from typing import Any
 
 import pandas as pd
+import yaml
 
 from redcaplite.metadata_ops.transform import (
     append_field,
@@ -19,6 +22,9 @@ from redcaplite.metadata_ops.transform import (
     remove_field,
     update_field,
 )
+from redcaplite.metadata_ops.frame import MetadataFrame
+from redcaplite.metadata_ops.lint import lint_metadata
+from redcaplite.metadata_ops.session import MetadataEditSession
 from redcaplite.metadata_ops.validate import ensure_field_exists, ensure_field_missing, validate_field_type
 
 from .helpers import ClientBootstrapError, build_client
@@ -33,6 +39,8 @@ _METADATA_SUBCOMMANDS = (
     "add",
     "edit",
     "remove",
+    "apply",
+    "lint",
 )
 
 
@@ -49,7 +57,9 @@ def register_parser(subparsers: argparse._SubParsersAction[argparse.ArgumentPars
             "  rcl metadata mysite list --form demographics\n"
             "  rcl metadata mysite add age demographics --field_type text\n"
             "  rcl metadata mysite edit age --field_label \"Age in years\"\n"
-            "  rcl metadata mysite remove age --yes"
+            "  rcl metadata mysite remove age --yes\n"
+            "  rcl metadata mysite apply changes.yml --dry-run\n"
+            "  rcl metadata mysite lint"
         ),
         epilog=(
             "Examples:\n"
@@ -95,6 +105,26 @@ def register_parser(subparsers: argparse._SubParsersAction[argparse.ArgumentPars
             "  rcl metadata mysite remove old_field\n"
             "  rcl metadata mysite remove old_field --yes"
         ),
+        "apply": (
+            "Apply a YAML file of add/edit/remove/move operations and import once.\n\n"
+            "The file holds a list of operations (or an \"operations\" key with one):\n"
+            "  - {op: add, field_name: age, form_name: demographics, field_type: text}\n"
+            "  - {op: edit, field_name: age, field_label: Age in years}\n"
+            "  - {op: move, field_name: age, after: record_id}\n"
+            "  - {op: remove, field_name: old_field}\n\n"
+            "Common usage patterns:\n"
+            "  rcl metadata mysite apply changes.yml --dry-run\n"
+            "  rcl metadata mysite apply changes.yml --yes"
+        ),
+        "lint": (
+            "Check the whole data dictionary for problems before an import.\n\n"
+            "Checks field names, field types, choice lists (missing, malformed or\n"
+            "duplicate codes), text validation types, and the fields referenced by\n"
+            "branching logic and calculations.\n\n"
+            "Common usage patterns:\n"
+            "  rcl metadata mysite lint\n"
+            "  rcl metadata mysite lint --file data_dictionary.csv --workers 4"
+        ),
     }
     for name in _METADATA_SUBCOMMANDS:
         command_parser = metadata_subparsers.add_parser(
@@ -148,6 +178,39 @@ def register_parser(subparsers: argparse._SubParsersAction[argparse.ArgumentPars
             )
             command_parser.set_defaults(handler=_handle_remove_field)
             continue
+        if name == "apply":
+            command_parser.add_argument("changes_file", metavar="<changes.yml>", help="YAML file of metadata operations.")
+            command_parser.add_argument(
+                "--yes",
+                action="store_true",
+                help="Skip the import confirmation prompt.",
+            )
+            command_parser.add_argument(
+                "--dry-run",
+                action="store_true",
+                help="Validate and preview the operations without importing metadata.",
+            )
+            command_parser.set_defaults(handler=_handle_apply_changes)
+            continue
+        if name == "lint":
+            command_parser.add_argument(
+                "--file",
+                dest="metadata_file",
+                help="Lint a local data dictionary CSV instead of exporting the profile's metadata.",
+            )
+            command_parser.add_argument(
+                "--workers",
+                type=int,
+                default=1,
+                help="Worker processes for checking branching logic and calculations (default: 1).",
+            )
+            command_parser.add_argument(
+                "--strict",
+                action="store_true",
+                help="Exit with an error when only warnings are found.",
+            )
+            command_parser.set_defaults(handler=_handle_lint_metadata)
+            continue
         command_parser.set_defaults(handler=_not_implemented)
 
 
@@ -221,7 +284,7 @@ def run_add_field(
 
     try:
         client = build_client(profile)
-        metadata = _ensure_metadata_frame(client.get_metadata(format="csv"))
+        metadata = MetadataFrame(_ensure_metadata_frame(_get_fresh_metadata(client)))
         ensure_field_missing(metadata, field_name)
         row = build_new_field_row(
             SimpleNamespace(
@@ -245,7 +308,7 @@ def run_add_field(
         print_error("cancelled by user.")
         return 1
 
-    client.import_metadata(updated_metadata, format="csv")
+    client.import_metadata(updated_metadata.to_frame(), format="csv")
     print_success(f'Added field "{field_name}" to form "{form_name}".')
     return 0
 
@@ -256,7 +319,7 @@ def run_edit_field(profile: str, field_name: str, field_flags: list[str]) -> int
 
     try:
         client = build_client(profile)
-        metadata = _ensure_metadata_frame(client.get_metadata(format="csv"))
+        metadata = MetadataFrame(_ensure_metadata_frame(_get_fresh_metadata(client)))
         ensure_field_exists(metadata, field_name)
         patch = _build_field_patch(metadata_flag_tokens)
         original_field = find_field(metadata, field_name)
@@ -284,7 +347,7 @@ def run_edit_field(profile: str, field_name: str, field_flags: list[str]) -> int
         print_error("cancelled by user.")
         return 1
 
-    client.import_metadata(updated_metadata, format="csv")
+    client.import_metadata(updated_metadata.to_frame(), format="csv")
     if updated_field_name == field_name:
         print_success(f'Updated field "{field_name}".')
     else:
@@ -292,6 +355,16 @@ def run_edit_field(profile: str, field_name: str, field_flags: list[str]) -> int
     return 0
 
 
+def _get_fresh_metadata(client: Any) -> Any:
+    """Export metadata straight from REDCap before editing it.
+
+    Edits are imported as a whole dictionary, so they must never start from
+    a cached copy that another user may have changed since.
+    """
+    client.clear_metadata_cache()
+    return client.get_metadata(format="csv")
+
+
 def _handle_list_fields(args: argparse.Namespace) -> int:
     """CLI handler for ``metadata list``."""
     return run_list_fields(args.profile, forms=args.form_names, fields=args.field_names)
@@ -316,7 +389,7 @@ def run_remove_field(profile: str, field_name: str, assume_yes: bool = False) ->
     """Remove a single metadata field row and import the updated metadata."""
     try:
         client = build_client(profile)
-        metadata = _ensure_metadata_frame(client.get_metadata(format="csv"))
+        metadata = MetadataFrame(_ensure_metadata_frame(_get_fresh_metadata(client)))
         field = find_field(metadata, field_name)
         updated_metadata = remove_field(metadata, field_name)
     except (ClientBootstrapError, ValueError) as exc:
@@ -333,7 +406,7 @@ def run_remove_field(profile: str, field_name: str, assume_yes: bool = False) ->
         print_error("cancelled by user.")
         return 1
 
-    client.import_metadata(updated_metadata, format="csv")
+    client.import_metadata(updated_metadata.to_frame(), format="csv")
     print_success(f'Removed field "{field_name}".')
     return 0
 
@@ -343,6 +416,121 @@ def _handle_remove_field(args: argparse.Namespace) -> int:
     return run_remove_field(args.profile, args.field_name, assume_yes=args.yes)
 
 
+def run_apply_changes(
+    profile: str,
+    changes_file: str,
+    assume_yes: bool = False,
+    dry_run: bool = False,
+) -> int:
+    """Apply a file of metadata operations to one export and import the result once."""
+    try:
+        operations = _load_operations(changes_file)
+        client = build_client(profile)
+        session = MetadataEditSession.load(client)
+    except (ClientBootstrapError, OSError, ValueError, yaml.YAMLError) as exc:
+        print_error(str(exc))
+        return 1
+
+    # Every operation is validated before anything is imported, so one bad
+    # entry reports all problems at once and leaves REDCap untouched.
+    errors = session.apply(operations)
+    if errors:
+        for error in errors:
+            print_error(str(error))
+        print_error(f"{len(errors)} of {len(operations)} operations failed; no metadata was imported.")
+        return 1
+
+    changes = session.changes
+    print_preview(
+        [
+            f'Metadata changes for "{profile}" from {changes_file}:',
+            f"Added: {len(changes.added)}",
+            f"Edited: {len(changes.edited)}",
+            f"Removed: {len(changes.removed)}",
+            f"Moved: {len(changes.moved)}",
+        ]
+    )
+    print_table(
+        [{"change": "add", "field_name": name} for name in changes.added]
+        + [{"change": "edit", "field_name": name} for name in changes.edited]
+        + [{"change": "remove", "field_name": name} for name in changes.removed]
+        + [{"change": "move", "field_name": name} for name in changes.moved]
+    )
+
+    if changes.empty:
+        print_success("No metadata changes to import.")
+        return 0
+    if dry_run:
+        print_success("Dry run enabled; no metadata was imported.")
+        return 0
+    if not assume_yes and not prompt_confirm(
+        f'Import metadata with {len(operations)} changes into "{profile}"? [y/N]: '
+    ):
+        print_error("cancelled by user.")
+        return 1
+
+    session.push(client)
+    print_success(f'Applied {len(operations)} metadata operations to "{profile}" in one import.')
+    return 0
+
+
+def _handle_apply_changes(args: argparse.Namespace) -> int:
+    """CLI handler for ``metadata apply``."""
+    return run_apply_changes(args.profile, args.changes_file, assume_yes=args.yes, dry_run=args.dry_run)
+
+
+def run_lint_metadata(
+    profile: str,
+    metadata_file: str | None = None,
+    workers: int = 1,
+    strict: bool = False,
+) -> int:
+    """Lint a profile's data dictionary, or a local CSV, and report every issue."""
+    try:
+        if metadata_file is not None:
+            metadata = pd.read_csv(metadata_file, dtype=str, keep_default_na=False)
+            source = metadata_file
+        else:
+            metadata = _ensure_metadata_frame(build_client(profile).get_metadata(format="csv"))
+            source = f'"{profile}"'
+        # An explicit --workers always uses the pool, whatever the dictionary size.
+        report = lint_metadata(metadata, max_workers=workers, parallel_min_fields=0)
+    except (ClientBootstrapError, OSError, ValueError) as exc:
+        print_error(str(exc))
+        return 1
+
+    print_preview(
+        [
+            f"Metadata lint for {source}:",
+            f"Fields: {report.fields}",
+            f"Errors: {len(report.errors)}",
+            f"Warnings: {len(report.warnings)}",
+        ]
+    )
+    if report.issues:
+        print_table([asdict(issue) for issue in report.issues])
+    if not report.ok or (strict and report.issues):
+        print_error(f"{len(report.issues)} metadata issues found.")
+        return 1
+    print_success("No metadata errors found.")
+    return 0
+
+
+def _handle_lint_metadata(args: argparse.Namespace) -> int:
+    """CLI handler for ``metadata lint``."""
+    return run_lint_metadata(args.profile, metadata_file=args.metadata_file, workers=args.workers, strict=args.strict)
+
+
+def _load_operations(changes_file: str) -> list[Any]:
+    """Read the operation list from a YAML changes file."""
+    content = yaml.safe_load(Path(changes_file).read_text(encoding="utf-8"))
+    if isinstance(content, dict):
+        content = content.get("operations")
+    if not isinstance(content, list):
+        raise ValueError(f'{changes_file} must contain a list of operations or an "operations" list.')
+    return content
+
+
 def _ensure_metadata_frame(metadata: Any) -> pd.DataFrame:
     """Normalize metadata API responses into a DataFrame."""
     # Metadata helpers operate on DataFrames, but the API layer may already have
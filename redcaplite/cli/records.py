@@ -0,0 +1,99 @@
+"""Record CLI command group definitions."""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+from pathlib import Path
+
+from .helpers import ClientBootstrapError, build_client
+from .output import print_error, print_success
+
+
+def register_parser(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) -> None:
+    """Attach the ``records`` command group to the CLI root."""
+    records_parser = subparsers.add_parser(
+        "records",
+        prog="rcl records",
+        help="Export project records.",
+        description=(
+            "Export project records.\n\n"
+            "Common usage patterns:\n"
+            "  rcl records mysite sync\n"
+            "  rcl records mysite sync --snapshot ./warehouse/mysite.sqlite\n"
+            "  rcl records mysite sync --full"
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    records_parser.add_argument("profile", metavar="<profile>", help="Profile name.")
+    records_subparsers = records_parser.add_subparsers(dest="records_command")
+    records_subparsers.required = True
+
+    sync_parser = records_subparsers.add_parser(
+        "sync",
+        prog="rcl records <profile> sync",
+        description=(
+            "Update a local SQLite snapshot with records changed since the last sync.\n\n"
+            "The first sync exports every record. Later syncs only export records\n"
+            "created or modified since the previous run and drop deleted records.\n\n"
+            "Common usage patterns:\n"
+            "  rcl records mysite sync\n"
+            "  rcl records mysite sync --snapshot ./warehouse/mysite.sqlite --full\n"
+            "  rcl records mysite sync --server-timezone America/Chicago"
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    sync_parser.add_argument(
+        "--snapshot",
+        metavar="PATH",
+        default=None,
+        help='SQLite snapshot file. Defaults to "<profile>_records.sqlite" in the current directory.',
+    )
+    sync_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Re-export every record and rebuild the snapshot.",
+    )
+    sync_parser.add_argument(
+        "--server-timezone",
+        metavar="ZONE",
+        default=None,
+        help=(
+            'The REDCap server\'s timezone, e.g. "America/Chicago". The watermark is kept on '
+            "the server's clock. Defaults to this machine's timezone."
+        ),
+    )
+    sync_parser.set_defaults(handler=_handle_sync_records)
+
+
+def run_sync_records(
+    profile: str,
+    snapshot: str | None = None,
+    full: bool = False,
+    server_timezone: str | None = None,
+) -> int:
+    """Bring a profile's record snapshot up to date and print a summary."""
+    snapshot_path = Path(snapshot) if snapshot else Path(f"{profile}_records.sqlite")
+    try:
+        client = build_client(profile)
+        result = client.sync_snapshot(snapshot_path, full=full, server_timezone=server_timezone)
+    except (ClientBootstrapError, ValueError, sqlite3.Error) as exc:
+        print_error(str(exc))
+        return 1
+
+    kind = "Full" if result.full else "Incremental"
+    print_success(f'{kind} sync of "{profile}" saved to {snapshot_path}')
+    print_success(f"Updated records: {result.updated_records}")
+    print_success(f"Deleted records: {result.deleted_records}")
+    print_success(f"Watermark: {result.watermark:%Y-%m-%d %H:%M:%S}")
+    return 0
+
+
+def _handle_sync_records(args: argparse.Namespace) -> int:
+    """CLI handler for ``records sync``."""
+    return run_sync_records(
+        args.profile,
+        snapshot=args.snapshot,
+        full=args.full,
+        server_timezone=args.server_timezone,
+    )
@@ -2,14 +2,37 @@
 
 from __future__ import annotations
 
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator
+from importlib import import_module
 from types import ModuleType
 
-from . import metadata, profiles, setup, sync
+# Command modules are listed by import path and loaded on demand, so running
+# one command (``rcl profiles``) never imports the others or what they need
+# (pandas, the HTTP client, the metadata tooling).
+_COMMAND_MODULES: dict[str, str] = {
+    "setup": "redcaplite.cli.setup",
+    "metadata": "redcaplite.cli.metadata",
+    "records": "redcaplite.cli.records",
+    "sync": "redcaplite.cli.sync",
+    "fanout": "redcaplite.cli.fanout",
+    "profiles": "redcaplite.cli.profiles",
+}
 
-_COMMAND_MODULES: tuple[ModuleType, ...] = (setup, metadata, sync, profiles)
 
+def command_names() -> tuple[str, ...]:
+    """Return the top-level command names in registration order."""
+    return tuple(_COMMAND_MODULES)
 
-def iter_command_modules() -> Iterator[ModuleType]:
-    """Yield command modules that attach their parsers to the root CLI."""
-    yield from _COMMAND_MODULES
+
+def load_command_module(name: str) -> ModuleType:
+    """Import and return the module that implements one top-level command."""
+    return import_module(_COMMAND_MODULES[name])
+
+
+def iter_command_modules(names: Iterable[str] | None = None) -> Iterator[ModuleType]:
+    """Yield command modules that attach their parsers to the root CLI.
+
+    Only the named commands are imported when ``names`` is given.
+    """
+    for name in _COMMAND_MODULES if names is None else names:
+        yield load_command_module(name)
@@ -3,13 +3,13 @@
 from __future__ import annotations
 
 import argparse
-from typing import Callable, Optional
+from typing import Optional
 from urllib.parse import urlparse
 
-from redcaplite import RedcapClient
 from redcaplite.auth import TokenStore
 from redcaplite.config import Profile, ProfileStore
 
+from .helpers import ClientFactory, redcap_client
 from .output import print_error, print_success
 from .prompts import confirm, prompt, prompt_secret
 
@@ -19,9 +19,6 @@ prompt_confirm = confirm
 prompt_text = prompt
 
 
-ClientFactory = Callable[[str, str], RedcapClient]
-
-
 class SetupCommand:
     """Create or update a named CLI setup profile."""
 
@@ -29,7 +26,7 @@ class SetupCommand:
         self,
         profile_store: Optional[ProfileStore] = None,
         token_store: Optional[TokenStore] = None,
-        client_factory: ClientFactory = RedcapClient,
+        client_factory: ClientFactory = redcap_client,
     ) -> None:
         self.profile_store = profile_store or ProfileStore()
         self.token_store = token_store or TokenStore()
@@ -72,7 +69,7 @@ def run_setup(
     profile_name: str,
     profile_store: Optional[ProfileStore] = None,
     token_store: Optional[TokenStore] = None,
-    client_factory: ClientFactory = RedcapClient,
+    client_factory: ClientFactory = redcap_client,
 ) -> int:
     """Create or update access for the requested profile name."""
     active_profile_store = profile_store or ProfileStore()
@@ -150,7 +147,7 @@ def _prompt_for_token() -> str:
 def _validate_access(
     url: str,
     token: str,
-    client_factory: ClientFactory = RedcapClient,
+    client_factory: ClientFactory = redcap_client,
 ) -> bool:
     """Return ``True`` when the supplied URL/token pair passes a simple API check."""
     client = client_factory(url, token)
@@ -5,11 +5,11 @@ from __future__ import annotations
 import argparse
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Sequence
 
 import pandas as pd
 
-from redcaplite.metadata_ops.transform import metadata_to_records
+from redcaplite.metadata_ops.diff import MetadataDiff, diff_metadata, diff_metadata_many
 
 from .helpers import ClientBootstrapError, build_client
 from .output import print_error, print_preview, print_success, print_table
@@ -26,7 +26,8 @@ def register_parser(subparsers: argparse._SubParsersAction[argparse.ArgumentPars
             "Common usage patterns:\n"
             "  rcl sync dev prod --dry-run\n"
             "  rcl sync dev prod --backup-file ./backups/\n"
-            "  rcl sync dev prod --yes"
+            "  rcl sync dev prod --yes\n"
+            "  rcl sync dev site_a site_b site_c --dry-run --show-changes"
         ),
         epilog=(
             "Examples:\n"
@@ -37,6 +38,12 @@ def register_parser(subparsers: argparse._SubParsersAction[argparse.ArgumentPars
     )
     parser.add_argument("profile", metavar="<source_profile>", help="Source profile name.")
     parser.add_argument("target_profile", metavar="<target_profile>", help="Profile to compare against and optionally update.")
+    parser.add_argument(
+        "more_target_profiles",
+        metavar="<target_profile>",
+        nargs="*",
+        help="Further profiles to compare against the same source metadata.",
+    )
     parser.add_argument(
         "--yes",
         action="store_true",
@@ -53,158 +60,180 @@ def register_parser(subparsers: argparse._SubParsersAction[argparse.ArgumentPars
         default=None,
         help="Export target metadata to this CSV path before importing source metadata.",
     )
+    parser.add_argument(
+        "--show-changes",
+        action="store_true",
+        help="Also list every changed value (field, column, source and target).",
+    )
     parser.set_defaults(handler=_handle_sync)
 
 
 def run_sync(
     source_profile: str,
-    target_profile: str,
+    target_profile: str | Sequence[str],
     assume_yes: bool = False,
     dry_run: bool = False,
     backup_file: str | None = None,
+    show_changes: bool = False,
 ) -> int:
-    """Compare source metadata to target metadata and optionally import source into target."""
-    if source_profile == target_profile:
+    """Compare source metadata to each target's metadata and optionally import source into the targets."""
+    target_profiles = [target_profile] if isinstance(target_profile, str) else list(dict.fromkeys(target_profile))
+    if source_profile in target_profiles:
         print_error("Source and target profiles cannot be the same.")
         return 1
 
     try:
         source_client = build_client(source_profile)
-        target_client = build_client(target_profile)
+        target_clients = {profile: build_client(profile) for profile in target_profiles}
+        if not dry_run:
+            # The source dictionary is imported as-is, so never take it (or
+            # the targets being overwritten) from the metadata cache.
+            source_client.clear_metadata_cache()
+            for target_client in target_clients.values():
+                target_client.clear_metadata_cache()
         source_metadata = source_client.get_metadata(format="csv")
-        target_metadata = target_client.get_metadata(format="csv")
+        target_metadata = {
+            profile: target_client.get_metadata(format="csv")
+            for profile, target_client in target_clients.items()
+        }
     except ClientBootstrapError as exc:
         print_error(str(exc))
         return 1
 
-    comparison = compare_metadata(source_metadata, target_metadata)
-    updates = comparison["updates"]
-    adds = comparison["adds"]
-    removals = comparison["removals"]
+    try:
+        diffs = diff_metadata_many(source_metadata, target_metadata)
+    except ValueError as exc:
+        # Duplicate or missing field_name values cannot be matched field by field.
+        print_error(str(exc))
+        return 1
 
-    print_preview(
-        [
-            f'Metadata comparison: source "{source_profile}" -> target "{target_profile}"',
-            f'Source fields: {len(source_metadata.index)}',
-            f'Target fields: {len(target_metadata.index)}',
-            'Comparison derives adds/removals from all-column anti joins and detects updates for matching field_name values.',
-            f"Adds: {len(adds.index)}",
-            f"Updates: {len(updates.index)}",
-            f"Removals: {len(removals.index)}",
-        ]
-    )
-    _print_comparison_table(
-        "Fields to add in target:",
-        metadata_to_records(adds),
-        columns=["field_name", "form_name", "field_type"],
-    )
-    _print_comparison_table(
-        "Fields to update in target:",
-        metadata_to_records(updates),
-        columns=["field_name", "form_name", "field_type"],
-    )
-    _print_comparison_table(
-        "Fields to remove from target:",
-        metadata_to_records(removals),
-        columns=["field_name", "form_name", "field_type"],
-    )
+    pending = []
+    for profile, diff in diffs.items():
+        _print_diff(source_profile, profile, source_metadata, target_metadata[profile], diff, show_changes)
+        if diff.empty:
+            print_success(f'No metadata differences found between "{source_profile}" and "{profile}".')
+        else:
+            pending.append(profile)
 
-    if adds.empty and updates.empty and removals.empty:
-        print_success(f'No metadata differences found between "{source_profile}" and "{target_profile}".')
+    if not pending:
         return 0
 
     if dry_run:
         print_success("Dry run enabled; no metadata was imported.")
         return 0
 
-    if not assume_yes and not confirm(
-        f'Import metadata from "{source_profile}" into "{target_profile}"? [y/N]: '
-    ):
-        print_error("cancelled by user.")
-        return 1
-
-    if backup_file:
-        backup_path = _normalize_backup_file_path(backup_file)
-        target_client.get_metadata(format="csv", output_file=str(backup_path))
-        print_success(f'Exported target metadata backup to "{backup_path}".')
-
-    target_client.import_metadata(source_metadata, format="csv")
-    print_success(f'Imported metadata from "{source_profile}" into "{target_profile}".')
-    return 0
+    status = 0
+    for profile in pending:
+        if not assume_yes and not confirm(
+            f'Import metadata from "{source_profile}" into "{profile}"? [y/N]: '
+        ):
+            print_error("cancelled by user.")
+            status = 1
+            continue
+
+        target_client = target_clients[profile]
+        if backup_file:
+            backup_path = _normalize_backup_file_path(
+                backup_file,
+                target_profile=profile if len(target_profiles) > 1 else None,
+            )
+            target_client.get_metadata(format="csv", output_file=str(backup_path))
+            print_success(f'Exported target metadata backup to "{backup_path}".')
+
+        target_client.import_metadata(source_metadata, format="csv")
+        print_success(f'Imported metadata from "{source_profile}" into "{profile}".')
+    return status
 
 
 def compare_metadata(
     source_metadata: pd.DataFrame,
     target_metadata: pd.DataFrame,
 ) -> dict[str, pd.DataFrame]:
-    """Return metadata differences as additions, updates, and removals."""
-    source_only = _left_anti_rows(source_metadata, target_metadata)
-    target_only = _left_anti_rows(target_metadata, source_metadata)
-    updates = target_only.merge(source_only[["field_name"]], how="inner", on="field_name")
-    source_only = source_only.merge(updates[["field_name"]], how="left_anti", on=["field_name"])
-    target_only = target_only.merge(updates[["field_name"]], how="left_anti", on=["field_name"])
-
-    return {
-        "adds": source_only,
-        "updates": updates,
-        "removals": target_only,
-    }
+    """Return metadata differences as additions, updates, removals, value changes and moves."""
+    return diff_metadata(source_metadata, target_metadata).as_dict()
 
 
 def _handle_sync(args: argparse.Namespace) -> int:
     """CLI handler for ``sync``."""
     return run_sync(
         args.profile,
-        args.target_profile,
+        [args.target_profile, *args.more_target_profiles],
         assume_yes=args.yes,
         dry_run=args.dry_run,
         backup_file=args.backup_file,
+        show_changes=args.show_changes,
     )
 
 
-def _left_anti_rows(
-    left_rows: pd.DataFrame,
-    right_rows: pd.DataFrame,
-) -> pd.DataFrame:
-    """Return left-only metadata rows using an all-column anti join."""
-    columns = list(left_rows.columns)
-    left_frame = left_rows.copy().fillna("")
-    right_frame = right_rows.copy().fillna("")
-
-    if left_frame.empty or right_frame.empty:
-        return left_frame
-
-    return left_frame.merge(
-        right_frame.drop_duplicates(),
-        how="left_anti",
-        on=columns
+def _print_diff(
+    source_profile: str,
+    target_profile: str,
+    source_metadata: pd.DataFrame,
+    target_metadata: pd.DataFrame,
+    diff: MetadataDiff,
+    show_changes: bool,
+) -> None:
+    """Print the summary and tables for one source/target comparison."""
+    print_preview(
+        [
+            f'Metadata comparison: source "{source_profile}" -> target "{target_profile}"',
+            f'Source fields: {len(source_metadata.index)}',
+            f'Target fields: {len(target_metadata.index)}',
+            'Comparison hashes each metadata row once and matches fields by field_name.',
+            f"Adds: {len(diff.adds.index)}",
+            f"Updates: {len(diff.updates.index)}",
+            f"Removals: {len(diff.removals.index)}",
+            f"Moves: {len(diff.moves.index)}",
+        ]
     )
+    field_columns = ["field_name", "form_name", "field_type"]
+    _print_comparison_table("Fields to add in target:", diff.adds, columns=field_columns)
+    _print_comparison_table("Fields to update in target:", diff.updates, columns=field_columns)
+    _print_comparison_table("Fields to remove from target:", diff.removals, columns=field_columns)
+    _print_comparison_table(
+        "Fields to move in target:",
+        diff.moves,
+        columns=["field_name", "source_position", "target_position"],
+    )
+    if show_changes:
+        _print_comparison_table(
+            "Changed values:",
+            diff.changes,
+            columns=["field_name", "column", "source", "target"],
+        )
+
 
+def _normalize_backup_file_path(backup_file: str, target_profile: str | None = None) -> Path:
+    """Resolve backup file path, defaulting directories to a timestamped filename.
 
-def _normalize_backup_file_path(backup_file: str) -> Path:
-    """Resolve backup file path, defaulting directories to a timestamped filename."""
+    With several targets, ``target_profile`` is added to the file name so
+    each target gets its own backup.
+    """
     backup_path = Path(backup_file)
     if backup_path.is_dir():
         timestamp = datetime.now(tz=UTC).strftime("%Y%m%dT%H%M%SZ")
-        return backup_path / f"target_metadata_backup_{timestamp}.csv"
+        prefix = f"{target_profile}_" if target_profile else ""
+        return backup_path / f"{prefix}target_metadata_backup_{timestamp}.csv"
+    if target_profile:
+        return backup_path.with_name(f"{backup_path.stem}_{target_profile}{backup_path.suffix}")
     return backup_path
 
 def _print_comparison_table(
     title: str,
-    rows: list[dict[str, Any]],
+    rows: pd.DataFrame,
     columns: list[str],
 ) -> None:
     """Print a titled comparison section."""
     print_preview([title])
-    if not rows:
+    if rows.empty:
         print_preview(["  (none)"])
         return
     print_table(_comparison_table_rows(rows, columns=columns))
 
 
 def _comparison_table_rows(
-    rows: list[dict[str, Any]],
+    rows: pd.DataFrame,
     columns: list[str],
 ) -> list[dict[str, Any]]:
     """Reduce comparison rows to the columns shown in sync output."""
-    return [{column: row.get(column, "") for column in columns} for row in rows]
+    return rows.reindex(columns=columns, fill_value="").fillna("").to_dict(orient="records")
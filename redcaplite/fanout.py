@@ -0,0 +1,185 @@
+"""Run one operation against many stored REDCap profiles concurrently."""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+from urllib.parse import urlsplit
+
+import requests
+
+from .auth import TokenStore
+from .config import ProfileStore
+from .http.client import build_session
+from .redcap import RedcapClient
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_MAX_PER_HOST = 4
+
+Operation = Callable[[RedcapClient], Any]
+
+# Named operations available to ``fan_out`` and ``rcl fanout``.
+OPERATIONS: Dict[str, str] = {
+    "metadata": "get_metadata",
+    "records": "export_records",
+    "logs": "get_logs",
+    "version": "get_version",
+}
+
+
+@dataclass
+class FanOutResult:
+    """Per-profile outcome of a fan-out run, in the order the profiles were resolved."""
+
+    results: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, Exception] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        """Return ``True`` when the operation succeeded for every profile."""
+        return not self.errors
+
+
+def resolve_profiles(
+    patterns: Iterable[str],
+    profile_store: Optional[ProfileStore] = None,
+) -> List[str]:
+    """Expand profile names and shell-style globs (``site_*``) into stored profile names.
+
+    Names keep the order of ``patterns``, and globs expand in sorted order.
+    A plain name is returned even when it is not stored, so ``fan_out``
+    can report it as that profile's error. Raises ``ValueError`` when
+    nothing matches at all.
+    """
+    stored = sorted((profile_store or ProfileStore()).load())
+    names: List[str] = []
+    for pattern in patterns:
+        if any(char in pattern for char in "*?["):
+            matches = [name for name in stored if fnmatchcase(name, pattern)]
+        else:
+            matches = [pattern]
+        names.extend(name for name in matches if name not in names)
+    if not names:
+        raise ValueError(f"No stored profiles match {', '.join(patterns)}.")
+    return names
+
+
+def get_host(url: str) -> str:
+    """Return the ``host[:port]`` that requests to ``url`` are pooled under."""
+    return urlsplit(url).netloc.lower()
+
+
+class HostPool:
+    """One shared ``requests.Session`` and concurrency limit per REDCap host.
+
+    Clients for projects on the same server reuse one connection pool, and
+    at most ``max_per_host`` operations run against each host at once.
+    """
+
+    def __init__(self, max_per_host: int = DEFAULT_MAX_PER_HOST) -> None:
+        if max_per_host < 1:
+            raise ValueError("max_per_host must be at least 1.")
+        self.max_per_host = max_per_host
+        self._sessions: Dict[str, requests.Session] = {}
+        self._limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def session(self, url: str) -> requests.Session:
+        """Return the session shared by every client of ``url``'s host."""
+        host = get_host(url)
+        with self._lock:
+            if host not in self._sessions:
+                self._sessions[host] = build_session(pool_connections=1, pool_maxsize=self.max_per_host)
+                self._limits[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._sessions[host]
+
+    def limit(self, url: str) -> threading.BoundedSemaphore:
+        """Return the semaphore capping concurrent operations on ``url``'s host."""
+        self.session(url)
+        return self._limits[get_host(url)]
+
+    def close(self) -> None:
+        """Close every shared session."""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._limits.clear()
+
+    def __enter__(self) -> "HostPool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def get_operation(operation: Union[str, Operation], **kwargs: Any) -> Operation:
+    """Return a callable for a named operation (see ``OPERATIONS``) or ``operation`` itself.
+
+    ``kwargs`` are passed to the client method of a named operation.
+    """
+    if callable(operation):
+        if kwargs:
+            raise ValueError("Operation arguments are only supported for named operations.")
+        return operation
+    if operation not in OPERATIONS:
+        raise ValueError(f'Unknown operation "{operation}". Choose from: {", ".join(OPERATIONS)}.')
+    method_name = OPERATIONS[operation]
+    return lambda client: getattr(client, method_name)(**kwargs)
+
+
+def fan_out(
+    profiles: Iterable[str],
+    operation: Union[str, Operation],
+    operation_kwargs: Optional[Dict[str, Any]] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_per_host: int = DEFAULT_MAX_PER_HOST,
+    profile_store: Optional[ProfileStore] = None,
+    token_store: Optional[TokenStore] = None,
+    client_factory: Callable[..., RedcapClient] = RedcapClient,
+    client_kwargs: Optional[Dict[str, Any]] = None,
+) -> FanOutResult:
+    """Run ``operation`` against each profile concurrently and collect the outcomes.
+
+    ``profiles`` may mix names and globs (see ``resolve_profiles``).
+    ``operation`` is a name from ``OPERATIONS`` (called with
+    ``operation_kwargs``) or a callable taking a ``RedcapClient``. At most
+    ``max_workers`` projects are processed at once and at most
+    ``max_per_host`` of them against the same server, whose clients share
+    one connection pool. A failing profile, including one that is not
+    stored or has no token, is recorded in ``errors`` and does not stop
+    the others.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1.")
+    run = get_operation(operation, **(operation_kwargs or {}))
+    active_profile_store = profile_store or ProfileStore()
+    active_token_store = token_store or TokenStore()
+    names = resolve_profiles(profiles, active_profile_store)
+
+    def run_profile(name: str, pool: HostPool) -> Any:
+        profile = active_profile_store.get(name)
+        if profile is None:
+            raise ValueError(f'Profile "{name}" was not found.')
+        token = active_token_store.get_token(name)
+        if token is None:
+            raise ValueError(f'Access token for profile "{name}" was not found.')
+        client = client_factory(profile.url, token, session=pool.session(profile.url), **(client_kwargs or {}))
+        try:
+            with pool.limit(profile.url):
+                return run(client)
+        finally:
+            client.close()
+
+    outcome = FanOutResult()
+    with HostPool(max_per_host) as pool, ThreadPoolExecutor(max_workers=min(max_workers, len(names))) as executor:
+        futures = {name: executor.submit(run_profile, name, pool) for name in names}
+        for name, future in futures.items():
+            try:
+                outcome.results[name] = future.result()
+            except Exception as exc:
+                outcome.errors[name] = exc
+    return outcome
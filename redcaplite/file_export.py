@@ -0,0 +1,212 @@
+"""Helpers for downloading File Upload fields across many records."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .api.utils import is_dataframe
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+MANIFEST_NAME = ".redcaplite-files.jsonl"
+
+
+@dataclass(frozen=True)
+class FileTask:
+    """One File Upload value to download: a field on a record, event and repeat instance."""
+
+    record: str
+    field: str
+    event: Optional[str] = None
+    repeat_instance: Optional[int] = None
+
+    @property
+    def key(self) -> Tuple[str, str, Optional[str], Optional[int]]:
+        """Return the identity used to match manifest entries."""
+        return (self.record, self.field, self.event, self.repeat_instance)
+
+    def target_dir(self, directory: Union[str, Path]) -> Path:
+        """Return the directory this file is saved in below ``directory``.
+
+        Files are laid out as ``<record>/[<event>/]<field>[_<instance>]/`` so
+        values from different events and repeat instances never collide.
+        The names come from the server, so path separators and drive colons
+        in them are replaced with ``_``, and a name of ``.`` or ``..`` or a
+        path that would still leave ``directory`` raises ``ValueError``.
+        """
+        folder = self.field if self.repeat_instance is None else f"{self.field}_{self.repeat_instance}"
+        parts = [self.record] + ([self.event] if self.event else []) + [folder]
+        target = Path(directory, *(_path_part(part) for part in parts))
+        if not target.resolve().is_relative_to(Path(directory).resolve()):
+            raise ValueError(f"File target {target} is outside {directory}.")
+        return target
+
+
+def _path_part(value: Any) -> str:
+    part = str(value)
+    for character in ("/", "\\", ":", "\0"):
+        part = part.replace(character, "_")
+    if part in ("", ".", ".."):
+        raise ValueError(f"Cannot use {value!r} as a file export folder name.")
+    return part
+
+
+@dataclass
+class FileExportResult:
+    """Outcome of a bulk file download."""
+
+    downloaded: List[Dict[str, Any]] = field(default_factory=list)
+    skipped: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """Return ``True`` when every file was downloaded or already present."""
+        return not self.errors
+
+
+def find_file_tasks(
+    records: pd.DataFrame,
+    fields: Sequence[str],
+    record_id_field: str,
+) -> Iterator[FileTask]:
+    """Yield a ``FileTask`` for every non-empty File Upload value in ``records``.
+
+    ``records`` is a flat export read as strings; REDCap puts the stored
+    file name in a File Upload column only when a file is attached.
+    """
+    if not is_dataframe(records) or records.empty:
+        return
+    has_events = "redcap_event_name" in records.columns
+    has_instances = "redcap_repeat_instance" in records.columns
+    for row in records.to_dict(orient="records"):
+        event = row.get("redcap_event_name") if has_events else None
+        instance = row.get("redcap_repeat_instance") if has_instances else None
+        for field_name in fields:
+            value = row.get(field_name)
+            if not isinstance(value, str) or not value.strip():
+                continue
+            yield FileTask(
+                record=str(row[record_id_field]),
+                field=field_name,
+                event=event or None,
+                repeat_instance=int(instance) if instance not in (None, "") else None,
+            )
+
+
+@contextmanager
+def open_part_file(target_dir: Path, file_name: str) -> Iterator[Tuple[BinaryIO, Path]]:
+    """Open ``target_dir/file_name`` for writing through a ``.part`` file.
+
+    Yields ``(file, path)``. The final name only appears once the block
+    completes, so an interrupted download never leaves a truncated file
+    behind.
+    """
+    target_dir.mkdir(parents=True, exist_ok=True)
+    path = target_dir / (Path(file_name).name or "download.raw")
+    part_path = path.with_name(path.name + ".part")
+    try:
+        with part_path.open("wb") as part_file:
+            yield part_file, path
+        os.replace(part_path, path)
+    except BaseException:
+        part_path.unlink(missing_ok=True)
+        raise
+
+
+def save_file_chunks(chunks: Iterable[bytes], target_dir: Path, file_name: str) -> Tuple[Path, int]:
+    """Write ``chunks`` to ``target_dir/file_name`` via a ``.part`` file and return ``(path, size)``."""
+    size = 0
+    with open_part_file(target_dir, file_name) as (part_file, path):
+        for chunk in chunks:
+            if chunk:
+                part_file.write(chunk)
+                size += len(chunk)
+    return path, size
+
+
+class DownloadManifest:
+    """Append-only JSON Lines log of completed downloads, used to resume runs.
+
+    Each line records one finished file, so an interrupted run loses at most
+    the files that were still in flight.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def completed(self) -> Dict[Tuple[str, str, Optional[str], Optional[int]], Dict[str, Any]]:
+        """Return finished entries whose files still exist, keyed by ``FileTask.key``."""
+        entries: Dict[Tuple[str, str, Optional[str], Optional[int]], Dict[str, Any]] = {}
+        if not self.path.exists():
+            return entries
+        with self.path.open("r", encoding="utf-8") as manifest_file:
+            for line in manifest_file:
+                try:
+                    entry = json.loads(line)
+                    task = FileTask(
+                        record=entry["record"],
+                        field=entry["field"],
+                        event=entry.get("event"),
+                        repeat_instance=entry.get("repeat_instance"),
+                    )
+                except (ValueError, KeyError, TypeError):
+                    # A line cut short by an interrupted write is ignored.
+                    continue
+                if entry.get("path") and Path(entry["path"]).exists():
+                    entries[task.key] = entry
+        return entries
+
+    def add(self, task: FileTask, path: Path, size: int) -> Dict[str, Any]:
+        """Record ``task`` as finished and return the written entry."""
+        entry = {**asdict(task), "path": str(path), "bytes": size}
+        line = json.dumps(entry, sort_keys=True) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as manifest_file:
+                manifest_file.write(line)
+        return entry
+
+
+class FileExportPlan:
+    """The downloads left for one bulk file export, and its running result.
+
+    Built from the record export that locates the files. Tasks already in
+    the resume manifest are counted as skipped; the client downloads
+    ``pending``, passes each finished file to ``finish()`` as soon as it is
+    saved and each outcome to ``record()``.
+    """
+
+    def __init__(
+        self,
+        records: pd.DataFrame,
+        fields: Sequence[str],
+        record_id_field: str,
+        directory: Union[str, Path],
+        manifest: Optional[Union[str, Path]] = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.manifest = DownloadManifest(manifest or self.directory / MANIFEST_NAME)
+        tasks = list(find_file_tasks(records, fields, record_id_field))
+        finished = self.manifest.completed()
+        self.pending = [task for task in tasks if task.key not in finished]
+        self.result = FileExportResult(skipped=len(tasks) - len(self.pending))
+
+    def finish(self, task: FileTask, path: Path, size: int) -> Dict[str, Any]:
+        """Append a finished download to the resume manifest and return its entry. Thread-safe."""
+        return self.manifest.add(task, path, size)
+
+    def record(self, task: FileTask, entry: Optional[Dict[str, Any]], error: Optional[BaseException]) -> None:
+        """Add one download's outcome to the result, in the order of ``pending``."""
+        if error is not None:
+            self.result.errors.append({**asdict(task), "error": str(error)})
+        else:
+            self.result.downloaded.append(entry)
@@ -0,0 +1,241 @@
+"""Parse the subset of REDCap ``filterLogic`` that can be evaluated locally.
+
+``parse_filter_logic`` turns an expression into a small AST, which is then
+rendered as a Python predicate (``compile_predicate``, used by the local
+stand-in server) or as SQL (``redcaplite.mirror.translate_filter_logic``).
+Both read the same tree, so they agree on every expression they accept.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+EVENT_COLUMN = "redcap_event_name"
+
+_TOKEN_RE = re.compile(
+    r"\s*(?:"
+    r"(?P<field>(?:\[[A-Za-z0-9_]+(?:\([A-Za-z0-9_.-]+\))?\])+)"
+    r"|(?P<string>'[^']*'|\"[^\"]*\")"
+    r"|(?P<number>-?\d+(?:\.\d+)?)"
+    r"|(?P<op><>|!=|<=|>=|=|<|>)"
+    r"|(?P<word>(?i:and|or))\b"
+    r"|(?P<paren>[()])"
+    r")"
+)
+
+_REFERENCE_RE = re.compile(r"\[([A-Za-z0-9_]+)(?:\(([A-Za-z0-9_.-]+)\))?\]")
+
+
+class FilterLogicError(ValueError):
+    """Raised when ``filterLogic`` uses syntax the local evaluators do not support."""
+
+
+@dataclass(frozen=True)
+class FieldRef:
+    """A ``[field]``, ``[field(code)]`` or ``[event][field]`` reference."""
+
+    column: str
+    event: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Literal:
+    """A quoted string or a number, kept as the text REDCap would compare."""
+
+    value: str
+
+
+Operand = Union[FieldRef, Literal]
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """``left <operator> right`` with one of ``= <> != < > <= >=``."""
+
+    left: Operand
+    operator: str
+    right: Operand
+
+
+@dataclass(frozen=True)
+class BoolOp:
+    """``left and right`` or ``left or right``."""
+
+    operator: str
+    left: "Node"
+    right: "Node"
+
+
+Node = Union[Comparison, BoolOp]
+
+
+def parse_number(value: Any) -> Optional[float]:
+    """Return ``value`` as a float when it reads as a number, else ``None``."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def redcap_compare(left: Optional[str], operator: str, right: Optional[str]) -> bool:
+    """Compare two exported values the way REDCap's ``filterLogic`` does.
+
+    Both sides are compared as numbers when both read as numbers and as
+    text otherwise. A blank value fails every ordered comparison.
+    """
+    left = "" if left is None else str(left)
+    right = "" if right is None else str(right)
+    a: Any = parse_number(left)
+    b: Any = parse_number(right)
+    if a is None or b is None:
+        a, b = left, right
+    if operator == "=":
+        return a == b
+    if operator in ("<>", "!="):
+        return a != b
+    if left == "" or right == "":
+        return False
+    if operator == "<":
+        return a < b
+    if operator == ">":
+        return a > b
+    if operator == "<=":
+        return a <= b
+    return a >= b
+
+
+def field_refs(node: Node) -> List[FieldRef]:
+    """Return every field reference in ``node``, left to right."""
+    if isinstance(node, BoolOp):
+        return field_refs(node.left) + field_refs(node.right)
+    return [operand for operand in (node.left, node.right) if isinstance(operand, FieldRef)]
+
+
+def _tokenize(logic: str) -> List[Tuple[str, str]]:
+    tokens = []
+    position = 0
+    logic = logic.strip()
+    while position < len(logic):
+        match = _TOKEN_RE.match(logic, position)
+        if match is None or match.end() == position:
+            raise FilterLogicError(f"Unsupported filterLogic near {logic[position:position + 20]!r}: {logic}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+        while position < len(logic) and logic[position].isspace():
+            position += 1
+    return tokens
+
+
+def parse_filter_logic(logic: str) -> Node:
+    """Parse REDCap ``filterLogic`` over a flat record export into an AST.
+
+    Supported: ``[field]``, checkbox options as ``[field(code)]`` (the
+    ``field___code`` column), ``[event][field]``, comparisons with
+    ``= <> != < > <= >=`` against quoted strings, numbers or other fields,
+    ``and``/``or`` and parentheses. Anything else, such as functions or
+    smart variables, raises ``FilterLogicError``.
+    """
+    tokens = _tokenize(logic)
+    position = 0
+
+    def peek(kind: Optional[str] = None, value: Optional[str] = None):
+        if position >= len(tokens):
+            return None
+        token = tokens[position]
+        if (kind is None or token[0] == kind) and (value is None or token[1].lower() == value):
+            return token
+        return None
+
+    def take():
+        nonlocal position
+        position += 1
+        return tokens[position - 1]
+
+    def parse_or() -> Node:
+        node = parse_and()
+        while peek("word", "or"):
+            take()
+            node = BoolOp("or", node, parse_and())
+        return node
+
+    def parse_and() -> Node:
+        node = parse_term()
+        while peek("word", "and"):
+            take()
+            node = BoolOp("and", node, parse_term())
+        return node
+
+    def parse_term() -> Node:
+        if peek("paren", "("):
+            take()
+            inner = parse_or()
+            if not peek("paren", ")"):
+                raise FilterLogicError(f"Unbalanced parentheses in filterLogic: {logic}")
+            take()
+            return inner
+        left = parse_operand()
+        if not peek("op"):
+            raise FilterLogicError(f"Expected a comparison in filterLogic: {logic}")
+        operator = take()[1]
+        return Comparison(left, operator, parse_operand())
+
+    def parse_operand() -> Operand:
+        token = peek()
+        if token is None or token[0] not in ("field", "string", "number"):
+            raise FilterLogicError(f"Unsupported filterLogic: {logic}")
+        kind, value = take()
+        if kind == "field":
+            references = _REFERENCE_RE.findall(value)
+            if len(references) > 2 or any(code for _, code in references[:-1]):
+                raise FilterLogicError(f"Unsupported field reference {value} in filterLogic: {logic}")
+            name, code = references[-1]
+            event = references[0][0] if len(references) == 2 else None
+            return FieldRef(f"{name}___{code}" if code else name, event)
+        if kind == "string":
+            return Literal(value[1:-1])
+        return Literal(value)
+
+    node = parse_or()
+    if position != len(tokens):
+        raise FilterLogicError(f"Unsupported filterLogic: {logic}")
+    return node
+
+
+def compile_predicate(node: Node) -> Callable[[Dict[str, Any]], bool]:
+    """Render an AST as a predicate over flat export rows.
+
+    ``[event][field]`` only matches rows of that event; rows without a
+    ``redcap_event_name`` column (classic projects) ignore the event.
+    """
+    if isinstance(node, BoolOp):
+        left = compile_predicate(node.left)
+        right = compile_predicate(node.right)
+        if node.operator == "and":
+            return lambda row: left(row) and right(row)
+        return lambda row: left(row) or right(row)
+
+    left_value = _compile_operand(node.left)
+    right_value = _compile_operand(node.right)
+    operator = node.operator
+    events = [operand.event for operand in (node.left, node.right) if isinstance(operand, FieldRef) and operand.event]
+
+    def matches(row: Dict[str, Any]) -> bool:
+        row_event = row.get(EVENT_COLUMN)
+        if row_event is not None and any(row_event != event for event in events):
+            return False
+        return redcap_compare(left_value(row), operator, right_value(row))
+
+    return matches
+
+
+def _compile_operand(operand: Operand) -> Callable[[Dict[str, Any]], Any]:
+    if isinstance(operand, FieldRef):
+        column = operand.column
+        return lambda row: row.get(column, "")
+    value = operand.value
+    return lambda row: value
@@ -1,2 +1,4 @@
-from .handler import response_error_handler, output_handler, csv_handler, json_handler, text_handler, file_download_handler, file_upload_handler  # noqa: F401
+from .handler import response_error_handler, output_handler, csv_handler, csv_stream_handler, arrow_handler, json_handler, text_handler, file_download_handler, file_upload_handler  # noqa: F401
 from .client import Client  # noqa: F401
+from .events import RequestEvent, RequestObserver  # noqa: F401
+from .retry import RateLimiter, RetryPolicy  # noqa: F401
@@ -0,0 +1,257 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import redcaplite.http.handler as hd
+from .client import DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE, check_arrow_request
+from .events import RequestEvent, RequestObserver, defer_events, notify, observe_parse, trace_timings
+from .retry import RateLimiter, RetryPolicy
+
+DEFAULT_MAX_CONCURRENCY = 10
+
+
+def build_async_session(
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    keep_alive: bool = True,
+    transport=None,
+):
+    """Return an ``httpx.AsyncClient`` with a bounded connection pool.
+
+    Requires the optional ``httpx`` dependency (``pip install redcaplite[async]``).
+    """
+    try:
+        import httpx
+    except ImportError as exc:  # pragma: no cover - exercised when httpx is unavailable
+        raise ImportError(
+            "AsyncRedcapClient requires httpx. Install it with: pip install 'redcaplite[async]'"
+        ) from exc
+
+    limits = httpx.Limits(
+        max_connections=pool_maxsize,
+        max_keepalive_connections=pool_maxsize if keep_alive else 0,
+    )
+    # REDCap exports can legitimately take minutes, so match the blocking
+    # client and never time out on our own.
+    return httpx.AsyncClient(limits=limits, timeout=None, transport=transport)
+
+
+class AsyncClient:
+    """asyncio transport mirroring ``Client`` on top of ``httpx.AsyncClient``."""
+
+    def __init__(
+        self,
+        url,
+        token,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        transport=None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        request_observers: Optional[Sequence[RequestObserver]] = None,
+    ):
+        # httpx keeps one pool for every host and always waits for a free
+        # connection, so ``pool_connections`` and ``pool_block`` are accepted
+        # only to keep the constructor interchangeable with ``Client``.
+        del pool_connections, pool_block
+        self.url = url
+        self.token = token
+        self.session = build_async_session(
+            pool_maxsize=pool_maxsize,
+            keep_alive=keep_alive,
+            transport=transport,
+        )
+        self.max_concurrency = max_concurrency
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.request_observers: List[RequestObserver] = list(request_observers or [])
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def add_request_observer(self, observer: RequestObserver) -> None:
+        """Call ``observer`` with a ``RequestEvent`` after every API request."""
+        self.request_observers.append(observer)
+
+    def remove_request_observer(self, observer: RequestObserver) -> None:
+        """Stop calling ``observer`` after API requests."""
+        self.request_observers.remove(observer)
+
+    async def close(self):
+        """Close the pooled HTTP session and release open connections."""
+        await self.session.aclose()
+
+    def __enter__(self):
+        raise TypeError(f"Use 'async with' on {type(self).__name__} so that close() is awaited.")
+
+    def __exit__(self, exc_type, exc_value, traceback):  # pragma: no cover - __enter__ always raises
+        return None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def post(
+        self,
+        data,
+        pd_read_csv_kwargs=None,
+        output_file=None,
+        empty_columns: Optional[Sequence[str]] = None,
+        chunksize: Optional[int] = None,
+        arrow: Optional[str] = None,
+        arrow_convert_options: Optional[Dict[str, Any]] = None,
+    ):
+        if arrow is not None:
+            check_arrow_request(data.get("format", None), chunksize)
+            return await self._arrow_api(data, arrow, arrow_convert_options, output_file, empty_columns)
+        if chunksize is not None:
+            raise ValueError("chunksize streaming is not supported by the async client.")
+        if data.get("format", None) not in ('csv', 'json'):
+            return await self.text_api(data, output_file=output_file)
+        if not self.request_observers:
+            response = await self._post(data)
+            hd.write_output(response, output_file)
+            return _parse_export(response, data, pd_read_csv_kwargs, empty_columns)
+        with defer_events(self.request_observers) as pending:
+            response = await self._post(data)
+            hd.write_output(response, output_file)
+        return observe_parse(
+            self.request_observers,
+            pending,
+            lambda: _parse_export(response, data, pd_read_csv_kwargs, empty_columns),
+        )
+
+    async def _arrow_api(self, data, arrow, convert_options=None, output_file=None, empty_columns=None):
+        from redcaplite.arrow import parse_arrow_response
+
+        def parse(response):
+            return parse_arrow_response(response, data, arrow, convert_options, output_file, empty_columns)
+
+        if not self.request_observers:
+            return parse(await self._post(data))
+        with defer_events(self.request_observers) as pending:
+            response = await self._post(data)
+        return observe_parse(self.request_observers, pending, lambda: parse(response))
+
+    async def _post(self, data, files=None):
+        return await self._send(data, files=files)
+
+    async def file_stream_api(self, data):
+        """Post ``data`` and return the response with its body left unread for streaming.
+
+        The caller must ``await response.aclose()`` once the body is consumed.
+        """
+        return await self._send(data, stream=True)
+
+    async def _send(self, data, files=None, stream=False):
+        """Send one request and return the checked response, reporting it to any request observers."""
+        data['returnFormat'] = 'json'
+        data['token'] = self.token
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if not self.request_observers:
+            return await self._send_with_retries(data, files, stream)
+        event = RequestEvent.start(data)
+        started = time.perf_counter()
+        try:
+            return await self._send_with_retries(data, files, stream, event)
+        except BaseException as exc:
+            event.error = exc
+            raise
+        finally:
+            event.total_seconds = time.perf_counter() - started
+            notify(self.request_observers, event)
+
+    async def _send_with_retries(self, data, files=None, stream=False, event: Optional[RequestEvent] = None):
+        """Apply the rate limiter and retry policy like ``handler.send_with_retries``."""
+        import httpx
+
+        retry_policy = self.retry_policy
+        positions = hd.upload_positions(files)
+        if positions is None:
+            # The first attempt consumes a stream that cannot be rewound.
+            retry_policy = None
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                await asyncio.sleep(self.rate_limiter.reserve())
+            try:
+                async with self._semaphore:
+                    request = self.session.build_request("POST", self.url, data=data, files=files)
+                    if event is not None:
+                        event.attempts += 1
+                        request.extensions["trace"] = trace_timings(event)
+                    response = await self.session.send(request, stream=stream)
+                if event is not None:
+                    event.record_attempt(data, response, stream=stream)
+            except httpx.TransportError:
+                if retry_policy is None or not retry_policy.should_retry(attempt, data):
+                    raise
+                delay = retry_policy.get_delay(attempt)
+            else:
+                if (
+                    response.status_code == 200
+                    or retry_policy is None
+                    or not retry_policy.should_retry(attempt, data, response.status_code)
+                ):
+                    if response.status_code != 200 and stream:
+                        # Error bodies are small; read them so check_response can report them.
+                        await response.aread()
+                        await response.aclose()
+                    return hd.check_response(response)
+                delay = retry_policy.get_delay(attempt, hd.get_retry_after(response))
+                await response.aclose()
+            await asyncio.sleep(delay)
+            hd.rewind_files(positions)
+            attempt += 1
+
+    async def text_api(self, data, output_file=None):
+        response = await self._post(data)
+        hd.write_output(response, output_file)
+        return response.text
+
+    async def file_download_api(
+        self,
+        data,
+        file_dictionary='',
+        file_obj=None,
+        progress: Optional[hd.ProgressCallback] = None,
+        chunk_size: int = hd.DEFAULT_DOWNLOAD_CHUNK_SIZE,
+    ):
+        response = await self.file_stream_api(data)
+        try:
+            if file_obj is not None:
+                await _write_async_body(response, file_obj, chunk_size, progress)
+            else:
+                file_name = hd.get_download_file_name(response)
+                with open(os.path.join(file_dictionary, file_name), 'wb') as f:
+                    await _write_async_body(response, f, chunk_size, progress)
+        finally:
+            await response.aclose()
+        return response
+
+    async def file_upload_api(self, file, data, file_name: Optional[str] = None):
+        with hd.open_upload(file, file_name) as upload:
+            return await self._post(data, files={'file': upload})
+
+
+def _parse_export(response, data, pd_read_csv_kwargs=None, empty_columns=None):
+    """Parse a CSV or JSON export the way the blocking client's handlers do."""
+    if data.get("format") == 'csv':
+        return hd.parse_csv_response(response, data, pd_read_csv_kwargs, empty_columns)
+    return response.json()
+
+
+async def _write_async_body(response, file_obj, chunk_size, progress=None):
+    """Async counterpart of ``handler.write_response_body`` for httpx streams."""
+    total = hd.get_content_length(response) if progress is not None else None
+    size = 0
+    async for chunk in response.aiter_bytes(chunk_size):
+        file_obj.write(chunk)
+        size += len(chunk)
+        if progress is not None:
+            progress(size, total)
+    return size
@@ -1,13 +1,100 @@
-from typing import Optional, Sequence
+from typing import Any, Dict, List, Optional, Sequence
 
 import requests
+from requests.adapters import HTTPAdapter
 import redcaplite.http.handler as hd
+from .events import RequestObserver
+from .retry import RateLimiter, RetryPolicy
+
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+
+
+def build_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    pool_block: bool = False,
+    keep_alive: bool = True,
+) -> requests.Session:
+    """Return a ``requests.Session`` backed by a reusable connection pool.
+
+    ``pool_connections`` is the number of per-host pools kept alive,
+    ``pool_maxsize`` caps the connections held open to a single host and
+    ``pool_block`` makes callers wait for a free connection instead of
+    opening throwaway ones once the per-host limit is reached.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def check_arrow_request(format: Optional[str], chunksize: Optional[int]) -> None:
+    """Reject option combinations the Arrow parsing path cannot serve."""
+    if format != 'csv':
+        raise ValueError("arrow is only supported for CSV exports.")
+    if chunksize is not None:
+        raise ValueError("arrow and chunksize cannot be combined.")
 
 
 class Client:
-    def __init__(self, url, token):
+    def __init__(
+        self,
+        url,
+        token,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        request_observers: Optional[Sequence[RequestObserver]] = None,
+        session: Optional[requests.Session] = None,
+    ):
         self.url = url
         self.token = token
+        # A caller-supplied session is shared with other clients, so only
+        # sessions built here are closed by ``close()``.
+        self._owns_session = session is None
+        self.session = session if session is not None else build_session(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            keep_alive=keep_alive,
+        )
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.request_observers: List[RequestObserver] = list(request_observers or [])
+
+    def add_request_observer(self, observer: RequestObserver) -> None:
+        """Call ``observer`` with a ``RequestEvent`` after every API request."""
+        self.request_observers.append(observer)
+
+    def remove_request_observer(self, observer: RequestObserver) -> None:
+        """Stop calling ``observer`` after API requests."""
+        self.request_observers.remove(observer)
+
+    def close(self):
+        """Close the pooled HTTP session and release open connections.
+
+        A session passed to the constructor is left open for its other users.
+        """
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def post(
         self,
@@ -15,10 +102,31 @@ class Client:
         pd_read_csv_kwargs=None,
         output_file=None,
         empty_columns: Optional[Sequence[str]] = None,
+        chunksize: Optional[int] = None,
+        arrow: Optional[str] = None,
+        arrow_convert_options: Optional[Dict[str, Any]] = None,
     ):
         if pd_read_csv_kwargs is None:
             pd_read_csv_kwargs = {}
         format = data.get("format", None)
+        if arrow is not None:
+            check_arrow_request(format, chunksize)
+            return self.__arrow_api(
+                data,
+                arrow,
+                convert_options=arrow_convert_options,
+                output_file=output_file,
+                empty_columns=empty_columns,
+            )
+        if chunksize is not None:
+            if format != 'csv':
+                raise ValueError("chunksize is only supported for CSV exports.")
+            return self.__csv_stream_api(
+                data,
+                chunksize,
+                pd_read_csv_kwargs=pd_read_csv_kwargs,
+                output_file=output_file,
+            )
         if format == 'csv':
             response = self.__csv_api(
                 data,
@@ -35,10 +143,10 @@ class Client:
         return response
 
     @hd.response_error_handler
-    def __post(self, data, files=None):
+    def __post(self, data, files=None, stream=False):
         data['token'] = self.token
-        response = requests.post(self.url, data=data, files=files)
-        print('HTTP Status: ' + str(response.status_code))
+        request_kwargs = {'stream': True} if stream else {}
+        response = self.session.post(self.url, data=data, files=files, **request_kwargs)
         return response
 
     @hd.csv_handler
@@ -46,6 +154,14 @@ class Client:
     def __csv_api(self, data):
         return self.__post(data)
 
+    @hd.arrow_handler
+    def __arrow_api(self, data):
+        return self.__post(data)
+
+    @hd.csv_stream_handler
+    def __csv_stream_api(self, data, stream=True):
+        return self.__post(data, stream=stream)
+
     @hd.json_handler
     @hd.output_handler
     def __json_api(self, data):
@@ -58,7 +174,11 @@ class Client:
 
     @hd.file_download_handler
     def file_download_api(self, data):
-        return self.__post(data)
+        return self.__post(data, stream=True)
+
+    def file_stream_api(self, data):
+        """Post ``data`` and return the response with its body left unread for streaming."""
+        return self.__post(data, stream=True)
 
     @hd.file_upload_handler
     def file_upload_api(self, data, files):
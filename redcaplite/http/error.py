@@ -1,3 +1,12 @@
+from typing import Optional
+
+
 class APIException(Exception):
-    """Base class for all API exceptions."""
-    pass
+    """Base class for all API exceptions.
+
+    ``status_code`` holds the HTTP status REDCap answered with, when known.
+    """
+
+    def __init__(self, *args, status_code: Optional[int] = None):
+        super().__init__(*args)
+        self.status_code = status_code
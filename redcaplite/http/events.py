@@ -0,0 +1,157 @@
+"""Structured per-request events for instrumenting REDCap API calls."""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+from urllib.parse import urlencode
+
+
+@dataclass
+class RequestEvent:
+    """What happened during one API call, passed to every request observer.
+
+    Timings are in seconds. ``ttfb_seconds``, ``connect_seconds`` and
+    ``dns_seconds`` describe the last attempt and are ``None`` when the
+    transport does not expose them: ``requests`` only reports the time to
+    the response headers, and ``httpx`` reports connection setup (DNS
+    lookup and TLS included) but never DNS on its own. ``total_seconds`` covers
+    every attempt, including retry delays. ``parse_seconds`` is set for
+    CSV and JSON exports parsed by the client.
+    """
+
+    content: Optional[str]
+    action: Optional[str] = None
+    format: Optional[str] = None
+    payload_bytes: int = 0
+    status_code: Optional[int] = None
+    response_bytes: Optional[int] = None
+    attempts: int = 0
+    dns_seconds: Optional[float] = None
+    connect_seconds: Optional[float] = None
+    ttfb_seconds: Optional[float] = None
+    total_seconds: float = 0.0
+    parse_seconds: Optional[float] = None
+    error: Optional[BaseException] = None
+
+    @classmethod
+    def start(cls, data: Dict[str, Any]) -> "RequestEvent":
+        """Return an empty event for the request payload ``data``."""
+        return cls(content=data.get("content"), action=data.get("action"), format=data.get("format"))
+
+    def record_attempt(self, data: Dict[str, Any], response, stream: bool = False) -> None:
+        """Fill in the payload, status and size of the latest attempt.
+
+        ``payload_bytes`` is the size of the form-encoded fields; uploaded
+        files are not counted. Streamed bodies are not read here, so their
+        size comes from ``content-length`` when the server sends one.
+        """
+        self.payload_bytes = len(urlencode(data, doseq=True))
+        self.status_code = getattr(response, "status_code", None)
+        self.response_bytes = get_response_bytes(response, stream)
+
+
+def get_elapsed_seconds(response) -> Optional[float]:
+    """Return ``requests``' time from sending the request to parsing the response headers."""
+    elapsed = getattr(response, "elapsed", None)
+    if isinstance(elapsed, timedelta):
+        return elapsed.total_seconds()
+    return None
+
+
+def trace_timings(event: RequestEvent) -> Callable[[str, Dict[str, Any]], Any]:
+    """Return an ``httpx`` trace hook recording connection setup and TTFB on ``event``.
+
+    Connection setup is only reported when the attempt opened a new
+    connection; reused keep-alive connections leave it as ``None``.
+    """
+    started = time.perf_counter()
+    marks: Dict[str, float] = {}
+    event.connect_seconds = None
+    event.ttfb_seconds = None
+
+    async def trace(name: str, info: Dict[str, Any]) -> None:
+        now = time.perf_counter()
+        step, _, phase = name.rpartition(".")
+        if phase == "started":
+            marks[step] = now
+        elif step in ("connection.connect_tcp", "connection.start_tls") and phase == "complete":
+            event.connect_seconds = (event.connect_seconds or 0.0) + now - marks.get(step, now)
+        elif step.endswith("receive_response_headers") and phase == "complete":
+            event.ttfb_seconds = now - started
+
+    return trace
+
+
+RequestObserver = Callable[[RequestEvent], None]
+
+# Set while a CSV or JSON handler is waiting to add its parse time, so the
+# transport hands the finished event over instead of notifying straight away.
+_pending_events: ContextVar[Optional[List[RequestEvent]]] = ContextVar("redcaplite_pending_events", default=None)
+
+
+def get_response_bytes(response, stream: bool = False) -> Optional[int]:
+    """Return the size of the response body without consuming a streamed body."""
+    if not stream:
+        content = getattr(response, "content", None)
+        if isinstance(content, (bytes, bytearray)):
+            return len(content)
+    try:
+        return int(response.headers["content-length"])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+
+def notify(observers: Sequence[RequestObserver], event: RequestEvent) -> None:
+    """Pass ``event`` to every observer, or to a waiting parser if one is active."""
+    pending = _pending_events.get()
+    if pending is not None and event.error is None:
+        pending.append(event)
+        return
+    for observer in observers:
+        observer(event)
+
+
+@contextmanager
+def defer_events(observers: Sequence[RequestObserver]) -> Iterator[List[RequestEvent]]:
+    """Collect events emitted inside the block instead of notifying ``observers``.
+
+    If the block raises, for example while saving ``output_file``, the
+    collected events are reported right away with the error attached.
+    """
+    pending: List[RequestEvent] = []
+    token = _pending_events.set(pending)
+    try:
+        yield pending
+    except BaseException as exc:
+        _pending_events.reset(token)
+        token = None
+        for event in pending:
+            event.error = exc
+            for observer in observers:
+                observer(event)
+        raise
+    finally:
+        if token is not None:
+            _pending_events.reset(token)
+
+
+def observe_parse(observers: Sequence[RequestObserver], pending: List[RequestEvent], parse: Callable[[], Any]) -> Any:
+    """Run ``parse``, add its duration to the deferred events and notify ``observers``."""
+    started = time.perf_counter()
+    try:
+        return parse()
+    except BaseException as exc:
+        for event in pending:
+            event.error = exc
+        raise
+    finally:
+        parse_seconds = time.perf_counter() - started
+        for event in pending:
+            event.parse_seconds = parse_seconds
+            for observer in observers:
+                observer(event)
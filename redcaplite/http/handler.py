@@ -1,9 +1,20 @@
 from .error import APIException
+from .events import RequestEvent, defer_events, get_elapsed_seconds, notify, observe_parse
 import os
 import io
-import pandas as pd
+import time
+import weakref
+import requests
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Sequence, Union
+from typing import Any, BinaryIO, Callable, List, Optional, Sequence, Tuple, Union
+
+DEFAULT_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Called with (bytes_written, total_bytes_or_None) after every downloaded chunk.
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+UploadSource = Union[str, os.PathLike, bytes, bytearray, BinaryIO]
 
 
 def output_handler(func):
@@ -15,47 +26,157 @@ def output_handler(func):
         **kwargs,
     ):
         response = func(obj, data, *args, **kwargs)
-        if output_file is not None:
-            output_path = Path(output_file)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            output_path.write_text(response.text, encoding="utf-8")
+        write_output(response, output_file)
         return response
 
     return wrapper
 
 
+def write_output(response, output_file: Optional[Union[str, os.PathLike[str]]] = None):
+    """Save the raw response body to ``output_file`` when one is given."""
+    if output_file is not None:
+        output_path = Path(output_file)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(response.content)
+
+
+def is_blank(body: bytes) -> bool:
+    """Return True for an empty or whitespace-only body.
+
+    ``bytes.isspace`` stops at the first other byte, so a non-empty export is
+    rejected after one byte instead of being stripped into a copy.
+    """
+    return not body or body.isspace()
+
+
+def get_response_encoding(response) -> str:
+    """Return the charset ``response.text`` would decode with, defaulting to UTF-8."""
+    return response.encoding or 'utf-8'
+
+
 def response_error_handler(func):
-    def wrapper(obj, data, files=None):
+    def wrapper(obj, data, files=None, **kwargs):
         data['returnFormat'] = 'json'
-        response = func(obj, data, files=files)
-        if response.status_code == 200:
-            return response
-        elif response.status_code == 400:
-            raise APIException(
-                f"Bad Request: {response.json().get('error', 'No message provided')}")
-        elif response.status_code == 401:
-            raise APIException(
-                "Unauthorized: API token was missing or incorrect.")
-        elif response.status_code == 403:
-            raise APIException(
-                "Forbidden: You do not have permissions to use the API.")
-        elif response.status_code == 404:
-            raise APIException(
-                "Not Found: The URI requested is invalid or the resource does not exist.")
-        elif response.status_code == 406:
-            raise APIException(
-                "Not Acceptable: The data being imported was formatted incorrectly.")
-        elif response.status_code == 500:
-            raise APIException(
-                "Internal Server Error: The server encountered an error processing your request.")
-        elif response.status_code == 501:
-            raise APIException(
-                "Not Implemented: The requested method is not implemented.")
-        else:
-            raise Exception("Unknown issue.")
+        observers = getattr(obj, 'request_observers', None)
+        if not observers:
+            return send_with_retries(func, obj, data, files, **kwargs)
+        return send_observed(func, obj, data, files, observers, **kwargs)
     return wrapper
 
 
+def send_observed(func, obj, data, files, observers, **kwargs):
+    """Run ``send_with_retries`` and report the call to ``observers`` as a ``RequestEvent``."""
+    event = RequestEvent.start(data)
+
+    def timed(obj, data, files=None, **kwargs):
+        event.attempts += 1
+        response = func(obj, data, files=files, **kwargs)
+        event.record_attempt(data, response, stream=kwargs.get('stream', False))
+        event.ttfb_seconds = get_elapsed_seconds(response)
+        return response
+
+    started = time.perf_counter()
+    try:
+        return send_with_retries(timed, obj, data, files, **kwargs)
+    except BaseException as exc:
+        event.error = exc
+        raise
+    finally:
+        event.total_seconds = time.perf_counter() - started
+        notify(observers, event)
+
+
+def send_with_retries(func, obj, data, files=None, **kwargs):
+    """Call ``func`` until it succeeds, applying ``obj``'s rate limiter and retry policy."""
+    retry_policy = getattr(obj, 'retry_policy', None)
+    rate_limiter = getattr(obj, 'rate_limiter', None)
+    positions = upload_positions(files)
+    if positions is None:
+        # The first attempt consumes a stream that cannot be rewound.
+        retry_policy = None
+    attempt = 0
+    while True:
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        try:
+            response = func(obj, data, files=files, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if retry_policy is None or not retry_policy.should_retry(attempt, data):
+                raise
+            delay = retry_policy.get_delay(attempt)
+        else:
+            if (
+                response.status_code == 200
+                or retry_policy is None
+                or not retry_policy.should_retry(attempt, data, response.status_code)
+            ):
+                return check_response(response)
+            delay = retry_policy.get_delay(attempt, get_retry_after(response))
+            response.close()
+        time.sleep(delay)
+        rewind_files(positions)
+        attempt += 1
+
+
+def get_retry_after(response) -> Optional[str]:
+    """Return the raw ``Retry-After`` header of ``response``, if present."""
+    try:
+        return response.headers.get("retry-after")
+    except AttributeError:
+        return None
+
+
+def upload_positions(files) -> Optional[List[Tuple[Any, int]]]:
+    """Return each uploaded file object with its start offset, or ``None`` if one cannot be rewound.
+
+    Bytes need no rewinding. A pipe, socket or other non-seekable stream is
+    consumed by the first attempt, so its request must not be retried.
+    """
+    positions = []
+    for upload in (files or {}).values():
+        file_obj = upload[1] if isinstance(upload, tuple) else upload
+        if isinstance(file_obj, (bytes, bytearray)):
+            continue
+        try:
+            if not file_obj.seekable():
+                return None
+            positions.append((file_obj, file_obj.tell()))
+        except (AttributeError, OSError, ValueError):
+            return None
+    return positions
+
+
+def rewind_files(positions) -> None:
+    """Seek uploaded file objects back to where they started so a retry sends them again."""
+    for file_obj, position in positions or ():
+        file_obj.seek(position)
+
+
+_STATUS_MESSAGES = {
+    401: "Unauthorized: API token was missing or incorrect.",
+    403: "Forbidden: You do not have permissions to use the API.",
+    404: "Not Found: The URI requested is invalid or the resource does not exist.",
+    406: "Not Acceptable: The data being imported was formatted incorrectly.",
+    500: "Internal Server Error: The server encountered an error processing your request.",
+    501: "Not Implemented: The requested method is not implemented.",
+}
+
+
+def check_response(response):
+    """Return ``response`` when REDCap answered 200, otherwise raise ``APIException``.
+
+    The exception's ``status_code`` carries the HTTP status.
+    """
+    status_code = response.status_code
+    if status_code == 200:
+        return response
+    if status_code == 400:
+        message = f"Bad Request: {response.json().get('error', 'No message provided')}"
+    else:
+        message = _STATUS_MESSAGES.get(status_code, "Unknown issue.")
+    raise APIException(message, status_code=status_code)
+
+
 def csv_handler(func):
     def wrapper(
         obj,
@@ -67,25 +188,173 @@ def csv_handler(func):
         if pd_read_csv_kwargs is None:
             pd_read_csv_kwargs = {}
         data['format'] = 'csv'
-        response = func(obj, data, output_file=output_file)
-        if 'returnContent' in data and data['returnContent'] == 'ids':
-            return response.json()
-        if response.text.strip() == '':
-            return pd.DataFrame(columns=empty_columns)
-        io_string = io.StringIO(response.text)
-        df = pd.read_csv(io_string, **pd_read_csv_kwargs)
-        io_string.close()
-        if df.shape == (0, 1):
-            return response.text
-        return df
+        observers = getattr(obj, 'request_observers', None)
+        if not observers:
+            response = func(obj, data, output_file=output_file)
+            return parse_csv_response(response, data, pd_read_csv_kwargs, empty_columns)
+        with defer_events(observers) as pending:
+            response = func(obj, data, output_file=output_file)
+        return observe_parse(
+            observers,
+            pending,
+            lambda: parse_csv_response(response, data, pd_read_csv_kwargs, empty_columns),
+        )
+    return wrapper
+
+
+def parse_csv_response(
+    response,
+    data,
+    pd_read_csv_kwargs=None,
+    empty_columns: Optional[Sequence[str]] = None,
+):
+    """Parse a CSV export response into a DataFrame."""
+    import pandas as pd
+
+    if pd_read_csv_kwargs is None:
+        pd_read_csv_kwargs = {}
+    if 'returnContent' in data and data['returnContent'] == 'ids':
+        return response.json()
+    body = response.content
+    if is_blank(body):
+        return pd.DataFrame(columns=empty_columns)
+    encoding = get_response_encoding(response)
+    # BytesIO shares the body's buffer, and pandas decodes while it parses,
+    # so the export is never held as a second, decoded copy.
+    df = pd.read_csv(io.BytesIO(body), **{'encoding': encoding, **pd_read_csv_kwargs})
+    if df.shape == (0, 1):
+        return body.decode(encoding)
+    return df
+
+
+def arrow_handler(func):
+    def wrapper(
+        obj,
+        data,
+        arrow='table',
+        convert_options=None,
+        output_file: Optional[Union[str, os.PathLike[str]]] = None,
+        empty_columns: Optional[Sequence[str]] = None,
+    ):
+        from redcaplite.arrow import parse_arrow_response
+
+        data['format'] = 'csv'
+
+        def parse(response):
+            return parse_arrow_response(response, data, arrow, convert_options, output_file, empty_columns)
+
+        observers = getattr(obj, 'request_observers', None)
+        if not observers:
+            return parse(func(obj, data))
+        with defer_events(observers) as pending:
+            response = func(obj, data)
+        return observe_parse(observers, pending, lambda: parse(response))
     return wrapper
 
 
+class _TeeReader:
+    """Binary reader that copies every chunk it hands out into ``sink``."""
+
+    def __init__(self, source, sink):
+        self.source = source
+        self.sink = sink
+
+    def read(self, size=-1):
+        chunk = self.source.read(size)
+        if chunk:
+            self.sink.write(chunk)
+        return chunk
+
+
+def csv_stream_handler(func):
+    def wrapper(
+        obj,
+        data,
+        chunksize,
+        pd_read_csv_kwargs=None,
+        output_file: Optional[Union[str, os.PathLike[str]]] = None,
+    ):
+        if pd_read_csv_kwargs is None:
+            pd_read_csv_kwargs = {}
+        data['format'] = 'csv'
+        response = func(obj, data, stream=True)
+        return CsvChunkStream(response, chunksize, pd_read_csv_kwargs, output_file)
+    return wrapper
+
+
+class CsvChunkStream:
+    """Iterator over the DataFrame chunks of a streamed CSV export.
+
+    It owns the response: the connection is released once the chunks run
+    out, the parser fails, ``close()`` is called (also by ``with``), or the
+    stream is dropped before it was ever iterated.
+    """
+
+    def __init__(self, response, chunksize, pd_read_csv_kwargs=None, output_file=None):
+        self._chunks = _iter_csv_chunks(response, chunksize, pd_read_csv_kwargs or {}, output_file)
+        self._release = weakref.finalize(self, response.close)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._chunks)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        """Stop parsing, close any ``output_file`` and release the response."""
+        self._chunks.close()
+        self._release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _iter_csv_chunks(response, chunksize, pd_read_csv_kwargs, output_file=None):
+    # Parse straight off the socket so only ``chunksize`` rows (plus the
+    # parser's read buffer) are ever held in memory. ``CsvChunkStream``
+    # closes the response.
+    import pandas as pd
+
+    response.raw.decode_content = True
+    sink = None
+    source = response.raw
+    try:
+        if output_file is not None:
+            output_path = Path(output_file)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            sink = output_path.open('wb')
+            source = _TeeReader(response.raw, sink)
+        try:
+            reader = pd.read_csv(
+                source,
+                chunksize=chunksize,
+                **{'encoding': get_response_encoding(response), **pd_read_csv_kwargs},
+            )
+        except pd.errors.EmptyDataError:
+            return
+        with reader:
+            yield from reader
+    finally:
+        if sink is not None:
+            sink.close()
+
+
 def json_handler(func):
     def wrapper(obj, data, output_file=None):
         data['format'] = 'json'
-        response = func(obj, data, output_file=output_file)
-        return response.json()
+        observers = getattr(obj, 'request_observers', None)
+        if not observers:
+            return func(obj, data, output_file=output_file).json()
+        with defer_events(observers) as pending:
+            response = func(obj, data, output_file=output_file)
+        return observe_parse(observers, pending, response.json)
     return wrapper
 
 
@@ -97,36 +366,124 @@ def text_handler(func):
 
 
 def file_download_handler(func):
-    def wrapper(obj, data, file_dictionary=''):
+    def wrapper(
+        obj,
+        data,
+        file_dictionary='',
+        file_obj=None,
+        progress: Optional[ProgressCallback] = None,
+        chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
+    ):
         response = func(obj, data)
         try:
-            # Extract and clean the content-type header, splitting by semicolon
-            # and stripping spaces
-            content_type = response.headers["content-type"]
-            splat = [item.strip() for item in content_type.split(";")]
-
-            # Create a dictionary of key-value pairs from the cleaned
-            # content-type
-            content_dict = {
-                key: value.replace('"', "")
-                for item in splat
-                if "=" in item
-                for key, value in [item.split("=")]
-            }
-            file_name = content_dict['name']
-
-        except:  # noqa: E722
-            file_name = 'download.raw'
-
-        with open(os.path.join(file_dictionary, file_name), 'wb') as f:
-            f.write(response.content)
+            save_downloaded_file(
+                response,
+                file_dictionary,
+                file_obj=file_obj,
+                progress=progress,
+                chunk_size=chunk_size,
+            )
+        finally:
+            response.close()
         return response
     return wrapper
 
 
+def get_download_file_name(response, default='download.raw'):
+    """Return the file name REDCap sent in the ``content-type`` header."""
+    try:
+        # Extract and clean the content-type header, splitting by semicolon
+        # and stripping spaces
+        content_type = response.headers["content-type"]
+        splat = [item.strip() for item in content_type.split(";")]
+
+        # Create a dictionary of key-value pairs from the cleaned
+        # content-type
+        content_dict = {
+            key: value.replace('"', "")
+            for item in splat
+            if "=" in item
+            for key, value in [item.split("=")]
+        }
+        return content_dict['name']
+
+    except:  # noqa: E722
+        return default
+
+
+def get_content_length(response) -> Optional[int]:
+    """Return the ``content-length`` header as an int, or ``None`` when REDCap omits it."""
+    try:
+        return int(response.headers["content-length"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def save_downloaded_file(
+    response,
+    file_dictionary='',
+    file_obj=None,
+    progress: Optional[ProgressCallback] = None,
+    chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
+):
+    """Stream a file download response into ``file_obj`` or a file in ``file_dictionary``.
+
+    The body is copied ``chunk_size`` bytes at a time, so memory use does
+    not grow with the size of the file.
+    """
+    if file_obj is not None:
+        write_response_body(response, file_obj, chunk_size, progress)
+        return
+    file_name = get_download_file_name(response)
+    with open(os.path.join(file_dictionary, file_name), 'wb') as f:
+        write_response_body(response, f, chunk_size, progress)
+
+
+def write_response_body(
+    response,
+    file_obj,
+    chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
+    progress: Optional[ProgressCallback] = None,
+):
+    """Copy a streamed response body into ``file_obj`` chunk by chunk and return the byte count.
+
+    ``progress`` is called after every chunk with the bytes written so far
+    and the total from ``content-length`` (``None`` when unknown).
+    """
+    total = get_content_length(response) if progress is not None else None
+    size = 0
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        if chunk:
+            file_obj.write(chunk)
+            size += len(chunk)
+            if progress is not None:
+                progress(size, total)
+    return size
+
+
 def file_upload_handler(func):
-    def wrapper(obj, file_path, data):
-        with open(file_path, 'rb') as file_obj:
-            response = func(obj, data, files={'file': file_obj})
+    def wrapper(obj, file, data, file_name: Optional[str] = None):
+        with open_upload(file, file_name) as upload:
+            response = func(obj, data, files={'file': upload})
         return response
     return wrapper
+
+
+@contextmanager
+def open_upload(file: UploadSource, file_name: Optional[str] = None):
+    """Yield the ``files`` entry for uploading ``file`` without copying its contents.
+
+    ``file`` may be a path (opened for the duration of the upload), an open
+    binary file-like object, or ``bytes``. ``file_name`` overrides the name
+    REDCap stores; bytes without one are sent as ``upload.raw``. Uploads from
+    a non-seekable stream are sent once, without retries.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'rb') as file_obj:
+            yield file_obj if file_name is None else (file_name, file_obj)
+    elif isinstance(file, (bytes, bytearray)):
+        yield (file_name or 'upload.raw', file)
+    elif hasattr(file, 'read'):
+        yield file if file_name is None else (file_name, file)
+    else:
+        raise TypeError("Uploads require a file path, bytes, or a binary file-like object.")
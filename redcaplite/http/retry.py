@@ -0,0 +1,127 @@
+"""Retry and client-side rate limiting for REDCap API requests."""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, FrozenSet, Optional
+
+# Actions that change project state. Repeating one after a lost response
+# could import, delete or rename twice, so they are not retried by default.
+WRITE_ACTIONS: FrozenSet[str] = frozenset({"import", "delete", "rename", "createFolder", "switch"})
+
+# REDCap answers 429 before doing any work, so it is safe to retry writes.
+_REJECTED_BEFORE_PROCESSING: FrozenSet[int] = frozenset({429})
+
+
+def is_idempotent(data: Dict[str, Any]) -> bool:
+    """Return ``True`` when repeating the request cannot change the project twice."""
+    return data.get("action") not in WRITE_ACTIONS and "data" not in data
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the delay in seconds named by a ``Retry-After`` header, if any."""
+    if not isinstance(value, str) or not value.strip():
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+@dataclass
+class RetryPolicy:
+    """When and how long to wait before repeating a failed request.
+
+    Delays grow as ``backoff_factor * 2 ** attempt`` up to ``max_backoff``,
+    with "equal jitter" (a random half of each delay) so parallel workers
+    do not retry in lockstep. A ``Retry-After`` header on the response takes
+    precedence, capped at ``max_retry_after``. Imports, deletes and other
+    writes are only retried when REDCap rejected them outright (429) unless
+    ``retry_non_idempotent`` is set.
+    """
+
+    max_retries: int = 3
+    backoff_factor: float = 0.5
+    max_backoff: float = 30.0
+    max_retry_after: float = 300.0
+    jitter: bool = True
+    retry_statuses: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+    retry_non_idempotent: bool = False
+    respect_retry_after: bool = True
+
+    def should_retry(
+        self,
+        attempt: int,
+        data: Dict[str, Any],
+        status_code: Optional[int] = None,
+    ) -> bool:
+        """Return whether to retry after ``attempt`` failed (0 for the first try).
+
+        ``status_code`` is ``None`` when the request failed to get a response
+        at all, for example on a dropped connection.
+        """
+        if attempt >= self.max_retries:
+            return False
+        if status_code is not None and status_code not in self.retry_statuses:
+            return False
+        if self.retry_non_idempotent or is_idempotent(data):
+            return True
+        return status_code in _REJECTED_BEFORE_PROCESSING
+
+    def get_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Return the number of seconds to wait before retry number ``attempt + 1``."""
+        if self.respect_retry_after:
+            server_delay = parse_retry_after(retry_after)
+            if server_delay is not None:
+                return min(server_delay, self.max_retry_after)
+        delay = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        if self.jitter:
+            delay = delay / 2 + random.uniform(0, delay / 2)
+        return delay
+
+
+class RateLimiter:
+    """Thread-safe token bucket allowing ``rate`` requests every ``per`` seconds.
+
+    Share one instance between clients (and threads) that use the same API
+    token so their combined request rate stays under the limit REDCap
+    enforces per user. ``burst`` sets how many requests may go out back to
+    back after an idle period; it defaults to ``rate``.
+    """
+
+    def __init__(self, rate: float, per: float = 60.0, burst: Optional[float] = None) -> None:
+        if rate <= 0 or per <= 0:
+            raise ValueError("rate and per must be positive.")
+        self.fill_rate = rate / per
+        self.capacity = float(burst if burst is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how many seconds the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.fill_rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.fill_rate
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
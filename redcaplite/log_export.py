@@ -0,0 +1,390 @@
+"""Helpers for exporting long log ranges as adaptive time windows."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, Optional, Tuple, Union
+
+import requests
+
+from .http.error import APIException
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+MINUTE = timedelta(minutes=1)
+
+# REDCap log timestamps have minute precision, and ``beginTime``/``endTime``
+# are both inclusive, so windows are whole minutes that never overlap.
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M"
+
+# Server statuses that usually mean the window was too much work for one request.
+_OVERLOAD_STATUSES = frozenset({500, 502, 503, 504})
+
+
+def floor_minute(value: datetime) -> datetime:
+    """Return ``value`` truncated to the start of its minute."""
+    return value.replace(second=0, microsecond=0)
+
+
+@dataclass(frozen=True)
+class LogWindow:
+    """An inclusive range of whole minutes passed as ``beginTime``/``endTime``."""
+
+    begin: datetime
+    end: datetime
+
+    @property
+    def span(self) -> timedelta:
+        """Return the length of the window, counting both end minutes."""
+        return self.end - self.begin + MINUTE
+
+    def split(self) -> Tuple["LogWindow", "LogWindow"]:
+        """Return the two halves of a window spanning at least two minutes."""
+        middle = self.begin + (self.span // 2 // MINUTE - 1) * MINUTE
+        return LogWindow(self.begin, middle), LogWindow(middle + MINUTE, self.end)
+
+
+@dataclass
+class WindowSizer:
+    """Pick the next window length from how large and slow the last responses were.
+
+    A window that returned more than ``target_rows`` rows or took longer
+    than ``target_seconds`` shrinks the next window proportionally (at most
+    4x at a time); quick, small responses double it. The size always stays
+    between ``min_window`` and ``max_window``.
+    """
+
+    window: timedelta = timedelta(hours=1)
+    min_window: timedelta = MINUTE
+    max_window: timedelta = timedelta(days=7)
+    target_rows: int = 50_000
+    target_seconds: float = 30.0
+
+    def __post_init__(self) -> None:
+        if self.min_window < MINUTE:
+            raise ValueError("min_window must be at least one minute.")
+        if self.max_window < self.min_window:
+            raise ValueError("max_window must not be shorter than min_window.")
+        if self.target_rows < 1 or self.target_seconds <= 0:
+            raise ValueError("target_rows and target_seconds must be positive.")
+        self._lock = threading.Lock()
+        self.window = self._clamp(self.window)
+
+    def _clamp(self, window: timedelta) -> timedelta:
+        minutes = max(1, int(window // MINUTE))
+        return min(max(minutes * MINUTE, self.min_window), self.max_window)
+
+    def observe(self, span: timedelta, rows: int, seconds: float) -> None:
+        """Resize from one finished window of length ``span``."""
+        scale = min(self.target_rows / max(rows, 1), self.target_seconds / max(seconds, 1e-6))
+        scale = min(max(scale, 0.25), 2.0)
+        with self._lock:
+            self.window = self._clamp(span * scale)
+
+    def shrink(self, span: timedelta) -> None:
+        """Halve the window after a request for ``span`` failed as too large."""
+        with self._lock:
+            self.window = self._clamp(min(self.window, span / 2))
+
+
+class WindowPlanner:
+    """Hand out consecutive windows from ``begin`` through ``end`` at the sizer's current length."""
+
+    def __init__(self, begin: datetime, end: datetime, sizer: WindowSizer) -> None:
+        self.cursor = begin
+        self.end = end
+        self.sizer = sizer
+
+    @property
+    def done(self) -> bool:
+        """Return ``True`` once the whole range has been handed out."""
+        return self.cursor > self.end
+
+    def next_window(self) -> LogWindow:
+        """Return the next window and advance past it."""
+        window = LogWindow(self.cursor, min(self.cursor + self.sizer.window - MINUTE, self.end))
+        self.cursor = window.end + MINUTE
+        return window
+
+
+def is_overloaded(exc: BaseException) -> bool:
+    """Return whether ``exc`` suggests the window asked for too much at once.
+
+    Timeouts, dropped connections and 5xx answers are treated as overload
+    and answered by splitting the window; anything else is a real error.
+    """
+    if isinstance(exc, APIException):
+        return exc.status_code in _OVERLOAD_STATUSES
+    if isinstance(exc, (requests.Timeout, requests.ConnectionError)):
+        return True
+    # httpx is optional; match its transport errors without importing it.
+    return any(cls.__module__.startswith("httpx") and cls.__name__ == "TransportError" for cls in type(exc).__mro__)
+
+
+def order_log_rows(frame: Any) -> pd.DataFrame:
+    """Return one window's rows oldest first.
+
+    REDCap lists logs newest first, so the rows are reversed and then
+    stably sorted by timestamp, keeping entries from the same minute in
+    the order they were logged.
+    """
+    import pandas as pd
+
+    if not isinstance(frame, pd.DataFrame):
+        return pd.DataFrame()
+    if frame.empty:
+        return frame
+    frame = frame.iloc[::-1]
+    if "timestamp" in frame.columns:
+        frame = frame.sort_values("timestamp", kind="stable")
+    return frame.reset_index(drop=True)
+
+
+@dataclass
+class LogExportResult:
+    """Outcome of a windowed log export written to a file."""
+
+    output_file: Optional[Path] = None
+    begin: Optional[datetime] = None
+    end: Optional[datetime] = None
+    windows: int = 0
+    rows: int = 0
+    resumed: bool = False
+
+
+class LogCheckpoint:
+    """JSON record of how far a windowed log export got, used to resume it.
+
+    The checkpoint stores the export's filters and range, the last minute
+    fully delivered, and the size of the output file at that point, so a
+    resumed run truncates any half-written window before continuing.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+
+    def load(self, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the saved state for ``query``, or ``None`` when there is none.
+
+        Raises ``ValueError`` when the checkpoint belongs to a different export.
+        """
+        if not self.path.exists():
+            return None
+        state = json.loads(self.path.read_text(encoding="utf-8"))
+        if state.get("query") != query:
+            raise ValueError(
+                f"Checkpoint {self.path} was written for a different log export. "
+                "Delete it or use another checkpoint path."
+            )
+        return state
+
+    def saved_end(self) -> Optional[datetime]:
+        """Return the ``endTime`` of the export this checkpoint belongs to, if one was saved."""
+        if not self.path.exists():
+            return None
+        end = json.loads(self.path.read_text(encoding="utf-8")).get("query", {}).get("endTime")
+        return datetime.strptime(end, _TIMESTAMP_FORMAT) if end else None
+
+    def save(self, query: Dict[str, Any], completed_through: datetime, output_bytes: int, rows: int) -> None:
+        """Atomically record that every minute through ``completed_through`` was delivered."""
+        state = {
+            "query": query,
+            "completed_through": completed_through.strftime(_TIMESTAMP_FORMAT),
+            "output_bytes": output_bytes,
+            "rows": rows,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        part_path = self.path.with_name(self.path.name + ".part")
+        part_path.write_text(json.dumps(state, sort_keys=True) + "\n", encoding="utf-8")
+        os.replace(part_path, self.path)
+
+
+@dataclass
+class WindowedLogExport:
+    """Plan, fetch and deliver one windowed log export.
+
+    The same bookkeeping serves the thread-pool and asyncio clients: both
+    fetch up to ``max_workers`` windows ahead, deliver them strictly in
+    time order, and split any window that fails as too large.
+    """
+
+    begin: datetime
+    end: datetime
+    filters: Dict[str, Any]
+    sizer: WindowSizer
+    output_file: Optional[Path] = None
+    checkpoint: Optional[LogCheckpoint] = None
+    result: LogExportResult = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.begin = floor_minute(self.begin)
+        self.end = floor_minute(self.end)
+        if self.end < self.begin:
+            raise ValueError("endTime must not be before beginTime.")
+        self.result = LogExportResult(output_file=self.output_file, begin=self.begin, end=self.end)
+        self._output_bytes = 0
+        start = self.begin
+        state = self.checkpoint.load(self.query) if self.checkpoint is not None else None
+        if state is not None:
+            start = datetime.strptime(state["completed_through"], _TIMESTAMP_FORMAT) + MINUTE
+            self._output_bytes = int(state.get("output_bytes", 0))
+            self.result.rows = int(state.get("rows", 0))
+            self.result.resumed = True
+        if self.output_file is not None:
+            self._prepare_output()
+        self.planner = WindowPlanner(start, self.end, self.sizer)
+
+    @property
+    def query(self) -> Dict[str, Any]:
+        """Return the filters and range identifying this export in a checkpoint."""
+        return {
+            **{key: value for key, value in self.filters.items() if value is not None},
+            "beginTime": self.begin.strftime(_TIMESTAMP_FORMAT),
+            "endTime": self.end.strftime(_TIMESTAMP_FORMAT),
+        }
+
+    def _prepare_output(self) -> None:
+        # Start a new file, or cut a resumed one back to the last checkpoint.
+        self.output_file.parent.mkdir(parents=True, exist_ok=True)
+        existing = self.output_file.stat().st_size if self.output_file.exists() else 0
+        if existing < self._output_bytes:
+            raise ValueError(
+                f"{self.output_file} is shorter than its checkpoint records; "
+                "delete the checkpoint to start the export over."
+            )
+        with self.output_file.open("ab") as output:
+            output.truncate(self._output_bytes)
+
+    def deliver(self, window: LogWindow, frame: pd.DataFrame) -> None:
+        """Append a delivered window to the output file and advance the checkpoint."""
+        self.result.windows += 1
+        self.result.rows += len(frame.index)
+        if self.output_file is not None and not frame.empty:
+            frame.to_csv(self.output_file, mode="a", index=False, header=self._output_bytes == 0)
+            self._output_bytes = self.output_file.stat().st_size
+        if self.checkpoint is not None:
+            self.checkpoint.save(self.query, window.end, self._output_bytes, self.result.rows)
+
+    def fetch_window(self, fetch: Callable[[LogWindow], Any], window: LogWindow) -> pd.DataFrame:
+        """Fetch ``window``, splitting it in half and retrying while it fails as too large."""
+        started = time.perf_counter()
+        try:
+            frame = order_log_rows(fetch(window))
+        except Exception as exc:
+            if window.span <= MINUTE or not is_overloaded(exc):
+                raise
+            self.sizer.shrink(window.span)
+            import pandas as pd
+
+            return pd.concat([self.fetch_window(fetch, half) for half in window.split()], ignore_index=True)
+        self.sizer.observe(window.span, len(frame.index), time.perf_counter() - started)
+        return frame
+
+    async def fetch_window_async(
+        self,
+        fetch: Callable[[LogWindow], Awaitable[Any]],
+        window: LogWindow,
+    ) -> pd.DataFrame:
+        """Async counterpart of ``fetch_window``."""
+        started = time.perf_counter()
+        try:
+            frame = order_log_rows(await fetch(window))
+        except Exception as exc:
+            if window.span <= MINUTE or not is_overloaded(exc):
+                raise
+            self.sizer.shrink(window.span)
+            halves = [await self.fetch_window_async(fetch, half) for half in window.split()]
+            import pandas as pd
+
+            return pd.concat(halves, ignore_index=True)
+        self.sizer.observe(window.span, len(frame.index), time.perf_counter() - started)
+        return frame
+
+    def run(self, fetch: Callable[[LogWindow], Any], max_workers: int) -> Iterator[pd.DataFrame]:
+        """Fetch windows on ``max_workers`` threads and yield each non-empty one in time order.
+
+        A window counts as delivered (and is checkpointed) once the caller
+        asks for the next chunk.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending: deque = deque()
+            try:
+                while pending or not self.planner.done:
+                    while len(pending) < max_workers and not self.planner.done:
+                        window = self.planner.next_window()
+                        pending.append((window, executor.submit(self.fetch_window, fetch, window)))
+                    window, future = pending.popleft()
+                    frame = future.result()
+                    if not frame.empty:
+                        yield frame
+                    self.deliver(window, frame)
+            finally:
+                for _, future in pending:
+                    future.cancel()
+
+    async def run_async(
+        self,
+        fetch: Callable[[LogWindow], Awaitable[Any]],
+        max_workers: int,
+    ) -> AsyncIterator[pd.DataFrame]:
+        """Async counterpart of ``run`` with up to ``max_workers`` windows in flight."""
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+        pending: deque = deque()
+        try:
+            while pending or not self.planner.done:
+                while len(pending) < max_workers and not self.planner.done:
+                    window = self.planner.next_window()
+                    pending.append((window, asyncio.ensure_future(self.fetch_window_async(fetch, window))))
+                window, task = pending.popleft()
+                frame = await task
+                if not frame.empty:
+                    yield frame
+                self.deliver(window, frame)
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+
+def build_log_export(
+    beginTime: datetime,
+    endTime: Optional[datetime],
+    filters: Dict[str, Any],
+    window: timedelta,
+    min_window: timedelta,
+    max_window: timedelta,
+    target_rows: int,
+    target_seconds: float,
+    output_file: Optional[Union[str, Path]] = None,
+    checkpoint: Optional[Union[str, Path]] = None,
+) -> WindowedLogExport:
+    """Set up a windowed export, taking a missing ``endTime`` from the checkpoint or the current time."""
+    log_checkpoint = LogCheckpoint(checkpoint) if checkpoint is not None else None
+    if endTime is None:
+        endTime = (log_checkpoint.saved_end() if log_checkpoint is not None else None) or datetime.now()
+    return WindowedLogExport(
+        begin=beginTime,
+        end=endTime,
+        filters=filters,
+        sizer=WindowSizer(
+            window=window,
+            min_window=min_window,
+            max_window=max_window,
+            target_rows=target_rows,
+            target_seconds=target_seconds,
+        ),
+        output_file=Path(output_file) if output_file is not None else None,
+        checkpoint=log_checkpoint,
+    )
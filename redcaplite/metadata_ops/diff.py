@@ -0,0 +1,212 @@
+"""Hash-indexed metadata diff engine used by ``rcl sync``."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .frame import MetadataFrame
+
+KEY_COLUMN = "field_name"
+
+CHANGE_COLUMNS = ["field_name", "column", "source", "target"]
+MOVE_COLUMNS = ["field_name", "source_position", "target_position"]
+
+
+@dataclass
+class MetadataDiff:
+    """Differences between a source and a target data dictionary.
+
+    ``adds`` holds the source rows whose ``field_name`` is missing from the
+    target, ``removals`` the target rows missing from the source and
+    ``updates`` the target rows of fields whose values differ. ``changes``
+    has one row per changed value (``field_name``, ``column``, ``source``,
+    ``target``), and ``moves`` lists fields whose relative order differs,
+    with their 1-based row positions in each dictionary.
+    """
+
+    adds: pd.DataFrame
+    updates: pd.DataFrame
+    removals: pd.DataFrame
+    changes: pd.DataFrame
+    moves: pd.DataFrame
+
+    @property
+    def empty(self) -> bool:
+        """Return whether the two dictionaries are identical."""
+        return self.adds.empty and self.updates.empty and self.removals.empty and self.moves.empty
+
+    def as_dict(self) -> dict[str, pd.DataFrame]:
+        """Return the differences keyed by kind."""
+        return {
+            "adds": self.adds,
+            "updates": self.updates,
+            "removals": self.removals,
+            "changes": self.changes,
+            "moves": self.moves,
+        }
+
+
+def normalize_metadata(metadata: pd.DataFrame) -> pd.DataFrame:
+    """Return ``metadata`` with every value as text and blanks as ``""``.
+
+    Float columns lose the ``.0`` pandas adds to whole numbers when a
+    column has blanks, so ``5`` and ``5.0`` compare equal.
+    """
+    normalized = {}
+    for column in metadata.columns:
+        values = metadata[column]
+        if pd.api.types.is_float_dtype(values):
+            text = values.astype(str).str.removesuffix(".0").where(values.notna(), "")
+        else:
+            text = values.fillna("").astype(str)
+        normalized[str(column)] = text.to_numpy(dtype=object)
+    return pd.DataFrame(normalized, columns=[str(column) for column in metadata.columns], dtype=object)
+
+
+class MetadataIndex:
+    """A data dictionary normalized once, with its rows hashed and indexed by ``field_name``.
+
+    Build one for a source dictionary and pass it to ``diff_metadata`` for
+    each target to avoid re-normalizing and re-hashing the source.
+    """
+
+    def __init__(self, metadata: pd.DataFrame | MetadataFrame) -> None:
+        if isinstance(metadata, MetadataFrame):
+            metadata = metadata.to_frame()
+        if KEY_COLUMN not in metadata.columns:
+            if not metadata.empty:
+                raise ValueError(f'Metadata is missing the "{KEY_COLUMN}" column.')
+            metadata = metadata.assign(**{KEY_COLUMN: pd.Series(dtype=object)})
+        self.metadata = metadata
+        self.normalized = normalize_metadata(metadata)
+        self.keys = pd.Index(self.normalized[KEY_COLUMN])
+        if not self.keys.is_unique:
+            duplicates = sorted(set(self.keys[self.keys.duplicated()]))
+            raise ValueError(f"Duplicate field_name values in metadata: {', '.join(duplicates)}")
+        self._aligned: dict[tuple[str, ...], tuple[np.ndarray, np.ndarray]] = {}
+
+    def aligned(self, columns: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Return the values and row hashes over ``columns``, missing columns read as blank."""
+        key = tuple(columns)
+        if key not in self._aligned:
+            values = self.normalized.reindex(columns=list(columns), fill_value="").to_numpy(dtype=object)
+            # One hash per row over its normalized values; Python caches string hashes.
+            hashes = np.fromiter(map(hash, map(tuple, values.tolist())), dtype=np.int64, count=len(values))
+            self._aligned[key] = (values, hashes)
+        return self._aligned[key]
+
+    def rows(self, positions: np.ndarray) -> pd.DataFrame:
+        """Return the original rows at ``positions`` with blanks as ``""``."""
+        return self.metadata.iloc[positions].fillna("").reset_index(drop=True)
+
+
+def diff_metadata(
+    source: pd.DataFrame | MetadataFrame | MetadataIndex,
+    target: pd.DataFrame | MetadataFrame | MetadataIndex,
+) -> MetadataDiff:
+    """Compare two data dictionaries, matching fields by ``field_name``.
+
+    Each row is hashed once over the union of both column sets and fields
+    are joined through a ``field_name`` index. Fields whose hashes differ
+    are compared column by column to list the changes, and fields whose
+    hashes match are checked for equality; all of this is linear in the
+    number of rows.
+    Order moves ignore the shifts caused by adds and removals: the fields
+    kept in place are the longest run already in source order (found in
+    ``O(n log n)``), and the rest are moves.
+    """
+    source_index = source if isinstance(source, MetadataIndex) else MetadataIndex(source)
+    target_index = target if isinstance(target, MetadataIndex) else MetadataIndex(target)
+    columns = list(dict.fromkeys([*source_index.normalized.columns, *target_index.normalized.columns]))
+    source_values, source_hashes = source_index.aligned(columns)
+    target_values, target_hashes = target_index.aligned(columns)
+
+    # For each target row, the position of the same field_name in the source (or -1).
+    positions = source_index.keys.get_indexer(target_index.keys)
+    matched = positions >= 0
+    target_rows = np.flatnonzero(matched)
+    source_rows = positions[matched]
+    in_target = np.zeros(len(source_index.keys), dtype=bool)
+    in_target[source_rows] = True
+
+    # Different hashes always mean different rows. Equal hashes are only a
+    # prefilter: those rows are compared value by value, so a hash collision
+    # can never hide a change.
+    changed = source_hashes[source_rows] != target_hashes[target_rows]
+    same = np.flatnonzero(~changed)
+    if len(same):
+        collided = (source_values[source_rows[same]] != target_values[target_rows[same]]).any(axis=1)
+        changed[same[collided]] = True
+    changed_source = source_rows[changed]
+    changed_target = target_rows[changed]
+    differs = source_values[changed_source] != target_values[changed_target]
+    row, column = np.nonzero(differs)
+    changes = pd.DataFrame(
+        {
+            "field_name": target_index.keys.to_numpy()[changed_target[row]],
+            "column": np.asarray(columns, dtype=object)[column],
+            "source": source_values[changed_source[row], column],
+            "target": target_values[changed_target[row], column],
+        },
+        columns=CHANGE_COLUMNS,
+    )
+
+    in_source_order = np.argsort(source_rows, kind="stable")
+    moved = ~_longest_increasing_run(target_rows[in_source_order])
+    moved_source = source_rows[in_source_order][moved]
+    moved_target = target_rows[in_source_order][moved]
+    moves = pd.DataFrame(
+        {
+            "field_name": source_index.keys.to_numpy()[moved_source],
+            "source_position": moved_source + 1,
+            "target_position": moved_target + 1,
+        },
+        columns=MOVE_COLUMNS,
+    )
+
+    return MetadataDiff(
+        adds=source_index.rows(np.flatnonzero(~in_target)),
+        updates=target_index.rows(changed_target),
+        removals=target_index.rows(np.flatnonzero(~matched)),
+        changes=changes,
+        moves=moves,
+    )
+
+
+def diff_metadata_many(
+    source: pd.DataFrame | MetadataFrame,
+    targets: Mapping[str, pd.DataFrame | MetadataFrame],
+) -> dict[str, MetadataDiff]:
+    """Compare one source dictionary against several targets, indexing the source once."""
+    source_index = MetadataIndex(source)
+    return {name: diff_metadata(source_index, target) for name, target in targets.items()}
+
+
+def _longest_increasing_run(values: np.ndarray) -> np.ndarray:
+    """Return a mask of one longest strictly increasing subsequence of ``values``."""
+    if (np.diff(values) > 0).all():
+        return np.ones(len(values), dtype=bool)
+    tails: list[int] = []
+    tail_positions: list[int] = []
+    previous = [-1] * len(values)
+    for position, value in enumerate(values.tolist()):
+        slot = bisect_left(tails, value)
+        if slot == len(tails):
+            tails.append(value)
+            tail_positions.append(position)
+        else:
+            tails[slot] = value
+            tail_positions[slot] = position
+        previous[position] = tail_positions[slot - 1] if slot else -1
+
+    keep = np.zeros(len(values), dtype=bool)
+    position = tail_positions[-1] if tail_positions else -1
+    while position >= 0:
+        keep[position] = True
+        position = previous[position]
+    return keep
@@ -0,0 +1,117 @@
+"""Derive record export dtypes from a project's metadata."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Iterable
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+_CATEGORICAL_FIELD_TYPES = {"dropdown", "radio", "truefalse", "yesno"}
+
+_STRING_FIELD_TYPES = {"file", "notes", "sql", "text"}
+
+_INTEGER_VALIDATIONS = {"integer"}
+
+_FLOAT_VALIDATIONS = {
+    "number",
+    "number_1dp",
+    "number_2dp",
+    "number_3dp",
+    "number_4dp",
+}
+
+_DATE_VALIDATION_PREFIXES = ("date_", "datetime_")
+
+# Columns REDCap adds to flat record exports regardless of the metadata.
+_EXPORT_COLUMN_DTYPES = {
+    "redcap_event_name": "category",
+    "redcap_repeat_instrument": "category",
+    "redcap_repeat_instance": "Int64",
+    "redcap_data_access_group": "category",
+}
+
+
+def parse_choice_codes(choices: Any) -> list[str]:
+    """Return the raw codes from a ``select_choices_or_calculations`` value."""
+    if not isinstance(choices, str) or not choices.strip():
+        return []
+    codes = []
+    for choice in choices.split("|"):
+        code, _, _ = choice.partition(",")
+        if code.strip():
+            codes.append(code.strip())
+    return codes
+
+
+def checkbox_column(field_name: str, code: str) -> str:
+    """Return the export column REDCap uses for one checkbox choice."""
+    normalized = code.lower().replace("-", "_").replace(".", "_")
+    return f"{field_name}___{normalized}"
+
+
+def build_record_dtypes(
+    metadata: pd.DataFrame,
+    raw: bool = True,
+    fields: Iterable[str] = (),
+    forms: Iterable[str] = (),
+) -> tuple[dict[str, Any], list[str]]:
+    """Return ``(dtype, parse_dates)`` arguments for ``pandas.read_csv`` of a record export.
+
+    ``raw`` should mirror ``rawOrLabel="raw"``; label exports keep checkbox
+    and form status columns categorical instead of small integers.
+    ``fields``/``forms`` mirror the export filters so that ``parse_dates``
+    only names columns that will actually be present.
+    """
+    selected_fields = set(fields)
+    selected_forms = set(forms)
+    select_all = not selected_fields and not selected_forms
+
+    dtypes: dict[str, Any] = dict(_EXPORT_COLUMN_DTYPES)
+    parse_dates: list[str] = []
+    if metadata.empty:
+        return dtypes, parse_dates
+
+    flag_dtype = "Int8" if raw else "category"
+    record_id_field = str(metadata["field_name"].iloc[0])
+    exported_forms: set[str] = set()
+
+    for row in metadata.to_dict(orient="records"):
+        field_name = str(row["field_name"])
+        form_name = str(row.get("form_name", ""))
+        field_type = str(row.get("field_type", "")).strip().lower()
+        validation = row.get("text_validation_type_or_show_slider_number")
+        validation = validation.strip().lower() if isinstance(validation, str) else ""
+        exported = (
+            select_all
+            or field_name in selected_fields
+            or form_name in selected_forms
+            or field_name == record_id_field
+        )
+        if exported and form_name:
+            exported_forms.add(form_name)
+
+        if field_name == record_id_field:
+            dtypes[field_name] = "string"
+        elif field_type == "checkbox":
+            for code in parse_choice_codes(row.get("select_choices_or_calculations")):
+                dtypes[checkbox_column(field_name, code)] = flag_dtype
+        elif field_type in _CATEGORICAL_FIELD_TYPES:
+            dtypes[field_name] = "category"
+        elif field_type == "calc":
+            dtypes[field_name] = "Float64"
+        elif field_type == "slider":
+            dtypes[field_name] = "Int64"
+        elif field_type == "text" and validation in _INTEGER_VALIDATIONS:
+            dtypes[field_name] = "Int64"
+        elif field_type == "text" and validation in _FLOAT_VALIDATIONS:
+            dtypes[field_name] = "Float64"
+        elif field_type == "text" and validation.startswith(_DATE_VALIDATION_PREFIXES):
+            if exported:
+                parse_dates.append(field_name)
+        elif field_type in _STRING_FIELD_TYPES:
+            dtypes[field_name] = "string"
+
+    for form_name in exported_forms:
+        dtypes[f"{form_name}_complete"] = flag_dtype
+    return dtypes, parse_dates
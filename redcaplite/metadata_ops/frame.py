@@ -0,0 +1,279 @@
+"""An indexed, in-memory data dictionary for metadata edits."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+from itertools import count
+from typing import Any
+
+import pandas as pd
+
+_INDEX_COLUMNS = ("field_name", "form_name")
+
+
+class MetadataFrame:
+    """A data dictionary indexed by ``field_name`` and by form.
+
+    Rows live in a dict keyed by ``field_name``, so lookups and edits are
+    O(1). The field order is kept as blocks of consecutive fields of one
+    form (one block per form in a well-formed dictionary), so inserting a
+    field next to its form's other fields costs O(fields in the form)
+    rather than O(all fields). Row positions and form ranges are derived
+    lazily and cached until the order changes. A ``DataFrame`` is only
+    built by ``to_frame()``, typically right before ``import_metadata``.
+
+    The helpers in ``metadata_ops.transform`` and ``metadata_ops.validate``
+    accept a ``MetadataFrame`` wherever they take a DataFrame, and edit it
+    in place.
+    """
+
+    def __init__(self, metadata: pd.DataFrame | Iterable[Mapping[str, Any]] = ()) -> None:
+        if isinstance(metadata, pd.DataFrame):
+            columns = [str(column) for column in metadata.columns]
+            # Zipping per-column lists is much faster than to_dict("records")
+            # on Arrow-backed string columns.
+            values = [metadata.iloc[:, index].tolist() for index in range(len(columns))]
+            records: Iterable[dict[str, Any]] = (dict(zip(columns, row)) for row in zip(*values))
+        else:
+            records = [{str(key): value for key, value in record.items()} for record in metadata]
+            columns = list(dict.fromkeys(str(key) for record in records for key in record))
+        missing = [column for column in _INDEX_COLUMNS if column not in columns]
+        if missing and (columns or isinstance(metadata, pd.DataFrame)):
+            raise ValueError(f"Metadata export is missing required columns: {', '.join(missing)}.")
+        self.columns: list[str] = columns or list(_INDEX_COLUMNS)
+
+        self._rows: dict[str, dict[str, Any]] = {}
+        self._blocks: dict[int, list[str]] = {}
+        self._block_form: dict[int, str] = {}
+        self._block_order: list[int] = []
+        self._block_of: dict[str, int] = {}
+        self._block_ids = count()
+        self._positions: dict[str, int] | None = None
+        self._offsets: dict[int, int] | None = None
+
+        block = None
+        for row in records:
+            name = str(row["field_name"])
+            if name in self._rows:
+                raise ValueError(f'Metadata field "{name}" appears more than once.')
+            if block is None or self._block_form[block] != row["form_name"]:
+                block = self._new_block(row["form_name"], len(self._block_order))
+            self._rows[name] = row
+            self._blocks[block].append(name)
+            self._block_of[name] = block
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, field_name: object) -> bool:
+        return field_name in self._rows
+
+    def __iter__(self) -> Iterator[str]:
+        for block in self._block_order:
+            yield from self._blocks[block]
+
+    @property
+    def empty(self) -> bool:
+        """Return whether the dictionary has no fields."""
+        return not self._rows
+
+    @property
+    def field_names(self) -> list[str]:
+        """Return the field names in dictionary order."""
+        return list(self)
+
+    @property
+    def form_names(self) -> list[str]:
+        """Return the form names in dictionary order."""
+        return list(dict.fromkeys(self._block_form[block] for block in self._block_order))
+
+    def row(self, field_name: str) -> dict[str, Any]:
+        """Return one field's stored row (not a copy)."""
+        try:
+            return self._rows[field_name]
+        except KeyError:
+            raise ValueError(f'Metadata field "{field_name}" was not found.') from None
+
+    def find(self, field_name: str) -> dict[str, Any]:
+        """Return a copy of one field's row with missing values as ``""``."""
+        return {column: _blank_missing(self.row(field_name).get(column)) for column in self.columns}
+
+    def position(self, field_name: str) -> int:
+        """Return the 0-based row position of a field."""
+        self.row(field_name)
+        if self._positions is None:
+            self._positions = {name: position for position, name in enumerate(self)}
+        return self._positions[field_name]
+
+    def form_fields(self, form_name: str) -> list[str]:
+        """Return the fields of one form in dictionary order."""
+        return [name for block in self._block_order if self._block_form[block] == form_name for name in self._blocks[block]]
+
+    def form_range(self, form_name: str) -> range:
+        """Return the row positions spanned by a form, from its first to its last field."""
+        offsets = self._block_offsets()
+        blocks = [block for block in self._block_order if self._block_form[block] == form_name and self._blocks[block]]
+        if not blocks:
+            raise ValueError(f'Form "{form_name}" has no fields.')
+        return range(offsets[blocks[0]], offsets[blocks[-1]] + len(self._blocks[blocks[-1]]))
+
+    def insert(self, row: Mapping[str, Any], after: str | None = None, before: str | None = None) -> None:
+        """Insert a new field after/before another field, or after the last field of its form.
+
+        A field whose form has no fields yet is appended at the end.
+        """
+        row = {str(key): value for key, value in row.items()}
+        name = str(row["field_name"])
+        if name in self._rows:
+            raise ValueError(f'Metadata field "{name}" already exists.')
+        if after is not None or before is not None:
+            anchor = after if after is not None else before
+            self.row(anchor)
+            self._place(name, row["form_name"], anchor, after is not None)
+        else:
+            block = self._last_block(row["form_name"])
+            if block is None:
+                block = self._new_block(row["form_name"], len(self._block_order))
+            self._blocks[block].append(name)
+            self._block_of[name] = block
+        self._rows[name] = row
+        for column in row:
+            if column not in self.columns:
+                self.columns.append(column)
+        self._invalidate()
+
+    def update(self, field_name: str, patch: Mapping[str, Any]) -> dict[str, Any]:
+        """Set the given columns of one field in place; a ``field_name`` value renames it."""
+        row = self.row(field_name)
+        new_name = str(patch.get("field_name", field_name))
+        if new_name != field_name and new_name in self._rows:
+            raise ValueError(f'Metadata field "{new_name}" already exists.')
+        if "form_name" in patch and patch["form_name"] != row["form_name"]:
+            self._change_form(field_name, patch["form_name"])
+        for column, value in patch.items():
+            row[str(column)] = value
+            if column not in self.columns:
+                self.columns.append(str(column))
+        if new_name != field_name:
+            block = self._block_of.pop(field_name)
+            fields = self._blocks[block]
+            fields[fields.index(field_name)] = new_name
+            self._block_of[new_name] = block
+            self._rows[new_name] = self._rows.pop(field_name)
+            self._invalidate()
+        return row
+
+    def remove(self, field_name: str) -> dict[str, Any]:
+        """Remove one field and return its row."""
+        row = self.row(field_name)
+        block = self._block_of.pop(field_name)
+        self._blocks[block].remove(field_name)
+        if not self._blocks[block]:
+            self._drop_block(block)
+        del self._rows[field_name]
+        self._invalidate()
+        return row
+
+    def move(self, field_name: str, after: str | None = None, before: str | None = None) -> None:
+        """Move a field directly after or before another field."""
+        self.row(field_name)
+        if (after is None) == (before is None):
+            raise ValueError('Pass exactly one of "after" or "before" to move a field.')
+        anchor = after if after is not None else before
+        if anchor == field_name:
+            raise ValueError(f'Cannot move field "{field_name}" relative to itself.')
+        self.row(anchor)
+        row = self.remove(field_name)
+        self._rows[field_name] = row
+        self._place(field_name, row["form_name"], anchor, after is not None)
+        self._invalidate()
+
+    def copy(self) -> "MetadataFrame":
+        """Return an independent copy."""
+        return MetadataFrame(self.records())
+
+    def records(self) -> list[dict[str, Any]]:
+        """Return copies of the rows in dictionary order."""
+        return [dict(self._rows[name]) for name in self]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Build the DataFrame that ``import_metadata`` expects."""
+        return pd.DataFrame.from_records([self._rows[name] for name in self], columns=self.columns)
+
+    def _place(self, name: str, form_name: Any, anchor: str, after: bool) -> None:
+        # Put ``name`` next to ``anchor``; a field of another form splits
+        # the anchor's block so blocks keep holding a single form.
+        block = self._block_of[anchor]
+        fields = self._blocks[block]
+        index = fields.index(anchor) + (1 if after else 0)
+        if self._block_form[block] == form_name:
+            fields.insert(index, name)
+            self._block_of[name] = block
+            return
+        tail = fields[index:]
+        del fields[index:]
+        order_index = self._block_order.index(block) + 1
+        new_block = self._new_block(form_name, order_index)
+        self._blocks[new_block].append(name)
+        self._block_of[name] = new_block
+        if tail:
+            tail_block = self._new_block(self._block_form[block], order_index + 1)
+            self._blocks[tail_block] = tail
+            for field_name in tail:
+                self._block_of[field_name] = tail_block
+        if not fields:
+            self._drop_block(block)
+
+    def _change_form(self, field_name: str, form_name: Any) -> None:
+        # Keep the field where it is, but in a block of its new form.
+        block = self._block_of[field_name]
+        fields = self._blocks[block]
+        if len(fields) == 1:
+            self._block_form[block] = form_name
+        else:
+            index = fields.index(field_name)
+            anchor, after = (fields[index - 1], True) if index else (fields[1], False)
+            fields.remove(field_name)
+            self._place(field_name, form_name, anchor, after)
+        self._invalidate()
+
+    def _new_block(self, form_name: Any, order_index: int) -> int:
+        block = next(self._block_ids)
+        self._blocks[block] = []
+        self._block_form[block] = form_name
+        self._block_order.insert(order_index, block)
+        return block
+
+    def _drop_block(self, block: int) -> None:
+        self._block_order.remove(block)
+        del self._blocks[block]
+        del self._block_form[block]
+
+    def _last_block(self, form_name: Any) -> int | None:
+        for block in reversed(self._block_order):
+            if self._block_form[block] == form_name:
+                return block
+        return None
+
+    def _block_offsets(self) -> dict[int, int]:
+        if self._offsets is None:
+            offsets = {}
+            position = 0
+            for block in self._block_order:
+                offsets[block] = position
+                position += len(self._blocks[block])
+            self._offsets = offsets
+        return self._offsets
+
+    def _invalidate(self) -> None:
+        self._positions = None
+        self._offsets = None
+
+
+def _blank_missing(value: Any) -> Any:
+    if value is None:
+        return ""
+    try:
+        return "" if pd.isna(value) else value
+    except (TypeError, ValueError):
+        return value
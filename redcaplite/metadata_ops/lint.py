@@ -0,0 +1,283 @@
+"""Whole-dictionary metadata linting."""
+
+from __future__ import annotations
+
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .diff import normalize_metadata
+from .frame import MetadataFrame
+from .validate import CHOICE_FIELD_TYPES, VALID_FIELD_TYPES
+
+# By default, dictionaries at least this long are split across a process
+# pool when ``max_workers`` allows it; below that, process start-up usually
+# costs more than it saves. ``parallel_min_fields`` overrides it per call.
+PARALLEL_MIN_FIELDS = 20_000
+DEFAULT_CHUNK_SIZE = 5_000
+
+VALIDATION_TYPES = frozenset(
+    {
+        "alpha_only",
+        "date_dmy",
+        "date_mdy",
+        "date_ymd",
+        "datetime_dmy",
+        "datetime_mdy",
+        "datetime_ymd",
+        "datetime_seconds_dmy",
+        "datetime_seconds_mdy",
+        "datetime_seconds_ymd",
+        "email",
+        "integer",
+        "mrn_10d",
+        "mrn_generic",
+        "number",
+        "number_1dp",
+        "number_2dp",
+        "number_3dp",
+        "number_4dp",
+        "number_comma_decimal",
+        "number_1dp_comma_decimal",
+        "number_2dp_comma_decimal",
+        "number_3dp_comma_decimal",
+        "number_4dp_comma_decimal",
+        "phone",
+        "phone_australia",
+        "postalcode_australia",
+        "postalcode_canada",
+        "postalcode_french",
+        "postalcode_germany",
+        "ssn",
+        "time",
+        "time_hh_mm_ss",
+        "time_mm_ss",
+        "vmrn",
+        "zipcode",
+    }
+)
+
+_LINT_COLUMNS = (
+    "field_name",
+    "form_name",
+    "field_type",
+    "select_choices_or_calculations",
+    "text_validation_type_or_show_slider_number",
+    "branching_logic",
+)
+
+_FIELD_NAME_RE = re.compile(r"^[a-z][a-z0-9_]*$")
+# A field reference is the last bracketed name in a run such as
+# ``[event_1_arm_1][age]``, optionally with a checkbox code (``[colors(2)]``),
+# a ``:value`` style modifier, and an instance (``[age][2]`` or
+# ``[age][current-instance]``). Event names never end a run, and smart
+# variables such as ``[user-name]`` never match a field name.
+_REFERENCE_RE = re.compile(
+    r"\[([A-Za-z][A-Za-z0-9_]*)(?:\(([^()\[\]]*)\))?(?::[A-Za-z0-9_-]+)?\]"
+    r"(?:\[(?:\d+|[a-z]+-[a-z-]+)\])?(?!\[)"
+)
+
+
+@dataclass
+class LintIssue:
+    """One problem found in a data dictionary."""
+
+    row: int
+    field_name: str
+    rule: str
+    message: str
+    severity: str = "error"
+
+
+@dataclass
+class LintReport:
+    """All issues found in a data dictionary, ordered by row."""
+
+    fields: int
+    issues: list[LintIssue] = field(default_factory=list)
+
+    @property
+    def errors(self) -> list[LintIssue]:
+        return [issue for issue in self.issues if issue.severity == "error"]
+
+    @property
+    def warnings(self) -> list[LintIssue]:
+        return [issue for issue in self.issues if issue.severity == "warning"]
+
+    @property
+    def ok(self) -> bool:
+        """Return whether no errors were found (warnings are allowed)."""
+        return not self.errors
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the issues as a DataFrame with one row per issue."""
+        return pd.DataFrame([asdict(issue) for issue in self.issues], columns=list(LintIssue.__dataclass_fields__))
+
+
+@lru_cache(maxsize=None)
+def parse_choices(choices: str) -> tuple[tuple[tuple[str, str], ...], tuple[str, ...]]:
+    """Parse ``"1, Yes | 0, No"`` into ``((code, label), ...)`` plus malformed entries.
+
+    Results are cached, so the many fields sharing one choice list (yes/no,
+    Likert scales) are parsed once.
+    """
+    parsed = []
+    malformed = []
+    for entry in choices.split("|"):
+        if not entry.strip():
+            continue
+        code, separator, label = entry.partition(",")
+        if not separator or not code.strip():
+            malformed.append(entry.strip())
+            continue
+        parsed.append((code.strip(), label.strip()))
+    return tuple(parsed), tuple(malformed)
+
+
+@lru_cache(maxsize=65_536)
+def logic_references(logic: str) -> tuple[tuple[str, str | None], ...]:
+    """Return the ``(field, choice code or None)`` pairs a logic expression refers to.
+
+    Event prefixes, instance suffixes and smart variables are skipped.
+    """
+    return tuple((name, code or None) for name, code in _REFERENCE_RE.findall(logic))
+
+
+def lint_metadata(
+    metadata: pd.DataFrame | MetadataFrame,
+    max_workers: int | None = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    parallel_min_fields: int = PARALLEL_MIN_FIELDS,
+) -> LintReport:
+    """Check a whole data dictionary and return every issue found.
+
+    Field names, duplicate names, field types and validation types are
+    checked column-wise. Choice lists are parsed once per distinct value
+    (``parse_choices``) to find malformed entries and duplicate codes. Branching logic and
+    calculations are checked against an index of field names and checkbox
+    codes. That last step runs in chunks over a process pool when
+    ``max_workers`` is greater than 1 (``None`` uses every CPU) and the
+    dictionary has at least ``parallel_min_fields`` fields, in chunks of at
+    most ``chunk_size`` rows so every worker gets a share.
+    """
+    frame = metadata.to_frame() if isinstance(metadata, MetadataFrame) else metadata
+    if "field_name" not in frame.columns:
+        raise ValueError("Metadata export is missing required columns: field_name.")
+    normalized = normalize_metadata(frame).reindex(columns=list(_LINT_COLUMNS), fill_value="")
+    names = normalized["field_name"]
+    field_types = normalized["field_type"].str.strip().str.lower()
+    validations = normalized["text_validation_type_or_show_slider_number"].str.strip().str.lower()
+    choices = normalized["select_choices_or_calculations"].str.strip()
+    logic = normalized["branching_logic"].str.strip()
+    name_list = names.tolist()
+    issues: list[LintIssue] = []
+
+    def add(rows: pd.Series, rule: str, message: str, severity: str = "error") -> None:
+        for row in np.flatnonzero(rows.to_numpy(dtype=bool)).tolist():
+            values = normalized.iloc[row]
+            issues.append(LintIssue(row + 1, name_list[row], rule, message.format(**values), severity))
+
+    add(~names.str.fullmatch(_FIELD_NAME_RE.pattern), "field-name",
+        'Field name "{field_name}" must start with a lowercase letter and use only a-z, 0-9 and _.')
+    add(names.duplicated(keep="first"), "duplicate-field", 'Field "{field_name}" is defined more than once.')
+    add(normalized["form_name"].str.strip() == "", "form-name", 'Field "{field_name}" has no form_name.')
+    add(~field_types.isin(VALID_FIELD_TYPES), "field-type", 'Unsupported field type "{field_type}".')
+    add((field_types == "text") & (validations != "") & ~validations.isin(VALIDATION_TYPES), "validation-type",
+        'Unknown text validation "{text_validation_type_or_show_slider_number}" (custom validations can be ignored).',
+        "warning")
+    has_choices = field_types.isin(CHOICE_FIELD_TYPES)
+    add(has_choices & (choices == ""), "missing-choices",
+        'Field type "{field_type}" requires non-empty "select_choices_or_calculations".')
+    is_calc = field_types == "calc"
+    add(is_calc & (choices == ""), "missing-calculation", 'Calculated field "{field_name}" has no calculation.')
+
+    choice_codes: dict[str, frozenset[str]] = {}
+    choice_list = choices.tolist()
+    type_list = field_types.tolist()
+    for row in np.flatnonzero((has_choices & (choices != "")).to_numpy(dtype=bool)).tolist():
+        name = name_list[row]
+        codes, malformed, duplicates = _choice_problems(choice_list[row])
+        if type_list[row] == "checkbox":
+            choice_codes[name] = codes
+        for entry in malformed:
+            issues.append(LintIssue(row + 1, name, "malformed-choice", f'Choice "{entry}" is not in "code, label" form.'))
+        if duplicates:
+            issues.append(LintIssue(row + 1, name, "duplicate-choice-code", f"Duplicate choice codes: {', '.join(duplicates)}."))
+
+    calculations = choices.where(is_calc, "")
+    logic_list = logic.tolist()
+    calculation_list = calculations.tolist()
+    rows = [
+        (row, name_list[row], logic_list[row], calculation_list[row])
+        for row in np.flatnonzero(((logic != "") | (calculations != "")).to_numpy(dtype=bool)).tolist()
+    ]
+    field_names = frozenset(name_list)
+    workers = _worker_count(max_workers, len(name_list), parallel_min_fields)
+    if workers > 1 and len(rows) > 1:
+        size = min(chunk_size, -(-len(rows) // workers))
+        chunks = [rows[start:start + size] for start in range(0, len(rows), size)]
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(field_names, choice_codes)) as pool:
+            for found in pool.map(_check_references_in_worker, chunks):
+                issues.extend(found)
+    else:
+        issues.extend(_check_references(rows, field_names, choice_codes))
+
+    issues.sort(key=lambda issue: issue.row)
+    return LintReport(fields=len(name_list), issues=issues)
+
+
+@lru_cache(maxsize=None)
+def _choice_problems(choices: str) -> tuple[frozenset[str], tuple[str, ...], list[str]]:
+    # Lower-cased codes, malformed entries and duplicate codes of one choice list.
+    parsed, malformed = parse_choices(choices)
+    counts = Counter(code for code, _ in parsed)
+    duplicates = sorted(code for code, seen in counts.items() if seen > 1)
+    return frozenset(code.lower() for code in counts), malformed, duplicates
+
+
+def _worker_count(max_workers: int | None, fields: int, parallel_min_fields: int) -> int:
+    if fields < parallel_min_fields:
+        return 1
+    if max_workers is None:
+        return os.cpu_count() or 1
+    return max(1, max_workers)
+
+
+def _check_references(
+    rows: list[tuple[int, str, str, str]],
+    field_names: frozenset[str],
+    choice_codes: dict[str, frozenset[str]],
+) -> list[LintIssue]:
+    issues = []
+    for row, name, branching_logic, calculation in rows:
+        for column, expression in (("branching logic", branching_logic), ("calculation", calculation)):
+            if not expression:
+                continue
+            for reference, code in logic_references(expression):
+                if reference not in field_names:
+                    issues.append(LintIssue(row + 1, name, "unknown-field-reference", f'The {column} refers to unknown field "{reference}".'))
+                elif code is not None and code.strip().lower() not in choice_codes.get(reference, frozenset()):
+                    issues.append(LintIssue(
+                        row + 1, name, "unknown-choice-code",
+                        f'The {column} refers to "{reference}({code})", which is not a checkbox choice.',
+                    ))
+    return issues
+
+
+_WORKER_INDEX: tuple[frozenset[str], dict[str, frozenset[str]]] = (frozenset(), {})
+
+
+def _init_worker(field_names: frozenset[str], choice_codes: dict[str, frozenset[str]]) -> None:
+    # Ship the field index once per worker process instead of once per chunk.
+    global _WORKER_INDEX
+    _WORKER_INDEX = (field_names, choice_codes)
+
+
+def _check_references_in_worker(rows: list[tuple[int, str, str, str]]) -> list[LintIssue]:
+    return _check_references(rows, *_WORKER_INDEX)
@@ -0,0 +1,206 @@
+"""Batched metadata edits applied in memory and imported once."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+import pandas as pd
+
+from .frame import MetadataFrame
+from .transform import validate_metadata_columns, build_new_field_row
+from .validate import (
+    METADATA_COLUMNS,
+    ensure_field_missing,
+    validate_choice_field_config,
+    validate_field_type,
+)
+
+OPERATIONS = ("add", "edit", "remove", "move")
+
+# Keys each operation accepts besides "op", "field_name" and, for "add" and
+# "edit", metadata column names.
+_OPERATION_KEYS = {
+    "add": ("form_name", "after", "before"),
+    "edit": ("new_field_name",),
+    "remove": (),
+    "move": ("after", "before"),
+}
+
+
+@dataclass
+class SessionChanges:
+    """Field names touched by an edit session, in the order they were changed."""
+
+    added: list[str] = field(default_factory=list)
+    edited: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    moved: list[str] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        """Return whether the session changed nothing."""
+        return not (self.added or self.edited or self.removed or self.moved)
+
+
+@dataclass
+class OperationError:
+    """A batch operation that could not be applied."""
+
+    index: int
+    operation: str
+    field_name: str
+    message: str
+
+    def __str__(self) -> str:
+        return f'Operation {self.index + 1} ({self.operation} "{self.field_name}"): {self.message}'
+
+
+class MetadataEditSession:
+    """Apply many field edits to a data dictionary in memory, then import it once.
+
+    The dictionary is held in a ``MetadataFrame``, so finding or editing a
+    field is a hash lookup and adding one costs O(fields in its form).
+    Every operation is validated with ``metadata_ops.validate`` as it is
+    applied, and a failed operation leaves the session unchanged.
+
+    REDCap's metadata import always replaces the whole data dictionary, so
+    ``push()`` still sends every row, but only once per batch.
+    """
+
+    def __init__(self, metadata: pd.DataFrame | MetadataFrame) -> None:
+        validate_metadata_columns(metadata)
+        self.metadata = metadata.copy() if isinstance(metadata, MetadataFrame) else MetadataFrame(metadata)
+        self.changes = SessionChanges()
+
+    @classmethod
+    def load(cls, client: Any) -> "MetadataEditSession":
+        """Start a session from a fresh metadata export, bypassing the metadata cache."""
+        client.clear_metadata_cache()
+        metadata = client.get_metadata(format="csv")
+        return cls(metadata if isinstance(metadata, pd.DataFrame) else pd.DataFrame(metadata))
+
+    def __contains__(self, field_name: str) -> bool:
+        return field_name in self.metadata
+
+    def __len__(self) -> int:
+        return len(self.metadata)
+
+    @property
+    def field_names(self) -> list[str]:
+        """Return the field names in dictionary order."""
+        return self.metadata.field_names
+
+    def field(self, field_name: str) -> dict[str, Any]:
+        """Return a copy of one field's row."""
+        return dict(self.metadata.row(field_name))
+
+    def add(
+        self,
+        field_name: str,
+        form_name: str,
+        after: str | None = None,
+        before: str | None = None,
+        **values: Any,
+    ) -> dict[str, Any]:
+        """Add a new field after or before another field, or after the last field of ``form_name``."""
+        self._check_columns(values)
+        ensure_field_missing(self.metadata, field_name)
+        row = build_new_field_row({"field_name": field_name, "form_name": form_name, **values})
+        self.metadata.insert(row, after=after, before=before)
+        self.changes.added.append(field_name)
+        return dict(row)
+
+    def edit(self, field_name: str, new_field_name: str | None = None, **patch: Any) -> dict[str, Any]:
+        """Update the given columns of one field, renaming it when ``new_field_name`` is set."""
+        self._check_columns(patch)
+        original = self.metadata.row(field_name)
+        patch = {key: value for key, value in patch.items() if value is not None}
+        if new_field_name is not None:
+            patch["field_name"] = str(new_field_name)
+        if not patch:
+            raise ValueError("No metadata changes were provided.")
+        new_name = str(patch.get("field_name", field_name))
+        if new_name != field_name:
+            ensure_field_missing(self.metadata, new_name)
+        if "field_type" in patch:
+            validate_field_type(str(patch["field_type"]))
+            patch["field_type"] = str(patch["field_type"]).strip().lower()
+        field_type = str(patch.get("field_type", original["field_type"]))
+        validate_choice_field_config(field_type, patch, existing_row=original)
+
+        row = self.metadata.update(field_name, patch)
+        self.changes.edited.append(new_name)
+        return dict(row)
+
+    def remove(self, field_name: str) -> dict[str, Any]:
+        """Remove one field and return its row."""
+        row = self.metadata.remove(field_name)
+        self.changes.removed.append(field_name)
+        return dict(row)
+
+    def move(self, field_name: str, after: str | None = None, before: str | None = None) -> None:
+        """Move a field directly after or before another field."""
+        self.metadata.move(field_name, after=after, before=before)
+        self.changes.moved.append(field_name)
+
+    def apply(self, operations: Iterable[Mapping[str, Any]]) -> list[OperationError]:
+        """Apply ``{"op": "add"|"edit"|"remove"|"move", "field_name": ..., ...}`` operations.
+
+        Every operation is attempted; the ones that fail are returned and
+        leave the session as it was before them.
+        """
+        errors = []
+        for index, operation in enumerate(operations):
+            if not isinstance(operation, Mapping):
+                errors.append(OperationError(index, "", "", "Each operation must be a mapping with an \"op\" key."))
+                continue
+            values = dict(operation)
+            name = str(values.pop("op", ""))
+            field_name = str(values.get("field_name", ""))
+            try:
+                if name not in OPERATIONS:
+                    raise ValueError(f'Unknown operation "{name}". Expected one of: {", ".join(OPERATIONS)}.')
+                if not field_name:
+                    raise ValueError('Missing required key "field_name".')
+                self._apply_one(name, values)
+            except (TypeError, ValueError) as exc:
+                errors.append(OperationError(index, name, field_name, str(exc)))
+        return errors
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the edited data dictionary in field order."""
+        return self.metadata.to_frame()
+
+    def push(self, client: Any) -> Any:
+        """Import the edited data dictionary with one ``import_metadata`` call."""
+        return client.import_metadata(self.to_frame(), format="csv")
+
+    def _apply_one(self, name: str, values: dict[str, Any]) -> None:
+        field_name = str(values.pop("field_name"))
+        allowed = set(_OPERATION_KEYS[name])
+        if name in ("add", "edit"):
+            allowed.update(self._columns())
+        unknown = [key for key in values if key not in allowed]
+        if unknown:
+            raise ValueError(f'Unknown key(s) for "{name}": {", ".join(map(str, unknown))}.')
+        if name == "add":
+            form_name = values.pop("form_name", None)
+            if not form_name:
+                raise ValueError('Missing required key "form_name".')
+            self.add(field_name, str(form_name), **values)
+        elif name == "edit":
+            self.edit(field_name, **values)
+        elif name == "remove":
+            self.remove(field_name)
+        else:
+            self.move(field_name, **values)
+
+    def _columns(self) -> set[str]:
+        return {*METADATA_COLUMNS, *self.metadata.columns}
+
+    def _check_columns(self, values: Mapping[str, Any]) -> None:
+        unknown = [key for key in values if key not in self._columns()]
+        if unknown:
+            raise ValueError(f'Unknown metadata column(s): {", ".join(map(str, unknown))}.')
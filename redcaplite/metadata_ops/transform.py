@@ -6,6 +6,7 @@ from typing import Any
 
 import pandas as pd
 
+from .frame import MetadataFrame
 from .validate import (
     ensure_field_exists,
     ensure_field_missing,
@@ -33,17 +34,21 @@ _IGNORED_BUILD_KEYS = {
 
 
 
-def metadata_to_records(df: pd.DataFrame) -> list[dict[str, Any]]:
+def metadata_to_records(df: pd.DataFrame | MetadataFrame) -> list[dict[str, Any]]:
     """Convert a metadata DataFrame into JSON-safe records."""
-    _validate_metadata_columns(df)
+    if isinstance(df, MetadataFrame):
+        df = df.to_frame()
+    validate_metadata_columns(df)
     records = df.fillna("").to_dict(orient="records")
     return [{str(key): value for key, value in record.items()} for record in records]
 
 
 
-def find_field(df: pd.DataFrame, field_name: str) -> dict[str, Any]:
+def find_field(df: pd.DataFrame | MetadataFrame, field_name: str) -> dict[str, Any]:
     """Return a single metadata field record by exact field name."""
-    _validate_metadata_columns(df)
+    validate_metadata_columns(df)
+    if isinstance(df, MetadataFrame):
+        return df.find(field_name)
     matches = df.loc[df["field_name"] == field_name]
     if matches.empty:
         raise ValueError(f'Metadata field "{field_name}" was not found.')
@@ -112,10 +117,16 @@ def build_new_field_row(args: Any) -> dict[str, Any]:
 
 
 
-def append_field(df: pd.DataFrame, row: dict[str, Any]) -> pd.DataFrame:
-    """Insert a new metadata field row after the last row for the same form."""
-    _validate_metadata_columns(pd.DataFrame([row]))
+def append_field(df: pd.DataFrame | MetadataFrame, row: dict[str, Any]) -> pd.DataFrame | MetadataFrame:
+    """Insert a new metadata field row after the last row for the same form.
+
+    A ``MetadataFrame`` is edited in place and returned.
+    """
+    validate_metadata_columns(pd.DataFrame([row]))
     ensure_field_missing(df, row["field_name"])
+    if isinstance(df, MetadataFrame):
+        df.insert(row)
+        return df
 
     updated = df.copy()
     row_frame = pd.DataFrame([row])
@@ -130,15 +141,26 @@ def append_field(df: pd.DataFrame, row: dict[str, Any]) -> pd.DataFrame:
 
 
 
-def update_field(df: pd.DataFrame, field_name: str, patch: dict[str, Any]) -> pd.DataFrame:
-    """Update a single metadata field row with the provided patch values."""
-    _validate_metadata_columns(df)
+def update_field(
+    df: pd.DataFrame | MetadataFrame,
+    field_name: str,
+    patch: dict[str, Any],
+) -> pd.DataFrame | MetadataFrame:
+    """Update a single metadata field row with the provided patch values.
+
+    A ``MetadataFrame`` is edited in place and returned.
+    """
+    validate_metadata_columns(df)
     ensure_field_exists(df, field_name)
 
-    updated = df.copy()
+    in_place = isinstance(df, MetadataFrame)
+    updated = df if in_place else df.copy()
     new_field_name = patch.get("field_name")
     if isinstance(new_field_name, str) and new_field_name != field_name:
-        ensure_field_missing(updated.loc[updated["field_name"] != field_name], new_field_name)
+        if in_place:
+            ensure_field_missing(updated, new_field_name)
+        else:
+            ensure_field_missing(updated.loc[updated["field_name"] != field_name], new_field_name)
 
     original_field = find_field(updated, field_name)
 
@@ -149,6 +171,10 @@ def update_field(df: pd.DataFrame, field_name: str, patch: dict[str, Any]) -> pd
     effective_field_type = str(patch.get("field_type", original_field["field_type"]))
     validate_choice_field_config(effective_field_type, patch, existing_row=original_field)
 
+    if in_place:
+        updated.update(field_name, {column: value for column, value in patch.items() if value is not None})
+        return updated
+
     field_mask = updated["field_name"] == field_name
     for column, value in patch.items():
         if value is None:
@@ -159,15 +185,21 @@ def update_field(df: pd.DataFrame, field_name: str, patch: dict[str, Any]) -> pd
 
 
 
-def remove_field(df: pd.DataFrame, field_name: str) -> pd.DataFrame:
-    """Remove a single metadata field row by field name."""
-    _validate_metadata_columns(df)
+def remove_field(df: pd.DataFrame | MetadataFrame, field_name: str) -> pd.DataFrame | MetadataFrame:
+    """Remove a single metadata field row by field name.
+
+    A ``MetadataFrame`` is edited in place and returned.
+    """
+    validate_metadata_columns(df)
     ensure_field_exists(df, field_name)
+    if isinstance(df, MetadataFrame):
+        df.remove(field_name)
+        return df
     return df.loc[df["field_name"] != field_name].copy()
 
 
 
-def _validate_metadata_columns(df: pd.DataFrame) -> None:
+def validate_metadata_columns(df: pd.DataFrame | MetadataFrame) -> None:
     """Ensure the metadata frame includes the columns required by the CLI."""
     missing_columns = [column for column in _REQUIRED_COLUMNS if column not in df.columns]
     if missing_columns:
@@ -6,7 +6,32 @@ from typing import Any
 
 import pandas as pd
 
-_VALID_FIELD_TYPES = {
+from .frame import MetadataFrame
+
+# Columns of a REDCap data dictionary, in export order.
+METADATA_COLUMNS = (
+    "field_name",
+    "form_name",
+    "section_header",
+    "field_type",
+    "field_label",
+    "select_choices_or_calculations",
+    "field_note",
+    "text_validation_type_or_show_slider_number",
+    "text_validation_min",
+    "text_validation_max",
+    "identifier",
+    "branching_logic",
+    "required_field",
+    "custom_alignment",
+    "question_number",
+    "matrix_group_name",
+    "matrix_ranking",
+    "field_annotation",
+)
+
+# Field types REDCap accepts in a data dictionary.
+VALID_FIELD_TYPES = frozenset({
     "calc",
     "checkbox",
     "descriptive",
@@ -20,23 +45,24 @@ _VALID_FIELD_TYPES = {
     "text",
     "truefalse",
     "yesno",
-}
+})
 
-_CHOICE_FIELD_TYPES = {
+# Field types whose "select_choices_or_calculations" holds a choice list.
+CHOICE_FIELD_TYPES = frozenset({
     "checkbox",
     "dropdown",
     "radio",
-}
+})
 
 
 
 def validate_field_type(field_type: str) -> None:
     """Ensure a REDCap metadata field type is supported."""
     normalized_field_type = field_type.strip().lower()
-    if normalized_field_type in _VALID_FIELD_TYPES:
+    if normalized_field_type in VALID_FIELD_TYPES:
         return
 
-    allowed_types = ", ".join(sorted(_VALID_FIELD_TYPES))
+    allowed_types = ", ".join(sorted(VALID_FIELD_TYPES))
     raise ValueError(
         f'Unsupported field type "{field_type}". Expected one of: {allowed_types}.'
     )
@@ -51,7 +77,7 @@ def validate_choice_field_config(
 ) -> None:
     """Ensure basic choice values exist for REDCap choice field types."""
     normalized_field_type = field_type.strip().lower()
-    if normalized_field_type not in _CHOICE_FIELD_TYPES:
+    if normalized_field_type not in CHOICE_FIELD_TYPES:
         return
 
     choices = row.get("select_choices_or_calculations")
@@ -68,8 +94,13 @@ def validate_choice_field_config(
 
 
 
-def ensure_field_exists(df: pd.DataFrame, field_name: str) -> None:
-    """Ensure a metadata field exists in the provided DataFrame."""
+def ensure_field_exists(df: pd.DataFrame | MetadataFrame, field_name: str) -> None:
+    """Ensure a metadata field exists in the provided DataFrame or ``MetadataFrame``."""
+    if isinstance(df, MetadataFrame):
+        if field_name in df:
+            return
+        raise ValueError(f'Metadata field "{field_name}" was not found.')
+
     _ensure_field_name_column(df)
     matches = df["field_name"] == field_name
     if matches.any():
@@ -79,8 +110,13 @@ def ensure_field_exists(df: pd.DataFrame, field_name: str) -> None:
 
 
 
-def ensure_field_missing(df: pd.DataFrame, field_name: str) -> None:
-    """Ensure a metadata field does not already exist in the provided DataFrame."""
+def ensure_field_missing(df: pd.DataFrame | MetadataFrame, field_name: str) -> None:
+    """Ensure a metadata field does not already exist in the provided DataFrame or ``MetadataFrame``."""
+    if isinstance(df, MetadataFrame):
+        if field_name not in df:
+            return
+        raise ValueError(f'Metadata field "{field_name}" already exists.')
+
     _ensure_field_name_column(df)
     matches = df["field_name"] == field_name
     if not matches.any():
@@ -0,0 +1,15 @@
+"""Local SQLite mirror of a REDCap project with offline ``filterLogic`` queries."""
+
+from .filter_logic import FilterLogicError, TranslatedLogic, redcap_compare, translate_filter_logic
+from .store import LOGS_TABLE, STRUCTURE_TABLES, MirrorRefreshResult, ProjectMirror
+
+__all__ = [
+    "FilterLogicError",
+    "LOGS_TABLE",
+    "MirrorRefreshResult",
+    "ProjectMirror",
+    "STRUCTURE_TABLES",
+    "TranslatedLogic",
+    "redcap_compare",
+    "translate_filter_logic",
+]
@@ -0,0 +1,80 @@
+"""Translate REDCap ``filterLogic`` into SQLite ``WHERE`` clauses."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, List, Set, Tuple
+
+from ..filter_logic import (
+    EVENT_COLUMN,
+    BoolOp,
+    FieldRef,
+    FilterLogicError,
+    Node,
+    field_refs,
+    parse_filter_logic,
+    parse_number,
+    redcap_compare,
+)
+
+__all__ = ["FilterLogicError", "TranslatedLogic", "redcap_compare", "translate_filter_logic"]
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+@dataclass
+class TranslatedLogic:
+    """A ``WHERE`` clause with its parameters and the columns it reads."""
+
+    sql: str
+    params: List[Any] = field(default_factory=list)
+    columns: Set[str] = field(default_factory=set)
+
+
+def translate_filter_logic(logic: str, has_events: bool = True) -> TranslatedLogic:
+    """Translate REDCap ``filterLogic`` over a flat record export into SQL.
+
+    The expression is parsed by ``redcaplite.filter_logic.parse_filter_logic``
+    (the same parser the local stand-in server evaluates), so the supported
+    syntax is the same. ``[event][field]`` restricts the comparison to rows
+    of that event unless ``has_events`` is false (a classic project). Text
+    equality is plain SQL; other comparisons go through the
+    ``redcap_compare`` SQL function, which ``ProjectMirror`` registers on its
+    connections.
+    """
+    node = parse_filter_logic(logic)
+    sql, params = _render(node, has_events)
+    columns = {ref.column for ref in field_refs(node)}
+    if has_events and any(ref.event for ref in field_refs(node)):
+        columns.add(EVENT_COLUMN)
+    return TranslatedLogic(sql=sql, params=params, columns=columns)
+
+
+def _render(node: Node, has_events: bool) -> Tuple[str, List[Any]]:
+    if isinstance(node, BoolOp):
+        left_sql, left_params = _render(node.left, has_events)
+        right_sql, right_params = _render(node.right, has_events)
+        return f"({left_sql} {node.operator.upper()} {right_sql})", left_params + right_params
+
+    sides = []
+    params: List[Any] = []
+    for operand in (node.left, node.right):
+        if isinstance(operand, FieldRef):
+            sides.append(f"IFNULL({_quote(operand.column)}, '')")
+        else:
+            sides.append("?")
+            params.append(operand.value)
+    literal = next((operand.value for operand in (node.right, node.left) if not isinstance(operand, FieldRef)), None)
+    if node.operator in ("=", "<>", "!=") and literal is not None and parse_number(literal) is None:
+        # Text equality behaves the same in SQL, so skip the Python call.
+        sql = f"{sides[0]} {'=' if node.operator == '=' else '<>'} {sides[1]}"
+    else:
+        sql = f"redcap_compare({sides[0]}, '{node.operator}', {sides[1]})"
+    if has_events:
+        for operand in (node.left, node.right):
+            if isinstance(operand, FieldRef) and operand.event is not None:
+                sql = f"({_quote(EVENT_COLUMN)} = ? AND {sql})"
+                params.insert(0, operand.event)
+    return sql, params
@@ -0,0 +1,229 @@
+"""A local SQLite mirror of a REDCap project that answers queries offline."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, tzinfo
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+import pandas as pd
+
+from ..http.error import APIException
+from ..log_export import floor_minute, order_log_rows
+from ..redcap import _TEXT_READ_CSV_KWARGS
+from ..snapshot import RECORDS_TABLE, RecordSnapshot
+from .filter_logic import FilterLogicError, redcap_compare, translate_filter_logic
+
+LOGS_TABLE = "logs"
+
+# Small project-structure exports, replaced in full on every refresh.
+# Events and arms only exist in longitudinal projects, and DAGs and users
+# need extra API rights, so a failed export of these is skipped.
+STRUCTURE_TABLES: Dict[str, Callable[[Any], Any]] = {
+    "metadata": lambda client: client.get_metadata(format="json"),
+    "instruments": lambda client: client.get_instruments(format="json"),
+    "arms": lambda client: client.get_arms(format="json"),
+    "events": lambda client: client.get_events(format="json"),
+    "form_event_mappings": lambda client: client.get_form_event_mappings(format="json"),
+    "dags": lambda client: client.get_dags(format="json"),
+    "users": lambda client: client.get_users(format="json"),
+}
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _text_value(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+def _structure_frame(rows: Any) -> pd.DataFrame:
+    """Build a table of text from a JSON export, keeping missing values as NULL and nested values as JSON."""
+    frame = pd.DataFrame(rows if isinstance(rows, list) else [])
+    return frame.astype(object).where(frame.notna(), None).map(_text_value)
+
+
+@dataclass
+class MirrorRefreshResult:
+    """Outcome of one mirror refresh."""
+
+    full: bool
+    updated_records: int
+    deleted_records: int
+    log_rows: int
+    watermark: datetime
+    tables: Dict[str, int] = field(default_factory=dict)
+    skipped: Dict[str, str] = field(default_factory=dict)
+
+
+class ProjectMirror:
+    """A SQLite file holding a project's records, structure, users and logs.
+
+    Records are kept by ``RecordSnapshot`` (one TEXT column per exported
+    field), so refreshes only export records changed since the last run.
+    Structure tables are replaced on every refresh, and new log entries are
+    appended. ``query()`` answers REDCap ``filterLogic`` locally.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.snapshot = RecordSnapshot(self.path)
+
+    def connect(self) -> sqlite3.Connection:
+        """Open a connection with the ``redcap_compare`` function registered."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.create_function("redcap_compare", 3, redcap_compare, deterministic=True)
+        return connection
+
+    @property
+    def watermark(self) -> Optional[datetime]:
+        """Return the start time of the last successful refresh, if any."""
+        return self.snapshot.watermark
+
+    def refresh(
+        self,
+        client: Any,
+        full: bool = False,
+        overlap: timedelta = timedelta(minutes=5),
+        server_timezone: Union[str, tzinfo, None] = None,
+    ) -> MirrorRefreshResult:
+        """Bring the mirror up to date from ``client``.
+
+        The first refresh (or ``full=True``) exports everything. Later ones
+        export records changed since the previous refresh through
+        ``RedcapClient.sync_snapshot()`` and append the log entries written
+        since then. Both start ``overlap`` before the stored watermark, which
+        is kept on the REDCap server's clock: pass ``server_timezone`` when
+        the server is not in this machine's timezone.
+        """
+        watermark = self.watermark
+        full = full or watermark is None
+        since = None if full else floor_minute(watermark - overlap)
+
+        tables: Dict[str, int] = {}
+        skipped: Dict[str, str] = {}
+        structure: Dict[str, pd.DataFrame] = {}
+        for name, export in STRUCTURE_TABLES.items():
+            try:
+                rows = export(client)
+            except APIException as exc:
+                skipped[name] = str(exc)
+                continue
+            structure[name] = _structure_frame(rows)
+            tables[name] = len(structure[name].index)
+
+        logs = order_log_rows(client.get_logs(format="csv", beginTime=since, pd_read_csv_kwargs=dict(_TEXT_READ_CSV_KWARGS)))
+        synced = client.sync_snapshot(self.path, full=full, overlap=overlap, server_timezone=server_timezone)
+
+        connection = self.connect()
+        try:
+            with connection:
+                for name, frame in structure.items():
+                    connection.execute(f"DROP TABLE IF EXISTS {_quote(name)}")
+                    if not frame.columns.empty:
+                        frame.to_sql(name, connection, index=False, dtype={column: "TEXT" for column in frame.columns})
+                if full:
+                    connection.execute(f"DROP TABLE IF EXISTS {LOGS_TABLE}")
+                elif since is not None and self._has_table(connection, LOGS_TABLE):
+                    # The overlap re-exports entries already stored; replace them.
+                    # This also holds when sync_snapshot() fell back to a full
+                    # record export, since the logs were still exported from ``since``.
+                    connection.execute(f"DELETE FROM {LOGS_TABLE} WHERE timestamp >= ?", (since.strftime("%Y-%m-%d %H:%M"),))
+                if not logs.columns.empty:
+                    logs.to_sql(LOGS_TABLE, connection, index=False, if_exists="append")
+        finally:
+            connection.close()
+
+        return MirrorRefreshResult(
+            full=synced.full,
+            updated_records=synced.updated_records,
+            deleted_records=synced.deleted_records,
+            log_rows=len(logs.index),
+            watermark=synced.watermark,
+            tables=tables,
+            skipped=skipped,
+        )
+
+    @staticmethod
+    def _has_table(connection: sqlite3.Connection, name: str) -> bool:
+        return connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ).fetchone() is not None
+
+    def _columns(self, connection: sqlite3.Connection, table: str) -> List[str]:
+        return [row[1] for row in connection.execute(f"PRAGMA table_info({_quote(table)})")]
+
+    def table(self, name: str) -> pd.DataFrame:
+        """Return a mirrored table (``records``, ``metadata``, ``events``, ``dags``, ``users``, ``logs``, ...)."""
+        return self.sql(f"SELECT * FROM {_quote(name)} ORDER BY rowid")
+
+    def sql(self, query: str, params: Sequence[Any] = ()) -> pd.DataFrame:
+        """Run a read-only SQL query against the mirror and return the rows."""
+        connection = self.connect()
+        try:
+            return pd.read_sql_query(query, connection, params=list(params))
+        finally:
+            connection.close()
+
+    def query(
+        self,
+        filter_logic: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        records: Optional[Sequence[str]] = None,
+        events: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """Return mirrored record rows the way ``export_records()`` would, without calling REDCap.
+
+        ``filter_logic`` uses REDCap syntax (see ``translate_filter_logic``)
+        and is applied to each row. ``fields`` limits the columns, always
+        keeping the record ID and the event, repeat instrument and repeat
+        instance columns when the project has them.
+        """
+        connection = self.connect()
+        try:
+            if not self._has_table(connection, RECORDS_TABLE):
+                return pd.DataFrame()
+            available = self._columns(connection, RECORDS_TABLE)
+            record_id_field = self.snapshot.record_id_field or available[0]
+            clauses: List[str] = []
+            params: List[Any] = []
+            if filter_logic:
+                logic = translate_filter_logic(filter_logic, has_events="redcap_event_name" in available)
+                unknown = sorted(logic.columns - set(available))
+                if unknown:
+                    raise FilterLogicError(f"filterLogic refers to fields not in the mirror: {', '.join(unknown)}")
+                clauses.append(logic.sql)
+                params.extend(logic.params)
+            if records:
+                clauses.append(f"{_quote(record_id_field)} IN ({', '.join('?' for _ in records)})")
+                params.extend(str(record) for record in records)
+            if events and "redcap_event_name" in available:
+                clauses.append(f"redcap_event_name IN ({', '.join('?' for _ in events)})")
+                params.extend(events)
+
+            columns = available
+            if fields:
+                keep = [record_id_field, "redcap_event_name", "redcap_repeat_instrument", "redcap_repeat_instance"]
+                wanted = set(fields) | set(keep)
+                columns = [
+                    column for column in available
+                    if column in wanted or column.split("___")[0] in wanted
+                ]
+            select = ", ".join(_quote(column) for column in columns)
+            where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+            return pd.read_sql_query(
+                f"SELECT {select} FROM {RECORDS_TABLE}{where} ORDER BY rowid",
+                connection,
+                params=params,
+            )
+        finally:
+            connection.close()
@@ -1,28 +1,71 @@
+from __future__ import annotations
+
 from redcaplite import api
 from redcaplite.api.schemas import get_empty_csv_columns
+from .arrow import ArrowResult
+from .cache import MetadataCache
+from .batch import (
+    BatchImportResult,
+    chunk_sequence,
+    collect_import_results,
+    concat_frames,
+    map_bounded,
+    split_records,
+    unique_record_ids,
+)
+from .file_export import FileExportPlan, FileExportResult, FileTask, save_file_chunks
 from .http import Client
-from typing import List, Optional, Dict, Any, Union, Literal
-from datetime import datetime
-import pandas as pd
+from .log_export import LogWindow, build_log_export
+from .http.handler import DEFAULT_DOWNLOAD_CHUNK_SIZE, ProgressCallback, UploadSource, get_download_file_name
+from .metadata_ops.dtypes import build_record_dtypes
+from .api.utils import is_dataframe
+from .snapshot import SnapshotPlan, SnapshotSyncResult
+from .http.client import DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE
+from .http.events import RequestObserver
+from .http.retry import RateLimiter, RetryPolicy
+from typing import TYPE_CHECKING, BinaryIO, List, Optional, Dict, Any, Sequence, Union, Literal
+from datetime import datetime, timedelta, tzinfo
+from pathlib import Path
+import requests
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 RedcapDataType = List[Dict[str, Any]]
 
+# Exports read as text keep values exactly as REDCap sent them.
+_TEXT_READ_CSV_KWARGS = {"dtype": str, "keep_default_na": False}
+
 
-class RedcapClient(Client):
+class BaseRedcapClient:
     """
-    A client for interacting with the REDCap API.
+    The REDCap API endpoints shared by `RedcapClient` and `AsyncRedcapClient`.
+
+    Each method builds its payload with `redcaplite.api` and hands it to the
+    transport's `post()`, `text_api()` or file methods, so on the async
+    client it returns a coroutine. Subclasses provide the transport,
+    `_cached_export()`, `_structure_change()` and `_get_record_metadata()`.
     """
 
-    def __init__(self, url: str, token: str):
+    # Metadata used to infer record export dtypes, fetched on first use and
+    # dropped whenever this client imports new metadata.
+    _record_metadata: Optional[pd.DataFrame] = None
+
+    # Optional on-disk cache for project structure exports (metadata,
+    # instruments, events, arms, form-event mappings and field names).
+    metadata_cache: Optional[MetadataCache] = None
+
+    def clear_metadata_cache(self):
         """
-        Initialize the RedcapClient.
+        Forget cached project structure so the next export fetches it again.
 
-        Args:
-            url (str): The URL of the REDCap API.
-            token (str): The API token for authentication.
+        Called automatically by every method that changes metadata, arms,
+        events, form-event mappings or repeating instruments.
         """
-        super().__init__(url, token)
+        self._record_metadata = None
+        if self.metadata_cache is not None:
+            self.metadata_cache.invalidate(self.url, self.token)
 
     # arms
     def get_arms(
@@ -42,10 +85,14 @@ class RedcapClient(Client):
         Returns:
             The response from the API containing arm information.
         """
-        return self.post(
-            api.get_arms({"arms": arms, "format": format}),
-            output_file=output_file,
-            empty_columns=get_empty_csv_columns("get_arms"),
+        return self._cached_export(
+            "get_arms",
+            {"arms": arms, "format": format, "output_file": output_file},
+            lambda: self.post(
+                api.get_arms({"arms": arms, "format": format}),
+                output_file=output_file,
+                empty_columns=get_empty_csv_columns("get_arms"),
+            ),
         )
 
     def import_arms(
@@ -61,7 +108,7 @@ class RedcapClient(Client):
         Returns:
             The response from the API after importing arms.
         """
-        return self.post(api.import_arms({"data": data, "override": override}))
+        return self._structure_change(lambda: self.post(api.import_arms({"data": data, "override": override})))
 
     def delete_arms(self, arms: List[int]):
         """
@@ -73,7 +120,7 @@ class RedcapClient(Client):
         Returns:
             The response from the API after deleting arms.
         """
-        return self.post(api.delete_arms({"arms": arms}))
+        return self._structure_change(lambda: self.post(api.delete_arms({"arms": arms})))
 
     # dags
     def get_dags(
@@ -185,10 +232,14 @@ class RedcapClient(Client):
         Returns:
             The response from the API containing event information.
         """
-        return self.post(
-            api.get_events({"arms": arms, "format": format}),
-            output_file=output_file,
-            empty_columns=get_empty_csv_columns("get_events"),
+        return self._cached_export(
+            "get_events",
+            {"arms": arms, "format": format, "output_file": output_file},
+            lambda: self.post(
+                api.get_events({"arms": arms, "format": format}),
+                output_file=output_file,
+                empty_columns=get_empty_csv_columns("get_events"),
+            ),
         )
 
     def import_events(self, data: RedcapDataType):
@@ -201,7 +252,7 @@ class RedcapClient(Client):
         Returns:
             The response from the API after importing events.
         """
-        return self.post(api.import_events({"data": data}))
+        return self._structure_change(lambda: self.post(api.import_events({"data": data})))
 
     def delete_events(self, events: List[str]):
         """
@@ -213,7 +264,7 @@ class RedcapClient(Client):
         Returns:
             The response from the API after deleting events.
         """
-        return self.post(api.delete_events({"events": events}))
+        return self._structure_change(lambda: self.post(api.delete_events({"events": events})))
 
     # field_names
     def get_field_names(
@@ -233,10 +284,14 @@ class RedcapClient(Client):
         Returns:
             The response from the API containing field name information.
         """
-        return self.post(
-            api.get_field_names({"field": field, "format": format}),
-            output_file=output_file,
-            empty_columns=get_empty_csv_columns("get_field_names"),
+        return self._cached_export(
+            "get_field_names",
+            {"field": field, "format": format, "output_file": output_file},
+            lambda: self.post(
+                api.get_field_names({"field": field, "format": format}),
+                output_file=output_file,
+                empty_columns=get_empty_csv_columns("get_field_names"),
+            ),
         )
 
     # file
@@ -247,19 +302,27 @@ class RedcapClient(Client):
         event: Optional[str] = None,
         repeat_instance: Optional[int] = None,
         file_dictionary: str = "",
+        file_obj: Optional[BinaryIO] = None,
+        progress: Optional[ProgressCallback] = None,
+        chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
     ):
         """
         Download a file from a File Upload field.
 
+        The file is streamed to disk (or into `file_obj`) in `chunk_size` pieces rather than held in memory.
+
         Args:
             record (str): The record ID.
             field (str): The name of the field containing the file.
             event (Optional[str]): The unique event name.
             repeat_instance (Optional[int]): The repeat instance number.
             file_dictionary (str): The directory to save the file to.
+            file_obj (Optional[BinaryIO]): Writable binary file-like object (for example `io.BytesIO`) to stream the file into instead of saving it in `file_dictionary`.
+            progress (Optional[ProgressCallback]): Called after every chunk with the bytes written so far and the total size (None when unknown).
+            chunk_size (int): Number of bytes read from the response and written at a time.
 
         Returns:
-            The response from the API containing the file data.
+            The response from the API. Its body has already been consumed.
         """
         return self.file_download_api(
             api.get_file(
@@ -271,25 +334,30 @@ class RedcapClient(Client):
                 }
             ),
             file_dictionary=file_dictionary,
+            file_obj=file_obj,
+            progress=progress,
+            chunk_size=chunk_size,
         )
 
     def import_file(
         self,
-        file_path: str,
+        file_path: UploadSource,
         record: str,
         field: str,
         event: Optional[str] = None,
         repeat_instance: Optional[int] = None,
+        file_name: Optional[str] = None,
     ):
         """
         Upload a file to a File Upload field.
 
         Args:
-            file_path (str): The path to the file to upload.
+            file_path (UploadSource): The path to the file to upload, or its contents as `bytes` or an open binary file-like object.
             record (str): The record ID.
             field (str): The name of the field to upload the file to.
             event (Optional[str]): The unique event name.
             repeat_instance (Optional[int]): The repeat instance number.
+            file_name (Optional[str]): The file name stored in REDCap. Defaults to the name of the path or file object.
 
         Returns:
             The response from the API after uploading the file.
@@ -304,6 +372,7 @@ class RedcapClient(Client):
                     "repeat_instance": repeat_instance,
                 }
             ),
+            file_name=file_name,
         )
 
     def delete_file(
@@ -379,36 +448,53 @@ class RedcapClient(Client):
         """
         return self.post(api.list_file_repository({"folder_id": folder_id}))
 
-    def export_file_repository(self, doc_id: int, file_dictionary: str = ""):
+    def export_file_repository(
+        self,
+        doc_id: int,
+        file_dictionary: str = "",
+        file_obj: Optional[BinaryIO] = None,
+        progress: Optional[ProgressCallback] = None,
+        chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
+    ):
         """
         Export a file from the File Repository.
 
         Args:
             doc_id (int): The document ID of the file to export.
             file_dictionary (str): The directory to save the file to.
+            file_obj (Optional[BinaryIO]): Writable binary file-like object (for example `io.BytesIO`) to stream the file into instead of saving it in `file_dictionary`.
+            progress (Optional[ProgressCallback]): Called after every chunk with the bytes written so far and the total size (None when unknown).
+            chunk_size (int): Number of bytes read from the response and written at a time.
 
         Returns:
-            The response from the API containing the file data.
+            The response from the API. Its body has already been consumed.
         """
         return self.file_download_api(
             api.export_file_repository({"doc_id": doc_id}),
             file_dictionary=file_dictionary,
+            file_obj=file_obj,
+            progress=progress,
+            chunk_size=chunk_size,
         )
 
-    def import_file_repository(self, file_path: str,
-                               folder_id: Optional[int] = None):
+    def import_file_repository(self, file_path: UploadSource,
+                               folder_id: Optional[int] = None,
+                               file_name: Optional[str] = None):
         """
         Import a file into the File Repository.
 
         Args:
-            file_path (str): The path to the file to import.
+            file_path (UploadSource): The path to the file to import, or its contents as `bytes` or an open binary file-like object.
             folder_id (Optional[int]): The ID of the folder to import the file into.
+            file_name (Optional[str]): The file name stored in REDCap. Defaults to the name of the path or file object.
 
         Returns:
             The response from the API after importing the file.
         """
         return self.file_upload_api(
-            file_path, api.import_file_repository({"folder_id": folder_id})
+            file_path,
+            api.import_file_repository({"folder_id": folder_id}),
+            file_name=file_name,
         )
 
     def delete_file_repository(self, doc_id: int):
@@ -439,10 +525,14 @@ class RedcapClient(Client):
         Returns:
             The response from the API containing instrument information.
         """
-        return self.post(
-            api.get_instruments({"format": format}),
-            output_file=output_file,
-            empty_columns=get_empty_csv_columns("get_instruments"),
+        return self._cached_export(
+            "get_instruments",
+            {"format": format, "output_file": output_file},
+            lambda: self.post(
+                api.get_instruments({"format": format}),
+                output_file=output_file,
+                empty_columns=get_empty_csv_columns("get_instruments"),
+            ),
         )
 
     # pdf
@@ -455,6 +545,9 @@ class RedcapClient(Client):
         allRecords: Optional[bool] = None,
         compactDisplay: Optional[bool] = None,
         file_dictionary: str = "",
+        file_obj: Optional[BinaryIO] = None,
+        progress: Optional[ProgressCallback] = None,
+        chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
     ):
         """
         Export a PDF file of data collection instruments.
@@ -467,9 +560,12 @@ class RedcapClient(Client):
             allRecords (Optional[bool]): Whether to export all records.
             compactDisplay (Optional[bool]): Whether to use compact display.
             file_dictionary (str): The directory to save the PDF file to.
+            file_obj (Optional[BinaryIO]): Writable binary file-like object (for example `io.BytesIO`) to stream the file into instead of saving it in `file_dictionary`.
+            progress (Optional[ProgressCallback]): Called after every chunk with the bytes written so far and the total size (None when unknown).
+            chunk_size (int): Number of bytes read from the response and written at a time.
 
         Returns:
-            The response from the API containing the PDF file data.
+            The response from the API. Its body has already been consumed.
         """
         return self.file_download_api(
             api.export_pdf(
@@ -483,6 +579,9 @@ class RedcapClient(Client):
                 }
             ),
             file_dictionary=file_dictionary,
+            file_obj=file_obj,
+            progress=progress,
+            chunk_size=chunk_size,
         )
 
     # form_event_mapping
@@ -503,10 +602,14 @@ class RedcapClient(Client):
         Returns:
             The response from the API containing form-event mapping information.
         """
-        return self.post(
-            api.get_form_event_mappings({"arms": arms, "format": format}),
-            output_file=output_file,
-            empty_columns=get_empty_csv_columns("get_form_event_mappings"),
+        return self._cached_export(
+            "get_form_event_mappings",
+            {"arms": arms, "format": format, "output_file": output_file},
+            lambda: self.post(
+                api.get_form_event_mappings({"arms": arms, "format": format}),
+                output_file=output_file,
+                empty_columns=get_empty_csv_columns("get_form_event_mappings"),
+            ),
         )
 
     def import_form_event_mappings(self, data: RedcapDataType):
@@ -519,7 +622,7 @@ class RedcapClient(Client):
         Returns:
             The response from the API after importing form-event mappings.
         """
-        return self.post(api.import_form_event_mappings({"data": data}))
+        return self._structure_change(lambda: self.post(api.import_form_event_mappings({"data": data})))
 
     # log
     def get_logs(
@@ -545,6 +648,9 @@ class RedcapClient(Client):
         endTime: Optional[datetime] = None,
         pd_read_csv_kwargs: Optional[Dict[str, Any]] = {},
         output_file: Optional[str] = None,
+        chunksize: Optional[int] = None,
+        arrow: Optional[ArrowResult] = None,
+        arrow_convert_options: Optional[Dict[str, Any]] = None,
     ):
         """
         Export logs from the project.
@@ -559,9 +665,14 @@ class RedcapClient(Client):
             endTime (Optional[datetime]): Filter logs by end time.
             pd_read_csv_kwargs (Optional[Dict[str, Any]]): Additional keyword arguments to pass to pandas' `read_csv` function when format is 'csv'. Defaults to {}.
             output_file (Optional[str]): Path to save the raw API response.
+            chunksize (Optional[int]): Stream the CSV response and yield DataFrames of at most this many rows instead of parsing it all at once. Requires format="csv".
+            arrow (Optional[Literal["table", "pandas"]]): Parse the CSV bytes with pyarrow's multithreaded reader and return a `pyarrow.Table` ("table") or an Arrow-backed DataFrame ("pandas") instead of using `pandas.read_csv`. An `output_file` ending in `.parquet` or `.feather` is then written from the parsed table; any other name gets the raw CSV bytes. Requires format="csv" and the `arrow` extra.
+            arrow_convert_options (Optional[Dict[str, Any]]): Keyword arguments for `pyarrow.csv.ConvertOptions`, such as `column_types`, when `arrow` is set.
 
         Returns:
             The response from the API containing the log data.
+            When `chunksize` is set, an iterator of DataFrame chunks.
+            When `arrow` is set, a `pyarrow.Table` or Arrow-backed DataFrame.
         """
         return self.post(
             api.get_logs(
@@ -577,6 +688,9 @@ class RedcapClient(Client):
             ),
             pd_read_csv_kwargs=pd_read_csv_kwargs,
             output_file=output_file,
+            chunksize=chunksize,
+            arrow=arrow,
+            arrow_convert_options=arrow_convert_options,
         )
 
     # metadata
@@ -617,11 +731,21 @@ class RedcapClient(Client):
             read_csv_kwargs['dtype'] = {**default_dtypes, **user_dtypes}
         read_csv_kwargs['keep_default_na'] = read_csv_kwargs.get('keep_default_na', False)
 
-        return self.post(
-            api.get_metadata(
-                {"fields": fields, "forms": forms, "format": format}),
-            pd_read_csv_kwargs=read_csv_kwargs,
-            output_file=output_file,
+        return self._cached_export(
+            "get_metadata",
+            {
+                "fields": fields,
+                "forms": forms,
+                "format": format,
+                "pd_read_csv_kwargs": read_csv_kwargs,
+                "output_file": output_file,
+            },
+            lambda: self.post(
+                api.get_metadata(
+                    {"fields": fields, "forms": forms, "format": format}),
+                pd_read_csv_kwargs=read_csv_kwargs,
+                output_file=output_file,
+            ),
         )
 
     def import_metadata(
@@ -639,7 +763,7 @@ class RedcapClient(Client):
         Returns:
             The response from the API after importing the metadata.
         """
-        return self.post(api.import_metadata({"data": data, "format": format}))
+        return self._structure_change(lambda: self.post(api.import_metadata({"data": data, "format": format})))
 
     # project
     def create_project(self, data: RedcapDataType):
@@ -752,6 +876,10 @@ class RedcapClient(Client):
         exportBlankForGrayFormStatus: Optional[bool] = None,
         pd_read_csv_kwargs: Optional[Dict[str, Any]] = {},
         output_file: Optional[str] = None,
+        chunksize: Optional[int] = None,
+        infer_dtypes: bool = False,
+        arrow: Optional[ArrowResult] = None,
+        arrow_convert_options: Optional[Dict[str, Any]] = None,
     ):
         """
         Export records from the project.
@@ -775,10 +903,27 @@ class RedcapClient(Client):
             exportBlankForGrayFormStatus (Optional[bool]): Whether to export blank for gray form status.
             pd_read_csv_kwargs (Optional[Dict[str, Any]]): Additional keyword arguments to pass to pandas' `read_csv` function when format is 'csv'. Defaults to {}.
             output_file (Optional[str]): Path to save the raw API response.
+            chunksize (Optional[int]): Stream the CSV response and yield DataFrames of at most this many rows instead of parsing it all at once. Requires format="csv".
+            infer_dtypes (bool): Build exact CSV dtypes from the project metadata: categoricals for choice fields, nullable numbers for validated text, calc and slider fields, datetimes for date fields, and strings for the record ID and free text. User-supplied `dtype` entries take precedence.
+            arrow (Optional[Literal["table", "pandas"]]): Parse the CSV bytes with pyarrow's multithreaded reader and return a `pyarrow.Table` ("table") or an Arrow-backed DataFrame ("pandas") instead of using `pandas.read_csv`. An `output_file` ending in `.parquet` or `.feather` is then written from the parsed table; any other name gets the raw CSV bytes. Requires format="csv" and the `arrow` extra.
+            arrow_convert_options (Optional[Dict[str, Any]]): Keyword arguments for `pyarrow.csv.ConvertOptions`, such as `column_types`, when `arrow` is set.
 
         Returns:
             The response from the API containing the exported records.
-        """
+            When `chunksize` is set, an iterator of DataFrame chunks.
+            When `arrow` is set, a `pyarrow.Table` or Arrow-backed DataFrame.
+        """
+        if infer_dtypes and arrow is not None:
+            raise ValueError("infer_dtypes builds pandas dtypes and cannot be combined with arrow.")
+        if infer_dtypes:
+            pd_read_csv_kwargs = self._infer_record_read_csv_kwargs(
+                pd_read_csv_kwargs,
+                fields=fields,
+                forms=forms,
+                rawOrLabel=rawOrLabel,
+                rawOrLabelHeaders=rawOrLabelHeaders,
+                decimalCharacter=decimalCharacter,
+            )
         return self.post(
             api.export_records(
                 {
@@ -802,7 +947,50 @@ class RedcapClient(Client):
             ),
             pd_read_csv_kwargs=pd_read_csv_kwargs,
             output_file=output_file,
+            chunksize=chunksize,
+            arrow=arrow,
+            arrow_convert_options=arrow_convert_options,
+        )
+
+    def _infer_record_read_csv_kwargs(
+        self,
+        pd_read_csv_kwargs: Optional[Dict[str, Any]],
+        fields: List[str],
+        forms: List[str],
+        rawOrLabel: str,
+        rawOrLabelHeaders: Optional[str],
+        decimalCharacter: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Merge metadata-derived dtypes into the caller's `read_csv` keyword arguments.
+
+        A `decimalCharacter` other than "." is passed on as `decimal`. pandas
+        only applies it when it infers floats itself, not when converting to
+        the nullable `Float64` dtype, so decimal fields are then left to its
+        inference and come back as `float64`.
+        """
+        read_csv_kwargs = dict(pd_read_csv_kwargs or {})
+        if rawOrLabelHeaders == "label":
+            # Column headers are field labels, which the metadata cannot map.
+            return read_csv_kwargs
+
+        dtypes, parse_dates = build_record_dtypes(
+            self._get_record_metadata(),
+            raw=rawOrLabel == "raw",
+            fields=fields,
+            forms=forms,
+        )
+        if decimalCharacter and decimalCharacter != ".":
+            read_csv_kwargs.setdefault("decimal", decimalCharacter)
+            dtypes = {column: dtype for column, dtype in dtypes.items() if dtype != "Float64"}
+        user_dtypes = read_csv_kwargs.get("dtype", {})
+        if not isinstance(user_dtypes, dict):
+            return read_csv_kwargs
+        read_csv_kwargs["dtype"] = {**dtypes, **user_dtypes}
+        read_csv_kwargs.setdefault(
+            "parse_dates",
+            [column for column in parse_dates if column not in user_dtypes],
         )
+        return read_csv_kwargs
 
     def import_records(
         self,
@@ -956,7 +1144,7 @@ class RedcapClient(Client):
         Returns:
             The response from the API after importing repeating forms events.
         """
-        return self.post(api.import_repeating_forms_events({"data": data}))
+        return self._structure_change(lambda: self.post(api.import_repeating_forms_events({"data": data})))
 
     # report
     def get_report(
@@ -970,6 +1158,9 @@ class RedcapClient(Client):
         decimalCharacter: Optional[str] = None,
         pd_read_csv_kwargs: Optional[Dict[str, Any]] = {},
         output_file: Optional[str] = None,
+        chunksize: Optional[int] = None,
+        arrow: Optional[ArrowResult] = None,
+        arrow_convert_options: Optional[Dict[str, Any]] = None,
     ):
         """
         Retrieve a report from REDCap.
@@ -984,9 +1175,14 @@ class RedcapClient(Client):
             decimalCharacter (Optional[str], optional): The decimal character for numeric data. Defaults to None.
             pd_read_csv_kwargs (Optional[Dict[str, Any]]): Additional keyword arguments to pass to pandas' `read_csv` function when format is 'csv'. Defaults to {}.
             output_file (Optional[str]): Path to save the raw API response.
+            chunksize (Optional[int]): Stream the CSV response and yield DataFrames of at most this many rows instead of parsing it all at once. Requires format="csv".
+            arrow (Optional[Literal["table", "pandas"]]): Parse the CSV bytes with pyarrow's multithreaded reader and return a `pyarrow.Table` ("table") or an Arrow-backed DataFrame ("pandas") instead of using `pandas.read_csv`. An `output_file` ending in `.parquet` or `.feather` is then written from the parsed table; any other name gets the raw CSV bytes. Requires format="csv" and the `arrow` extra.
+            arrow_convert_options (Optional[Dict[str, Any]]): Keyword arguments for `pyarrow.csv.ConvertOptions`, such as `column_types`, when `arrow` is set.
 
         Returns:
             The report data in the specified format.
+            When `chunksize` is set, an iterator of DataFrame chunks.
+            When `arrow` is set, a `pyarrow.Table` or Arrow-backed DataFrame.
         """
         return self.post(
             api.get_report(
@@ -1002,6 +1198,9 @@ class RedcapClient(Client):
             ),
             pd_read_csv_kwargs=pd_read_csv_kwargs,
             output_file=output_file,
+            chunksize=chunksize,
+            arrow=arrow,
+            arrow_convert_options=arrow_convert_options,
         )
 
     # version
@@ -1265,3 +1464,463 @@ class RedcapClient(Client):
             str: A message indicating the number of user-role assignments added or updated.
         """
         return self.post(api.import_user_role_mappings({"data": data}))
+
+
+class RedcapClient(BaseRedcapClient, Client):
+    """
+    A client for interacting with the REDCap API.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        token: str,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        metadata_cache: Optional[MetadataCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        request_observers: Optional[Sequence[RequestObserver]] = None,
+        session: Optional[requests.Session] = None,
+    ):
+        """
+        Initialize the RedcapClient.
+
+        Args:
+            url (str): The URL of the REDCap API.
+            token (str): The API token for authentication.
+            pool_connections (int): Number of per-host connection pools to keep alive.
+            pool_maxsize (int): Maximum number of connections kept open to a single host.
+            pool_block (bool): Whether to wait for a free pooled connection once `pool_maxsize` is reached instead of opening a throwaway one.
+            keep_alive (bool): Whether to reuse connections between requests.
+            metadata_cache (Optional[MetadataCache]): On-disk cache for metadata, instruments, events, arms, form-event mappings and field names. Disabled when None.
+            retry_policy (Optional[RetryPolicy]): When and how to retry transient failures (429 and 5xx responses, dropped connections). Requests fail immediately when None.
+            rate_limiter (Optional[RateLimiter]): Token bucket shared by every request, for example across clients and threads using the same API token.
+            request_observers (Optional[Sequence[RequestObserver]]): Callables receiving a `RequestEvent` (content, action, sizes, status and timings) after every request.
+            session (Optional[requests.Session]): Existing session to send requests through, for example one shared by every client of the same host. The pool options are ignored and `close()` leaves it open.
+        """
+        super().__init__(
+            url,
+            token,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            keep_alive=keep_alive,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            request_observers=request_observers,
+            session=session,
+        )
+        self.metadata_cache = metadata_cache
+
+    def _cached_export(self, name: str, params: Dict[str, Any], fetch):
+        """Return ``fetch()`` through the metadata cache when it is enabled.
+
+        Exports that write the raw response to ``output_file`` always go to
+        the server so the file is actually produced.
+        """
+        if self.metadata_cache is None or params.get("output_file") is not None:
+            return fetch()
+        key = (name, sorted(params.items()))
+        cached = self.metadata_cache.get(self.url, self.token, key)
+        if cached is not None:
+            return cached
+        value = fetch()
+        self.metadata_cache.set(self.url, self.token, key, value)
+        return value
+
+    def _structure_change(self, send):
+        """Return ``send()``, dropping cached project structure before and after it.
+
+        Clearing again once the request has finished, even when it failed,
+        means an export made while it was in flight, or a partially applied
+        change, is never served from the cache.
+        """
+        self.clear_metadata_cache()
+        try:
+            return send()
+        finally:
+            self.clear_metadata_cache()
+
+    def _get_record_metadata(self) -> pd.DataFrame:
+        """Return the project metadata used for dtype inference, fetching it once."""
+        if self._record_metadata is None:
+            self._record_metadata = self.get_metadata(format="csv")
+        return self._record_metadata
+
+    def export_records_chunked(
+        self,
+        chunk_size: int = 1000,
+        max_workers: int = 4,
+        record_id_field: Optional[str] = None,
+        iterate: bool = False,
+        records: List[str] = [],
+        fields: List[str] = [],
+        forms: List[str] = [],
+        events: List[str] = [],
+        rawOrLabel: Literal["raw", "label"] = "raw",
+        rawOrLabelHeaders: Optional[Literal["raw", "label"]] = None,
+        exportCheckboxLabel: Optional[bool] = None,
+        exportSurveyFields: Optional[bool] = None,
+        exportDataAccessGroups: Optional[bool] = None,
+        filterLogic: Optional[str] = None,
+        dateRangeBegin: Optional[datetime] = None,
+        dateRangeEnd: Optional[datetime] = None,
+        csvDelimiter: Optional[str] = None,
+        decimalCharacter: Optional[str] = None,
+        exportBlankForGrayFormStatus: Optional[bool] = None,
+        pd_read_csv_kwargs: Optional[Dict[str, Any]] = {},
+        infer_dtypes: bool = False,
+    ):
+        """
+        Export records as CSV in record ID batches fetched concurrently.
+
+        The record ID list is exported first (only the record ID field, with the
+        same filters), split into batches of `chunk_size` IDs, and each batch is
+        exported on a pool of `max_workers` threads sharing this client's
+        connection pool. All rows of a record always land in the same batch.
+
+        Args:
+            chunk_size (int): Number of record IDs per batch request.
+            max_workers (int): Maximum number of batch requests in flight.
+            record_id_field (Optional[str]): The project's record ID field. Looked up with `get_field_names()` when omitted.
+            iterate (bool): Yield one DataFrame per batch instead of returning a single concatenated DataFrame.
+            records (List[str]): Specific records to export. Skips the record ID lookup when provided.
+            fields (List[str]): Specific fields to export.
+            forms (List[str]): Specific forms to export.
+            events (List[str]): Specific events to export.
+            rawOrLabel (Literal["raw", "label"]): Export raw or label values.
+            rawOrLabelHeaders (Optional[Literal["raw", "label"]]): Export raw or label headers.
+            exportCheckboxLabel (Optional[bool]): Whether to export checkbox labels.
+            exportSurveyFields (Optional[bool]): Whether to export survey fields.
+            exportDataAccessGroups (Optional[bool]): Whether to export Data Access Groups.
+            filterLogic (Optional[str]): Logic to filter the data.
+            dateRangeBegin (Optional[datetime]): Start date for filtering.
+            dateRangeEnd (Optional[datetime]): End date for filtering.
+            csvDelimiter (Optional[str]): Delimiter for CSV export.
+            decimalCharacter (Optional[str]): Decimal character for number fields.
+            exportBlankForGrayFormStatus (Optional[bool]): Whether to export blank for gray form status.
+            pd_read_csv_kwargs (Optional[Dict[str, Any]]): Additional keyword arguments to pass to pandas' `read_csv` function for every batch. Defaults to {}.
+            infer_dtypes (bool): Parse every batch with the metadata-derived dtypes described in `export_records()`, so all batches share the same column types.
+
+        Returns:
+            A single DataFrame with all batches in record ID order, or an iterator of per-batch DataFrames when `iterate` is True.
+        """
+        export_kwargs = {
+            "format": "csv",
+            "fields": fields,
+            "forms": forms,
+            "events": events,
+            "rawOrLabel": rawOrLabel,
+            "rawOrLabelHeaders": rawOrLabelHeaders,
+            "exportCheckboxLabel": exportCheckboxLabel,
+            "exportSurveyFields": exportSurveyFields,
+            "exportDataAccessGroups": exportDataAccessGroups,
+            "filterLogic": filterLogic,
+            "dateRangeBegin": dateRangeBegin,
+            "dateRangeEnd": dateRangeEnd,
+            "csvDelimiter": csvDelimiter,
+            "decimalCharacter": decimalCharacter,
+            "exportBlankForGrayFormStatus": exportBlankForGrayFormStatus,
+            "pd_read_csv_kwargs": pd_read_csv_kwargs,
+            "infer_dtypes": infer_dtypes,
+        }
+        if infer_dtypes:
+            # Fetch the metadata once up front instead of racing in every worker.
+            self._get_record_metadata()
+        record_ids = list(records) or self._export_record_ids(
+            record_id_field,
+            events=events,
+            filterLogic=filterLogic,
+            dateRangeBegin=dateRangeBegin,
+            dateRangeEnd=dateRangeEnd,
+        )
+        chunks = map_bounded(
+            lambda batch: self.export_records(records=batch, **export_kwargs),
+            chunk_sequence(record_ids, chunk_size),
+            max_workers,
+        )
+        if iterate:
+            return (chunk for chunk in chunks if is_dataframe(chunk))
+        return concat_frames(chunks)
+
+    def _export_record_ids(
+        self,
+        record_id_field: Optional[str] = None,
+        events: List[str] = [],
+        filterLogic: Optional[str] = None,
+        dateRangeBegin: Optional[datetime] = None,
+        dateRangeEnd: Optional[datetime] = None,
+    ) -> List[str]:
+        """Return the distinct record IDs matching the given filters, in export order."""
+        if record_id_field is None:
+            record_id_field = self.get_field_names(format="json")[0]["original_field_name"]
+        ids = self.export_records(
+            format="csv",
+            fields=[record_id_field],
+            events=events,
+            filterLogic=filterLogic,
+            dateRangeBegin=dateRangeBegin,
+            dateRangeEnd=dateRangeEnd,
+            pd_read_csv_kwargs=dict(_TEXT_READ_CSV_KWARGS),
+        )
+        return unique_record_ids(ids, record_id_field)
+
+    def import_records_batched(
+        self,
+        data: Union[pd.DataFrame, List[Dict[str, Any]]],
+        batch_size: int = 500,
+        max_workers: int = 4,
+        record_id_field: Optional[str] = None,
+        format: Literal["json", "csv"] = "csv",
+        returnContent: Literal["count", "ids", "auto_ids"] = "ids",
+        overwriteBehavior: Literal["normal", "overwrite"] = "normal",
+        forceAutoNumber: bool = False,
+        backgroundProcess: Optional[bool] = None,
+        dateFormat: Optional[Literal["MDY", "DMY", "YMD"]] = None,
+        csvDelimiter: Optional[str] = None,
+    ) -> BatchImportResult:
+        """
+        Import records in record ID batches posted concurrently.
+
+        Rows are grouped by record ID so all events and repeat instances of a
+        record are imported together. A failing batch is recorded in the result
+        instead of aborting the remaining batches. Rows with a missing or blank
+        record ID raise `ValueError` before any batch is sent.
+
+        Args:
+            data (Union[pd.DataFrame, List[Dict[str, Any]]]): The records to import.
+            batch_size (int): Maximum number of records per batch request.
+            max_workers (int): Maximum number of batch requests in flight.
+            record_id_field (Optional[str]): Column holding the record ID. Defaults to the first column.
+            format (Literal["json", "csv"]): The format of the imported data.
+            returnContent (Literal["count", "ids", "auto_ids"]): Type of content to return.
+            overwriteBehavior (Literal["normal", "overwrite"]): How to handle existing records.
+            forceAutoNumber (bool): Whether to force auto-numbering of record IDs.
+            backgroundProcess (Optional[bool]): Whether to run as a background process.
+            dateFormat (Optional[Literal["MDY", "DMY", "YMD"]]): The date format used in the data.
+            csvDelimiter (Optional[str]): Delimiter for CSV import.
+
+        Returns:
+            BatchImportResult: The merged `count` and `ids` of all successful batches, plus one `errors` entry (batch number, record IDs and message) per failed batch.
+        """
+        def import_batch(numbered_batch):
+            batch_number, (record_ids, rows) = numbered_batch
+            try:
+                return batch_number, record_ids, self.import_records(
+                    rows,
+                    format=format,
+                    returnContent=returnContent,
+                    overwriteBehavior=overwriteBehavior,
+                    forceAutoNumber=forceAutoNumber,
+                    backgroundProcess=backgroundProcess,
+                    dateFormat=dateFormat,
+                    csvDelimiter=csvDelimiter,
+                ), None
+            except Exception as exc:
+                return batch_number, record_ids, None, exc
+
+        batches = enumerate(split_records(data, batch_size, record_id_field))
+        return collect_import_results(map_bounded(import_batch, batches, max_workers))
+
+    def export_files(
+        self,
+        fields: Union[str, List[str]],
+        directory: Union[str, Path],
+        records: List[str] = [],
+        events: List[str] = [],
+        record_id_field: Optional[str] = None,
+        max_workers: int = 4,
+        manifest: Optional[Union[str, Path]] = None,
+        chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
+    ) -> FileExportResult:
+        """
+        Download every file stored in one or more File Upload fields.
+
+        A single record export finds the records, events and repeat instances
+        that actually hold a file, then the files are streamed to disk on a
+        bounded pool of `max_workers` threads. Each file is saved under
+        `<directory>/<record>/[<event>/]<field>[_<instance>]/` with the name
+        REDCap reports. Finished files are appended to a resume manifest, so
+        running the same call again skips them.
+
+        Args:
+            fields (Union[str, List[str]]): The File Upload field or fields to download.
+            directory (Union[str, Path]): The directory to save the files to.
+            records (List[str]): Specific records to download files for. Defaults to all records.
+            events (List[str]): Specific events to download files for. Defaults to all events.
+            record_id_field (Optional[str]): The project's record ID field. Looked up with `get_field_names()` when omitted.
+            max_workers (int): Maximum number of downloads in flight.
+            manifest (Optional[Union[str, Path]]): Path of the JSON Lines resume manifest. Defaults to `.redcaplite-files.jsonl` in `directory`.
+            chunk_size (int): Number of bytes read from the response and written to disk at a time.
+
+        Returns:
+            FileExportResult: The manifest entries of downloaded files, the number of files skipped because an earlier run finished them, and one `errors` entry per failed file.
+        """
+        fields = [fields] if isinstance(fields, str) else list(fields)
+        if record_id_field is None:
+            record_id_field = self.get_field_names(format="json")[0]["original_field_name"]
+        export = self.export_records(
+            format="csv",
+            records=records,
+            events=events,
+            fields=[record_id_field, *fields],
+            pd_read_csv_kwargs=dict(_TEXT_READ_CSV_KWARGS),
+        )
+        plan = FileExportPlan(export, fields, record_id_field, directory, manifest)
+
+        def download(task: FileTask):
+            try:
+                path, size = self._download_file_task(task, directory, chunk_size)
+            except Exception as exc:
+                return task, None, exc
+            return task, plan.finish(task, path, size), None
+
+        for task, entry, error in map_bounded(download, plan.pending, max_workers):
+            plan.record(task, entry, error)
+        return plan.result
+
+    def _download_file_task(self, task: FileTask, directory: Union[str, Path], chunk_size: int):
+        """Stream one File Upload value into its directory and return ``(path, size)``."""
+        response = self.file_stream_api(
+            api.get_file(
+                {
+                    "record": task.record,
+                    "field": task.field,
+                    "event": task.event,
+                    "repeat_instance": task.repeat_instance,
+                }
+            )
+        )
+        try:
+            return save_file_chunks(
+                response.iter_content(chunk_size=chunk_size),
+                task.target_dir(directory),
+                get_download_file_name(response, default=f"{task.field}.raw"),
+            )
+        finally:
+            response.close()
+
+    def export_logs_windowed(
+        self,
+        beginTime: datetime,
+        endTime: Optional[datetime] = None,
+        logtype: Optional[str] = None,
+        user: Optional[str] = None,
+        record: Optional[str] = None,
+        dag: Optional[str] = None,
+        window: timedelta = timedelta(hours=1),
+        min_window: timedelta = timedelta(minutes=1),
+        max_window: timedelta = timedelta(days=7),
+        target_rows: int = 50_000,
+        target_seconds: float = 30.0,
+        max_workers: int = 4,
+        output_file: Optional[Union[str, Path]] = None,
+        checkpoint: Optional[Union[str, Path]] = None,
+    ):
+        """
+        Export a long range of logs as consecutive time windows fetched concurrently.
+
+        The range is split into whole-minute windows passed to `get_logs()` as
+        `beginTime`/`endTime`. Each window's size adapts to the last responses:
+        windows that returned more than `target_rows` rows or took longer than
+        `target_seconds` make the next ones smaller, and small, quick ones make
+        them larger. A window that times out or fails with a 5xx status is
+        split in half and retried. Up to `max_workers` windows are fetched at
+        once, but rows are always delivered oldest first.
+
+        Args:
+            beginTime (datetime): Start of the range.
+            endTime (Optional[datetime]): End of the range, inclusive. Defaults to the end saved in `checkpoint`, or now.
+            logtype (Optional[str]): The type of log to export, as in `get_logs()`.
+            user (Optional[str]): Filter logs by username.
+            record (Optional[str]): Filter logs by record ID.
+            dag (Optional[str]): Filter logs by Data Access Group.
+            window (timedelta): Length of the first windows.
+            min_window (timedelta): Shortest window to use. At least one minute.
+            max_window (timedelta): Longest window to use.
+            target_rows (int): Rows per response to aim for.
+            target_seconds (float): Seconds per response to aim for.
+            max_workers (int): Maximum number of windows in flight.
+            output_file (Optional[Union[str, Path]]): Append every window's rows to this CSV file instead of yielding them.
+            checkpoint (Optional[Union[str, Path]]): JSON file recording the last delivered window. Running the same export again with it resumes after that window.
+
+        Returns:
+            An iterator of DataFrames (one per non-empty window, read as text), or a `LogExportResult` with the window and row counts when `output_file` is set.
+        """
+        export = build_log_export(
+            beginTime,
+            endTime,
+            {"logtype": logtype, "user": user, "record": record, "dag": dag},
+            window=window,
+            min_window=min_window,
+            max_window=max_window,
+            target_rows=target_rows,
+            target_seconds=target_seconds,
+            output_file=output_file,
+            checkpoint=checkpoint,
+        )
+
+        def fetch(log_window: LogWindow):
+            return self.get_logs(
+                format="csv",
+                logtype=logtype,
+                user=user,
+                record=record,
+                dag=dag,
+                beginTime=log_window.begin,
+                endTime=log_window.end,
+                pd_read_csv_kwargs=dict(_TEXT_READ_CSV_KWARGS),
+            )
+
+        chunks = export.run(fetch, max_workers)
+        if output_file is None:
+            return chunks
+        for _ in chunks:
+            pass
+        return export.result
+
+    def sync_snapshot(
+        self,
+        path: Union[str, Path],
+        full: bool = False,
+        overlap: timedelta = timedelta(minutes=5),
+        server_timezone: Union[str, tzinfo, None] = None,
+    ) -> SnapshotSyncResult:
+        """
+        Bring a local SQLite snapshot of the project's records up to date.
+
+        The first run (or `full=True`) exports every record. Later runs only
+        export records created or modified since the previous run's start
+        time on the server's clock, via `dateRangeBegin`, and remove records
+        named in the `record_delete` logs for the same window.
+
+        Args:
+            path (Union[str, Path]): The SQLite file holding the snapshot. Created when missing.
+            full (bool): Re-export every record and replace the snapshot's contents.
+            overlap (timedelta): How far before the stored watermark to start the next window, to absorb clock drift and writes still in flight when the last run started.
+            server_timezone (Union[str, tzinfo, None]): The REDCap server's timezone, as an IANA name such as "America/Chicago" or a tzinfo. REDCap filters on its own local time, so the watermark is taken on that clock. Defaults to this machine's local time.
+
+        Returns:
+            SnapshotSyncResult: Whether a full export ran, how many records were updated and deleted, and the new watermark.
+        """
+        plan = SnapshotPlan.start(path, full, overlap, server_timezone)
+        records = self.export_records(
+            format="csv",
+            dateRangeBegin=plan.since,
+            pd_read_csv_kwargs=dict(_TEXT_READ_CSV_KWARGS),
+        )
+        if plan.needs_full_export(records):
+            return self.sync_snapshot(path, full=True, overlap=overlap, server_timezone=server_timezone)
+
+        delete_logs = None
+        if not plan.full:
+            delete_logs = self.get_logs(
+                format="csv",
+                logtype="record_delete",
+                beginTime=plan.since,
+                pd_read_csv_kwargs=dict(_TEXT_READ_CSV_KWARGS),
+            )
+        return plan.apply(records, delete_logs)
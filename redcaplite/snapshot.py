@@ -0,0 +1,283 @@
+"""Local SQLite snapshots of a project's records, kept current incrementally."""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timedelta, tzinfo
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Union
+
+from .api.utils import is_dataframe
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+RECORDS_TABLE = "records"
+STATE_TABLE = "sync_state"
+WATERMARK_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Matches the ``action`` REDCap writes for record deletions, e.g.
+# "Delete record 1001" or "Deleted Record (API) 1001".
+_DELETE_ACTION = re.compile(r"delete[d]?\s+record\s*(?:\([^)]*\))?\s+(.+)$", re.IGNORECASE)
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def server_now(server_timezone: Union[str, tzinfo, None] = None) -> datetime:
+    """Return the current time as a naive timestamp on the REDCap server's clock.
+
+    REDCap compares ``dateRangeBegin`` and ``beginTime`` with its own local
+    time, so watermarks are kept in that zone. ``server_timezone`` is an IANA
+    name such as ``"America/Chicago"`` or a ``tzinfo``; ``None`` uses this
+    machine's local time, which is only right when both share a timezone.
+    """
+    if server_timezone is None:
+        return datetime.now().replace(microsecond=0)
+    if isinstance(server_timezone, str):
+        from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+        try:
+            server_timezone = ZoneInfo(server_timezone)
+        except (ZoneInfoNotFoundError, ValueError) as exc:
+            raise ValueError(f"Unknown server timezone: {server_timezone!r}") from exc
+    return datetime.now(server_timezone).replace(tzinfo=None, microsecond=0)
+
+
+@dataclass
+class SnapshotSyncResult:
+    """Outcome of one snapshot sync run."""
+
+    full: bool
+    updated_records: int
+    deleted_records: int
+    watermark: datetime
+
+
+def deleted_record_ids(logs: Any) -> List[str]:
+    """Return the record IDs named by a ``get_logs(logtype="record_delete")`` export."""
+    if not is_dataframe(logs) or logs.empty:
+        return []
+    if "record" in logs.columns:
+        values = logs["record"]
+    elif "action" in logs.columns:
+        values = logs["action"].astype(str).str.strip().str.extract(_DELETE_ACTION, expand=False)
+    else:
+        return []
+    ids = [str(value).strip() for value in values.dropna()]
+    return list(dict.fromkeys(value for value in ids if value))
+
+
+class RecordSnapshot:
+    """A SQLite file holding a flat record export plus its sync watermark.
+
+    Every value is stored as TEXT exactly as REDCap exported it, so the
+    snapshot never has to guess dtypes and new fields only need an
+    ``ALTER TABLE ... ADD COLUMN``.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {STATE_TABLE} (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        return connection
+
+    def _get_state(self, key: str) -> Optional[str]:
+        if not self.path.exists():
+            return None
+        connection = self._connect()
+        try:
+            row = connection.execute(f"SELECT value FROM {STATE_TABLE} WHERE key = ?", (key,)).fetchone()
+        finally:
+            connection.close()
+        return row[0] if row else None
+
+    @property
+    def watermark(self) -> Optional[datetime]:
+        """Return the start time of the last successful sync, if any."""
+        value = self._get_state("watermark")
+        return datetime.strptime(value, WATERMARK_FORMAT) if value else None
+
+    @property
+    def record_id_field(self) -> Optional[str]:
+        """Return the record ID column the snapshot is keyed on, if any."""
+        return self._get_state("record_id_field")
+
+    def read(self) -> pd.DataFrame:
+        """Return every stored row as a DataFrame of strings, in export order."""
+        import pandas as pd
+
+        if not self.path.exists():
+            return pd.DataFrame()
+        connection = self._connect()
+        try:
+            exists = connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (RECORDS_TABLE,)
+            ).fetchone()
+            if not exists:
+                return pd.DataFrame()
+            return pd.read_sql_query(f"SELECT * FROM {RECORDS_TABLE} ORDER BY rowid", connection)
+        finally:
+            connection.close()
+
+    def apply(
+        self,
+        records: pd.DataFrame,
+        deleted_ids: Iterable[str],
+        watermark: datetime,
+        full: bool = False,
+        record_id_field: Optional[str] = None,
+    ) -> SnapshotSyncResult:
+        """Merge one export into the snapshot in a single transaction.
+
+        With ``full`` the stored rows are replaced by ``records``. Otherwise
+        ``deleted_ids`` are removed first and then every row of each record
+        in ``records`` replaces the stored rows for that record, so events
+        and repeat instances removed upstream disappear as well.
+        """
+        if record_id_field is None:
+            if records.columns.empty:
+                record_id_field = self.record_id_field
+            else:
+                record_id_field = str(records.columns[0])
+        deleted = [str(record_id) for record_id in deleted_ids]
+        record_ids = (
+            list(dict.fromkeys(records[record_id_field].astype(str)))
+            if record_id_field is not None and record_id_field in records.columns
+            else []
+        )
+
+        connection = self._connect()
+        try:
+            with connection:
+                if full:
+                    connection.execute(f"DROP TABLE IF EXISTS {RECORDS_TABLE}")
+                columns = self._ensure_columns(connection, records.columns, record_id_field)
+                if columns and record_id_field is not None:
+                    id_column = _quote(record_id_field)
+                    removed = [(record_id,) for record_id in deleted + record_ids]
+                    connection.executemany(
+                        f"DELETE FROM {RECORDS_TABLE} WHERE {id_column} = ?", removed
+                    )
+                if not records.empty:
+                    names = [str(column) for column in records.columns]
+                    placeholders = ", ".join("?" for _ in names)
+                    rows = records.astype(object).where(records.notna(), None)
+                    values = (
+                        tuple(None if value is None else str(value) for value in row)
+                        for row in rows.itertuples(index=False, name=None)
+                    )
+                    connection.executemany(
+                        f"INSERT INTO {RECORDS_TABLE} ({', '.join(map(_quote, names))}) "
+                        f"VALUES ({placeholders})",
+                        values,
+                    )
+                state = {"watermark": watermark.strftime(WATERMARK_FORMAT)}
+                if record_id_field is not None:
+                    state["record_id_field"] = record_id_field
+                connection.executemany(
+                    f"INSERT OR REPLACE INTO {STATE_TABLE} (key, value) VALUES (?, ?)",
+                    state.items(),
+                )
+        finally:
+            connection.close()
+
+        return SnapshotSyncResult(
+            full=full,
+            updated_records=len(record_ids),
+            deleted_records=len(set(deleted) - set(record_ids)),
+            watermark=watermark,
+        )
+
+    @staticmethod
+    def _ensure_columns(
+        connection: sqlite3.Connection,
+        columns: Iterable[Any],
+        record_id_field: Optional[str],
+    ) -> List[str]:
+        """Create the records table or add any missing TEXT columns; return the table's columns."""
+        existing = [row[1] for row in connection.execute(f"PRAGMA table_info({RECORDS_TABLE})")]
+        wanted = [str(column) for column in columns]
+        if not existing:
+            if not wanted:
+                return []
+            definitions = ", ".join(f"{_quote(column)} TEXT" for column in wanted)
+            connection.execute(f"CREATE TABLE {RECORDS_TABLE} ({definitions})")
+            if record_id_field is not None:
+                connection.execute(
+                    f"CREATE INDEX {RECORDS_TABLE}_record_id ON {RECORDS_TABLE} ({_quote(record_id_field)})"
+                )
+            return wanted
+        for column in wanted:
+            if column not in existing:
+                connection.execute(f"ALTER TABLE {RECORDS_TABLE} ADD COLUMN {_quote(column)} TEXT")
+                existing.append(column)
+        return existing
+
+
+@dataclass
+class SnapshotPlan:
+    """One ``sync_snapshot()`` run: the export window and how to merge its results.
+
+    Shared by the sync and async clients, which only make the two exports:
+    records changed since ``since`` and, unless ``full``, the
+    ``record_delete`` logs for the same window.
+    """
+
+    snapshot: RecordSnapshot
+    full: bool
+    started: datetime
+    since: Optional[datetime]
+
+    @classmethod
+    def start(
+        cls,
+        path: Union[str, Path],
+        full: bool,
+        overlap: timedelta,
+        server_timezone: Union[str, tzinfo, None] = None,
+    ) -> "SnapshotPlan":
+        """Plan a run against the snapshot at ``path``; the first run is always full.
+
+        The new watermark is taken before any export, on the server's clock
+        (see ``server_now``).
+        """
+        snapshot = RecordSnapshot(path)
+        watermark = snapshot.watermark
+        full = full or watermark is None
+        return cls(
+            snapshot=snapshot,
+            full=full,
+            started=server_now(server_timezone),
+            since=None if full else watermark - overlap,
+        )
+
+    def needs_full_export(self, records: Any) -> bool:
+        """Return whether an incremental export cannot be merged and a full run is needed.
+
+        This happens when the record ID field was renamed: rows keyed on the
+        old name cannot be matched with the new export.
+        """
+        return (
+            not self.full
+            and is_dataframe(records)
+            and not records.columns.empty
+            and records.columns[0] != self.snapshot.record_id_field
+        )
+
+    def apply(self, records: Any, delete_logs: Any = None) -> SnapshotSyncResult:
+        """Merge the record export and the deletions named in ``delete_logs`` into the snapshot."""
+        if not is_dataframe(records):
+            import pandas as pd
+
+            records = pd.DataFrame()
+        return self.snapshot.apply(records, deleted_record_ids(delete_logs), self.started, full=self.full)
+
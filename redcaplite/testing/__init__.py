@@ -0,0 +1,2 @@
+from .project import FakeProject, FakeProjectError, compile_filter_logic  # noqa: F401
+from .server import DEFAULT_TOKEN, FakeRedcapServer  # noqa: F401
@@ -0,0 +1,601 @@
+"""In-memory REDCap project used by the local stand-in server."""
+
+from __future__ import annotations
+
+import random
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..filter_logic import FilterLogicError, compile_predicate, parse_filter_logic
+
+METADATA_COLUMNS = [
+    "field_name",
+    "form_name",
+    "section_header",
+    "field_type",
+    "field_label",
+    "select_choices_or_calculations",
+    "field_note",
+    "text_validation_type_or_show_slider_number",
+    "text_validation_min",
+    "text_validation_max",
+    "identifier",
+    "branching_logic",
+    "required_field",
+    "custom_alignment",
+    "question_number",
+    "matrix_group_name",
+    "matrix_ranking",
+    "field_annotation",
+]
+
+LOG_COLUMNS = ["timestamp", "username", "action", "details", "record"]
+
+# Fields that hold no data and never appear in record exports.
+_NON_DATA_TYPES = {"descriptive"}
+
+# Cycled through when generating synthetic fields: (field_type, validation, choices).
+_FIELD_TEMPLATES: List[Tuple[str, str, str]] = [
+    ("text", "", ""),
+    ("text", "integer", ""),
+    ("text", "date_ymd", ""),
+    ("radio", "", "1, Yes | 0, No"),
+    ("dropdown", "", "1, Low | 2, Medium | 3, High"),
+    ("text", "number", ""),
+    ("checkbox", "", "1, Red | 2, Green | 3, Blue"),
+    ("notes", "", ""),
+    ("yesno", "", ""),
+]
+
+_WORDS = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliet"]
+
+RecordKey = Tuple[str, str, str, str]
+FileKey = Tuple[str, str, str, str]
+
+
+class FakeProjectError(ValueError):
+    """Raised for requests REDCap would reject; reported to the client as HTTP 400."""
+
+
+def split_choices(choices: str) -> List[Tuple[str, str]]:
+    """Return ``(code, label)`` pairs from a ``select_choices_or_calculations`` value."""
+    pairs = []
+    for choice in choices.split("|"):
+        code, _, label = choice.partition(",")
+        if code.strip():
+            pairs.append((code.strip(), label.strip()))
+    return pairs
+
+
+@dataclass
+class FakeProject:
+    """A REDCap project held in memory: data dictionary, records, files, logs and file repository.
+
+    Records are stored as flat export rows keyed by record ID, event and
+    repeat instance. Every write is logged the way REDCap logs it, so
+    ``dateRangeBegin`` filters and ``record_delete`` log exports behave
+    like a live server. All access goes through ``lock``, since the
+    server answers requests on several threads.
+    """
+
+    metadata: List[Dict[str, str]] = field(default_factory=list)
+    records: Dict[RecordKey, Dict[str, str]] = field(default_factory=dict)
+    arms: List[Dict[str, Any]] = field(default_factory=list)
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    form_event_mappings: List[Dict[str, Any]] = field(default_factory=list)
+    repeating_forms_events: List[Dict[str, str]] = field(default_factory=list)
+    files: Dict[FileKey, Tuple[str, bytes]] = field(default_factory=dict)
+    logs: List[Dict[str, str]] = field(default_factory=list)
+    repository: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+    dags: List[Dict[str, str]] = field(default_factory=list)
+    users: List[Dict[str, str]] = field(default_factory=list)
+    modified: Dict[str, datetime] = field(default_factory=dict)
+    project_title: str = "Fake REDCap Project"
+    username: str = "fake_api_user"
+    version: str = "14.0.0"
+    lock: threading.RLock = field(default_factory=threading.RLock, repr=False, compare=False)
+
+    @classmethod
+    def generate(
+        cls,
+        records: int = 100,
+        fields: int = 10,
+        forms: int = 2,
+        events: int = 0,
+        file_fields: int = 0,
+        repository_files: int = 0,
+        seed: Optional[int] = 0,
+        start: Optional[datetime] = None,
+    ) -> "FakeProject":
+        """Return a synthetic project with ``records`` records spread over the last 30 days.
+
+        ``fields`` data fields of mixed types are split across ``forms``
+        instruments, plus ``file_fields`` File Upload fields holding a small
+        text file on every record. ``events`` greater than zero makes the
+        project longitudinal with that many events in one arm.
+        ``repository_files`` files are placed in the File Repository.
+        """
+        rng = random.Random(seed)
+        end = start or datetime.now().replace(microsecond=0)
+        project = cls()
+        project.users.append({
+            "username": project.username,
+            "email": f"{project.username}@example.edu",
+            "firstname": "Fake",
+            "lastname": "User",
+            "expiration": "",
+            "data_access_group": "",
+            "api_export": "1",
+            "api_import": "1",
+        })
+        form_names = [f"form_{index + 1}" for index in range(max(1, forms))]
+        project.metadata.append(_metadata_row("record_id", form_names[0], "text", "Record ID"))
+        for index in range(fields):
+            field_type, validation, choices = _FIELD_TEMPLATES[index % len(_FIELD_TEMPLATES)]
+            form_name = form_names[index * len(form_names) // max(1, fields)]
+            project.metadata.append(
+                _metadata_row(f"field_{index + 1}", form_name, field_type, f"Field {index + 1}", choices, validation)
+            )
+        for index in range(file_fields):
+            project.metadata.append(_metadata_row(f"file_{index + 1}", form_names[-1], "file", f"File {index + 1}"))
+
+        if events:
+            project.arms = [{"arm_num": 1, "name": "Arm 1"}]
+            for index in range(events):
+                name = f"Event {index + 1}"
+                project.events.append({
+                    "event_name": name,
+                    "arm_num": 1,
+                    "unique_event_name": f"event_{index + 1}_arm_1",
+                    "custom_event_label": "",
+                    "event_id": index + 1,
+                })
+                for form_name in form_names:
+                    project.form_event_mappings.append(
+                        {"arm_num": 1, "unique_event_name": f"event_{index + 1}_arm_1", "form": form_name}
+                    )
+
+        event_names = [event["unique_event_name"] for event in project.events] or [""]
+        for number in range(1, records + 1):
+            record_id = str(number)
+            stamp = end - timedelta(seconds=rng.randrange(30 * 24 * 3600))
+            for event_name in event_names:
+                row = {"record_id": record_id}
+                if event_name:
+                    row["redcap_event_name"] = event_name
+                for meta in project.metadata[1:]:
+                    row.update(_synthetic_values(meta, rng, stamp))
+                for form_name in form_names:
+                    row[f"{form_name}_complete"] = str(rng.choice([0, 1, 2]))
+                project.records[(record_id, event_name, "", "")] = row
+                for meta in project.metadata:
+                    if meta["field_type"] == "file":
+                        file_name = f"{meta['field_name']}_{record_id}.txt"
+                        row[meta["field_name"]] = file_name
+                        project.files[(record_id, meta["field_name"], event_name, "")] = (
+                            file_name,
+                            f"{meta['field_name']} for record {record_id}\n".encode(),
+                        )
+            project.modified[record_id] = stamp
+            project.logs.append(_log_row(stamp, project.username, f"Created Record {record_id}", "", record_id))
+
+        for index in range(repository_files):
+            doc_id = index + 1
+            project.repository[doc_id] = {
+                "doc_id": doc_id,
+                "name": f"document_{doc_id}.txt",
+                "folder_id": None,
+                "content": f"repository document {doc_id}\n".encode(),
+            }
+        project.logs.sort(key=lambda entry: entry["timestamp"])
+        return project
+
+    # -- project structure -------------------------------------------------
+
+    @property
+    def record_id_field(self) -> str:
+        return self.metadata[0]["field_name"] if self.metadata else "record_id"
+
+    @property
+    def is_longitudinal(self) -> bool:
+        return bool(self.events)
+
+    @property
+    def form_names(self) -> List[str]:
+        names: List[str] = []
+        for meta in self.metadata:
+            if meta["form_name"] not in names:
+                names.append(meta["form_name"])
+        return names
+
+    def export_field_names(self, field_name: Optional[str] = None) -> List[Dict[str, str]]:
+        """Return REDCap's ``exportFieldNames`` rows, expanding checkbox choices."""
+        rows = []
+        for meta in self.metadata:
+            if meta["field_type"] in _NON_DATA_TYPES:
+                continue
+            if field_name and meta["field_name"] != field_name:
+                continue
+            if meta["field_type"] == "checkbox":
+                for code, _ in split_choices(meta["select_choices_or_calculations"]):
+                    rows.append({
+                        "original_field_name": meta["field_name"],
+                        "choice_value": code,
+                        "export_field_name": f"{meta['field_name']}___{code}",
+                    })
+            else:
+                rows.append({
+                    "original_field_name": meta["field_name"],
+                    "choice_value": "",
+                    "export_field_name": meta["field_name"],
+                })
+        if field_name and not rows:
+            raise FakeProjectError(f'The field "{field_name}" does not exist.')
+        return rows
+
+    def record_columns(
+        self,
+        fields: Sequence[str] = (),
+        forms: Sequence[str] = (),
+    ) -> List[str]:
+        """Return the flat export header, limited to ``fields`` and ``forms`` when given."""
+        known = {meta["field_name"] for meta in self.metadata}
+        unknown = [name for name in fields if name not in known]
+        if unknown:
+            raise FakeProjectError(f"The following values in the parameter \"fields\" are not valid: {', '.join(unknown)}")
+        unknown_forms = [name for name in forms if name not in self.form_names]
+        if unknown_forms:
+            raise FakeProjectError(f"The following values in the parameter \"forms\" are not valid: {', '.join(unknown_forms)}")
+        wanted_forms = set(forms)
+        wanted_fields = set(fields)
+        columns = [self.record_id_field]
+        if self.is_longitudinal:
+            columns.append("redcap_event_name")
+        if self.repeating_forms_events:
+            columns += ["redcap_repeat_instrument", "redcap_repeat_instance"]
+        last_form = None
+        for meta in self.metadata:
+            form_name = meta["form_name"]
+            if last_form is not None and form_name != last_form:
+                self._append_form_status(columns, last_form, wanted_fields, wanted_forms)
+            last_form = form_name
+            if meta["field_name"] == self.record_id_field or meta["field_type"] in _NON_DATA_TYPES:
+                continue
+            if (wanted_fields or wanted_forms) and meta["field_name"] not in wanted_fields and form_name not in wanted_forms:
+                continue
+            columns += [entry["export_field_name"] for entry in self.export_field_names(meta["field_name"])]
+        if last_form is not None:
+            self._append_form_status(columns, last_form, wanted_fields, wanted_forms)
+        return columns
+
+    @staticmethod
+    def _append_form_status(columns, form_name, wanted_fields, wanted_forms) -> None:
+        status = f"{form_name}_complete"
+        if not (wanted_fields or wanted_forms) or form_name in wanted_forms or status in wanted_fields:
+            columns.append(status)
+
+    # -- records -----------------------------------------------------------
+
+    def export_records(
+        self,
+        records: Sequence[str] = (),
+        fields: Sequence[str] = (),
+        forms: Sequence[str] = (),
+        events: Sequence[str] = (),
+        filter_logic: Optional[str] = None,
+        date_range_begin: Optional[datetime] = None,
+        date_range_end: Optional[datetime] = None,
+    ) -> Tuple[List[str], List[Dict[str, str]]]:
+        """Return the header and rows of a flat record export after applying REDCap's filters."""
+        columns = self.record_columns(fields, forms)
+        unknown_events = [name for name in events if name not in {event["unique_event_name"] for event in self.events}]
+        if unknown_events:
+            raise FakeProjectError(f"The following values in the parameter \"events\" are not valid: {', '.join(unknown_events)}")
+        matches = compile_filter_logic(filter_logic) if filter_logic else None
+        wanted_records = set(records)
+        wanted_events = set(events)
+        rows = []
+        for (record_id, event_name, _, _), row in self.records.items():
+            if wanted_records and record_id not in wanted_records:
+                continue
+            if wanted_events and event_name not in wanted_events:
+                continue
+            stamp = self.modified.get(record_id)
+            if date_range_begin is not None and (stamp is None or stamp < date_range_begin):
+                continue
+            if date_range_end is not None and (stamp is None or stamp > date_range_end):
+                continue
+            if matches is not None and not matches(row):
+                continue
+            rows.append({column: row.get(column, "") for column in columns})
+        return columns, rows
+
+    def import_records(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        overwrite: bool = False,
+        force_auto_number: bool = False,
+    ) -> List[str]:
+        """Merge flat rows into the project and return the imported record IDs in order.
+
+        Blank values leave stored values alone unless ``overwrite`` is set,
+        like REDCap's ``overwriteBehavior=normal``.
+        """
+        rows = list(rows)
+        valid_columns = set(self.record_columns()) | {"redcap_event_name", "redcap_repeat_instrument", "redcap_repeat_instance"}
+        unknown = sorted({column for row in rows for column in row if column not in valid_columns})
+        if unknown:
+            raise FakeProjectError(f"The following fields were not found in the project as real data fields: {', '.join(unknown)}")
+        id_field = self.record_id_field
+        imported: List[str] = []
+        renamed: Dict[str, str] = {}
+        known = {key[0] for key in self.records}
+        now = datetime.now().replace(microsecond=0)
+        for row in rows:
+            record_id = str(row.get(id_field, "")).strip()
+            if not record_id:
+                raise FakeProjectError(f'The record ID field "{id_field}" is missing or blank.')
+            if force_auto_number:
+                if record_id not in renamed:
+                    renamed[record_id] = self.next_record_name()
+                    # Reserve the new ID so the next auto number moves on.
+                    self.modified[renamed[record_id]] = now
+                record_id = renamed[record_id]
+            event_name = str(row.get("redcap_event_name") or "")
+            if self.is_longitudinal and not event_name:
+                raise FakeProjectError("The redcap_event_name column is required for longitudinal projects.")
+            key = (
+                record_id,
+                event_name,
+                str(row.get("redcap_repeat_instrument") or ""),
+                str(row.get("redcap_repeat_instance") or ""),
+            )
+            existed = record_id in known
+            known.add(record_id)
+            stored = self.records.setdefault(key, {id_field: record_id})
+            if event_name:
+                stored["redcap_event_name"] = event_name
+            for column, value in row.items():
+                value = "" if value is None else str(value)
+                if column == id_field or (value == "" and not overwrite):
+                    continue
+                stored[column] = value
+            self.modified[record_id] = now
+            action = "Updated Record" if existed else "Created Record"
+            self.log(f"{action} {record_id}", record=record_id, when=now)
+            if record_id not in imported:
+                imported.append(record_id)
+        return imported
+
+    def delete_records(self, records: Sequence[str], event: Optional[str] = None) -> int:
+        """Delete ``records`` (or only their rows in ``event``) and return how many records were affected."""
+        existing = {key[0] for key in self.records}
+        missing = [record_id for record_id in records if record_id not in existing]
+        if missing:
+            raise FakeProjectError(f"One or more of the records provided cannot be deleted because they do not exist in the project: {', '.join(missing)}")
+        now = datetime.now().replace(microsecond=0)
+        for record_id in records:
+            for key in [key for key in self.records if key[0] == record_id and (event is None or key[1] == event)]:
+                del self.records[key]
+            for key in [key for key in self.files if key[0] == record_id and (event is None or key[2] == event)]:
+                del self.files[key]
+            if any(key[0] == record_id for key in self.records):
+                self.modified[record_id] = now
+                self.log(f"Updated Record {record_id}", details=f"Deleted event {event}", record=record_id, when=now)
+            else:
+                self.modified.pop(record_id, None)
+                self.log(f"Deleted Record {record_id}", record=record_id, when=now)
+        return len(records)
+
+    def rename_record(self, record_id: str, new_record_id: str) -> None:
+        """Move every row and file of ``record_id`` to ``new_record_id``."""
+        keys = [key for key in self.records if key[0] == record_id]
+        if not keys:
+            raise FakeProjectError(f'The record "{record_id}" does not exist.')
+        if any(key[0] == new_record_id for key in self.records):
+            raise FakeProjectError(f'The record "{new_record_id}" already exists.')
+        for key in keys:
+            row = self.records.pop(key)
+            row[self.record_id_field] = new_record_id
+            self.records[(new_record_id,) + key[1:]] = row
+        for key in [key for key in self.files if key[0] == record_id]:
+            self.files[(new_record_id,) + key[1:]] = self.files.pop(key)
+        now = datetime.now().replace(microsecond=0)
+        self.modified.pop(record_id, None)
+        self.modified[new_record_id] = now
+        self.log(f"Updated Record {new_record_id}", details=f"Renamed from {record_id}", record=new_record_id, when=now)
+
+    def next_record_name(self) -> str:
+        """Return one more than the highest numeric record ID."""
+        numbers = [int(record_id) for record_id in self.modified if record_id.isdigit()]
+        numbers += [int(key[0]) for key in self.records if key[0].isdigit()]
+        return str(max(numbers, default=0) + 1)
+
+    # -- files -------------------------------------------------------------
+
+    def get_file(self, record_id: str, field_name: str, event: str = "", repeat_instance: str = "") -> Tuple[str, bytes]:
+        """Return the ``(name, content)`` stored in a File Upload field."""
+        try:
+            return self.files[(record_id, field_name, event, repeat_instance)]
+        except KeyError:
+            raise FakeProjectError("There is no file to download for this record") from None
+
+    def set_file(self, record_id: str, field_name: str, name: str, content: bytes, event: str = "", repeat_instance: str = "") -> None:
+        """Attach a file to a File Upload field, creating the record row if needed."""
+        meta = next((meta for meta in self.metadata if meta["field_name"] == field_name), None)
+        if meta is None or meta["field_type"] != "file":
+            raise FakeProjectError(f'The field "{field_name}" is not a File Upload field.')
+        self.files[(record_id, field_name, event, repeat_instance)] = (name, content)
+        self.import_records([{
+            self.record_id_field: record_id,
+            **({"redcap_event_name": event} if event else {}),
+            field_name: name,
+        }])
+
+    def delete_file(self, record_id: str, field_name: str, event: str = "", repeat_instance: str = "") -> None:
+        """Remove the file from a File Upload field."""
+        if self.files.pop((record_id, field_name, event, repeat_instance), None) is None:
+            raise FakeProjectError("There is no file to delete for this record")
+        self.import_records([{
+            self.record_id_field: record_id,
+            **({"redcap_event_name": event} if event else {}),
+            field_name: "",
+        }], overwrite=True)
+
+    # -- file repository ---------------------------------------------------
+
+    def list_repository(self, folder_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return the folders and files directly inside ``folder_id`` (the top level when ``None``)."""
+        entries = []
+        for entry in self.repository.values():
+            if entry.get("folder_id") != folder_id:
+                continue
+            if "doc_id" in entry:
+                entries.append({"doc_id": entry["doc_id"], "name": entry["name"]})
+            else:
+                entries.append({"folder_id": entry["id"], "name": entry["name"]})
+        return entries
+
+    def create_folder(self, name: str, parent_id: Optional[int] = None) -> int:
+        folder_id = max(self.repository, default=0) + 1
+        self.repository[folder_id] = {"id": folder_id, "name": name, "folder_id": parent_id}
+        self.log(f"Created folder {name}", record="")
+        return folder_id
+
+    def add_document(self, name: str, content: bytes, folder_id: Optional[int] = None) -> int:
+        doc_id = max(self.repository, default=0) + 1
+        self.repository[doc_id] = {"doc_id": doc_id, "name": name, "folder_id": folder_id, "content": content}
+        self.log(f"Uploaded document {name}", record="")
+        return doc_id
+
+    def get_document(self, doc_id: int) -> Dict[str, Any]:
+        entry = self.repository.get(doc_id)
+        if entry is None or "doc_id" not in entry:
+            raise FakeProjectError(f'The doc_id "{doc_id}" does not exist.')
+        return entry
+
+    def delete_document(self, doc_id: int) -> None:
+        entry = self.get_document(doc_id)
+        del self.repository[doc_id]
+        self.log(f"Deleted document {entry['name']}", record="")
+
+    # -- logging -----------------------------------------------------------
+
+    def log(self, action: str, details: str = "", record: str = "", when: Optional[datetime] = None) -> None:
+        self.logs.append(_log_row(when or datetime.now(), self.username, action, details, record))
+
+    def export_logs(
+        self,
+        logtype: Optional[str] = None,
+        user: Optional[str] = None,
+        record: Optional[str] = None,
+        begin: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[Dict[str, str]]:
+        """Return log entries, newest first like REDCap, after applying the export filters."""
+        prefixes = _LOGTYPE_PREFIXES.get(logtype or "")
+        entries = []
+        for entry in self.logs:
+            stamp = datetime.strptime(entry["timestamp"], "%Y-%m-%d %H:%M")
+            if begin is not None and stamp < begin.replace(second=0, microsecond=0):
+                continue
+            if end is not None and stamp > end:
+                continue
+            if user and entry["username"] != user:
+                continue
+            if record and entry["record"] != record:
+                continue
+            if prefixes is not None and not entry["action"].startswith(prefixes):
+                continue
+            entries.append(dict(entry))
+        entries.reverse()
+        return entries
+
+
+_LOGTYPE_PREFIXES: Dict[str, Tuple[str, ...]] = {
+    "record": ("Created Record", "Updated Record", "Deleted Record"),
+    "record_add": ("Created Record",),
+    "record_edit": ("Updated Record",),
+    "record_delete": ("Deleted Record",),
+    "manage": ("Created folder", "Uploaded document", "Deleted document", "Manage"),
+    "export": ("Data Export",),
+    "user": ("User",),
+    "lock_record": ("Lock",),
+    "page_view": ("Page View",),
+}
+
+
+def _metadata_row(
+    field_name: str,
+    form_name: str,
+    field_type: str,
+    label: str,
+    choices: str = "",
+    validation: str = "",
+) -> Dict[str, str]:
+    row = {column: "" for column in METADATA_COLUMNS}
+    row.update({
+        "field_name": field_name,
+        "form_name": form_name,
+        "field_type": field_type,
+        "field_label": label,
+        "select_choices_or_calculations": choices,
+        "text_validation_type_or_show_slider_number": validation,
+    })
+    return row
+
+
+def _synthetic_values(meta: Dict[str, str], rng: random.Random, stamp: datetime) -> Dict[str, str]:
+    name = meta["field_name"]
+    field_type = meta["field_type"]
+    validation = meta["text_validation_type_or_show_slider_number"]
+    if field_type == "checkbox":
+        return {
+            f"{name}___{code}": str(rng.randint(0, 1))
+            for code, _ in split_choices(meta["select_choices_or_calculations"])
+        }
+    if field_type in ("radio", "dropdown"):
+        return {name: rng.choice(split_choices(meta["select_choices_or_calculations"]))[0]}
+    if field_type == "yesno":
+        return {name: str(rng.randint(0, 1))}
+    if field_type == "file":
+        return {name: ""}
+    if validation == "integer":
+        return {name: str(rng.randint(0, 100))}
+    if validation == "number":
+        return {name: f"{rng.uniform(0, 100):.2f}"}
+    if validation == "date_ymd":
+        return {name: (stamp - timedelta(days=rng.randrange(3650))).strftime("%Y-%m-%d")}
+    if field_type == "notes":
+        return {name: " ".join(rng.choice(_WORDS) for _ in range(12))}
+    # Leave some values blank so empty handling gets exercised too.
+    return {name: rng.choice(_WORDS) if rng.random() > 0.1 else ""}
+
+
+def _log_row(when: datetime, username: str, action: str, details: str, record: str) -> Dict[str, str]:
+    return {
+        "timestamp": when.strftime("%Y-%m-%d %H:%M"),
+        "username": username,
+        "action": action,
+        "details": details,
+        "record": record,
+    }
+
+
+# -- filterLogic --------------------------------------------------------------
+
+
+def compile_filter_logic(logic: str) -> Callable[[Dict[str, str]], bool]:
+    """Compile REDCap ``filterLogic`` into a predicate over flat export rows.
+
+    The expression is parsed by ``redcaplite.filter_logic`` (the same parser
+    ``ProjectMirror`` translates to SQL), so the stand-in server and the
+    mirror accept and evaluate the same syntax. Unsupported expressions are
+    rejected with ``FakeProjectError``.
+    """
+    try:
+        return compile_predicate(parse_filter_logic(logic))
+    except FilterLogicError as exc:
+        raise FakeProjectError(str(exc)) from exc
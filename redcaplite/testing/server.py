@@ -0,0 +1,648 @@
+"""A local stand-in for the REDCap API, for benchmarks and offline tests.
+
+Serve a synthetic project in-process::
+
+    from redcaplite import RedcapClient
+    from redcaplite.testing import FakeProject, FakeRedcapServer
+
+    with FakeRedcapServer(FakeProject.generate(records=1000)) as server:
+        client = RedcapClient(server.url, server.token)
+        records = client.export_records()
+
+or from the command line, for clients running in another process::
+
+    python -m redcaplite.testing --records 5000 --port 8765 --latency 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import email.parser
+import email.policy
+import io
+import json
+import random
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl
+
+from .project import LOG_COLUMNS, METADATA_COLUMNS, FakeProject, FakeProjectError
+
+DEFAULT_TOKEN = "0" * 32
+
+Response = Tuple[int, Dict[str, str], bytes]
+
+_DATETIME_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d")
+
+
+class FakeRedcapServer:
+    """Serve a ``FakeProject`` over HTTP on a background thread.
+
+    ``latency`` seconds (plus up to ``jitter`` more) are added to every
+    response. ``error_rate`` is the probability of answering with
+    ``error_status`` instead of handling the request; ``fail_next`` queues
+    a fixed number of failures for deterministic tests. Every handled
+    request is appended to ``request_log`` as ``(content, action)``.
+    """
+
+    def __init__(
+        self,
+        project: Optional[FakeProject] = None,
+        token: str = DEFAULT_TOKEN,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        retry_after: Optional[float] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.project = project if project is not None else FakeProject.generate()
+        self.token = token
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.request_log: List[Tuple[str, Optional[str]]] = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._queued_failures: List[Tuple[int, Optional[float]]] = []
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # -- lifecycle ---------------------------------------------------------
+
+    @property
+    def url(self) -> str:
+        """Return the API endpoint URL; only valid once the server has started."""
+        if self._httpd is None:
+            raise RuntimeError("The server has not been started.")
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/api/"
+
+    def start(self) -> "FakeRedcapServer":
+        """Start answering requests on a daemon thread and return ``self``."""
+        if self._httpd is None:
+            self._httpd = ThreadingHTTPServer((self.host, self.port), _make_handler(self))
+            self._httpd.daemon_threads = True
+            # A short poll interval keeps ``stop`` quick in test teardown.
+            self._thread = threading.Thread(
+                target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and close its socket."""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+            self._thread = None
+
+    def __enter__(self) -> "FakeRedcapServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    # -- fault injection ---------------------------------------------------
+
+    def fail_next(self, count: int = 1, status: int = 503, retry_after: Optional[float] = None) -> None:
+        """Answer the next ``count`` requests with ``status`` instead of handling them."""
+        with self._lock:
+            self._queued_failures.extend([(status, retry_after)] * count)
+
+    def _injected_failure(self) -> Optional[Response]:
+        with self._lock:
+            if self._queued_failures:
+                status, retry_after = self._queued_failures.pop(0)
+            elif self.error_rate and self._random.random() < self.error_rate:
+                status, retry_after = self.error_status, self.retry_after
+            else:
+                return None
+        headers = {"Retry-After": str(int(retry_after))} if retry_after is not None else {}
+        return _error(f"Injected failure ({status}).", status, headers)
+
+    def _delay(self) -> float:
+        if not self.jitter:
+            return self.latency
+        with self._lock:
+            return self.latency + self._random.uniform(0, self.jitter)
+
+    # -- dispatch ----------------------------------------------------------
+
+    def handle(self, form: Dict[str, str], files: Optional[Dict[str, Tuple[str, bytes]]] = None) -> Response:
+        """Answer one API request given its form fields and uploaded files.
+
+        Returns ``(status, headers, body)``. This is what the HTTP handler
+        calls, and it can be used directly to test without sockets.
+        """
+        delay = self._delay()
+        if delay > 0:
+            time.sleep(delay)
+        failure = self._injected_failure()
+        if failure is not None:
+            return failure
+        if form.get("token") != self.token:
+            return _error("You do not have permissions to use the API", 403)
+        content = form.get("content", "")
+        action = form.get("action") or ("import" if "data" in form else "export")
+        with self._lock:
+            self.request_log.append((content, form.get("action")))
+        route = _ROUTES.get((content, action))
+        if route is None:
+            return _error(f'The value of the parameter "content" ("{content}") or "action" ("{action}") is not supported.')
+        try:
+            with self.project.lock:
+                return route(self.project, form, files or {})
+        except FakeProjectError as exc:
+            return _error(str(exc))
+
+
+# -- HTTP plumbing ------------------------------------------------------------
+
+
+def _make_handler(server: FakeRedcapServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):  # noqa: N802 - http.server naming
+            length = int(self.headers.get("Content-Length", 0))
+            body = self.rfile.read(length)
+            form, files = _parse_body(self.headers.get("Content-Type", ""), body)
+            status, headers, payload = server.handle(form, files)
+            self.send_response(status)
+            headers.setdefault("Content-Type", "text/html; charset=utf-8")
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def _parse_body(content_type: str, body: bytes) -> Tuple[Dict[str, str], Dict[str, Tuple[str, bytes]]]:
+    """Split a urlencoded or multipart POST body into form fields and uploaded files."""
+    if not content_type.startswith("multipart/form-data"):
+        return dict(parse_qsl(body.decode("utf-8"), keep_blank_values=True)), {}
+    message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+        b"Content-Type: " + content_type.encode("latin-1") + b"\r\n\r\n" + body
+    )
+    form: Dict[str, str] = {}
+    files: Dict[str, Tuple[str, bytes]] = {}
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        payload = part.get_payload(decode=True) or b""
+        file_name = part.get_filename()
+        if file_name is not None:
+            files[name] = (file_name, payload)
+        else:
+            form[name] = payload.decode("utf-8")
+    return form, files
+
+
+# -- response helpers ---------------------------------------------------------
+
+
+def _error(message: str, status: int = 400, headers: Optional[Dict[str, str]] = None) -> Response:
+    return status, {"Content-Type": "application/json; charset=utf-8", **(headers or {})}, json.dumps({"error": message}).encode()
+
+
+def _text(value: Any) -> Response:
+    return 200, {}, str(value).encode()
+
+
+def _json(value: Any) -> Response:
+    return 200, {"Content-Type": "application/json; charset=utf-8"}, json.dumps(value).encode()
+
+
+def _table(form: Dict[str, str], columns: Sequence[str], rows: Sequence[Dict[str, Any]]) -> Response:
+    """Render rows as CSV or JSON depending on the request's ``format``."""
+    format = form.get("format", "json")
+    if format == "json":
+        return _json([{column: row.get(column, "") for column in columns} for row in rows])
+    if format == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=list(columns), lineterminator="\n", extrasaction="ignore")
+        if rows:
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            # REDCap sends a bare newline when an export matches nothing.
+            buffer.write("\n")
+        return 200, {"Content-Type": "text/csv; charset=utf-8"}, buffer.getvalue().encode()
+    raise FakeProjectError(f'The format "{format}" is not supported by the fake server.')
+
+
+def _file(name: str, content: bytes) -> Response:
+    return 200, {"Content-Type": f'application/octet-stream; name="{name}"'}, content
+
+
+def _import_rows(form: Dict[str, str]) -> List[Dict[str, Any]]:
+    """Parse the ``data`` field of an import in the request's ``format``."""
+    data = form.get("data", "")
+    if form.get("format", "json") == "csv":
+        return list(csv.DictReader(io.StringIO(data)))
+    try:
+        rows = json.loads(data or "[]")
+    except ValueError as exc:
+        raise FakeProjectError(f"The data being imported is not valid JSON: {exc}") from None
+    return rows if isinstance(rows, list) else [rows]
+
+
+def _indexed(form: Dict[str, str], name: str) -> List[str]:
+    """Return the values of ``name[0]``, ``name[1]``, ... in index order."""
+    values = []
+    index = 0
+    while f"{name}[{index}]" in form:
+        values.append(form[f"{name}[{index}]"])
+        index += 1
+    return values
+
+
+def _datetime(form: Dict[str, str], name: str) -> Optional[datetime]:
+    value = form.get(name)
+    if not value:
+        return None
+    for pattern in _DATETIME_FORMATS:
+        try:
+            return datetime.strptime(value, pattern)
+        except ValueError:
+            continue
+    raise FakeProjectError(f'The value of "{name}" is not a valid date: {value}')
+
+
+def _classic_only_error(kind: str) -> FakeProjectError:
+    return FakeProjectError(f"You cannot export {kind} for classic projects")
+
+
+# -- endpoints ----------------------------------------------------------------
+
+
+def _version(project: FakeProject, form, files) -> Response:
+    return _text(project.version)
+
+
+def _export_project(project: FakeProject, form, files) -> Response:
+    info = {
+        "project_id": 1,
+        "project_title": project.project_title,
+        "creation_time": "2024-01-01 00:00:00",
+        "in_production": 0,
+        "is_longitudinal": int(project.is_longitudinal),
+        "has_repeating_instruments_or_events": int(bool(project.repeating_forms_events)),
+        "surveys_enabled": 0,
+        "record_autonumbering_enabled": 1,
+    }
+    if form.get("format", "json") == "csv":
+        return _table(form, list(info), [info])
+    return _json(info)
+
+
+def _export_metadata(project: FakeProject, form, files) -> Response:
+    fields = set(_indexed(form, "fields"))
+    forms = set(_indexed(form, "forms"))
+    rows = [
+        meta for meta in project.metadata
+        if (not fields and not forms) or meta["field_name"] in fields or meta["form_name"] in forms
+    ]
+    return _table(form, METADATA_COLUMNS, rows)
+
+
+def _import_metadata(project: FakeProject, form, files) -> Response:
+    rows = _import_rows(form)
+    if not rows or "field_name" not in rows[0] or "form_name" not in rows[0]:
+        raise FakeProjectError("The data dictionary must include field_name and form_name columns.")
+    project.metadata = [{column: str(row.get(column) or "") for column in METADATA_COLUMNS} for row in rows]
+    project.log("Manage: Uploaded data dictionary")
+    return _text(len(rows))
+
+
+def _export_instruments(project: FakeProject, form, files) -> Response:
+    rows = [{"instrument_name": name, "instrument_label": name.replace("_", " ").title()} for name in project.form_names]
+    return _table(form, ["instrument_name", "instrument_label"], rows)
+
+
+def _export_dags(project: FakeProject, form, files) -> Response:
+    return _table(form, ["data_access_group_name", "unique_group_name", "data_access_group_id"], project.dags)
+
+
+def _export_users(project: FakeProject, form, files) -> Response:
+    columns = list(project.users[0]) if project.users else ["username", "email", "firstname", "lastname"]
+    return _table(form, columns, project.users)
+
+
+def _export_field_names(project: FakeProject, form, files) -> Response:
+    rows = project.export_field_names(form.get("field"))
+    return _table(form, ["original_field_name", "choice_value", "export_field_name"], rows)
+
+
+def _export_arms(project: FakeProject, form, files) -> Response:
+    if not project.is_longitudinal:
+        raise _classic_only_error("arms")
+    arms = {str(arm) for arm in _indexed(form, "arms")}
+    rows = [arm for arm in project.arms if not arms or str(arm["arm_num"]) in arms]
+    return _table(form, ["arm_num", "name"], rows)
+
+
+def _import_arms(project: FakeProject, form, files) -> Response:
+    rows = _import_rows(form)
+    if form.get("override") in ("1", "true"):
+        project.arms = []
+    known = {str(arm["arm_num"]): arm for arm in project.arms}
+    for row in rows:
+        known[str(row["arm_num"])] = {"arm_num": int(row["arm_num"]), "name": row.get("name", "")}
+    project.arms = sorted(known.values(), key=lambda arm: arm["arm_num"])
+    return _text(len(rows))
+
+
+def _delete_arms(project: FakeProject, form, files) -> Response:
+    arms = set(_indexed(form, "arms"))
+    before = len(project.arms)
+    project.arms = [arm for arm in project.arms if str(arm["arm_num"]) not in arms]
+    project.events = [event for event in project.events if str(event["arm_num"]) not in arms]
+    return _text(before - len(project.arms))
+
+
+def _export_events(project: FakeProject, form, files) -> Response:
+    if not project.is_longitudinal:
+        raise _classic_only_error("events")
+    arms = set(_indexed(form, "arms"))
+    rows = [event for event in project.events if not arms or str(event["arm_num"]) in arms]
+    return _table(form, ["event_name", "arm_num", "unique_event_name", "custom_event_label", "event_id"], rows)
+
+
+def _import_events(project: FakeProject, form, files) -> Response:
+    rows = _import_rows(form)
+    known = {event["unique_event_name"]: event for event in project.events}
+    for row in rows:
+        arm_num = int(row.get("arm_num") or 1)
+        unique_name = row.get("unique_event_name") or f"{str(row['event_name']).lower().replace(' ', '_')}_arm_{arm_num}"
+        known[unique_name] = {
+            "event_name": row["event_name"],
+            "arm_num": arm_num,
+            "unique_event_name": unique_name,
+            "custom_event_label": row.get("custom_event_label", ""),
+            "event_id": known.get(unique_name, {}).get("event_id", len(known) + 1),
+        }
+    project.events = list(known.values())
+    return _text(len(rows))
+
+
+def _delete_events(project: FakeProject, form, files) -> Response:
+    events = set(_indexed(form, "events"))
+    before = len(project.events)
+    project.events = [event for event in project.events if event["unique_event_name"] not in events]
+    project.form_event_mappings = [row for row in project.form_event_mappings if row["unique_event_name"] not in events]
+    return _text(before - len(project.events))
+
+
+def _export_form_event_mappings(project: FakeProject, form, files) -> Response:
+    if not project.is_longitudinal:
+        raise _classic_only_error("form-event mappings")
+    arms = set(_indexed(form, "arms"))
+    rows = [row for row in project.form_event_mappings if not arms or str(row["arm_num"]) in arms]
+    return _table(form, ["arm_num", "unique_event_name", "form"], rows)
+
+
+def _import_form_event_mappings(project: FakeProject, form, files) -> Response:
+    rows = _import_rows(form)
+    project.form_event_mappings = [
+        {"arm_num": int(row["arm_num"]), "unique_event_name": row["unique_event_name"], "form": row["form"]}
+        for row in rows
+    ]
+    return _text(len(rows))
+
+
+def _export_repeating_forms_events(project: FakeProject, form, files) -> Response:
+    columns = ["event_name", "form_name", "custom_form_label"] if project.is_longitudinal else ["form_name", "custom_form_label"]
+    return _table(form, columns, project.repeating_forms_events)
+
+
+def _import_repeating_forms_events(project: FakeProject, form, files) -> Response:
+    rows = _import_rows(form)
+    project.repeating_forms_events = [{key: str(value or "") for key, value in row.items()} for row in rows]
+    return _text(len(rows))
+
+
+def _export_records(project: FakeProject, form, files) -> Response:
+    columns, rows = project.export_records(
+        records=_indexed(form, "records"),
+        fields=_indexed(form, "fields"),
+        forms=_indexed(form, "forms"),
+        events=_indexed(form, "events"),
+        filter_logic=form.get("filterLogic") or None,
+        date_range_begin=_datetime(form, "dateRangeBegin"),
+        date_range_end=_datetime(form, "dateRangeEnd"),
+    )
+    return _table(form, columns, rows)
+
+
+def _import_records(project: FakeProject, form, files) -> Response:
+    rows = _import_rows(form)
+    record_ids = project.import_records(
+        rows,
+        overwrite=form.get("overwriteBehavior") == "overwrite",
+        force_auto_number=form.get("forceAutoNumber") == "true",
+    )
+    return_content = form.get("returnContent", "count")
+    if return_content == "count":
+        if form.get("format") == "csv":
+            return _text(len(record_ids))
+        return _json({"count": len(record_ids)})
+    if return_content == "auto_ids":
+        originals = []
+        for row in rows:
+            original = str(row.get(project.record_id_field, ""))
+            if original not in originals:
+                originals.append(original)
+        return _json([f"{new},{old}" for new, old in zip(record_ids, originals)])
+    return _json(record_ids)
+
+
+def _delete_records(project: FakeProject, form, files) -> Response:
+    return _text(project.delete_records(_indexed(form, "records"), event=form.get("event") or None))
+
+
+def _rename_record(project: FakeProject, form, files) -> Response:
+    project.rename_record(form["record"], form["new_record_name"])
+    return _text(1)
+
+
+def _generate_next_record_name(project: FakeProject, form, files) -> Response:
+    return _text(project.next_record_name())
+
+
+def _file_key(form: Dict[str, str]) -> Tuple[str, str, str, str]:
+    try:
+        return form["record"], form["field"], form.get("event", ""), form.get("repeat_instance", "")
+    except KeyError as exc:
+        raise FakeProjectError(f"The parameter {exc} is missing.") from None
+
+
+def _export_file(project: FakeProject, form, files) -> Response:
+    return _file(*project.get_file(*_file_key(form)))
+
+
+def _import_file(project: FakeProject, form, files) -> Response:
+    if "file" not in files:
+        raise FakeProjectError("No valid file was uploaded")
+    record_id, field_name, event, repeat_instance = _file_key(form)
+    name, content = files["file"]
+    project.set_file(record_id, field_name, name, content, event, repeat_instance)
+    return _text("")
+
+
+def _delete_file(project: FakeProject, form, files) -> Response:
+    project.delete_file(*_file_key(form))
+    return _text(1)
+
+
+def _folder_id(form: Dict[str, str]) -> Optional[int]:
+    value = form.get("folder_id")
+    return int(value) if value else None
+
+
+def _list_repository(project: FakeProject, form, files) -> Response:
+    entries = project.list_repository(_folder_id(form))
+    if form.get("format", "json") == "json":
+        return _json(entries)
+    return _table(form, ["folder_id", "doc_id", "name"], entries)
+
+
+def _create_folder(project: FakeProject, form, files) -> Response:
+    return _json([{"folder_id": project.create_folder(form["name"], _folder_id(form))}])
+
+
+def _export_repository_file(project: FakeProject, form, files) -> Response:
+    entry = project.get_document(int(form["doc_id"]))
+    return _file(entry["name"], entry["content"])
+
+
+def _import_repository_file(project: FakeProject, form, files) -> Response:
+    if "file" not in files:
+        raise FakeProjectError("No valid file was uploaded")
+    name, content = files["file"]
+    project.add_document(name, content, _folder_id(form))
+    return _text("")
+
+
+def _delete_repository_file(project: FakeProject, form, files) -> Response:
+    project.delete_document(int(form["doc_id"]))
+    return _text(1)
+
+
+def _export_logs(project: FakeProject, form, files) -> Response:
+    rows = project.export_logs(
+        logtype=form.get("logtype") or None,
+        user=form.get("user") or None,
+        record=form.get("record") or None,
+        begin=_datetime(form, "beginTime"),
+        end=_datetime(form, "endTime"),
+    )
+    return _table(form, LOG_COLUMNS, rows)
+
+
+_ROUTES: Dict[Tuple[str, str], Callable[[FakeProject, Dict[str, str], Dict[str, Tuple[str, bytes]]], Response]] = {
+    ("version", "export"): _version,
+    ("project", "export"): _export_project,
+    ("metadata", "export"): _export_metadata,
+    ("metadata", "import"): _import_metadata,
+    ("instrument", "export"): _export_instruments,
+    ("exportFieldNames", "export"): _export_field_names,
+    ("dag", "export"): _export_dags,
+    ("user", "export"): _export_users,
+    ("arm", "export"): _export_arms,
+    ("arm", "import"): _import_arms,
+    ("arm", "delete"): _delete_arms,
+    ("event", "export"): _export_events,
+    ("event", "import"): _import_events,
+    ("event", "delete"): _delete_events,
+    ("formEventMapping", "export"): _export_form_event_mappings,
+    ("formEventMapping", "import"): _import_form_event_mappings,
+    ("repeatingFormsEvents", "export"): _export_repeating_forms_events,
+    ("repeatingFormsEvents", "import"): _import_repeating_forms_events,
+    ("record", "export"): _export_records,
+    ("record", "import"): _import_records,
+    ("record", "delete"): _delete_records,
+    ("record", "rename"): _rename_record,
+    ("generateNextRecordName", "export"): _generate_next_record_name,
+    ("file", "export"): _export_file,
+    ("file", "import"): _import_file,
+    ("file", "delete"): _delete_file,
+    ("fileRepository", "list"): _list_repository,
+    ("fileRepository", "createFolder"): _create_folder,
+    ("fileRepository", "export"): _export_repository_file,
+    ("fileRepository", "import"): _import_repository_file,
+    ("fileRepository", "delete"): _delete_repository_file,
+    ("log", "export"): _export_logs,
+}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m redcaplite.testing",
+        description="Serve a synthetic REDCap project for benchmarks and offline tests.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on.")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (0 picks a free port).")
+    parser.add_argument("--token", default=DEFAULT_TOKEN, help="API token clients must send.")
+    parser.add_argument("--records", type=int, default=1000, help="Number of synthetic records.")
+    parser.add_argument("--fields", type=int, default=20, help="Number of data fields per record.")
+    parser.add_argument("--forms", type=int, default=2, help="Number of instruments.")
+    parser.add_argument("--events", type=int, default=0, help="Number of events (0 for a classic project).")
+    parser.add_argument("--file-fields", type=int, default=0, help="Number of File Upload fields, filled on every record.")
+    parser.add_argument("--repository-files", type=int, default=0, help="Number of File Repository documents.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the synthetic data.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra random seconds per response.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of answering with --error-status.")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status used for injected errors.")
+    args = parser.parse_args(argv)
+
+    project = FakeProject.generate(
+        records=args.records,
+        fields=args.fields,
+        forms=args.forms,
+        events=args.events,
+        file_fields=args.file_fields,
+        repository_files=args.repository_files,
+        seed=args.seed,
+    )
+    server = FakeRedcapServer(
+        project,
+        token=args.token,
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed,
+    )
+    server.start()
+    print(f"Serving {args.records} synthetic records at {server.url} (token {server.token})", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+from datetime import datetime
+
+import pytest
+
+from redcaplite import api
+from redcaplite.api.utils import OPTIONAL, PayloadSpec, field_to_index, optional_field, require_field
+
+
+@optional_field('format', 'csv')
+@field_to_index('records')
+@optional_field('flag')
+@optional_field('when', datetime(2024, 1, 2, 3, 4, 5))
+@require_field('record')
+def _build_payload(data):
+    return {'content': 'test'}
+
+
+def test_stacked_decorators_compile_into_one_spec():
+    spec = _build_payload.payload_spec
+    assert [step[:2] for step in spec.steps] == [
+        ('require', 'record'),
+        ('optional', 'when'),
+        ('optional', 'flag'),
+        ('index', 'records'),
+        ('optional', 'format'),
+    ]
+    assert _build_payload.__name__ == '_build_payload'
+
+
+def test_compiled_builder_keeps_decorator_order_and_conversions():
+    result = _build_payload({'record': '1', 'flag': True, 'records': [1, 2], 'format': 'json'})
+    assert list(result.items()) == [
+        ('content', 'test'),
+        ('record', '1'),
+        ('when', '2024-01-02 03:04:05'),
+        ('flag', 'true'),
+        ('records[0]', '1'),
+        ('records[1]', '2'),
+        ('format', 'json'),
+    ]
+
+
+def test_compiled_builder_handles_missing_and_none_values():
+    result = _build_payload({'record': '1', 'flag': None, 'when': None})
+    assert result == {'content': 'test', 'record': '1', 'when': None, 'format': 'csv'}
+    with pytest.raises(KeyError):
+        _build_payload({})
+
+
+def test_payload_spec_compiles_without_decorators():
+    build = PayloadSpec(lambda data: {'content': 'log'}).add(OPTIONAL, 'beginTime').compile()
+    assert build({'beginTime': datetime(2024, 5, 6)}) == {'content': 'log', 'beginTime': '2024-05-06 00:00:00'}
+    assert build({}) == {'content': 'log'}
+    with pytest.raises(ValueError, match='Unknown payload step kind'):
+        PayloadSpec(lambda data: {}).add('bogus', 'x').compile()
+
+
+def test_api_builders_match_previous_output():
+    assert api.export_records({'records': ['1'], 'exportSurveyFields': False}) == {
+        'content': 'record', 'action': 'export', 'type': 'flat',
+        'exportSurveyFields': 'false', 'records[0]': '1', 'format': 'csv',
+    }
+    assert api.delete_records({'records': ['3']}) == {
+        'content': 'record', 'action': 'delete', 'format': 'json', 'records[0]': '3',
+    }
+
+
+def test_compiled_builder_is_a_plain_closure():
+    @optional_field('format', 'csv')
+    @require_field('record')
+    def build(data):
+        return {'content': 'test'}
+
+    assert build.__code__.co_filename == api.utils.__file__
+    assert build({'record': '1'}) == {'content': 'test', 'record': '1', 'format': 'csv'}
+    assert build({'record': '2', 'format': 'json'}) == {'content': 'test', 'record': '2', 'format': 'json'}
+    assert build.payload_spec.compile()({'record': '3'}) == build({'record': '3'})
@@ -18,6 +18,7 @@ class MetadataClient(FakeClient):
         self.imported_metadata: pd.DataFrame | None = None
         self.imported_format: str | None = None
         self.exported_metadata_output_file: str | None = None
+        self.cache_clears = 0
         self._metadata = [
             {
                 "field_name": "record_id",
@@ -53,6 +54,9 @@ class MetadataClient(FakeClient):
             metadata = metadata.loc[metadata["field_name"].isin(fields)]
         return metadata
 
+    def clear_metadata_cache(self) -> None:
+        self.cache_clears += 1
+
     def import_metadata(self, data: pd.DataFrame, format: str = "csv") -> str:
         self.imported_metadata = data
         self.imported_format = format
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from redcaplite.cli.main import main
+from redcaplite.fanout import FanOutResult
+
+
+def test_main_fanout_prints_results_and_saves_files(monkeypatch, capsys, tmp_path) -> None:
+    calls = []
+
+    def fake_fan_out(profiles, operation, **kwargs):
+        calls.append((profiles, operation, kwargs))
+        return FanOutResult(results={
+            "site_a": pd.DataFrame({"record_id": ["1", "2"]}),
+            "site_b": pd.DataFrame({"record_id": ["3"]}),
+        })
+
+    monkeypatch.setattr("redcaplite.cli.fanout.fan_out", fake_fan_out)
+
+    assert main(["fanout", "records", "site_*", "--max-per-host", "2", "--output-dir", str(tmp_path)]) == 0
+
+    captured = capsys.readouterr()
+    assert calls[0][0] == ["site_*"]
+    assert calls[0][1] == "records"
+    assert calls[0][2]["max_per_host"] == 2
+    assert "site_a   ok" in captured.out
+    assert "2 rows" in captured.out
+    assert "Completed records for 2 profiles." in captured.out
+    assert pd.read_csv(tmp_path / "site_b_records.csv", dtype=str)["record_id"].tolist() == ["3"]
+
+
+def test_main_fanout_reports_failed_profiles(monkeypatch, capsys) -> None:
+    monkeypatch.setattr(
+        "redcaplite.cli.fanout.fan_out",
+        lambda profiles, operation, **kwargs: FanOutResult(
+            results={"site_a": "14.0.0"},
+            errors={"site_b": ValueError('Access token for profile "site_b" was not found.')},
+        ),
+    )
+
+    assert main(["fanout", "version", "site_a", "site_b"]) == 1
+
+    captured = capsys.readouterr()
+    assert "14.0.0" in captured.out
+    assert 'Access token for profile "site_b" was not found.' in captured.out
+    assert "Error: 1 of 2 profiles failed." in captured.err
+
+
+def test_main_fanout_errors_when_no_profiles_match(monkeypatch, capsys) -> None:
+    def fake_fan_out(profiles, operation, **kwargs):
+        raise ValueError("No stored profiles match nothing_*.")
+
+    monkeypatch.setattr("redcaplite.cli.fanout.fan_out", fake_fan_out)
+
+    assert main(["fanout", "metadata", "nothing_*"]) == 1
+    assert "Error: No stored profiles match nothing_*." in capsys.readouterr().err
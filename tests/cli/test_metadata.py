@@ -334,3 +334,139 @@ def test_main_metadata_remove_field_prompts_before_import(monkeypatch, capsys) -
     assert "Preview of field to remove:" in captured.out
     assert "Error: cancelled by user." in captured.err
     assert client.imported_metadata is None
+
+
+def test_main_metadata_edit_reads_metadata_past_the_cache(monkeypatch) -> None:
+    client = MetadataClient("https://redcap.example.edu/api/", "secret-token")
+    monkeypatch.setattr("redcaplite.cli.metadata.build_client", lambda profile: client)
+
+    assert main(["metadata", "demo", "edit", "age", "--field_label", "Age in years", "--yes"]) == 0
+    assert client.cache_clears == 1
+
+    assert main(["metadata", "demo", "list"]) == 0
+    assert client.cache_clears == 1
+
+
+def test_main_metadata_apply_imports_all_operations_once(monkeypatch, capsys, tmp_path) -> None:
+    client = MetadataClient("https://redcap.example.edu/api/", "secret-token")
+    monkeypatch.setattr("redcaplite.cli.metadata.build_client", lambda profile: client)
+    changes_file = tmp_path / "changes.yml"
+    changes_file.write_text(
+        "operations:\n"
+        "  - {op: add, field_name: height, form_name: demographics}\n"
+        "  - {op: edit, field_name: age, field_label: Age in years}\n"
+        "  - {op: move, field_name: height, before: age}\n",
+        encoding="utf-8",
+    )
+
+    assert main(["metadata", "demo", "apply", str(changes_file), "--yes"]) == 0
+
+    captured = capsys.readouterr()
+    assert "Added: 1" in captured.out
+    assert "Moved: 1" in captured.out
+    assert 'Applied 3 metadata operations to "demo" in one import.' in captured.out
+    assert list(client.imported_metadata["field_name"]) == ["record_id", "height", "age"]
+    assert client.imported_metadata.loc[2, "field_label"] == "Age in years"
+    assert client.cache_clears == 1
+
+
+def test_main_metadata_apply_reports_errors_without_importing(monkeypatch, capsys, tmp_path) -> None:
+    client = MetadataClient("https://redcap.example.edu/api/", "secret-token")
+    monkeypatch.setattr("redcaplite.cli.metadata.build_client", lambda profile: client)
+    changes_file = tmp_path / "changes.yml"
+    changes_file.write_text(
+        "- {op: edit, field_name: missing, field_label: X}\n"
+        "- {op: add, field_name: status, form_name: demographics, field_type: radio}\n"
+        "- {op: remove, field_name: age}\n",
+        encoding="utf-8",
+    )
+
+    assert main(["metadata", "demo", "apply", str(changes_file), "--yes"]) == 1
+
+    captured = capsys.readouterr()
+    assert 'Operation 1 (edit "missing")' in captured.err
+    assert 'Operation 2 (add "status")' in captured.err
+    assert "2 of 3 operations failed; no metadata was imported." in captured.err
+    assert client.imported_metadata is None
+
+
+def test_main_metadata_apply_dry_run_never_imports(monkeypatch, capsys, tmp_path) -> None:
+    client = MetadataClient("https://redcap.example.edu/api/", "secret-token")
+    monkeypatch.setattr("redcaplite.cli.metadata.build_client", lambda profile: client)
+    changes_file = tmp_path / "changes.yml"
+    changes_file.write_text("- {op: remove, field_name: age}\n", encoding="utf-8")
+
+    assert main(["metadata", "demo", "apply", str(changes_file), "--dry-run"]) == 0
+
+    captured = capsys.readouterr()
+    assert "Removed: 1" in captured.out
+    assert "Dry run enabled; no metadata was imported." in captured.out
+    assert client.imported_metadata is None
+
+
+def test_main_metadata_lint_reports_clean_dictionary(monkeypatch, capsys) -> None:
+    client = MetadataClient("https://redcap.example.edu/api/", "secret-token")
+    monkeypatch.setattr("redcaplite.cli.metadata.build_client", lambda profile: client)
+
+    assert main(["metadata", "demo", "lint"]) == 0
+
+    captured = capsys.readouterr()
+    assert 'Metadata lint for "demo":' in captured.out
+    assert "Fields: 2" in captured.out
+    assert "Errors: 0" in captured.out
+    assert "No metadata errors found." in captured.out
+    assert client.imported_metadata is None
+
+
+def test_main_metadata_lint_file_reports_issues(monkeypatch, capsys, tmp_path) -> None:
+    monkeypatch.setattr(
+        "redcaplite.cli.metadata.build_client",
+        lambda profile: (_ for _ in ()).throw(AssertionError("lint --file must not contact REDCap")),
+    )
+    metadata_file = tmp_path / "dictionary.csv"
+    metadata_file.write_text(
+        "field_name,form_name,field_type,select_choices_or_calculations,branching_logic\n"
+        "record_id,enrollment,text,,\n"
+        'status,enrollment,radio,"1, Yes | 1, No",[missing_field] = 1\n',
+        encoding="utf-8",
+    )
+
+    assert main(["metadata", "demo", "lint", "--file", str(metadata_file)]) == 1
+
+    captured = capsys.readouterr()
+    assert "Errors: 2" in captured.out
+    assert "duplicate-choice-code" in captured.out
+    assert "unknown-field-reference" in captured.out
+    assert "2 metadata issues found." in captured.err
+
+
+def test_main_metadata_lint_strict_fails_on_warnings(monkeypatch, capsys, tmp_path) -> None:
+    metadata_file = tmp_path / "dictionary.csv"
+    metadata_file.write_text(
+        "field_name,form_name,field_type,text_validation_type_or_show_slider_number\n"
+        "record_id,enrollment,text,my_custom_validation\n",
+        encoding="utf-8",
+    )
+
+    assert main(["metadata", "demo", "lint", "--file", str(metadata_file)]) == 0
+    assert main(["metadata", "demo", "lint", "--file", str(metadata_file), "--strict"]) == 1
+
+    captured = capsys.readouterr()
+    assert "Warnings: 1" in captured.out
+    assert "1 metadata issues found." in captured.err
+
+
+def test_main_metadata_lint_workers_use_the_pool_for_any_size(monkeypatch, tmp_path) -> None:
+    from redcaplite.metadata_ops.lint import LintReport
+
+    calls = []
+    monkeypatch.setattr(
+        "redcaplite.cli.metadata.lint_metadata",
+        lambda metadata, **kwargs: calls.append(kwargs) or LintReport(fields=len(metadata), issues=[]),
+    )
+    metadata_file = tmp_path / "dictionary.csv"
+    metadata_file.write_text("field_name,form_name,field_type\nrecord_id,enrollment,text\n", encoding="utf-8")
+
+    assert main(["metadata", "demo", "lint", "--file", str(metadata_file), "--workers", "4"]) == 0
+
+    assert calls == [{"max_workers": 4, "parallel_min_fields": 0}]
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+
+from redcaplite.cli.main import main
+from redcaplite.snapshot import SnapshotSyncResult
+from tests.cli.fakes import FakeClient
+
+
+class SnapshotClient(FakeClient):
+    def __init__(self, url: str, token: str) -> None:
+        super().__init__(url, token)
+        self.sync_calls: list[tuple[Path, bool, str | None]] = []
+
+    def sync_snapshot(self, path: Path, full: bool = False, server_timezone: str | None = None) -> SnapshotSyncResult:
+        self.sync_calls.append((path, full, server_timezone))
+        return SnapshotSyncResult(
+            full=full,
+            updated_records=3,
+            deleted_records=1,
+            watermark=datetime(2026, 3, 25, 12, 0, 0),
+        )
+
+
+def test_main_records_sync_defaults_snapshot_path(monkeypatch, capsys) -> None:
+    client = SnapshotClient("https://redcap.example.edu/api/", "secret-token")
+    monkeypatch.setattr("redcaplite.cli.records.build_client", lambda profile: client)
+
+    assert main(["records", "demo", "sync"]) == 0
+
+    captured = capsys.readouterr()
+    assert client.sync_calls == [(Path("demo_records.sqlite"), False, None)]
+    assert 'Incremental sync of "demo" saved to demo_records.sqlite' in captured.out
+    assert "Updated records: 3" in captured.out
+    assert "Deleted records: 1" in captured.out
+    assert "Watermark: 2026-03-25 12:00:00" in captured.out
+    assert captured.err == ""
+
+
+def test_main_records_sync_full_with_snapshot_path(monkeypatch, capsys, tmp_path) -> None:
+    client = SnapshotClient("https://redcap.example.edu/api/", "secret-token")
+    monkeypatch.setattr("redcaplite.cli.records.build_client", lambda profile: client)
+    snapshot = tmp_path / "warehouse.sqlite"
+
+    assert main(["records", "demo", "sync", "--snapshot", str(snapshot), "--full"]) == 0
+
+    assert client.sync_calls == [(snapshot, True, None)]
+    assert "Full sync" in capsys.readouterr().out
+
+
+def test_main_records_sync_passes_server_timezone(monkeypatch, capsys) -> None:
+    client = SnapshotClient("https://redcap.example.edu/api/", "secret-token")
+    monkeypatch.setattr("redcaplite.cli.records.build_client", lambda profile: client)
+
+    assert main(["records", "demo", "sync", "--server-timezone", "America/Chicago"]) == 0
+
+    assert client.sync_calls == [(Path("demo_records.sqlite"), False, "America/Chicago")]
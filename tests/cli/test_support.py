@@ -5,6 +5,7 @@ from io import StringIO
 import pytest
 
 from redcaplite.auth import TokenStore
+from redcaplite.cache import MetadataCache
 from redcaplite.cli.helpers import ProfileNotFoundError, TokenNotFoundError, build_client
 from redcaplite.cli.output import print_preview, print_success, print_table
 from redcaplite.cli.prompts import confirm, prompt
@@ -101,3 +102,18 @@ def test_prompt_strips_whitespace() -> None:
 def test_confirm_accepts_yes_variants() -> None:
     assert confirm("Continue? ", input_func=lambda _: "YeS") is True
     assert confirm("Continue? ", input_func=lambda _: "n") is False
+
+
+def test_build_client_attaches_metadata_cache(tmp_path, monkeypatch) -> None:
+    profile_store = ProfileStore(tmp_path)
+    token_store = TokenStore(tmp_path)
+    profile_store.upsert(Profile(name="demo", url="https://redcap.example.edu/api/"))
+    token_store.save_token("demo", "secret-token")
+    monkeypatch.delenv("RCL_NO_CACHE", raising=False)
+
+    client = build_client("demo", profile_store=profile_store, token_store=token_store, client_factory=FakeClient)
+    assert isinstance(client.metadata_cache, MetadataCache)
+
+    monkeypatch.setenv("RCL_NO_CACHE", "1")
+    client = build_client("demo", profile_store=profile_store, token_store=token_store, client_factory=FakeClient)
+    assert not hasattr(client, "metadata_cache")
@@ -72,7 +72,7 @@ def test_main_sync_prints_differences_and_imports_source_metadata(monkeypatch, c
 
     captured = capsys.readouterr()
     assert 'Metadata comparison: source "profile1" -> target "profile2"' in captured.out
-    assert "all-column anti joins" in captured.out
+    assert "matches fields by field_name" in captured.out
     assert "Fields to add in target:" in captured.out
     assert "height" in captured.out
     assert "Fields to update in target:" in captured.out
@@ -87,6 +87,7 @@ def test_main_sync_prints_differences_and_imports_source_metadata(monkeypatch, c
     assert 'Imported metadata from "profile1" into "profile2".' in captured.out
     assert target_client.imported_metadata is not None
     assert list(target_client.imported_metadata["field_name"]) == ["record_id", "age", "height"]
+    assert source_client.cache_clears == target_client.cache_clears == 1
     assert captured.err == ""
 
 
@@ -241,6 +242,7 @@ def test_main_sync_dry_run_never_imports(monkeypatch, capsys) -> None:
     captured = capsys.readouterr()
     assert "Dry run enabled; no metadata was imported." in captured.out
     assert target_client.imported_metadata is None
+    assert source_client.cache_clears == target_client.cache_clears == 0
 
 
 def test_main_sync_prints_summary_counts(monkeypatch, capsys) -> None:
@@ -297,3 +299,71 @@ def test_main_sync_exports_backup_before_import(monkeypatch, capsys, tmp_path) -
     assert "Exported target metadata backup" in captured.out
     assert target_client.exported_metadata_output_file == str(backup_file)
     assert target_client.imported_metadata is not None
+
+
+def test_main_sync_compares_several_targets_and_imports_only_changed_ones(monkeypatch, capsys, tmp_path) -> None:
+    source_metadata = [
+        {"field_name": "record_id", "form_name": "enrollment", "field_type": "text", "field_label": "Record ID"},
+        {"field_name": "age", "form_name": "demographics", "field_type": "text", "field_label": "Age"},
+    ]
+    clients = {
+        "source": SyncMetadataClient("https://redcap.example.edu/api/", "source-token", source_metadata),
+        "site_a": SyncMetadataClient("https://redcap.example.edu/api/", "site-a-token", list(source_metadata)),
+        "site_b": SyncMetadataClient(
+            "https://redcap.example.edu/api/",
+            "site-b-token",
+            [source_metadata[1], {**source_metadata[0], "field_label": "Study ID"}],
+        ),
+    }
+    monkeypatch.setattr("redcaplite.cli.sync.build_client", lambda profile: clients[profile])
+
+    assert main(["sync", "source", "site_a", "site_b", "--yes", "--show-changes", "--backup-file", str(tmp_path / "backup.csv")]) == 0
+
+    captured = capsys.readouterr()
+    assert 'No metadata differences found between "source" and "site_a".' in captured.out
+    assert "Moves: 1" in captured.out
+    assert "Changed values:" in captured.out
+    assert "Study ID" in captured.out
+    assert clients["site_a"].imported_metadata is None
+    assert list(clients["site_b"].imported_metadata["field_name"]) == ["record_id", "age"]
+    assert clients["site_b"].exported_metadata_output_file == str(tmp_path / "backup_site_b.csv")
+
+
+def test_compare_metadata_reports_value_changes_and_moves() -> None:
+    source_metadata = pd.DataFrame(
+        [
+            {"field_name": "record_id", "field_label": "Record ID"},
+            {"field_name": "age", "field_label": "Participant Age"},
+            {"field_name": "height", "field_label": "Height"},
+        ]
+    )
+    target_metadata = pd.DataFrame(
+        [
+            {"field_name": "record_id", "field_label": "Record ID"},
+            {"field_name": "height", "field_label": "Height"},
+            {"field_name": "age", "field_label": "Age"},
+        ]
+    )
+
+    comparison = compare_metadata(source_metadata, target_metadata)
+
+    assert comparison["changes"].to_dict(orient="records") == [
+        {"field_name": "age", "column": "field_label", "source": "Participant Age", "target": "Age"}
+    ]
+    assert list(comparison["moves"]["field_name"]) == ["age"]
+
+
+def test_main_sync_reports_duplicate_field_names(monkeypatch, capsys) -> None:
+    row = {"field_name": "age", "form_name": "enrollment", "field_type": "text", "field_label": "Age"}
+    source_client = SyncMetadataClient("https://source.example.edu/api/", "source-token", metadata=[row, row])
+    target_client = SyncMetadataClient("https://target.example.edu/api/", "target-token", metadata=[row])
+    monkeypatch.setattr(
+        "redcaplite.cli.sync.build_client",
+        lambda profile: source_client if profile == "profile1" else target_client,
+    )
+
+    assert main(["sync", "profile1", "profile2", "--yes"]) == 1
+
+    captured = capsys.readouterr()
+    assert "Duplicate field_name values in metadata: age" in captured.err
+    assert target_client.imported_metadata is None
@@ -1,4 +1,5 @@
 import os
+import pytest
 from unittest.mock import Mock, patch, mock_open
 from redcaplite.http import Client
 
@@ -90,7 +91,7 @@ def test_client__post():
     client = Client('https://example.com', 'token')
     mock_response = Mock()
     mock_response.status_code = 200
-    with patch('requests.post', return_value=mock_response) as mock_post:
+    with patch('requests.Session.post', return_value=mock_response) as mock_post:
         response = client._Client__post({})
         assert response == mock_response
         mock_post.assert_called_once_with(
@@ -102,15 +103,17 @@ def test_client_file_download_api():
     client = Client('https://example.com', 'token')
     mock_response = Mock()
     mock_response.status_code = 200
-    mock_response.content = b'test content'  # Specify the content attribute
+    mock_response.iter_content.return_value = iter([b'test ', b'content'])
     file_path = 'download.raw'
-    with patch.object(client, '_Client__post', return_value=mock_response):
+    with patch.object(client, '_Client__post', return_value=mock_response) as mock_post:
         response = client.file_download_api({})
         assert response == mock_response
+        mock_post.assert_called_once_with({}, stream=True)
+        mock_response.close.assert_called_once_with()
 
     assert os.path.exists(file_path)
     with open(file_path, 'rb') as f:
-        assert f.read() == mock_response.content
+        assert f.read() == b'test content'
     os.remove(file_path)
 
 
@@ -141,3 +144,68 @@ def test_client_post_csv_with_empty_columns():
             output_file=None,
             empty_columns=["arm_num", "name"],
         )
+
+
+def test_client_reuses_pooled_session():
+    """Test Client owns one pooled session configured from the constructor"""
+    client = Client('https://example.com', 'token', pool_connections=3, pool_maxsize=7, pool_block=True)
+    adapter = client.session.get_adapter('https://example.com')
+    assert adapter._pool_connections == 3
+    assert adapter._pool_maxsize == 7
+    assert adapter._pool_block is True
+    assert 'Connection' not in client.session.headers or client.session.headers['Connection'] != 'close'
+
+    mock_response = Mock()
+    mock_response.status_code = 200
+    with patch.object(client.session, 'post', return_value=mock_response) as mock_post:
+        client._Client__post({})
+        client._Client__post({})
+        assert mock_post.call_count == 2
+
+
+def test_client_without_keep_alive():
+    """Test Client asks the server to close connections when keep-alive is off"""
+    client = Client('https://example.com', 'token', keep_alive=False)
+    assert client.session.headers['Connection'] == 'close'
+
+
+def test_client_context_manager_closes_session():
+    """Test Client closes its pooled session when used as a context manager"""
+    client = Client('https://example.com', 'token')
+    with patch.object(client.session, 'close') as mock_close:
+        with client as entered:
+            assert entered is client
+        mock_close.assert_called_once_with()
+
+
+def test_client_post_csv_with_chunksize():
+    """Test Client post method routes chunked CSV exports to the streaming API"""
+    client = Client('https://example.com', 'token')
+    chunks = iter([])
+    with patch.object(client, '_Client__csv_stream_api', return_value=chunks) as mock_stream_api:
+        response = client.post({'format': 'csv'}, chunksize=100, output_file='records.csv')
+        assert response is chunks
+        mock_stream_api.assert_called_once_with(
+            {'format': 'csv'},
+            100,
+            pd_read_csv_kwargs={},
+            output_file='records.csv',
+        )
+
+
+def test_client_post_json_with_chunksize():
+    """Test Client post method rejects chunksize for non-CSV formats"""
+    client = Client('https://example.com', 'token')
+    with pytest.raises(ValueError):
+        client.post({'format': 'json'}, chunksize=100)
+
+
+def test_client__post_stream():
+    """Test Client _post method requests a streamed body when asked"""
+    client = Client('https://example.com', 'token')
+    mock_response = Mock()
+    mock_response.status_code = 200
+    with patch('requests.Session.post', return_value=mock_response) as mock_post:
+        client._Client__post({}, stream=True)
+        mock_post.assert_called_once_with(
+            'https://example.com', data={'token': 'token', 'returnFormat': 'json'}, files=None, stream=True)
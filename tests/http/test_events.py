@@ -0,0 +1,159 @@
+import asyncio
+from datetime import timedelta
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+import requests
+
+from redcaplite import RedcapClient
+from redcaplite.http import RequestEvent, RetryPolicy
+from redcaplite.http.error import APIException
+from redcaplite.http.events import trace_timings
+
+
+def _response(status_code=200, body=b'', elapsed=0.25, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    response.elapsed = timedelta(seconds=elapsed)
+    response.headers.update(headers or {})
+    return response
+
+
+def test_client_no_longer_prints_status(capsys):
+    """Test that requests do not write the HTTP status to stdout"""
+    client = RedcapClient('https://example.com', 'token')
+    with patch('requests.Session.post', return_value=_response(body=b'14.0.0')):
+        assert client.get_version() == '14.0.0'
+    assert capsys.readouterr().out == ''
+
+
+def test_request_observer_receives_csv_export_event():
+    """Test that a CSV export reports one event including its parse time"""
+    events = []
+    client = RedcapClient('https://example.com', 'token', request_observers=[events.append])
+    body = b'record_id,age\n1,30\n2,40\n'
+
+    with patch('requests.Session.post', return_value=_response(body=body, elapsed=0.5)):
+        df = client.export_records(format='csv')
+
+    assert len(df) == 2
+    assert len(events) == 1
+    event = events[0]
+    assert isinstance(event, RequestEvent)
+    assert (event.content, event.action, event.format) == ('record', 'export', 'csv')
+    assert event.status_code == 200
+    assert event.response_bytes == len(body)
+    assert event.payload_bytes > len('content=record')
+    assert event.attempts == 1
+    assert event.ttfb_seconds == 0.5
+    assert event.dns_seconds is None and event.connect_seconds is None
+    assert event.parse_seconds is not None and event.parse_seconds >= 0
+    assert event.total_seconds >= 0
+    assert event.error is None
+
+
+def test_request_observer_text_and_json_exports():
+    """Test that JSON exports carry a parse time and text exports do not"""
+    events = []
+    client = RedcapClient('https://example.com', 'token')
+    client.add_request_observer(events.append)
+
+    with patch('requests.Session.post', side_effect=[_response(body=b'14.0.0'), _response(body=b'[{"arm_num": 1}]')]):
+        client.get_version()
+        assert client.get_arms() == [{'arm_num': 1}]
+
+    assert [event.content for event in events] == ['version', 'arm']
+    assert events[0].parse_seconds is None
+    assert events[1].parse_seconds is not None
+
+    client.remove_request_observer(events.append)
+    with patch('requests.Session.post', return_value=_response(body=b'14.0.0')):
+        client.get_version()
+    assert len(events) == 2
+
+
+def test_request_observer_reports_errors_and_retries():
+    """Test that failed calls are reported once with the error and attempt count"""
+    events = []
+    client = RedcapClient(
+        'https://example.com', 'token',
+        retry_policy=RetryPolicy(max_retries=1), request_observers=[events.append])
+    responses = [_response(503), _response(400, b'{"error": "bad field"}')]
+
+    with patch('requests.Session.post', side_effect=responses), patch('redcaplite.http.handler.time.sleep'):
+        with pytest.raises(APIException):
+            client.export_records(format='csv')
+
+    assert len(events) == 1
+    assert events[0].attempts == 2
+    assert events[0].status_code == 400
+    assert isinstance(events[0].error, APIException)
+    assert events[0].parse_seconds is None
+
+
+def test_request_observer_reports_output_file_errors(tmp_path):
+    """Test that an event is still reported when saving output_file fails"""
+    events = []
+    client = RedcapClient('https://example.com', 'token', request_observers=[events.append])
+
+    with patch('requests.Session.post', return_value=_response(body=b'record_id\n1\n')):
+        with patch('redcaplite.http.handler.write_output', side_effect=OSError('disk full')):
+            with pytest.raises(OSError):
+                client.export_records(format='csv', output_file=tmp_path / 'records.csv')
+
+    assert len(events) == 1
+    assert isinstance(events[0].error, OSError)
+
+
+def test_trace_timings_records_connection_and_ttfb():
+    """Test the httpx trace hook that fills in connect and TTFB timings"""
+    event = RequestEvent(content='record')
+    names = [
+        'connection.connect_tcp.started',
+        'connection.connect_tcp.complete',
+        'connection.start_tls.started',
+        'connection.start_tls.complete',
+        'http11.receive_response_headers.complete',
+    ]
+    clock = iter([0.5, 1.0, 1.25, 1.3, 1.4, 2.0])
+
+    async def run():
+        trace = trace_timings(event)
+        for name in names:
+            await trace(name, {})
+
+    with patch('redcaplite.http.events.time.perf_counter', side_effect=lambda: next(clock)):
+        asyncio.run(run())
+    assert event.connect_seconds == pytest.approx(0.35)
+    assert event.ttfb_seconds == pytest.approx(1.5)
+
+
+def test_async_request_observer_receives_events():
+    """Test that the async client reports the same events"""
+    httpx = pytest.importorskip("httpx")
+    from redcaplite import AsyncRedcapClient
+
+    events = []
+
+    def handler(request):
+        if b'content=version' in request.content:
+            return httpx.Response(200, text='14.0.0')
+        return httpx.Response(200, text='record_id\n1\n')
+
+    async def run():
+        async with AsyncRedcapClient(
+            'https://example.com', 'token',
+            transport=httpx.MockTransport(handler), request_observers=[events.append],
+        ) as client:
+            await client.get_version()
+            return await client.export_records(format='csv')
+
+    df = asyncio.run(run())
+    assert df.equals(pd.DataFrame({'record_id': [1]}))
+    assert [(event.content, event.status_code, event.attempts) for event in events] == [
+        ('version', 200, 1), ('record', 200, 1)]
+    assert events[0].parse_seconds is None
+    assert events[1].parse_seconds is not None
+    assert events[1].response_bytes == len(b'record_id\n1\n')
@@ -1,10 +1,17 @@
 import pytest
 from unittest.mock import Mock, patch, mock_open
 from redcaplite.http.error import APIException
-from redcaplite.http import response_error_handler, output_handler, csv_handler, json_handler, text_handler, file_download_handler, file_upload_handler
+from redcaplite.http import response_error_handler, output_handler, csv_handler, csv_stream_handler, json_handler, text_handler, file_download_handler, file_upload_handler
+import io
 import os
 import pandas as pd
 import tempfile
+from types import SimpleNamespace
+
+
+def _text_response(text, **kwargs):
+    """Mock response whose raw body is ``text`` encoded as UTF-8."""
+    return Mock(text=text, content=text.encode('utf-8'), encoding='utf-8', **kwargs)
 
 
 def test_response_error_handler_200():
@@ -89,14 +96,14 @@ def test_response_error_handler_unknown_status_code():
     """Test unknown status code response"""
     mock_func = Mock(return_value=Mock(status_code=999))
     decorated_func = response_error_handler(mock_func)
-    with pytest.raises(Exception) as exc_info:
+    with pytest.raises(APIException) as exc_info:
         decorated_func(None, {})
     assert str(exc_info.value) == "Unknown issue."
 
 
 def test_csv_handler():
     """Test csv_handler decorator"""
-    mock_func = Mock(return_value=Mock(text='csv data'))
+    mock_func = Mock(return_value=_text_response('csv data'))
     decorated_func = csv_handler(mock_func)
     response = decorated_func(None, {})
     assert response == 'csv data'
@@ -115,7 +122,7 @@ def test_csv_handler_return_ids():
 
 def test_csv_handler_return_empty():
     """Test csv_handler decorator"""
-    mock_func = Mock(return_value=Mock(text='\n'))
+    mock_func = Mock(return_value=_text_response('\n'))
     decorated_func = csv_handler(mock_func)
     response = decorated_func(None, {})
     assert isinstance(response, pd.DataFrame)
@@ -125,7 +132,7 @@ def test_csv_handler_return_empty():
 
 def test_csv_handler_return_empty_with_columns():
     """Test csv_handler decorator returns schema-aware empty DataFrame."""
-    mock_func = Mock(return_value=Mock(text='\n'))
+    mock_func = Mock(return_value=_text_response('\n'))
     decorated_func = csv_handler(mock_func)
     response = decorated_func(None, {}, empty_columns=["arm_num", "name"])
     assert isinstance(response, pd.DataFrame)
@@ -135,7 +142,7 @@ def test_csv_handler_return_empty_with_columns():
 
 def test_csv_handler_csv_reader():
     """Test csv_handler decorator"""
-    mock_func = Mock(return_value=Mock(text='csv data,date\n04,005'))
+    mock_func = Mock(return_value=_text_response('csv data,date\n04,005'))
     decorated_func = csv_handler(mock_func)
     response = decorated_func(None, {})
     assert isinstance(response, pd.DataFrame)
@@ -145,7 +152,7 @@ def test_csv_handler_csv_reader():
 
 
 def test_csv_handler_with_pd_read_csv_kwargs():
-    mock_func = Mock(return_value=Mock(text='csv data,date\n04,005'))
+    mock_func = Mock(return_value=_text_response('csv data,date\n04,005'))
     decorated_func = csv_handler(mock_func)
     response = decorated_func(None, {}, pd_read_csv_kwargs={"dtype": str})
     assert isinstance(response, pd.DataFrame)
@@ -155,7 +162,7 @@ def test_csv_handler_with_pd_read_csv_kwargs():
 
 
 def test_csv_handler_with_output_file():
-    mock_func = Mock(return_value=Mock(text='csv data,date\n04,005'))
+    mock_func = Mock(return_value=_text_response('csv data,date\n04,005'))
     decorated_func = csv_handler(output_handler(mock_func))
     with tempfile.TemporaryDirectory() as tmpdir:
         output_file = os.path.join(tmpdir, 'records.csv')
@@ -166,9 +173,84 @@ def test_csv_handler_with_output_file():
             assert file_obj.read() == 'csv data,date\n04,005'
 
 
+def test_csv_handler_parses_bytes_without_decoding_text():
+    """Test csv_handler parses the raw body in the response's charset"""
+    response = SimpleNamespace(content='name\ncafé\n'.encode('latin-1'), encoding='ISO-8859-1')
+    decorated_func = csv_handler(Mock(return_value=response))
+    pd.testing.assert_frame_equal(
+        decorated_func(None, {}), pd.DataFrame({'name': ['café']}))
+
+
+def test_csv_handler_whitespace_body_is_empty():
+    """Test csv_handler treats a whitespace-only body as an empty export"""
+    response = SimpleNamespace(content=b' \r\n\t\n', encoding='utf-8')
+    decorated_func = csv_handler(Mock(return_value=response))
+    pd.testing.assert_frame_equal(
+        decorated_func(None, {}, empty_columns=['record_id']),
+        pd.DataFrame(columns=['record_id']))
+
+
+def test_csv_stream_handler_yields_chunks():
+    """Test csv_stream_handler parses the raw stream in row chunks"""
+    response = Mock(raw=io.BytesIO(b'record_id,age\n1,30\n2,40\n3,50\n'), encoding=None)
+    mock_func = Mock(return_value=response)
+    decorated_func = csv_stream_handler(mock_func)
+    chunks = list(decorated_func(None, {}, 2, pd_read_csv_kwargs={"dtype": {"record_id": str}}))
+    assert mock_func.call_args[0][1] == {"format": "csv"}
+    assert mock_func.call_args[1] == {"stream": True}
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks, ignore_index=True),
+        pd.DataFrame({'record_id': ['1', '2', '3'], 'age': [30, 40, 50]}))
+    assert response.raw.decode_content is True
+    response.close.assert_called_once_with()
+
+
+def test_csv_stream_handler_empty_body():
+    """Test csv_stream_handler yields nothing for a blank response"""
+    response = Mock(raw=io.BytesIO(b''), encoding=None)
+    decorated_func = csv_stream_handler(Mock(return_value=response))
+    assert list(decorated_func(None, {}, 10)) == []
+    response.close.assert_called_once_with()
+
+
+def test_csv_stream_handler_with_output_file():
+    """Test csv_stream_handler copies the raw stream to output_file"""
+    body = b'record_id,age\n1,30\n2,40\n'
+    decorated_func = csv_stream_handler(Mock(return_value=Mock(raw=io.BytesIO(body), encoding=None)))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_file = os.path.join(tmpdir, 'exports', 'records.csv')
+        chunks = list(decorated_func(None, {}, 1, output_file=output_file))
+        assert len(chunks) == 2
+        with open(output_file, 'rb') as file_obj:
+            assert file_obj.read() == body
+
+
+def test_csv_stream_handler_uses_response_encoding():
+    """Test csv_stream_handler decodes with the response charset like csv_handler"""
+    body = 'record_id,name\n1,Zoë\n'.encode('latin-1')
+    response = Mock(raw=io.BytesIO(body), encoding='latin-1')
+    chunks = list(csv_stream_handler(Mock(return_value=response))(None, {}, 10))
+    assert chunks[0]['name'].tolist() == ['Zoë']
+
+
+def test_csv_stream_handler_closes_response_without_iteration():
+    """Test the response is released when the chunks are closed or dropped unread"""
+    closed = Mock(raw=io.BytesIO(b'record_id\n1\n'), encoding=None)
+    chunks = csv_stream_handler(Mock(return_value=closed))(None, {}, 10)
+    chunks.close()
+    closed.close.assert_called_once_with()
+    assert list(chunks) == []
+    closed.close.assert_called_once_with()
+
+    dropped = Mock(raw=io.BytesIO(b'record_id\n1\n'), encoding=None)
+    csv_stream_handler(Mock(return_value=dropped))(None, {}, 10)
+    dropped.close.assert_called_once_with()
+
+
 def test_output_handler_with_output_file():
     """Test output_handler decorator writes raw response text"""
-    mock_func = Mock(return_value=Mock(text='raw content'))
+    mock_func = Mock(return_value=_text_response('raw content'))
     decorated_func = output_handler(mock_func)
     with tempfile.TemporaryDirectory() as tmpdir:
         output_file = os.path.join(tmpdir, 'output.txt')
@@ -178,6 +260,17 @@ def test_output_handler_with_output_file():
             assert file_obj.read() == 'raw content'
 
 
+def test_output_handler_writes_raw_bytes():
+    """Test output_handler saves the body exactly as it was received"""
+    body = '\ufeffrecord_id,name\r\n1,café\r\n'.encode('utf-8')
+    decorated_func = output_handler(Mock(return_value=SimpleNamespace(content=body)))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_file = os.path.join(tmpdir, 'records.csv')
+        decorated_func(None, {}, output_file=output_file)
+        with open(output_file, 'rb') as file_obj:
+            assert file_obj.read() == body
+
+
 def test_json_handler():
     """Test json_handler decorator"""
     mock_func = Mock(return_value=Mock(json=lambda: {'key': 'value'}))
@@ -189,8 +282,8 @@ def test_json_handler():
 
 def test_json_handler_with_output_file():
     """Test json_handler decorator with output file"""
-    mock_func = Mock(return_value=Mock(
-        text='{"key": "value"}',
+    mock_func = Mock(return_value=_text_response(
+        '{"key": "value"}',
         json=lambda: {'key': 'value'},
     ))
     decorated_func = json_handler(output_handler(mock_func))
@@ -205,7 +298,7 @@ def test_json_handler_with_output_file():
 
 def test_text_handler_with_output_file():
     """Test text_handler decorator with output file"""
-    mock_func = Mock(return_value=Mock(text='plain text'))
+    mock_func = Mock(return_value=_text_response('plain text'))
     decorated_func = text_handler(output_handler(mock_func))
     with tempfile.TemporaryDirectory() as tmpdir:
         output_file = os.path.join(tmpdir, 'output.txt')
@@ -219,7 +312,7 @@ def test_file_download_handler():
     """Test file_download_handler decorator"""
     mock_func = Mock(return_value=Mock(
         headers={"content-type": 'application/octet-stream; name="test.txt"'}))
-    mock_func.return_value.content = b'test content99'
+    mock_func.return_value.iter_content.return_value = iter([b'test content99'])
     decorated_func = file_download_handler(mock_func)
     with tempfile.TemporaryDirectory() as tmpdir:
         response = decorated_func(None, {}, file_dictionary=tmpdir)
@@ -231,7 +324,7 @@ def test_file_download_handler():
 def test_file_download_handler_no_content_type():
     """Test file_download_handler decorator with no content-type header"""
     mock_func = Mock(return_value=Mock(headers={}))
-    mock_func.return_value.content = b'test content8'
+    mock_func.return_value.iter_content.return_value = iter([b'test content8'])
     decorated_func = file_download_handler(mock_func)
     with tempfile.TemporaryDirectory() as tmpdir:
         response = decorated_func(None, {}, file_dictionary=tmpdir)
@@ -244,7 +337,7 @@ def test_file_download_handler_no_name_in_content_type():
     """Test file_download_handler decorator with no name in content-type header"""
     mock_func = Mock(return_value=Mock(
         headers={"content-type": 'application/octet-stream'}))
-    mock_func.return_value.content = b'test content7'
+    mock_func.return_value.iter_content.return_value = iter([b'test content7'])
     decorated_func = file_download_handler(mock_func)
     with tempfile.TemporaryDirectory() as tmpdir:
         response = decorated_func(None, {}, file_dictionary=tmpdir)
@@ -257,7 +350,7 @@ def test_file_download_handler_file_dictionary_not_provided():
     """Test file_download_handler decorator with no file dictionary provided"""
     mock_func = Mock(return_value=Mock(
         headers={"content-type": 'application/octet-stream; name="test.txt"'}))
-    mock_func.return_value.content = b'test content6'
+    mock_func.return_value.iter_content.return_value = iter([b'test content6'])
     decorated_func = file_download_handler(mock_func)
     response = decorated_func(None, {})
     assert response == mock_func.return_value
@@ -270,7 +363,7 @@ def test_file_download_handler_os_error():
     """Test file_download_handler decorator with os error"""
     mock_func = Mock(return_value=Mock(
         headers={"content-type": 'application/octet-stream; name="test.txt"'}))
-    mock_func.return_value.content = b'test content'
+    mock_func.return_value.iter_content.return_value = iter([b'test content'])
     decorated_func = file_download_handler(mock_func)
     with patch('os.path.join', side_effect=OSError()):
         with pytest.raises(OSError):
@@ -296,3 +389,43 @@ def test_file_upload_handler_file_not_found():
     with patch('builtins.open', side_effect=FileNotFoundError()):
         with pytest.raises(FileNotFoundError):
             decorated_func(None, 'test.txt', {})
+
+
+def test_file_download_handler_streams_into_file_obj_with_progress():
+    """Test file_download_handler streaming into a buffer and reporting progress"""
+    mock_response = Mock(headers={"content-length": "9"})
+    mock_response.iter_content.return_value = iter([b'abcd', b'', b'efghi'])
+    decorated_func = file_download_handler(Mock(return_value=mock_response))
+    buffer = io.BytesIO()
+    progress = []
+
+    response = decorated_func(
+        None, {}, file_obj=buffer, progress=lambda done, total: progress.append((done, total)), chunk_size=4)
+
+    assert response == mock_response
+    assert buffer.getvalue() == b'abcdefghi'
+    assert progress == [(4, 9), (9, 9)]
+    mock_response.iter_content.assert_called_once_with(chunk_size=4)
+    mock_response.close.assert_called_once_with()
+
+
+def test_file_upload_handler_accepts_bytes_and_file_objects():
+    """Test file_upload_handler with in-memory uploads"""
+    mock_func = Mock(return_value=Mock())
+    decorated_func = file_upload_handler(mock_func)
+    payload = b'%PDF-1.7'
+    buffer = io.BytesIO(payload)
+
+    decorated_func(None, payload, {}, file_name='consent.pdf')
+    decorated_func(None, payload, {})
+    decorated_func(None, buffer, {})
+    decorated_func(None, buffer, {}, file_name='scan.png')
+
+    uploads = [call.kwargs['files']['file'] for call in mock_func.call_args_list]
+    assert uploads[0] == ('consent.pdf', payload)
+    assert uploads[0][1] is payload
+    assert uploads[1] == ('upload.raw', payload)
+    assert uploads[2] is buffer
+    assert uploads[3] == ('scan.png', buffer)
+    with pytest.raises(TypeError):
+        decorated_func(None, 42, {})
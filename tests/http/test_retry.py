@@ -0,0 +1,214 @@
+import asyncio
+import io
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from redcaplite.http import RateLimiter, RetryPolicy, response_error_handler
+from redcaplite.http.error import APIException
+from redcaplite.http.retry import is_idempotent, parse_retry_after
+
+
+def _response(status_code, headers=None):
+    return Mock(status_code=status_code, headers=headers or {}, json=lambda: {'error': 'boom'})
+
+
+def test_is_idempotent_flags_writes():
+    """Test that exports are idempotent and imports, deletes and renames are not"""
+    assert is_idempotent({'content': 'record', 'action': 'export'})
+    assert is_idempotent({'content': 'metadata'})
+    assert not is_idempotent({'content': 'record', 'action': 'import', 'data': '[]'})
+    assert not is_idempotent({'content': 'arm', 'action': 'delete'})
+    assert not is_idempotent({'content': 'project', 'data': '[]'})
+
+
+def test_retry_policy_should_retry():
+    """Test retry decisions for statuses, attempts and idempotency"""
+    policy = RetryPolicy(max_retries=2)
+    export = {'content': 'record', 'action': 'export'}
+    write = {'content': 'record', 'action': 'import', 'data': '[]'}
+
+    assert policy.should_retry(0, export, 503)
+    assert policy.should_retry(1, export)
+    assert not policy.should_retry(2, export, 503)
+    assert not policy.should_retry(0, export, 400)
+    assert not policy.should_retry(0, write, 500)
+    assert not policy.should_retry(0, write)
+    assert policy.should_retry(0, write, 429)
+    assert RetryPolicy(retry_non_idempotent=True).should_retry(0, write, 500)
+
+
+def test_retry_policy_delay_uses_backoff_jitter_and_retry_after():
+    """Test exponential backoff bounds and Retry-After handling"""
+    policy = RetryPolicy(backoff_factor=1, max_backoff=5, max_retry_after=60)
+
+    for attempt, full in [(0, 1), (1, 2), (2, 4), (5, 5)]:
+        delay = policy.get_delay(attempt)
+        assert full / 2 <= delay <= full
+    assert RetryPolicy(backoff_factor=1, jitter=False).get_delay(3) == 8
+    assert policy.get_delay(0, '7') == 7
+    assert policy.get_delay(0, '600') == 60
+    assert policy.get_delay(0, 'Wed, 21 Oct 2015 07:28:00 GMT') == 0
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
+
+
+def test_rate_limiter_spaces_requests_after_burst():
+    """Test that the token bucket allows a burst and then spaces requests at the fill rate"""
+    now = [100.0]
+    with patch('redcaplite.http.retry.time.monotonic', side_effect=lambda: now[0]):
+        limiter = RateLimiter(2, per=1.0, burst=2)
+        assert limiter.reserve() == 0
+        assert limiter.reserve() == 0
+        assert limiter.reserve() == pytest.approx(0.5)
+        assert limiter.reserve() == pytest.approx(1.0)
+        now[0] += 2.0
+        assert limiter.reserve() == 0
+    with pytest.raises(ValueError):
+        RateLimiter(0)
+
+
+def test_response_error_handler_retries_transient_statuses():
+    """Test that response_error_handler retries 503s, honoring Retry-After"""
+    obj = SimpleNamespace(retry_policy=RetryPolicy(max_retries=3), rate_limiter=Mock())
+    mock_func = Mock(side_effect=[_response(503, {'retry-after': '2'}), _response(502), _response(200)])
+    decorated_func = response_error_handler(mock_func)
+
+    with patch('redcaplite.http.handler.time.sleep') as mock_sleep:
+        response = decorated_func(obj, {'content': 'record', 'action': 'export'})
+
+    assert response.status_code == 200
+    assert mock_func.call_count == 3
+    assert mock_sleep.call_args_list[0].args == (2.0,)
+    assert obj.rate_limiter.acquire.call_count == 3
+
+
+def test_response_error_handler_does_not_retry_imports_on_server_errors():
+    """Test that imports are not replayed after a 500 or a dropped connection"""
+    obj = SimpleNamespace(retry_policy=RetryPolicy(), rate_limiter=None)
+    data = {'content': 'record', 'action': 'import', 'data': '[]'}
+
+    with patch('redcaplite.http.handler.time.sleep') as mock_sleep:
+        with pytest.raises(APIException):
+            response_error_handler(Mock(return_value=_response(500)))(obj, dict(data))
+        with pytest.raises(requests.ConnectionError):
+            response_error_handler(Mock(side_effect=requests.ConnectionError()))(obj, dict(data))
+    mock_sleep.assert_not_called()
+
+
+def test_response_error_handler_retries_connection_errors_and_rewinds_uploads():
+    """Test that dropped connections are retried and upload files are rewound"""
+    obj = SimpleNamespace(retry_policy=RetryPolicy(), rate_limiter=None)
+    upload = Mock(**{'seekable.return_value': True, 'tell.return_value': 0})
+    mock_func = Mock(side_effect=[requests.ConnectionError(), _response(200)])
+
+    with patch('redcaplite.http.handler.time.sleep'):
+        response = response_error_handler(mock_func)(obj, {'content': 'file', 'action': 'export'}, files={'file': upload})
+
+    assert response.status_code == 200
+    upload.seek.assert_called_once_with(0)
+
+
+def test_response_error_handler_rewinds_uploads_to_their_start_offset():
+    """Test that a retried upload resends the stream from where it started"""
+    obj = SimpleNamespace(retry_policy=RetryPolicy(), rate_limiter=None)
+    upload = io.BytesIO(b'headerbody')
+    upload.read(6)
+    sent = []
+
+    def send(obj, data, files=None):
+        sent.append(files['file'][1].read())
+        return _response(503 if len(sent) == 1 else 200)
+
+    with patch('redcaplite.http.handler.time.sleep'):
+        response_error_handler(send)(obj, {'content': 'file', 'action': 'export'}, files={'file': ('a.txt', upload)})
+
+    assert sent == [b'body', b'body']
+
+
+def test_response_error_handler_does_not_retry_non_seekable_uploads():
+    """Test that an upload from a pipe-like stream is sent only once"""
+    obj = SimpleNamespace(retry_policy=RetryPolicy(), rate_limiter=None)
+    upload = Mock(**{'seekable.return_value': False})
+    mock_func = Mock(side_effect=requests.ConnectionError())
+
+    with patch('redcaplite.http.handler.time.sleep') as mock_sleep:
+        with pytest.raises(requests.ConnectionError):
+            response_error_handler(mock_func)(obj, {'content': 'file', 'action': 'export'}, files={'file': upload})
+
+    assert mock_func.call_count == 1
+    mock_sleep.assert_not_called()
+    upload.seek.assert_not_called()
+
+
+def test_response_error_handler_gives_up_after_max_retries():
+    """Test that the last transient failure is raised once retries run out"""
+    obj = SimpleNamespace(retry_policy=RetryPolicy(max_retries=1), rate_limiter=None)
+    mock_func = Mock(return_value=_response(503))
+
+    with patch('redcaplite.http.handler.time.sleep'):
+        with pytest.raises(APIException) as exc_info:
+            response_error_handler(mock_func)(obj, {'content': 'version'})
+
+    assert mock_func.call_count == 2
+    assert str(exc_info.value) == "Unknown issue."
+
+
+def test_async_client_retries_transient_statuses():
+    """Test that the async transport applies the same retry policy"""
+    httpx = pytest.importorskip("httpx")
+    from redcaplite import AsyncRedcapClient
+
+    statuses = iter([503, 200])
+
+    def handler(request):
+        status = next(statuses)
+        return httpx.Response(status, text='14.0.0', headers={'retry-after': '0'})
+
+    async def run():
+        async with AsyncRedcapClient(
+            'https://example.com', 'token',
+            transport=httpx.MockTransport(handler),
+            retry_policy=RetryPolicy(),
+            rate_limiter=RateLimiter(100, per=1.0),
+        ) as client:
+            return await client.get_version()
+
+    assert asyncio.run(run()) == '14.0.0'
+
+
+def test_async_client_does_not_retry_non_seekable_uploads():
+    """Test that the async transport sends a pipe-like upload only once"""
+    httpx = pytest.importorskip("httpx")
+    from redcaplite import AsyncRedcapClient
+
+    class Pipe(io.RawIOBase):
+        def __init__(self):
+            self.chunks = [b'file body']
+
+        def readable(self):
+            return True
+
+        def read(self, size=-1):
+            return self.chunks.pop() if self.chunks else b''
+
+    bodies = []
+
+    def handler(request):
+        bodies.append(request.read())
+        return httpx.Response(429, json={'error': 'slow down'}, headers={'retry-after': '0'})
+
+    async def run():
+        async with AsyncRedcapClient(
+            'https://example.com', 'token',
+            transport=httpx.MockTransport(handler),
+            retry_policy=RetryPolicy(),
+        ) as client:
+            await client.import_file(Pipe(), record='1', field='upload', file_name='a.txt')
+
+    with pytest.raises(APIException):
+        asyncio.run(run())
+    assert len(bodies) == 1
+    assert b'file body' in bodies[0]
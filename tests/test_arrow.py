@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from redcaplite.arrow import parse_arrow_response, read_csv_table, table_to_pandas
+
+pa = pytest.importorskip("pyarrow")
+
+
+def test_read_csv_table_parses_bytes_with_options():
+    """Test delimiter mapping and convert options"""
+    table = read_csv_table(
+        b'record_id\tscore\n001\t1.5\n002\t\n',
+        delimiter='tab',
+        convert_options={'column_types': {'record_id': pa.string()}},
+    )
+    assert table.column_names == ['record_id', 'score']
+    assert table.column('record_id').to_pylist() == ['001', '002']
+    assert table.column('score').to_pylist() == [1.5, None]
+
+
+def test_read_csv_table_blank_body_uses_empty_columns():
+    """Test that REDCap's blank response becomes an empty table with the expected schema"""
+    table = read_csv_table(b'\n', empty_columns=['arm_num', 'name'])
+    assert table.num_rows == 0
+    assert table.column_names == ['arm_num', 'name']
+    assert read_csv_table(b'').num_columns == 0
+
+
+def test_table_to_pandas_is_arrow_backed():
+    """Test that the pandas result keeps Arrow dtypes"""
+    frame = table_to_pandas(pa.table({'age': [1, None]}))
+    assert isinstance(frame, pd.DataFrame)
+    assert str(frame['age'].dtype) == 'int64[pyarrow]'
+
+
+@pytest.mark.parametrize('suffix, reader', [
+    ('.parquet', lambda path: __import__('pyarrow.parquet', fromlist=['read_table']).read_table(path)),
+    ('.feather', lambda path: __import__('pyarrow.feather', fromlist=['read_table']).read_table(path)),
+])
+def test_parse_arrow_response_writes_columnar_output(tmp_path, suffix, reader):
+    """Test Parquet and Feather output written from the parsed table"""
+    output_file = tmp_path / f'records{suffix}'
+    response = SimpleNamespace(content=b'record_id,age\n1,30\n')
+    table = parse_arrow_response(response, {}, 'table', output_file=output_file)
+    assert reader(output_file).equals(table)
+
+
+def test_parse_arrow_response_writes_raw_csv_for_other_suffixes(tmp_path):
+    """Test that other output names receive the response bytes unchanged"""
+    output_file = tmp_path / 'nested' / 'records.csv'
+    body = b'record_id,name\n1,Jos\xc3\xa9\n'
+    frame = parse_arrow_response(SimpleNamespace(content=body), {}, 'pandas', output_file=output_file)
+    assert output_file.read_bytes() == body
+    assert frame['name'].tolist() == ['José']
+    with pytest.raises(ValueError):
+        parse_arrow_response(SimpleNamespace(content=body), {}, 'numpy')
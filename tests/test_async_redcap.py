@@ -0,0 +1,252 @@
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from redcaplite import AsyncRedcapClient
+from redcaplite.http.error import APIException
+
+httpx = pytest.importorskip("httpx")
+
+
+def _form(request):
+    return {key: values[0] for key, values in parse_qs(request.content.decode()).items()}
+
+
+def _client(handler, **kwargs):
+    return AsyncRedcapClient(
+        'https://example.com', 'token', transport=httpx.MockTransport(handler), **kwargs)
+
+
+def test_async_client_reuses_sync_payload_builders():
+    seen = []
+
+    def handler(request):
+        seen.append(_form(request))
+        return httpx.Response(200, json=[{"arm_num": 1, "name": "Arm 1"}])
+
+    async def run():
+        async with _client(handler) as client:
+            return await client.get_arms(arms=[1])
+
+    assert asyncio.run(run()) == [{"arm_num": 1, "name": "Arm 1"}]
+    assert seen == [{'content': 'arm', 'format': 'json', 'arms[0]': '1',
+                     'returnFormat': 'json', 'token': 'token'}]
+
+
+def test_async_client_parses_csv_and_text():
+    def handler(request):
+        form = _form(request)
+        if form['content'] == 'version':
+            return httpx.Response(200, text='14.0.0')
+        return httpx.Response(200, text='record_id,age\n1,30\n')
+
+    async def run():
+        async with _client(handler) as client:
+            return await asyncio.gather(client.export_records(), client.get_version())
+
+    records, version = asyncio.run(run())
+    assert_frame_equal(records, pd.DataFrame({'record_id': [1], 'age': [30]}))
+    assert version == '14.0.0'
+
+
+def test_async_client_raises_api_errors():
+    def handler(request):
+        return httpx.Response(400, json={"error": "bad field"})
+
+    async def run():
+        async with _client(handler) as client:
+            await client.get_metadata()
+
+    with pytest.raises(APIException, match='Bad Request: bad field'):
+        asyncio.run(run())
+
+
+def test_async_client_bounds_concurrency():
+    active = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return httpx.Response(200, text='14.0.0')
+
+    async def run():
+        async with _client(handler, max_concurrency=3) as client:
+            return await asyncio.gather(*(client.get_version() for _ in range(20)))
+
+    assert asyncio.run(run()) == ['14.0.0'] * 20
+    assert peak == 3
+
+
+def test_async_client_export_records_chunked_and_import_batched():
+    rows = {'1': 30, '2': 40, '3': 50}
+
+    def handler(request):
+        form = _form(request)
+        if form['content'] == 'exportFieldNames':
+            return httpx.Response(200, json=[{"original_field_name": "record_id"}])
+        if form.get('action') == 'import':
+            ids = [row['record_id'] for row in json.loads(form['data'])]
+            if '3' in ids:
+                return httpx.Response(400, json={"error": "bad record"})
+            return httpx.Response(200, json=ids)
+        records = [value for key, value in form.items() if key.startswith('records[')] or list(rows)
+        body = 'record_id,age\n' + ''.join(f'{record},{rows[record]}\n' for record in records)
+        return httpx.Response(200, text=body)
+
+    async def run():
+        async with _client(handler) as client:
+            exported = await client.export_records_chunked(chunk_size=2)
+            chunks = [chunk async for chunk in await client.export_records_chunked(chunk_size=1, iterate=True)]
+            imported = await client.import_records_batched(
+                [{'record_id': '1'}, {'record_id': '2'}, {'record_id': '3'}], batch_size=2)
+            return exported, chunks, imported
+
+    exported, chunks, imported = asyncio.run(run())
+    assert exported['age'].tolist() == [30, 40, 50]
+    assert [chunk['record_id'].tolist() for chunk in chunks] == [[1], [2], [3]]
+    assert imported.ids == ['1', '2']
+    assert imported.errors == [{'batch': 1, 'records': ['3'], 'error': 'Bad Request: bad record'}]
+
+
+def test_async_client_batches_re_raise_cancellation(tmp_path):
+    def handler(request):
+        form = _form(request)
+        if form.get('action') == 'import' and json.loads(form['data'])[0]['record_id'] == '2':
+            raise asyncio.CancelledError()
+        if form['content'] == 'record' and form.get('action') == 'export':
+            return httpx.Response(200, text='record_id,consent\n1,a.pdf\n')
+        if form['content'] == 'file':
+            raise asyncio.CancelledError()
+        return httpx.Response(200, json=['1'])
+
+    async def import_records():
+        async with _client(handler) as client:
+            return await client.import_records_batched([{'record_id': '1'}, {'record_id': '2'}], batch_size=1)
+
+    async def export_files():
+        async with _client(handler) as client:
+            return await client.export_files(['consent'], tmp_path, record_id_field='record_id')
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(import_records())
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(export_files())
+
+
+def test_async_client_file_download_and_upload(tmp_path):
+    uploads = []
+
+    def handler(request):
+        if b'name="file"' in request.content:
+            uploads.append(request.content)
+            return httpx.Response(200, text='')
+        return httpx.Response(
+            200, content=b'%PDF', headers={'content-type': 'application/pdf; name="consent.pdf"'})
+
+    source = tmp_path / 'upload.txt'
+    source.write_bytes(b'hello upload')
+
+    async def run():
+        async with _client(handler) as client:
+            await client.get_file('1', 'consent', file_dictionary=str(tmp_path))
+            await client.import_file(str(source), '1', 'consent')
+
+    asyncio.run(run())
+    assert (tmp_path / 'consent.pdf').read_bytes() == b'%PDF'
+    assert b'hello upload' in uploads[0]
+
+
+def test_async_client_export_files(tmp_path):
+    def handler(request):
+        form = _form(request)
+        if form['content'] == 'record':
+            return httpx.Response(200, text='record_id,consent\n1,a.pdf\n2,b.pdf\n')
+        return httpx.Response(
+            200,
+            content=f"file-{form['record']}".encode(),
+            headers={'content-type': f'application/pdf; name="{form["record"]}.pdf"'},
+        )
+
+    async def run():
+        async with _client(handler) as client:
+            return await client.export_files(['consent'], tmp_path, record_id_field='record_id')
+
+    result = asyncio.run(run())
+    assert result.ok
+    assert (tmp_path / '1' / 'consent' / '1.pdf').read_bytes() == b'file-1'
+    assert (tmp_path / '2' / 'consent' / '2.pdf').read_bytes() == b'file-2'
+    assert asyncio.run(run()).skipped == 2
+
+
+def test_async_client_export_records_with_arrow():
+    """Test that the async client supports the Arrow parsing path"""
+    pytest.importorskip("pyarrow")
+
+    def handler(request):
+        assert _form(request)['format'] == 'csv'
+        return httpx.Response(200, text='record_id,age\n1,30\n')
+
+    async def run():
+        async with _client(handler) as client:
+            return await client.export_records(arrow='pandas')
+
+    frame = asyncio.run(run())
+    assert frame['age'].tolist() == [30]
+    assert str(frame['age'].dtype) == 'int64[pyarrow]'
+
+
+def test_async_client_is_not_a_sync_client():
+    from redcaplite import RedcapClient
+    from redcaplite.redcap import BaseRedcapClient
+
+    client = _client(lambda request: httpx.Response(200, text=''))
+    assert not isinstance(client, RedcapClient)
+    assert isinstance(client, BaseRedcapClient)
+    with pytest.raises(TypeError, match="async with"):
+        with client:
+            pass
+    asyncio.run(client.close())
+
+
+def test_async_client_chunked_iterate_skips_empty_batches():
+    def handler(request):
+        form = _form(request)
+        if form['content'] == 'exportFieldNames':
+            return httpx.Response(200, json=[{"original_field_name": "record_id"}])
+        if form.get('records[0]') == '2':
+            # A header-only CSV body is returned as text, not a DataFrame.
+            return httpx.Response(200, text='record_id\n')
+        return httpx.Response(200, text=f"record_id\n{form.get('records[0]', '1')}\n")
+
+    async def run():
+        async with _client(handler) as client:
+            iterator = await client.export_records_chunked(records=['1', '2', '3'], chunk_size=1, iterate=True)
+            return [chunk async for chunk in iterator]
+
+    chunks = asyncio.run(run())
+    assert [chunk['record_id'].tolist() for chunk in chunks] == [[1], [3]]
+
+
+def test_async_client_clears_metadata_cache_after_structure_change(tmp_path):
+    from redcaplite.cache import MetadataCache
+
+    cache = MetadataCache(tmp_path)
+
+    def handler(request):
+        cache.set('https://example.com', 'token', 'stale', 'old')
+        return httpx.Response(200, text='1')
+
+    async def run():
+        async with _client(handler, metadata_cache=cache) as client:
+            await client.import_metadata([{'field_name': 'record_id'}])
+
+    asyncio.run(run())
+    assert cache.get('https://example.com', 'token', 'stale') is None
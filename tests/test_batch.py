@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from redcaplite.batch import BatchImportResult, chunk_sequence, map_bounded, merge_import_result, split_records
+
+
+def test_chunk_sequence_splits_in_order():
+    assert list(chunk_sequence(['a', 'b', 'c', 'd', 'e'], 2)) == [['a', 'b'], ['c', 'd'], ['e']]
+    assert list(chunk_sequence([], 3)) == []
+
+
+def test_chunk_sequence_rejects_non_positive_size():
+    with pytest.raises(ValueError):
+        list(chunk_sequence([1], 0))
+
+
+def test_map_bounded_preserves_order_and_limits_concurrency():
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def work(item):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.01 * (5 - item))
+        with lock:
+            active -= 1
+        return item * 10
+
+    assert list(map_bounded(work, range(5), max_workers=2)) == [0, 10, 20, 30, 40]
+    assert peak <= 2
+
+
+def test_map_bounded_raises_batch_errors():
+    def work(item):
+        if item == 1:
+            raise RuntimeError('boom')
+        return item
+
+    results = map_bounded(work, range(3), max_workers=2)
+    assert next(results) == 0
+    with pytest.raises(RuntimeError, match='boom'):
+        next(results)
+
+
+def test_split_records_keeps_record_rows_together():
+    df = pd.DataFrame({
+        'record_id': ['1', '2', '1', '3', '2'],
+        'redcap_repeat_instance': [1, 1, 2, 1, 2],
+    })
+    batches = list(split_records(df, 2))
+    assert [record_ids for record_ids, _ in batches] == [['1', '2'], ['3']]
+    assert batches[0][1]['record_id'].tolist() == ['1', '2', '1', '2']
+    assert batches[1][1]['record_id'].tolist() == ['3']
+
+
+def test_split_records_from_dicts_with_record_id_field():
+    rows = [
+        {'age': 1, 'study_id': 'a'},
+        {'age': 2, 'study_id': 'b'},
+        {'age': 3, 'study_id': 'a'},
+    ]
+    batches = list(split_records(rows, 1, record_id_field='study_id'))
+    assert batches == [
+        (['a'], [{'age': 1, 'study_id': 'a'}, {'age': 3, 'study_id': 'a'}]),
+        (['b'], [{'age': 2, 'study_id': 'b'}]),
+    ]
+
+
+def test_split_records_rejects_rows_without_a_record_id():
+    df = pd.DataFrame({'record_id': ['1', None, '2', ''], 'age': [1, 2, 3, 4]})
+    with pytest.raises(ValueError, match=r"Rows 1, 3 have no value in the record ID field 'record_id'"):
+        next(split_records(df, 10))
+    rows = [{'record_id': '1'}, {'record_id': float('nan')}, {'age': 3}]
+    with pytest.raises(ValueError, match=r"Rows 1, 2 have no value"):
+        next(split_records(rows, 10))
+
+
+def test_split_records_rejects_text_payloads():
+    with pytest.raises(TypeError):
+        list(split_records('record_id\n1', 10))
+
+
+def test_merge_import_result_handles_return_content_shapes():
+    result = BatchImportResult()
+    merge_import_result(result, ['1', '2'])
+    merge_import_result(result, {'count': 3})
+    merge_import_result(result, pd.DataFrame({'count': [4]}))
+    merge_import_result(result, pd.DataFrame({'id': ['9'], 'original_id': ['x']}))
+    assert result.count == 10
+    assert result.ids == ['1', '2', '9']
+    assert result.ok
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from redcaplite import RedcapClient
+from redcaplite.auth import TokenStore
+from redcaplite.config import Profile, ProfileStore
+from redcaplite.fanout import FanOutResult, HostPool, fan_out, get_operation, resolve_profiles
+from redcaplite.testing import FakeProject, FakeRedcapServer
+
+
+@pytest.fixture
+def stores(tmp_path):
+    profile_store = ProfileStore(tmp_path)
+    token_store = TokenStore(tmp_path)
+    for name, url in [
+        ("site_a", "https://redcap.one.edu/api/"),
+        ("site_b", "https://redcap.one.edu/api/"),
+        ("site_c", "https://redcap.two.edu/api/"),
+        ("other", "https://redcap.two.edu/api/"),
+    ]:
+        profile_store.upsert(Profile(name=name, url=url))
+        token_store.save_token(name, f"{name}-token")
+    return profile_store, token_store
+
+
+class RecordingClient:
+    def __init__(self, url, token, session=None):
+        self.url = url
+        self.token = token
+        self.session = session
+        self.closed = False
+
+    def get_version(self):
+        return f"14.0.0 for {self.token}"
+
+    def close(self):
+        self.closed = True
+
+
+def clients_by_token(clients):
+    return {client.token: client for client in clients}
+
+
+def test_resolve_profiles_expands_globs_in_order(stores) -> None:
+    profile_store, _ = stores
+
+    assert resolve_profiles(["other", "site_*", "site_a"], profile_store) == ["other", "site_a", "site_b", "site_c"]
+    assert resolve_profiles(["missing"], profile_store) == ["missing"]
+    with pytest.raises(ValueError, match="No stored profiles match"):
+        resolve_profiles(["nothing_*"], profile_store)
+
+
+def test_get_operation_rejects_unknown_names() -> None:
+    with pytest.raises(ValueError, match='Unknown operation "bogus"'):
+        get_operation("bogus")
+    with pytest.raises(ValueError, match="only supported for named operations"):
+        get_operation(lambda client: None, fields=["record_id"])
+
+
+def test_fan_out_collects_results_and_errors_by_profile(stores) -> None:
+    profile_store, token_store = stores
+    clients = []
+
+    def factory(url, token, session=None):
+        clients.append(RecordingClient(url, token, session))
+        return clients[-1]
+
+    outcome = fan_out(
+        ["site_*", "missing"],
+        "version",
+        profile_store=profile_store,
+        token_store=token_store,
+        client_factory=factory,
+    )
+
+    assert isinstance(outcome, FanOutResult)
+    assert outcome.results == {
+        "site_a": "14.0.0 for site_a-token",
+        "site_b": "14.0.0 for site_b-token",
+        "site_c": "14.0.0 for site_c-token",
+    }
+    assert list(outcome.errors) == ["missing"]
+    assert 'Profile "missing" was not found.' in str(outcome.errors["missing"])
+    assert not outcome.ok
+    assert len({id(client.session) for client in clients}) == 2
+    assert clients_by_token(clients)["site_a-token"].session is clients_by_token(clients)["site_b-token"].session
+    assert all(client.closed for client in clients)
+
+
+def test_fan_out_caps_concurrency_per_host(stores) -> None:
+    profile_store, token_store = stores
+    running = {}
+    peaks = {}
+    lock = threading.Lock()
+
+    def operation(client):
+        with lock:
+            running[client.url] = running.get(client.url, 0) + 1
+            peaks[client.url] = max(peaks.get(client.url, 0), running[client.url])
+        time.sleep(0.05)
+        with lock:
+            running[client.url] -= 1
+        return client.token
+
+    outcome = fan_out(
+        ["*"],
+        operation,
+        max_workers=4,
+        max_per_host=1,
+        profile_store=profile_store,
+        token_store=token_store,
+        client_factory=RecordingClient,
+    )
+
+    assert outcome.ok
+    assert len(outcome.results) == 4
+    assert peaks == {"https://redcap.one.edu/api/": 1, "https://redcap.two.edu/api/": 1}
+
+
+def test_host_pool_shares_one_session_per_host() -> None:
+    with HostPool(max_per_host=2) as pool:
+        first = pool.session("https://Redcap.one.edu/api/")
+        assert pool.session("https://redcap.one.edu/other/") is first
+        assert pool.session("https://redcap.two.edu/api/") is not first
+        assert pool.limit("https://redcap.one.edu/api/") is pool.limit("https://REDCAP.one.edu/")
+    with pytest.raises(ValueError):
+        HostPool(max_per_host=0)
+
+
+def test_redcap_client_leaves_shared_session_open() -> None:
+    session = Mock()
+    client = RedcapClient("https://redcap.one.edu/api/", "token", session=session)
+    assert client.session is session
+    client.close()
+    session.close.assert_not_called()
+
+
+def test_fan_out_against_local_server(tmp_path) -> None:
+    project = FakeProject.generate(records=5, fields=3)
+    with FakeRedcapServer(project) as server:
+        profile_store = ProfileStore(tmp_path)
+        token_store = TokenStore(tmp_path)
+        for name in ("east", "west"):
+            profile_store.upsert(Profile(name=name, url=server.url))
+            token_store.save_token(name, server.token)
+
+        outcome = fan_out(
+            ["east", "west"],
+            "records",
+            operation_kwargs={"fields": ["record_id"]},
+            profile_store=profile_store,
+            token_store=token_store,
+        )
+
+    assert outcome.ok
+    assert [len(frame.index) for frame in outcome.results.values()] == [5, 5]
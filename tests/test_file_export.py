@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from redcaplite.file_export import DownloadManifest, FileTask, find_file_tasks, save_file_chunks
+
+
+def test_find_file_tasks_skips_empty_values() -> None:
+    records = pd.DataFrame(
+        {
+            "record_id": ["1", "1", "2"],
+            "redcap_event_name": ["baseline", "followup", "baseline"],
+            "redcap_repeat_instance": ["", "2", ""],
+            "consent": ["consent.pdf", "", ""],
+            "scan": ["", "scan.png", ""],
+        }
+    )
+
+    tasks = list(find_file_tasks(records, ["consent", "scan"], "record_id"))
+
+    assert tasks == [
+        FileTask("1", "consent", "baseline", None),
+        FileTask("1", "scan", "followup", 2),
+    ]
+    assert tasks[1].target_dir("out") == Path("out", "1", "followup", "scan_2")
+
+
+def test_file_task_target_dir_stays_inside_the_directory(tmp_path) -> None:
+    assert FileTask("../../etc", "consent").target_dir(tmp_path) == tmp_path / ".._.._etc" / "consent"
+    assert FileTask("C:\\x", "consent", "a/b").target_dir(tmp_path) == tmp_path / "C__x" / "a_b" / "consent"
+    with pytest.raises(ValueError, match="folder name"):
+        FileTask("..", "consent").target_dir(tmp_path)
+    with pytest.raises(ValueError, match="folder name"):
+        FileTask("1", "consent", ".").target_dir(tmp_path)
+
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (tmp_path / "out").mkdir()
+    (tmp_path / "out" / "link").symlink_to(outside, target_is_directory=True)
+    with pytest.raises(ValueError, match="is outside"):
+        FileTask("link", "consent").target_dir(tmp_path / "out")
+
+
+def test_save_file_chunks_renames_only_complete_files(tmp_path) -> None:
+    path, size = save_file_chunks([b"ab", b"", b"cd"], tmp_path / "1", "../consent.pdf")
+
+    assert path == tmp_path / "1" / "consent.pdf"
+    assert path.read_bytes() == b"abcd"
+    assert size == 4
+
+    def broken_chunks():
+        yield b"partial"
+        raise ConnectionError("reset")
+
+    with pytest.raises(ConnectionError):
+        save_file_chunks(broken_chunks(), tmp_path / "2", "scan.png")
+    assert list((tmp_path / "2").iterdir()) == []
+
+
+def test_download_manifest_tracks_existing_files(tmp_path) -> None:
+    manifest = DownloadManifest(tmp_path / "manifest.jsonl")
+    kept = tmp_path / "kept.pdf"
+    kept.write_bytes(b"x")
+
+    manifest.add(FileTask("1", "consent"), kept, 1)
+    manifest.add(FileTask("2", "consent"), tmp_path / "deleted.pdf", 1)
+    with manifest.path.open("a", encoding="utf-8") as manifest_file:
+        manifest_file.write('{"record": "3", "fie')
+
+    assert list(manifest.completed()) == [FileTask("1", "consent").key]
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from redcaplite.filter_logic import (
+    BoolOp,
+    Comparison,
+    FieldRef,
+    FilterLogicError,
+    Literal,
+    compile_predicate,
+    parse_filter_logic,
+    redcap_compare,
+)
+from redcaplite.mirror import translate_filter_logic
+from redcaplite.testing import compile_filter_logic
+
+ROWS = [
+    {"record_id": "1", "redcap_event_name": "baseline_arm_1", "age": "30", "name": "al", "color___2": "1"},
+    {"record_id": "1", "redcap_event_name": "visit_arm_1", "age": "31", "name": "al", "color___2": "0"},
+    {"record_id": "2", "redcap_event_name": "baseline_arm_1", "age": "40", "name": "bob", "color___2": "0"},
+    {"record_id": "3", "redcap_event_name": "visit_arm_1", "age": "", "name": "", "color___2": "1"},
+]
+
+
+def test_parse_filter_logic_builds_an_ast() -> None:
+    node = parse_filter_logic("[baseline_arm_1][age] >= 18 and ([color(2)] = '1' OR [name] <> \"bob\")")
+
+    assert node == BoolOp(
+        "and",
+        Comparison(FieldRef("age", "baseline_arm_1"), ">=", Literal("18")),
+        BoolOp(
+            "or",
+            Comparison(FieldRef("color___2"), "=", Literal("1")),
+            Comparison(FieldRef("name"), "<>", Literal("bob")),
+        ),
+    )
+
+
+@pytest.mark.parametrize("logic", ["datediff([dob], 'today', 'y') > 18", "[age] >", "([age] = 1", "[a][b][c] = 1"])
+def test_parse_filter_logic_rejects_unsupported_syntax(logic) -> None:
+    with pytest.raises(FilterLogicError):
+        parse_filter_logic(logic)
+
+
+@pytest.mark.parametrize(
+    "logic",
+    [
+        "[age] > 30",
+        "[age] < 35 or [name] = ''",
+        "[visit_arm_1][age] > 0",
+        "[baseline_arm_1][color(2)] = '1' or [name] = 'bob'",
+        "([age] >= 31 and [color(2)] = 0) or [record_id] = 3",
+        "[age] <> [record_id]",
+    ],
+)
+def test_predicate_and_sql_select_the_same_rows(logic) -> None:
+    columns = list(ROWS[0])
+    connection = sqlite3.connect(":memory:")
+    connection.create_function("redcap_compare", 3, redcap_compare, deterministic=True)
+    connection.execute(f"CREATE TABLE records ({', '.join(columns)})")
+    connection.executemany(f"INSERT INTO records VALUES ({', '.join('?' for _ in columns)})", [list(row.values()) for row in ROWS])
+    translated = translate_filter_logic(logic)
+
+    selected = connection.execute(f"SELECT rowid - 1 FROM records WHERE {translated.sql} ORDER BY rowid", translated.params)
+    predicate = compile_predicate(parse_filter_logic(logic))
+
+    assert [index for index, row in enumerate(ROWS) if predicate(row)] == [index for (index,) in selected]
+
+
+def test_event_references_are_ignored_without_an_event_column() -> None:
+    rows = [{"record_id": "1", "age": "30"}, {"record_id": "2", "age": "40"}]
+
+    matches = compile_filter_logic("[visit_arm_1][age] = 40")
+
+    assert [row["record_id"] for row in rows if matches(row)] == ["2"]
+    assert translate_filter_logic("[visit_arm_1][age] = 40", has_events=False).sql == "redcap_compare(IFNULL(\"age\", ''), '=', ?)"
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from redcaplite.api.utils import is_dataframe
+
+
+def _loaded_modules(code: str, tmp_path) -> set[str]:
+    # A fresh interpreter, so modules imported by other tests do not count.
+    script = f"{code}\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))"
+    env = {**os.environ, "HOME": str(tmp_path), "XDG_CONFIG_HOME": str(tmp_path / ".config"), "APPDATA": str(tmp_path), "RCL_NO_CACHE": "1"}
+    completed = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=env, check=True)
+    return set(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+
+def test_importing_redcaplite_defers_clients_and_pandas(tmp_path) -> None:
+    modules = _loaded_modules("import redcaplite, redcaplite.config", tmp_path)
+
+    assert "pandas" not in modules
+    assert "redcaplite.redcap" not in modules
+
+
+def test_redcap_client_imports_without_pandas(tmp_path) -> None:
+    modules = _loaded_modules("from redcaplite import RedcapClient, AsyncRedcapClient\nRedcapClient('https://x/api/', 't')", tmp_path)
+
+    assert "redcaplite.redcap" in modules
+    assert "pandas" not in modules
+
+
+@pytest.mark.parametrize("argv", [["--version"], ["profiles"]])
+def test_light_cli_commands_skip_heavy_modules(tmp_path, argv) -> None:
+    modules = _loaded_modules(f"from redcaplite.cli.main import main\nmain({argv!r})", tmp_path)
+
+    assert "pandas" not in modules
+    assert "requests" not in modules
+    assert "redcaplite.cli.metadata" not in modules
+
+
+def test_unknown_lazy_attribute_raises() -> None:
+    import redcaplite
+    import redcaplite.cli
+
+    with pytest.raises(AttributeError):
+        redcaplite.NotAClient
+    with pytest.raises(AttributeError):
+        redcaplite.cli.not_a_helper
+    assert redcaplite.cli.build_client.__module__ == "redcaplite.cli.helpers"
+
+
+def test_is_dataframe() -> None:
+    assert is_dataframe(pd.DataFrame())
+    assert not is_dataframe([{"record_id": "1"}])
+    assert not is_dataframe(None)
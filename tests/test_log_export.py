@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+import requests
+
+from redcaplite import RedcapClient
+from redcaplite.http.error import APIException
+from redcaplite.log_export import (
+    LogCheckpoint,
+    LogExportResult,
+    LogWindow,
+    WindowPlanner,
+    WindowSizer,
+    is_overloaded,
+    order_log_rows,
+)
+from redcaplite.testing import FakeProject, FakeRedcapServer
+
+START = datetime(2026, 3, 1, 12, 0)
+END = datetime(2026, 3, 31, 12, 0)
+
+
+@pytest.fixture(scope="module")
+def server():
+    project = FakeProject.generate(records=300, fields=2, start=END)
+    with FakeRedcapServer(project) as fake_server:
+        yield fake_server
+
+
+def full_export(client: RedcapClient) -> pd.DataFrame:
+    logs = client.get_logs(beginTime=START, endTime=END, pd_read_csv_kwargs={"dtype": str, "keep_default_na": False})
+    return order_log_rows(logs)
+
+
+def test_log_window_split_and_span() -> None:
+    window = LogWindow(START, START + timedelta(minutes=4))
+    first, second = window.split()
+    assert window.span == timedelta(minutes=5)
+    assert (first, second) == (
+        LogWindow(START, START + timedelta(minutes=1)),
+        LogWindow(START + timedelta(minutes=2), START + timedelta(minutes=4)),
+    )
+    assert LogWindow(START, START + timedelta(minutes=1)).split() == (
+        LogWindow(START, START),
+        LogWindow(START + timedelta(minutes=1), START + timedelta(minutes=1)),
+    )
+
+
+def test_window_sizer_adapts_within_bounds() -> None:
+    sizer = WindowSizer(
+        window=timedelta(hours=1),
+        min_window=timedelta(minutes=5),
+        max_window=timedelta(hours=3),
+        target_rows=1000,
+        target_seconds=10,
+    )
+    sizer.observe(timedelta(hours=1), rows=2000, seconds=1)
+    assert sizer.window == timedelta(minutes=30)
+    sizer.observe(timedelta(minutes=30), rows=100_000, seconds=1)
+    assert sizer.window == timedelta(minutes=7)
+    sizer.observe(timedelta(minutes=7), rows=0, seconds=0.1)
+    assert sizer.window == timedelta(minutes=14)
+    sizer.observe(timedelta(hours=3), rows=10, seconds=0.1)
+    assert sizer.window == timedelta(hours=3)
+    sizer.observe(timedelta(hours=1), rows=10, seconds=40)
+    assert sizer.window == timedelta(minutes=15)
+    sizer.shrink(timedelta(minutes=8))
+    assert sizer.window == timedelta(minutes=5)
+    with pytest.raises(ValueError):
+        WindowSizer(min_window=timedelta(seconds=30))
+
+
+def test_window_planner_covers_range_without_overlap() -> None:
+    sizer = WindowSizer(window=timedelta(minutes=45))
+    planner = WindowPlanner(START, START + timedelta(hours=2), sizer)
+    windows = []
+    while not planner.done:
+        windows.append(planner.next_window())
+    assert windows[0] == LogWindow(START, START + timedelta(minutes=44))
+    assert windows[-1].end == START + timedelta(hours=2)
+    assert all(later.begin == earlier.end + timedelta(minutes=1) for earlier, later in zip(windows, windows[1:]))
+
+
+def test_is_overloaded() -> None:
+    assert is_overloaded(APIException("Internal Server Error", status_code=500))
+    assert is_overloaded(requests.Timeout())
+    assert not is_overloaded(APIException("Unauthorized", status_code=401))
+    assert not is_overloaded(ValueError("bad"))
+
+
+def test_order_log_rows_returns_oldest_first() -> None:
+    frame = pd.DataFrame({
+        "timestamp": ["2026-03-02 10:00", "2026-03-01 09:00", "2026-03-01 09:00"],
+        "action": ["third", "second", "first"],
+    })
+    assert order_log_rows(frame)["action"].tolist() == ["first", "second", "third"]
+    assert order_log_rows("").empty
+
+
+def test_export_logs_windowed_matches_full_export(server) -> None:
+    with RedcapClient(server.url, server.token) as client:
+        expected = full_export(client)
+        chunks = list(client.export_logs_windowed(START, END, window=timedelta(days=2), max_workers=3))
+
+    assert len(chunks) > 5
+    combined = pd.concat(chunks, ignore_index=True)
+    pd.testing.assert_frame_equal(combined, expected)
+    assert combined["timestamp"].is_monotonic_increasing
+
+
+def test_export_logs_windowed_splits_failed_windows(server) -> None:
+    with RedcapClient(server.url, server.token) as client:
+        expected = full_export(client)
+        server.fail_next(2, status=504)
+        chunks = list(client.export_logs_windowed(START, END, window=timedelta(days=30), max_workers=1))
+
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+
+
+def test_export_logs_windowed_keeps_logs_stamped_on_split_minutes() -> None:
+    project = FakeProject()
+    for minute in range(10):
+        for n in range(3):
+            project.log(f"Updated Record {minute}-{n}", record=str(minute), when=START + timedelta(minutes=minute))
+    with FakeRedcapServer(project) as fake_server, RedcapClient(fake_server.url, fake_server.token) as client:
+        end = START + timedelta(minutes=9)
+        fake_server.fail_next(3, status=504)
+        chunks = list(client.export_logs_windowed(START, end, window=timedelta(minutes=10), max_workers=1))
+
+    combined = pd.concat(chunks, ignore_index=True)
+    assert fake_server.request_log == [("log", None)] * 4
+    assert len(combined.index) == 30
+    assert not combined.duplicated().any()
+    assert sorted(combined["action"]) == sorted(entry["action"] for entry in project.logs)
+
+
+def test_export_logs_windowed_resumes_from_checkpoint(server, tmp_path) -> None:
+    output_file = tmp_path / "logs.csv"
+    checkpoint = tmp_path / "logs.checkpoint.json"
+    with RedcapClient(server.url, server.token) as client:
+        expected = full_export(client)
+        chunks = client.export_logs_windowed(
+            START, END, window=timedelta(days=3), max_workers=1, checkpoint=checkpoint,
+        )
+        next(chunks)
+        next(chunks)
+        chunks.close()
+        state = json.loads(checkpoint.read_text(encoding="utf-8"))
+        assert state["completed_through"] < "2026-03-31 12:00"
+
+        server.request_log.clear()
+        resumed = client.export_logs_windowed(
+            START, output_file=output_file, window=timedelta(days=3), checkpoint=checkpoint,
+        )
+
+    assert isinstance(resumed, LogExportResult)
+    assert resumed.resumed
+    assert resumed.end == END
+    assert resumed.rows == len(expected.index)
+    written = pd.read_csv(output_file, dtype=str, keep_default_na=False)
+    first_resumed = datetime.strptime(state["completed_through"], "%Y-%m-%d %H:%M") + timedelta(minutes=1)
+    pd.testing.assert_frame_equal(
+        written,
+        expected.loc[expected["timestamp"] >= first_resumed.strftime("%Y-%m-%d %H:%M")].reset_index(drop=True),
+    )
+    assert len(server.request_log) < 10
+
+
+def test_export_logs_windowed_output_file_survives_interruption(server, tmp_path) -> None:
+    output_file = tmp_path / "logs.csv"
+    checkpoint = tmp_path / "logs.checkpoint.json"
+    with RedcapClient(server.url, server.token) as client:
+        expected = full_export(client)
+        server.fail_next(1, status=401)
+        with pytest.raises(APIException):
+            client.export_logs_windowed(
+                START, END, window=timedelta(days=1), max_workers=1, output_file=output_file, checkpoint=checkpoint,
+            )
+        server.request_log.clear()
+        result = client.export_logs_windowed(
+            START, END, window=timedelta(days=1), max_workers=2, output_file=output_file, checkpoint=checkpoint,
+        )
+
+    assert result.rows == len(expected.index)
+    pd.testing.assert_frame_equal(pd.read_csv(output_file, dtype=str, keep_default_na=False), expected)
+
+
+def test_checkpoint_rejects_a_different_export(server, tmp_path) -> None:
+    checkpoint = tmp_path / "logs.checkpoint.json"
+    LogCheckpoint(checkpoint).save({"beginTime": "2020-01-01 00:00"}, START, 0, 0)
+    with RedcapClient(server.url, server.token) as client:
+        with pytest.raises(ValueError, match="different log export"):
+            client.export_logs_windowed(START, END, checkpoint=checkpoint)
+
+
+def test_async_export_logs_windowed_matches_full_export(server) -> None:
+    pytest.importorskip("httpx")
+    from redcaplite import AsyncRedcapClient
+
+    async def run():
+        async with AsyncRedcapClient(server.url, server.token) as client:
+            chunks = await client.export_logs_windowed(START, END, window=timedelta(days=4), max_workers=3)
+            return [chunk async for chunk in chunks]
+
+    with RedcapClient(server.url, server.token) as client:
+        expected = full_export(client)
+    chunks = asyncio.run(run())
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from redcaplite.cache import MetadataCache
+
+URL = "https://redcap.example.edu/api/"
+
+
+def test_metadata_cache_round_trips_values(tmp_path) -> None:
+    cache = MetadataCache(tmp_path)
+    frame = pd.DataFrame({"field_name": ["record_id", "age"]})
+
+    cache.set(URL, "token-a", ("get_metadata", ()), frame)
+
+    cached = cache.get(URL, "token-a", ("get_metadata", ()))
+    assert cached.equals(frame)
+    assert cache.get(URL, "token-b", ("get_metadata", ())) is None
+    assert cache.get(URL, "token-a", ("get_instruments", ())) is None
+    assert "token-a" not in str(list(tmp_path.rglob("*")))
+
+
+def test_metadata_cache_expires_entries_after_ttl(tmp_path, monkeypatch) -> None:
+    cache = MetadataCache(tmp_path, ttl=60)
+    now = 1_000_000.0
+    monkeypatch.setattr("redcaplite.cache.time.time", lambda: now)
+    cache.set(URL, "token", "key", [1, 2])
+
+    now += 59
+    assert cache.get(URL, "token", "key") == [1, 2]
+    now += 2
+    assert cache.get(URL, "token", "key") is None
+
+
+def test_metadata_cache_invalidates_one_project(tmp_path) -> None:
+    cache = MetadataCache(tmp_path)
+    cache.set(URL, "token-a", "key", "a")
+    cache.set(URL, "token-b", "key", "b")
+
+    cache.invalidate(URL, "token-a")
+
+    assert cache.get(URL, "token-a", "key") is None
+    assert cache.get(URL, "token-b", "key") == "b"
+
+    cache.clear()
+    assert cache.get(URL, "token-b", "key") is None
+
+
+def test_metadata_cache_treats_corrupt_entries_as_missing(tmp_path) -> None:
+    cache = MetadataCache(tmp_path)
+    cache.set(URL, "token", "key", "value")
+    entry = next(cache.project_dir(URL, "token").glob("*.pkl"))
+    entry.write_bytes(b"not a pickle")
+
+    assert cache.get(URL, "token", "key") is None
+    assert not entry.exists()
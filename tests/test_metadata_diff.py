@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from redcaplite.metadata_ops.diff import MetadataIndex, diff_metadata, diff_metadata_many, normalize_metadata
+
+
+def _metadata(names: list[str], **columns: list[object]) -> pd.DataFrame:
+    return pd.DataFrame({"field_name": names, **columns})
+
+
+def test_diff_metadata_reports_per_column_changes() -> None:
+    source = _metadata(["record_id", "age", "height"], field_label=["ID", "Participant Age", "Height"], field_type=["text", "text", "text"])
+    target = _metadata(["record_id", "age", "height"], field_label=["ID", "Age", "Height"], field_type=["text", "text", "notes"])
+
+    diff = diff_metadata(source, target)
+
+    assert list(diff.updates["field_name"]) == ["age", "height"]
+    assert diff.changes.to_dict(orient="records") == [
+        {"field_name": "age", "column": "field_label", "source": "Participant Age", "target": "Age"},
+        {"field_name": "height", "column": "field_type", "source": "text", "target": "notes"},
+    ]
+    assert diff.adds.empty and diff.removals.empty and diff.moves.empty
+
+
+def test_diff_metadata_reports_moves_but_not_shifts_from_adds_and_removals() -> None:
+    source = _metadata(["record_id", "a", "b", "c", "d", "e"])
+    target = _metadata(["record_id", "new", "d", "a", "c", "e"])
+
+    diff = diff_metadata(source, target)
+
+    assert list(diff.adds["field_name"]) == ["b"]
+    assert list(diff.removals["field_name"]) == ["new"]
+    assert diff.moves.to_dict(orient="records") == [
+        {"field_name": "d", "source_position": 5, "target_position": 3},
+    ]
+    assert not diff.empty
+
+
+def test_diff_metadata_normalizes_blanks_numbers_and_missing_columns() -> None:
+    source = _metadata(["age"], text_validation_max=[120], branching_logic=[None])
+    target = _metadata(["age", "weight"], text_validation_max=[120.0, np.nan], branching_logic=["", ""], notes=["", "kg"])
+
+    diff = diff_metadata(source, target)
+
+    assert diff.updates.empty
+    assert list(diff.removals["field_name"]) == ["weight"]
+    assert normalize_metadata(target)["text_validation_max"].tolist() == ["120", ""]
+
+
+def test_diff_metadata_rejects_duplicate_field_names() -> None:
+    with pytest.raises(ValueError, match="Duplicate field_name values in metadata: age"):
+        MetadataIndex(_metadata(["age", "age"]))
+    with pytest.raises(ValueError, match='missing the "field_name" column'):
+        MetadataIndex(pd.DataFrame({"form_name": ["demographics"]}))
+
+
+def test_diff_metadata_many_indexes_the_source_once() -> None:
+    source = _metadata(["record_id", "age"], field_label=["ID", "Age"])
+    targets = {
+        "same": source.copy(),
+        "empty": pd.DataFrame(),
+        "relabelled": _metadata(["record_id", "age"], field_label=["ID", "Age (years)"]),
+    }
+
+    diffs = diff_metadata_many(source, targets)
+
+    assert list(diffs) == ["same", "empty", "relabelled"]
+    assert diffs["same"].empty
+    assert list(diffs["empty"].adds["field_name"]) == ["record_id", "age"]
+    assert diffs["relabelled"].changes["target"].tolist() == ["Age (years)"]
+
+
+def test_diff_metadata_compares_values_when_hashes_match(monkeypatch) -> None:
+    source = _metadata(["record_id", "age"], field_label=["ID", "Age"])
+    target = _metadata(["record_id", "age"], field_label=["ID", "Age (years)"])
+    aligned = MetadataIndex.aligned
+
+    def colliding(self, columns):
+        values, hashes = aligned(self, columns)
+        return values, np.zeros_like(hashes)
+
+    monkeypatch.setattr(MetadataIndex, "aligned", colliding)
+
+    diff = diff_metadata(source, target)
+
+    assert list(diff.updates["field_name"]) == ["age"]
+    assert diff.changes["target"].tolist() == ["Age (years)"]
+    assert diff_metadata(source, source.copy()).empty
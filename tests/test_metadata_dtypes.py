@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import io
+
+import pandas as pd
+
+from redcaplite.metadata_ops.dtypes import build_record_dtypes, checkbox_column, parse_choice_codes
+
+
+def _metadata() -> pd.DataFrame:
+    return pd.DataFrame(
+        [
+            {"field_name": "record_id", "form_name": "enrollment", "field_type": "text",
+             "select_choices_or_calculations": "", "text_validation_type_or_show_slider_number": ""},
+            {"field_name": "zip", "form_name": "enrollment", "field_type": "text",
+             "select_choices_or_calculations": "", "text_validation_type_or_show_slider_number": ""},
+            {"field_name": "age", "form_name": "enrollment", "field_type": "text",
+             "select_choices_or_calculations": "", "text_validation_type_or_show_slider_number": "integer"},
+            {"field_name": "weight", "form_name": "visit", "field_type": "text",
+             "select_choices_or_calculations": "", "text_validation_type_or_show_slider_number": "number_1dp"},
+            {"field_name": "visit_date", "form_name": "visit", "field_type": "text",
+             "select_choices_or_calculations": "", "text_validation_type_or_show_slider_number": "date_mdy"},
+            {"field_name": "sex", "form_name": "enrollment", "field_type": "radio",
+             "select_choices_or_calculations": "1, Male | 2, Female", "text_validation_type_or_show_slider_number": ""},
+            {"field_name": "race", "form_name": "enrollment", "field_type": "checkbox",
+             "select_choices_or_calculations": "1, White | -9, Unknown", "text_validation_type_or_show_slider_number": ""},
+            {"field_name": "bmi", "form_name": "visit", "field_type": "calc",
+             "select_choices_or_calculations": "[weight]/4", "text_validation_type_or_show_slider_number": ""},
+            {"field_name": "intro", "form_name": "enrollment", "field_type": "descriptive",
+             "select_choices_or_calculations": "", "text_validation_type_or_show_slider_number": ""},
+        ]
+    )
+
+
+def test_parse_choice_codes_and_checkbox_columns() -> None:
+    assert parse_choice_codes("1, Yes | 0, No") == ["1", "0"]
+    assert parse_choice_codes("") == []
+    assert checkbox_column("race", "-9") == "race____9"
+
+
+def test_build_record_dtypes_maps_field_types() -> None:
+    dtypes, parse_dates = build_record_dtypes(_metadata())
+
+    assert dtypes["record_id"] == "string"
+    assert dtypes["zip"] == "string"
+    assert dtypes["age"] == "Int64"
+    assert dtypes["weight"] == "Float64"
+    assert dtypes["sex"] == "category"
+    assert dtypes["race___1"] == "Int8"
+    assert dtypes["race____9"] == "Int8"
+    assert dtypes["bmi"] == "Float64"
+    assert dtypes["enrollment_complete"] == "Int8"
+    assert dtypes["visit_complete"] == "Int8"
+    assert dtypes["redcap_event_name"] == "category"
+    assert "intro" not in dtypes
+    assert parse_dates == ["visit_date"]
+
+
+def test_build_record_dtypes_limits_dates_and_forms_to_exported_columns() -> None:
+    dtypes, parse_dates = build_record_dtypes(_metadata(), raw=False, forms=["enrollment"])
+
+    assert parse_dates == []
+    assert dtypes["race___1"] == "category"
+    assert dtypes["enrollment_complete"] == "category"
+    assert "visit_complete" not in dtypes
+
+
+def test_build_record_dtypes_parse_export() -> None:
+    dtypes, parse_dates = build_record_dtypes(_metadata())
+    csv = (
+        "record_id,zip,age,weight,visit_date,sex,race___1,race____9,bmi,enrollment_complete,visit_complete\n"
+        "007,02134,41,70.5,2024-01-31,1,1,0,17.6,2,0\n"
+        "010,,,,,2,0,1,,0,\n"
+    )
+    df = pd.read_csv(io.StringIO(csv), dtype=dtypes, parse_dates=parse_dates)
+
+    assert df["record_id"].tolist() == ["007", "010"]
+    assert df["zip"].iloc[0] == "02134"
+    assert str(df["age"].dtype) == "Int64"
+    assert str(df["sex"].dtype) == "category"
+    assert pd.api.types.is_datetime64_any_dtype(df["visit_date"])
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from redcaplite.metadata_ops.diff import diff_metadata
+from redcaplite.metadata_ops.frame import MetadataFrame
+from redcaplite.metadata_ops.transform import append_field, find_field, remove_field, update_field
+from redcaplite.metadata_ops.validate import ensure_field_exists, ensure_field_missing
+
+
+@pytest.fixture
+def metadata_frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        [
+            {"field_name": "record_id", "form_name": "enrollment", "field_type": "text", "field_label": "Record ID", "field_note": None},
+            {"field_name": "age", "form_name": "demographics", "field_type": "text", "field_label": "Age", "field_note": "years"},
+            {"field_name": "sex", "form_name": "demographics", "field_type": "text", "field_label": "Sex", "field_note": None},
+            {"field_name": "visit_date", "form_name": "visit", "field_type": "text", "field_label": "Visit date", "field_note": None},
+        ]
+    )
+
+
+def test_metadata_frame_indexes_fields_and_forms(metadata_frame: pd.DataFrame) -> None:
+    metadata = MetadataFrame(metadata_frame)
+
+    assert len(metadata) == 4 and "age" in metadata and "height" not in metadata
+    assert metadata.field_names == ["record_id", "age", "sex", "visit_date"]
+    assert metadata.form_names == ["enrollment", "demographics", "visit"]
+    assert metadata.position("sex") == 2
+    assert metadata.form_range("demographics") == range(1, 3)
+    assert metadata.form_fields("demographics") == ["age", "sex"]
+    assert metadata.find("record_id")["field_note"] == ""
+    with pytest.raises(ValueError, match='Metadata field "missing" was not found.'):
+        metadata.position("missing")
+    with pytest.raises(ValueError, match="appears more than once"):
+        MetadataFrame(pd.concat([metadata_frame, metadata_frame.iloc[:1]]))
+
+
+def test_metadata_frame_inserts_moves_and_materializes(metadata_frame: pd.DataFrame) -> None:
+    metadata = MetadataFrame(metadata_frame)
+
+    metadata.insert({"field_name": "height", "form_name": "demographics", "field_type": "text", "field_label": "Height"})
+    metadata.insert({"field_name": "consent", "form_name": "consent", "field_type": "yesno", "field_label": "Consent"})
+    metadata.insert({"field_name": "note", "form_name": "visit", "field_label": "Note", "branching_logic": "[age] > 1"}, after="age")
+    metadata.move("visit_date", before="note")
+    metadata.update("sex", {"field_name": "sex_at_birth", "form_name": "enrollment"})
+
+    assert metadata.field_names == ["record_id", "age", "visit_date", "note", "sex_at_birth", "height", "consent"]
+    assert metadata.form_range("visit") == range(2, 4)
+    assert metadata.form_range("demographics") == range(1, 6)
+    assert metadata.position("consent") == 6
+
+    frame = metadata.to_frame()
+    assert list(frame.columns)[-1] == "branching_logic"
+    assert list(frame["form_name"]) == ["enrollment", "demographics", "visit", "visit", "enrollment", "demographics", "consent"]
+    assert MetadataFrame(frame).field_names == metadata.field_names
+
+    metadata.remove("note")
+    metadata.remove("visit_date")
+    assert metadata.field_names == ["record_id", "age", "sex_at_birth", "height", "consent"]
+    assert metadata.form_names == ["enrollment", "demographics", "consent"]
+
+
+def test_transform_helpers_edit_metadata_frames_in_place(metadata_frame: pd.DataFrame) -> None:
+    metadata = MetadataFrame(metadata_frame)
+
+    assert append_field(metadata, {"field_name": "height", "form_name": "demographics", "field_type": "text", "field_label": "Height"}) is metadata
+    assert update_field(metadata, "age", {"field_label": "Age in years", "field_name": "age_years"}) is metadata
+    assert remove_field(metadata, "visit_date") is metadata
+
+    assert metadata.field_names == ["record_id", "age_years", "sex", "height"]
+    assert find_field(metadata, "age_years")["field_label"] == "Age in years"
+    ensure_field_exists(metadata, "height")
+    ensure_field_missing(metadata, "age")
+    with pytest.raises(ValueError, match='Metadata field "sex" already exists.'):
+        update_field(metadata, "height", {"field_name": "sex"})
+    assert not diff_metadata(metadata, metadata.to_frame()).changes.shape[0]
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from redcaplite.metadata_ops import lint
+from redcaplite.metadata_ops.frame import MetadataFrame
+from redcaplite.metadata_ops.lint import lint_metadata, logic_references, parse_choices
+
+
+def _row(field_name: str, field_type: str = "text", form_name: str = "main", **values: str) -> dict[str, str]:
+    return {"field_name": field_name, "form_name": form_name, "field_type": field_type, **values}
+
+
+def _rules(report: lint.LintReport) -> list[tuple[str, str]]:
+    return [(issue.field_name, issue.rule) for issue in report.issues]
+
+
+def test_lint_metadata_accepts_a_clean_dictionary() -> None:
+    metadata = pd.DataFrame(
+        [
+            _row("record_id"),
+            _row("age", text_validation_type_or_show_slider_number="integer"),
+            _row("colors", "checkbox", select_choices_or_calculations="1, Red | 2, Blue"),
+            _row("double_age", "calc", select_choices_or_calculations="[age] * 2", branching_logic="[colors(2)] = '1'"),
+        ]
+    )
+
+    report = lint_metadata(metadata)
+
+    assert report.ok
+    assert report.issues == []
+    assert report.fields == 4
+
+
+def test_lint_metadata_reports_field_level_problems_in_row_order() -> None:
+    metadata = pd.DataFrame(
+        [
+            _row("record_id"),
+            _row("Bad-Name"),
+            _row("record_id"),
+            _row("notes", "blob", form_name=""),
+            _row("phone", text_validation_type_or_show_slider_number="my_custom"),
+            _row("status", "radio"),
+            _row("score", "calc"),
+        ]
+    )
+
+    report = lint_metadata(metadata)
+
+    assert _rules(report) == [
+        ("Bad-Name", "field-name"),
+        ("record_id", "duplicate-field"),
+        ("notes", "form-name"),
+        ("notes", "field-type"),
+        ("phone", "validation-type"),
+        ("status", "missing-choices"),
+        ("score", "missing-calculation"),
+    ]
+    assert [issue.row for issue in report.issues] == [2, 3, 4, 4, 5, 6, 7]
+    assert [issue.field_name for issue in report.warnings] == ["phone"]
+    assert not report.ok
+
+
+def test_lint_metadata_checks_choices_and_references() -> None:
+    metadata = MetadataFrame(
+        [
+            _row("record_id"),
+            _row("colors", "checkbox", select_choices_or_calculations="1, Red | 1, Blue | green"),
+            _row("bmi", "calc", select_choices_or_calculations="[weight] / [record_id]"),
+            _row("follow_up", branching_logic="[event_1_arm_1][colors(3)] = '1' and [user-name] <> ''"),
+        ]
+    )
+
+    report = lint_metadata(metadata)
+
+    assert _rules(report) == [
+        ("colors", "malformed-choice"),
+        ("colors", "duplicate-choice-code"),
+        ("bmi", "unknown-field-reference"),
+        ("follow_up", "unknown-choice-code"),
+    ]
+    assert 'unknown field "weight"' in report.issues[2].message
+
+
+def test_lint_metadata_requires_field_name_column() -> None:
+    with pytest.raises(ValueError, match="field_name"):
+        lint_metadata(pd.DataFrame({"form_name": ["main"]}))
+
+
+def test_parse_choices_and_logic_references_are_cached() -> None:
+    assert parse_choices("1, Yes | 0, No") == ((("1", "Yes"), ("0", "No")), ())
+    assert parse_choices("1, Yes | 0, No") is parse_choices("1, Yes | 0, No")
+    assert logic_references("[event_1_arm_1][age] > 1 and [age][2] = '' and [visits][current-instance] = 1") == (
+        ("age", None),
+        ("age", None),
+        ("visits", None),
+    )
+    assert logic_references("[colors(2)] = '1' or [record-name] = ''") == (("colors", "2"),)
+
+
+def test_lint_metadata_process_pool_matches_serial(monkeypatch) -> None:
+    rows = [_row("record_id")] + [
+        _row(f"f{index}", branching_logic=f"[record_id] = 1 or [missing_{index % 3}] = 1") for index in range(1, 40)
+    ]
+    metadata = pd.DataFrame(rows)
+    serial = lint_metadata(metadata)
+    submitted = []
+    monkeypatch.setattr(lint, "_check_references_in_worker", lambda rows: submitted.append(len(rows)) or [])
+    monkeypatch.setattr(lint, "ProcessPoolExecutor", _InlinePool)
+
+    assert lint_metadata(metadata, max_workers=2).issues == serial.issues
+    assert submitted == []
+    lint_metadata(metadata, max_workers=2, parallel_min_fields=0)
+    assert submitted == [20, 19]
+    monkeypatch.undo()
+
+    parallel = lint_metadata(metadata, max_workers=2, chunk_size=10, parallel_min_fields=0)
+
+    assert parallel.issues == serial.issues
+    assert len(parallel.errors) == 39
+
+
+class _InlinePool:
+    def __init__(self, workers, initializer, initargs):
+        initializer(*initargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return None
+
+    def map(self, func, chunks):
+        return map(func, chunks)
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from redcaplite.metadata_ops.session import MetadataEditSession
+
+
+@pytest.fixture
+def metadata_frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        [
+            {"field_name": "record_id", "form_name": "enrollment", "field_type": "text", "field_label": "Record ID", "select_choices_or_calculations": None},
+            {"field_name": "age", "form_name": "demographics", "field_type": "text", "field_label": "Age", "select_choices_or_calculations": None},
+            {"field_name": "sex", "form_name": "demographics", "field_type": "radio", "field_label": "Sex", "select_choices_or_calculations": "1, F | 2, M"},
+            {"field_name": "visit_date", "form_name": "visit", "field_type": "text", "field_label": "Visit date", "select_choices_or_calculations": None},
+        ]
+    )
+
+
+def test_session_applies_many_operations_in_memory(metadata_frame: pd.DataFrame) -> None:
+    session = MetadataEditSession(metadata_frame)
+
+    errors = session.apply(
+        [
+            {"op": "add", "field_name": "height", "form_name": "demographics", "field_note": "cm"},
+            {"op": "edit", "field_name": "age", "field_label": "Age in years", "new_field_name": "age_years"},
+            {"op": "remove", "field_name": "visit_date"},
+            {"op": "move", "field_name": "sex", "after": "record_id"},
+            {"op": "edit", "field_name": "sex", "field_type": "DROPDOWN"},
+        ]
+    )
+
+    assert errors == []
+    frame = session.to_frame()
+    assert list(frame["field_name"]) == ["record_id", "sex", "age_years", "height"]
+    assert list(frame.columns)[-1] == "field_note"
+    assert frame.loc[frame["field_name"] == "height", "field_label"].item() == "Height"
+    assert frame.loc[frame["field_name"] == "sex", "field_type"].item() == "dropdown"
+    assert session.changes.added == ["height"]
+    assert session.changes.edited == ["age_years", "sex"]
+    assert session.changes.removed == ["visit_date"]
+    assert session.changes.moved == ["sex"]
+
+
+def test_session_reports_every_failed_operation_and_keeps_state(metadata_frame: pd.DataFrame) -> None:
+    session = MetadataEditSession(metadata_frame)
+
+    errors = session.apply(
+        [
+            {"op": "add", "field_name": "age", "form_name": "demographics"},
+            {"op": "edit", "field_name": "age", "field_type": "checkbox"},
+            {"op": "add", "field_name": "mood", "form_name": "visit", "field_type": "slider"},
+            {"op": "move", "field_name": "age", "before": "missing"},
+            {"op": "rename", "field_name": "age"},
+            "remove age",
+        ]
+    )
+
+    assert [error.index for error in errors] == [0, 1, 3, 4, 5]
+    assert 'already exists' in errors[0].message
+    assert 'requires non-empty "select_choices_or_calculations"' in errors[1].message
+    assert 'Metadata field "missing" was not found.' in str(errors[2])
+    assert 'Unknown operation "rename"' in errors[3].message
+    assert session.field_names == ["record_id", "age", "sex", "visit_date", "mood"]
+    assert session.field("age")["field_type"] == "text"
+
+
+def test_session_rejects_unknown_keys_and_adds_before_a_field(metadata_frame: pd.DataFrame) -> None:
+    session = MetadataEditSession(metadata_frame)
+
+    errors = session.apply(
+        [
+            {"op": "add", "field_name": "weight", "form_name": "demographics", "before": "age"},
+            {"op": "add", "field_name": "height", "form_name": "demographics", "colour": "red"},
+            {"op": "edit", "field_name": "age", "after": "record_id"},
+            {"op": "remove", "field_name": "sex", "before": "age"},
+        ]
+    )
+
+    assert [error.index for error in errors] == [1, 2, 3]
+    assert errors[0].message == 'Unknown key(s) for "add": colour.'
+    assert errors[1].message == 'Unknown key(s) for "edit": after.'
+    assert errors[2].message == 'Unknown key(s) for "remove": before.'
+    assert session.field_names == ["record_id", "weight", "age", "sex", "visit_date"]
+    assert "colour" not in session.to_frame().columns
+    assert "after" not in session.to_frame().columns
+    with pytest.raises(ValueError, match="Unknown metadata column"):
+        session.edit("age", label="Age")
+
+
+def test_session_load_and_push_use_one_export_and_one_import(metadata_frame: pd.DataFrame) -> None:
+    class Client:
+        cache_clears = 0
+        imported = None
+
+        def clear_metadata_cache(self) -> None:
+            self.cache_clears += 1
+
+        def get_metadata(self, format: str) -> pd.DataFrame:
+            return metadata_frame
+
+        def import_metadata(self, data: pd.DataFrame, format: str) -> int:
+            self.imported = data
+            return len(data.index)
+
+    client = Client()
+    session = MetadataEditSession.load(client)
+    session.remove("age")
+
+    assert session.push(client) == 3
+    assert client.cache_clears == 1
+    assert "age" not in session
+    assert len(session) == 3
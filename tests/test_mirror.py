@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from redcaplite import RedcapClient
+from redcaplite.mirror import FilterLogicError, ProjectMirror, redcap_compare, translate_filter_logic
+from redcaplite.testing import FakeProject, FakeRedcapServer
+
+TEXT = {"dtype": str, "keep_default_na": False}
+
+
+@pytest.fixture
+def served():
+    project = FakeProject.generate(records=60, fields=8)
+    with FakeRedcapServer(project) as server:
+        with RedcapClient(server.url, server.token) as client:
+            yield server, client
+
+
+def test_redcap_compare_matches_redcap_rules() -> None:
+    assert redcap_compare("5", "=", "5.0")
+    assert redcap_compare("10", ">", "9")
+    assert not redcap_compare("10", "<", "9")
+    assert redcap_compare("b", ">", "a")
+    assert not redcap_compare("", "<", "3")
+    assert redcap_compare("", "<>", "3")
+    assert redcap_compare(None, "=", "")
+
+
+def test_translate_filter_logic() -> None:
+    logic = translate_filter_logic("[age] >= 18 and ([sex] = '1' or [color(2)] = \"1\") AND [site] <> 'north'")
+    assert logic.sql == (
+        "((redcap_compare(IFNULL(\"age\", ''), '>=', ?) AND "
+        "(redcap_compare(IFNULL(\"sex\", ''), '=', ?) OR redcap_compare(IFNULL(\"color___2\", ''), '=', ?))) "
+        "AND IFNULL(\"site\", '') <> ?)"
+    )
+    assert logic.params == ["18", "1", "1", "north"]
+    assert logic.columns == {"age", "sex", "color___2", "site"}
+
+    event_logic = translate_filter_logic("[baseline_arm_1][weight] > 70")
+    assert event_logic.sql == "(\"redcap_event_name\" = ? AND redcap_compare(IFNULL(\"weight\", ''), '>', ?))"
+    assert event_logic.params == ["baseline_arm_1", "70"]
+
+
+@pytest.mark.parametrize("logic", ["datediff([dob], 'today', 'y') > 18", "[age] > ", "([age] = 1", "[a] = 1 [b] = 2"])
+def test_translate_filter_logic_rejects_unsupported_syntax(logic) -> None:
+    with pytest.raises(FilterLogicError):
+        translate_filter_logic(logic)
+
+
+def test_refresh_mirrors_project_tables(served, tmp_path) -> None:
+    server, client = served
+    mirror = ProjectMirror(tmp_path / "mirror.sqlite")
+
+    result = mirror.refresh(client)
+
+    assert result.full
+    assert result.updated_records == 60
+    assert result.tables["metadata"] == len(server.project.metadata)
+    assert result.tables["users"] == 1
+    assert set(result.skipped) == {"arms", "events", "form_event_mappings"}
+    assert result.log_rows == 60
+    pd.testing.assert_frame_equal(mirror.table("records"), client.export_records(pd_read_csv_kwargs=TEXT))
+    assert mirror.table("users")["username"].tolist() == ["fake_api_user"]
+    assert mirror.table("logs")["timestamp"].is_monotonic_increasing
+
+
+@pytest.mark.parametrize(
+    "logic",
+    [
+        "[field_6] > 40",
+        "[field_2] >= 10 and [field_6] < 60",
+        "[field_1] = 'golf' or [field_1] = ''",
+        "([field_3] > '2024-01-01' and [field_6] <= 50) or [record_id] = 7",
+    ],
+)
+def test_query_matches_server_filter_logic(served, tmp_path, logic) -> None:
+    _, client = served
+    mirror = ProjectMirror(tmp_path / "mirror.sqlite")
+    mirror.refresh(client)
+
+    expected = client.export_records(filterLogic=logic, pd_read_csv_kwargs=TEXT)
+    local = mirror.query(filter_logic=logic)
+
+    assert not expected.empty
+    pd.testing.assert_frame_equal(local, expected)
+
+
+def test_query_fields_and_records(served, tmp_path) -> None:
+    _, client = served
+    mirror = ProjectMirror(tmp_path / "mirror.sqlite")
+    mirror.refresh(client)
+
+    frame = mirror.query(fields=["field_2"], records=["3", "1"])
+
+    assert frame.columns.tolist() == ["record_id", "field_2"]
+    checked = mirror.query(filter_logic="[field_7(2)] = '1'", fields=["field_7"])
+    assert checked.columns.tolist() == ["record_id", "field_7___1", "field_7___2", "field_7___3"]
+    assert not checked.empty and (checked["field_7___2"] == "1").all()
+    records = mirror.table("records")
+    assert len(checked.index) == (records["field_7___2"] == "1").sum()
+    assert frame["record_id"].tolist() == ["1", "3"]
+    with pytest.raises(FilterLogicError, match="not in the mirror: missing_field"):
+        mirror.query(filter_logic="[missing_field] = 1")
+
+
+def test_refresh_is_incremental(served, tmp_path) -> None:
+    server, client = served
+    mirror = ProjectMirror(tmp_path / "mirror.sqlite")
+    mirror.refresh(client)
+
+    client.import_records([{"record_id": "5", "field_1": "changed"}])
+    client.delete_records(["6"])
+    server.request_log.clear()
+    result = mirror.refresh(client)
+
+    assert not result.full
+    assert result.updated_records == 1
+    assert result.deleted_records == 1
+    records = mirror.table("records")
+    assert records.loc[records["record_id"] == "5", "field_1"].tolist() == ["changed"]
+    assert "6" not in records["record_id"].tolist()
+    logs = mirror.table("logs")
+    assert logs["action"].str.startswith("Deleted Record").sum() == 1
+    assert len(logs.index) == 62
+    with sqlite3.connect(mirror.path) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM sync_state").fetchone()[0] == 2
+
+
+def test_refresh_stores_missing_structure_values_as_null(served, tmp_path, monkeypatch) -> None:
+    _, client = served
+    users = [
+        {"username": "alice", "expiration": None, "forms": {"demographics": 1}},
+        {"username": "bob", "forms_export": [{"demographics": 0}]},
+    ]
+    monkeypatch.setattr(client, "get_users", lambda format: users)
+    mirror = ProjectMirror(tmp_path / "mirror.sqlite")
+
+    mirror.refresh(client)
+
+    with sqlite3.connect(mirror.path) as connection:
+        rows = connection.execute("SELECT username, expiration, forms, forms_export FROM users ORDER BY rowid").fetchall()
+    assert rows == [
+        ("alice", None, '{"demographics": 1}', None),
+        ("bob", None, None, '[{"demographics": 0}]'),
+    ]
+
+
+def test_refresh_keeps_logs_when_sync_snapshot_falls_back_to_full(served, tmp_path, monkeypatch) -> None:
+    _, client = served
+    mirror = ProjectMirror(tmp_path / "mirror.sqlite")
+    mirror.refresh(client)
+    client.import_records([{"record_id": "5", "field_1": "changed"}])
+    sync_snapshot = client.sync_snapshot
+    monkeypatch.setattr(client, "sync_snapshot", lambda path, full, **kwargs: sync_snapshot(path, full=True, **kwargs))
+
+    result = mirror.refresh(client)
+
+    assert result.full
+    logs = mirror.table("logs")
+    assert len(logs.index) == 61
+    assert not logs.duplicated().any()
@@ -1,10 +1,15 @@
 import pytest
 from unittest.mock import Mock, patch, mock_open
 from redcaplite import RedcapClient
+from redcaplite.cache import MetadataCache
+from redcaplite.http.error import APIException
+from redcaplite.snapshot import RecordSnapshot
 from redcaplite.api.schemas import get_empty_csv_columns
 import pandas as pd
 import numpy as np
 from pandas.testing import assert_frame_equal
+import io
+from datetime import timedelta
 import json
 import tempfile
 from pathlib import Path
@@ -26,6 +31,8 @@ def mock_response_factory(status_code=200, return_text='{"foo": "bar"}'):
     mock_response.status_code = status_code
     mock_response.json.return_value = return_obj
     mock_response.text = return_text
+    mock_response.content = return_text.encode('utf-8')
+    mock_response.encoding = 'utf-8'
     return mock_response
 
 
@@ -39,7 +46,7 @@ def mock_redcap_client_post(
         expected_requests_files=None
 ):
     """Mock RedcapClient post method"""
-    with patch('requests.post', return_value=mock_response) as mock_post:
+    with patch('requests.Session.post', return_value=mock_response) as mock_post:
         response = getattr(client, method)(**method_kwargs)
         if expected_df is not None:
             assert_frame_equal(response, expected_df)
@@ -192,8 +199,8 @@ def test_redcap_client_get_field_names(client):
 def test_redcap_client_get_file(client):
     """Test RedcapClient get_file method"""
     mock_response = mock_response_factory()
-    mock_response.content = b'Hello, world!'
-    with patch('requests.post', return_value=mock_response) as mock_post:
+    mock_response.iter_content.return_value = iter([b'Hello, world!'])
+    with patch('requests.Session.post', return_value=mock_response) as mock_post:
         with patch('builtins.open', new=mock_open()) as mock_file:
             response = client.get_file(record='2', field='pdf')
             assert response == mock_response
@@ -201,7 +208,8 @@ def test_redcap_client_get_file(client):
                 'https://example.com',
                 data={'content': 'file', 'action': 'export', 'record': '2',
                       'field': 'pdf', 'returnFormat': 'json', 'token': 'token'},
-                files=None)
+                files=None,
+                stream=True)
             mock_file.assert_called_once_with('download.raw', 'wb')
             mock_file.return_value.write.assert_called_once_with(
                 b'Hello, world!')
@@ -211,7 +219,7 @@ def test_redcap_client_import_file(client):
     """Test RedcapClient import_file method"""
     mock_response = mock_response_factory()
     mock_response.content = b'Hello, world!'
-    with patch('requests.post', return_value=mock_response) as mock_post:
+    with patch('requests.Session.post', return_value=mock_response) as mock_post:
         with patch('builtins.open', new=mock_open()) as mock_file:
             response = client.import_file('file.txt', record='2', field='pdf')
             assert response == mock_response
@@ -254,8 +262,8 @@ def test_redcap_client_list_file_repository(client):
 def test_redcap_client_export_file_repository(client):
     """Test RedcapClient export_file_repository method"""
     mock_response = mock_response_factory()
-    mock_response.content = b'Hello, world!'
-    with patch('requests.post', return_value=mock_response) as mock_post:
+    mock_response.iter_content.return_value = iter([b'Hello, world!'])
+    with patch('requests.Session.post', return_value=mock_response) as mock_post:
         with patch('builtins.open', new=mock_open()) as mock_file:
             response = client.export_file_repository(doc_id='5')
             assert response == mock_response
@@ -263,7 +271,8 @@ def test_redcap_client_export_file_repository(client):
                 'https://example.com',
                 data={'content': 'fileRepository', 'action': 'export',
                       'doc_id': '5', 'returnFormat': 'json', 'token': 'token'},
-                files=None)
+                files=None,
+                stream=True)
             mock_file.assert_called_once_with('download.raw', 'wb')
             mock_file.return_value.write.assert_called_once_with(
                 b'Hello, world!')
@@ -273,7 +282,7 @@ def test_redcap_client_import_file_repository(client):
     """Test RedcapClient import_file_repository method"""
     mock_response = mock_response_factory()
     mock_response.content = b'Hello, world!'
-    with patch('requests.post', return_value=mock_response) as mock_post:
+    with patch('requests.Session.post', return_value=mock_response) as mock_post:
         with patch('builtins.open', new=mock_open()) as mock_file:
             response = client.import_file_repository(
                 'file.txt', folder_id='24')
@@ -309,8 +318,8 @@ def test_redcap_client_get_instruments(client):
 def test_redcap_client_export_pdf(client):
     """Test RedcapClient export_pdf method"""
     mock_response = mock_response_factory()
-    mock_response.content = b'Hello, world!'
-    with patch('requests.post', return_value=mock_response) as mock_post:
+    mock_response.iter_content.return_value = iter([b'Hello, world!'])
+    with patch('requests.Session.post', return_value=mock_response) as mock_post:
         with patch('builtins.open', new=mock_open()) as mock_file:
             response = client.export_pdf()
             assert response == mock_response
@@ -320,7 +329,8 @@ def test_redcap_client_export_pdf(client):
                     'content': 'pdf',
                     'returnFormat': 'json',
                     'token': 'token'},
-                files=None)
+                files=None,
+                stream=True)
             mock_file.assert_called_once_with('download.raw', 'wb')
             mock_file.return_value.write.assert_called_once_with(
                 b'Hello, world!')
@@ -522,6 +532,292 @@ def test_export_records_with_output_file(client):
         assert output_file.read_text(encoding='utf-8') == 'record_id\n1'
 
 
+def test_export_records_with_chunksize(client):
+    mock_response = mock_response_factory(return_text='')
+    mock_response.raw = io.BytesIO(b'record_id,age\n1,30\n2,40\n3,50\n')
+    with patch('requests.Session.post', return_value=mock_response) as mock_post:
+        chunks = list(client.export_records(chunksize=2))
+        mock_post.assert_called_once_with(
+            'https://example.com',
+            data={'content': 'record', 'action': 'export', 'rawOrLabel': 'raw',
+                  'type': 'flat', 'format': 'csv', 'returnFormat': 'json', 'token': 'token'},
+            files=None,
+            stream=True,
+        )
+    assert [chunk['record_id'].tolist() for chunk in chunks] == [[1, 2], [3]]
+
+
+def test_export_records_with_infer_dtypes(client):
+    metadata_csv = (
+        'field_name,form_name,field_type,select_choices_or_calculations,text_validation_type_or_show_slider_number\n'
+        'record_id,enrollment,text,,\n'
+        'dob,enrollment,text,,date_ymd\n'
+        'sex,enrollment,radio,"1, Male | 2, Female",\n'
+    )
+    records_csv = 'record_id,dob,sex,enrollment_complete\n007,2001-02-03,1,2\n'
+
+    def side_effect(url, data, files=None):
+        return mock_response_factory(return_text=metadata_csv if data['content'] == 'metadata' else records_csv)
+
+    with patch('requests.Session.post', side_effect=side_effect) as mock_post:
+        first = client.export_records(infer_dtypes=True, pd_read_csv_kwargs={'dtype': {'sex': str}})
+        client.export_records(infer_dtypes=True)
+        assert mock_post.call_count == 3
+
+        client.import_metadata('field_name\nrecord_id')
+        client.export_records(infer_dtypes=True)
+        assert mock_post.call_count == 6
+
+    assert first['record_id'].tolist() == ['007']
+    assert pd.api.types.is_datetime64_any_dtype(first['dob'])
+    assert first['sex'].tolist() == ['1']
+    assert str(first['enrollment_complete'].dtype) == 'Int8'
+
+
+def test_export_records_with_infer_dtypes_and_comma_decimals(client):
+    metadata_csv = (
+        'field_name,form_name,field_type,select_choices_or_calculations,text_validation_type_or_show_slider_number\n'
+        'record_id,enrollment,text,,\n'
+        'weight,enrollment,text,,number\n'
+        'bmi,enrollment,calc,[weight],\n'
+        'visits,enrollment,text,,integer\n'
+    )
+    records_csv = 'record_id,weight,bmi,visits\n1,"72,5","22,25",3\n2,,,\n'
+
+    def side_effect(url, data, files=None):
+        return mock_response_factory(return_text=metadata_csv if data['content'] == 'metadata' else records_csv)
+
+    with patch('requests.Session.post', side_effect=side_effect) as mock_post:
+        records = client.export_records(infer_dtypes=True, decimalCharacter=',')
+
+    assert mock_post.call_args_list[-1].kwargs['data']['decimalCharacter'] == ','
+    assert records['weight'].tolist()[0] == 72.5
+    assert records['bmi'].tolist()[0] == 22.25
+    assert records['weight'].isna().tolist() == [False, True]
+    assert str(records['visits'].dtype) == 'Int64'
+    assert records['record_id'].tolist() == ['1', '2']
+
+
+def test_export_records_with_arrow(client, tmp_path):
+    """Test that arrow=... parses the CSV bytes with pyarrow and writes Parquet output"""
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    response = mock_response_factory(return_text='record_id,age\n007,30\n')
+    response.content = b'record_id,age\n007,30\n'
+    output_file = tmp_path / 'records.parquet'
+    with patch('requests.Session.post', return_value=response) as mock_post:
+        table = client.export_records(
+            arrow='table',
+            arrow_convert_options={'column_types': {'record_id': pa.string()}},
+            output_file=output_file,
+        )
+        frame = client.get_report(1, arrow='pandas')
+
+    assert mock_post.call_args_list[0].kwargs['data']['format'] == 'csv'
+    assert table.to_pydict() == {'record_id': ['007'], 'age': [30]}
+    assert pq.read_table(output_file).equals(table)
+    assert str(frame['age'].dtype) == 'int64[pyarrow]'
+    with pytest.raises(ValueError):
+        client.export_records(format='json', arrow='table')
+    with pytest.raises(ValueError):
+        client.export_records(arrow='table', infer_dtypes=True)
+
+
+def test_redcap_client_metadata_cache(tmp_path):
+    """Test that structure exports are served from the metadata cache until a structure change."""
+    client = RedcapClient('https://example.com', 'token', metadata_cache=MetadataCache(tmp_path))
+    metadata_csv = 'field_name,form_name\nrecord_id,enrollment\n'
+
+    def side_effect(url, data, files=None):
+        if data['content'] == 'metadata':
+            return mock_response_factory(return_text=metadata_csv)
+        if data['content'] == 'instrument':
+            return mock_response_factory(return_text='[{"instrument_name": "enrollment"}]')
+        return mock_response_factory(return_text='1')
+
+    with patch('requests.Session.post', side_effect=side_effect) as mock_post:
+        first = client.get_metadata()
+        assert client.get_metadata().equals(first)
+        assert client.get_instruments() == client.get_instruments()
+        assert mock_post.call_count == 2
+
+        client.get_metadata(output_file=str(tmp_path / 'metadata.csv'))
+        assert mock_post.call_count == 3
+
+        client.get_metadata(fields=['record_id'])
+        assert mock_post.call_count == 4
+
+        client.import_events([{'event_name': 'Baseline', 'arm_num': 1}])
+        client.get_metadata()
+        client.get_instruments()
+        assert mock_post.call_count == 7
+
+    reopened = RedcapClient('https://example.com', 'token', metadata_cache=MetadataCache(tmp_path))
+    with patch('requests.Session.post') as mock_post:
+        assert reopened.get_metadata().equals(first)
+        mock_post.assert_not_called()
+
+
+def test_redcap_client_clears_metadata_cache_after_structure_change(tmp_path):
+    """Test that exports cached while an import is in flight, or before it fails, are dropped."""
+    client = RedcapClient('https://example.com', 'token', metadata_cache=MetadataCache(tmp_path))
+    metadata_csv = 'field_name,form_name\nrecord_id,enrollment\n'
+
+    def side_effect(url, data, files=None):
+        if data['content'] == 'metadata' and 'data' in data:
+            # Another export caches the old dictionary while the import runs.
+            client.metadata_cache.set(client.url, client.token, 'stale', 'old')
+            return mock_response_factory(status_code=400, return_text='{"error": "bad"}')
+        return mock_response_factory(return_text=metadata_csv)
+
+    with patch('requests.Session.post', side_effect=side_effect):
+        with pytest.raises(APIException):
+            client.import_metadata([{'field_name': 'record_id'}])
+
+    assert client.metadata_cache.get(client.url, client.token, 'stale') is None
+
+
+def test_redcap_client_sync_snapshot(client, tmp_path):
+    """Test that sync_snapshot exports everything once, then only changes and deletions."""
+    path = tmp_path / 'records.sqlite'
+    responses = {
+        'record': 'record_id,age\n1,30\n2,40\n',
+        'log': '',
+    }
+
+    def side_effect(url, data, files=None):
+        return mock_response_factory(return_text=responses[data['content']])
+
+    with patch('requests.Session.post', side_effect=side_effect) as mock_post:
+        first = client.sync_snapshot(path)
+        assert first.full
+        assert [call.kwargs['data']['content'] for call in mock_post.call_args_list] == ['record']
+        assert 'dateRangeBegin' not in mock_post.call_args.kwargs['data']
+
+        responses['record'] = 'record_id,age\n1,31\n'
+        responses['log'] = 'timestamp,username,action,details,record\n2026-01-01 09:00,alice,Delete record 2,,2\n'
+        second = client.sync_snapshot(path)
+
+    assert not second.full
+    record_call, log_call = mock_post.call_args_list[1:]
+    expected_since = (first.watermark - timedelta(minutes=5)).strftime('%Y-%m-%d %H:%M:%S')
+    assert record_call.kwargs['data']['dateRangeBegin'] == expected_since
+    assert log_call.kwargs['data']['logtype'] == 'record_delete'
+    assert log_call.kwargs['data']['beginTime'] == expected_since
+    assert second.updated_records == 1
+    assert second.deleted_records == 1
+    assert RecordSnapshot(path).read().to_dict(orient='records') == [{'record_id': '1', 'age': '31'}]
+
+
+def test_redcap_client_export_files(client, tmp_path):
+    """Test that export_files streams every attached file once and resumes from its manifest."""
+    records_csv = 'record_id,consent\n1,consent.pdf\n2,\n3,other.pdf\n'
+
+    def side_effect(url, data, files=None, stream=False):
+        if data['content'] == 'exportFieldNames':
+            return mock_response_factory(return_text='[{"original_field_name": "record_id"}]')
+        if data['content'] == 'record':
+            return mock_response_factory(return_text=records_csv)
+        if data['record'] == '3':
+            return mock_response_factory(status_code=404)
+        assert stream is True
+        response = Mock(status_code=200, headers={'content-type': 'application/pdf; name="consent.pdf"'})
+        response.iter_content.return_value = iter([b'%PDF', b'-1.7'])
+        return response
+
+    with patch('requests.Session.post', side_effect=side_effect) as mock_post:
+        result = client.export_files('consent', tmp_path)
+        record_call = mock_post.call_args_list[1]
+        assert record_call.kwargs['data']['fields[0]'] == 'record_id'
+        assert record_call.kwargs['data']['fields[1]'] == 'consent'
+
+        rerun = client.export_files('consent', tmp_path, record_id_field='record_id')
+
+    saved = tmp_path / '1' / 'consent' / 'consent.pdf'
+    assert saved.read_bytes() == b'%PDF-1.7'
+    assert [entry['path'] for entry in result.downloaded] == [str(saved)]
+    assert [error['record'] for error in result.errors] == ['3']
+    assert not result.ok
+    assert rerun.skipped == 1
+    assert rerun.downloaded == []
+    assert [error['record'] for error in rerun.errors] == ['3']
+
+
+
+def test_redcap_client_export_files_keeps_server_names_inside_directory(client, tmp_path):
+    """Test that record IDs from the server cannot send a download outside the directory."""
+    records_csv = 'record_id,consent\n..,a.pdf\n../../escape,b.pdf\n'
+    output_dir = tmp_path / 'files'
+
+    def side_effect(url, data, files=None, stream=False):
+        if data['content'] == 'record':
+            return mock_response_factory(return_text=records_csv)
+        response = Mock(status_code=200, headers={'content-type': 'application/pdf; name="x.pdf"'})
+        response.iter_content.return_value = iter([b'data'])
+        return response
+
+    with patch('requests.Session.post', side_effect=side_effect):
+        result = client.export_files('consent', output_dir, record_id_field='record_id')
+
+    assert [error['record'] for error in result.errors] == ['..']
+    assert [entry['path'] for entry in result.downloaded] == [str(output_dir / '.._.._escape' / 'consent' / 'x.pdf')]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['files']
+
+def _records_post_side_effect(rows):
+    """Answer record export requests from an in-memory list of row dicts."""
+    def side_effect(url, data, files=None):
+        if data['content'] == 'exportFieldNames':
+            return mock_response_factory(
+                return_text='[{"original_field_name": "record_id", "choice_value": "", "export_field_name": "record_id"}]')
+        records = [value for key, value in data.items() if key.startswith('records[')]
+        fields = [value for key, value in data.items() if key.startswith('fields[')]
+        selected = pd.DataFrame([row for row in rows if not records or row['record_id'] in records])
+        if fields:
+            selected = selected[fields]
+        return mock_response_factory(return_text=selected.to_csv(index=False))
+    return side_effect
+
+
+def test_export_records_chunked(client):
+    rows = [
+        {'record_id': '001', 'redcap_repeat_instance': 1, 'age': 30},
+        {'record_id': '001', 'redcap_repeat_instance': 2, 'age': 31},
+        {'record_id': '002', 'redcap_repeat_instance': 1, 'age': 40},
+        {'record_id': '003', 'redcap_repeat_instance': 1, 'age': 50},
+    ]
+    with patch('requests.Session.post', side_effect=_records_post_side_effect(rows)) as mock_post:
+        response = client.export_records_chunked(chunk_size=2, max_workers=2, pd_read_csv_kwargs={'dtype': {'record_id': str}})
+
+    assert_frame_equal(response, pd.DataFrame(rows))
+    # field names lookup + record ID export + two batches
+    assert mock_post.call_count == 4
+    batch_payloads = [call.kwargs['data'] for call in mock_post.call_args_list[2:]]
+    assert sorted((payload['records[0]'], payload.get('records[1]')) for payload in batch_payloads) == [
+        ('001', '002'), ('003', None)]
+
+
+def test_export_records_chunked_iterate_with_explicit_records(client):
+    rows = [
+        {'record_id': '1', 'age': 30},
+        {'record_id': '2', 'age': 40},
+        {'record_id': '3', 'age': 50},
+    ]
+    with patch('requests.Session.post', side_effect=_records_post_side_effect(rows)) as mock_post:
+        chunks = list(client.export_records_chunked(records=['3', '1'], chunk_size=1, iterate=True))
+
+    assert [chunk['record_id'].tolist() for chunk in chunks] == [[3], [1]]
+    assert mock_post.call_count == 2
+
+
+def test_export_records_chunked_without_records(client):
+    with patch('requests.Session.post', return_value=mock_response_factory(return_text='\n')) as mock_post:
+        response = client.export_records_chunked(record_id_field='record_id')
+
+    assert_frame_equal(response, pd.DataFrame())
+    mock_post.assert_called_once()
+
+
 def test_import_records_with_kwargs(client):
     mock_response = mock_response_factory(return_text='["5"]')
     mock_redcap_client_post(
@@ -533,6 +829,38 @@ def test_import_records_with_kwargs(client):
     )
 
 
+def test_import_records_batched_merges_ids_and_reports_failures(client):
+    df = pd.DataFrame({
+        'record_id': ['1', '1', '2', '3'],
+        'redcap_repeat_instance': [1, 2, 1, 1],
+    })
+
+    def side_effect(url, data, files=None):
+        imported = pd.read_csv(io.StringIO(data['data']), dtype=str)
+        if '3' in imported['record_id'].tolist():
+            return mock_response_factory(status_code=400, return_text='{"error": "bad value"}')
+        return mock_response_factory(return_text=json.dumps(imported['record_id'].drop_duplicates().tolist()))
+
+    with patch('requests.Session.post', side_effect=side_effect) as mock_post:
+        result = client.import_records_batched(df, batch_size=2, max_workers=2)
+
+    assert mock_post.call_count == 2
+    assert result.ids == ['1', '2']
+    assert result.count == 2
+    assert not result.ok
+    assert result.errors == [{'batch': 1, 'records': ['3'], 'error': 'Bad Request: bad value'}]
+
+
+def test_import_records_batched_rejects_missing_record_ids_before_posting(client):
+    df = pd.DataFrame({'record_id': ['1', None, '2'], 'age': ['30', '31', '32']})
+
+    with patch('requests.Session.post') as mock_post:
+        with pytest.raises(ValueError, match='record ID field'):
+            client.import_records_batched(df, batch_size=1)
+
+    mock_post.assert_not_called()
+
+
 def test_import_records_with_2records(client):
     mock_response = mock_response_factory(return_text='["bar1","bar2"]')
     mock_redcap_client_post(
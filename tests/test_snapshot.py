@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+from redcaplite.snapshot import RecordSnapshot, SnapshotPlan, deleted_record_ids, server_now
+
+
+def _frame(rows: list[dict[str, str]]) -> pd.DataFrame:
+    return pd.DataFrame(rows, dtype=str)
+
+
+def test_record_snapshot_full_then_incremental_merge(tmp_path) -> None:
+    snapshot = RecordSnapshot(tmp_path / "snapshot.sqlite")
+    assert snapshot.watermark is None
+    assert snapshot.read().empty
+
+    first = snapshot.apply(
+        _frame(
+            [
+                {"record_id": "1", "redcap_event_name": "baseline", "age": "30"},
+                {"record_id": "1", "redcap_event_name": "followup", "age": "31"},
+                {"record_id": "2", "redcap_event_name": "baseline", "age": "40"},
+                {"record_id": "3", "redcap_event_name": "baseline", "age": "50"},
+            ]
+        ),
+        [],
+        datetime(2026, 1, 1, 8, 0, 0),
+        full=True,
+    )
+    assert first.full
+    assert first.updated_records == 3
+    assert snapshot.record_id_field == "record_id"
+
+    second = snapshot.apply(
+        _frame(
+            [
+                {"record_id": "1", "redcap_event_name": "baseline", "age": "32", "weight": "70"},
+                {"record_id": "4", "redcap_event_name": "baseline", "age": "", "weight": "80"},
+            ]
+        ),
+        ["2", "99"],
+        datetime(2026, 1, 1, 9, 0, 0),
+    )
+    assert not second.full
+    assert second.updated_records == 2
+    assert second.deleted_records == 2
+    assert snapshot.watermark == datetime(2026, 1, 1, 9, 0, 0)
+
+    stored = snapshot.read().sort_values("record_id").reset_index(drop=True)
+    assert stored["record_id"].tolist() == ["1", "3", "4"]
+    assert stored["age"].tolist() == ["32", "50", ""]
+    assert stored["weight"].isna().tolist() == [False, True, False]
+
+
+def test_record_snapshot_full_apply_replaces_rows(tmp_path) -> None:
+    snapshot = RecordSnapshot(tmp_path / "snapshot.sqlite")
+    snapshot.apply(_frame([{"record_id": "1", "age": "30"}]), [], datetime(2026, 1, 1), full=True)
+
+    snapshot.apply(_frame([{"record_id": "2", "sex": "1"}]), [], datetime(2026, 1, 2), full=True)
+
+    stored = snapshot.read()
+    assert stored.columns.tolist() == ["record_id", "sex"]
+    assert stored["record_id"].tolist() == ["2"]
+
+
+def test_deleted_record_ids_reads_record_column_or_action() -> None:
+    assert deleted_record_ids(pd.DataFrame({"record": ["7", "8", "7"]})) == ["7", "8"]
+    assert deleted_record_ids(
+        pd.DataFrame({"action": ["Delete record 1001", "Deleted Record (API) A-2"]})
+    ) == ["1001", "A-2"]
+    assert deleted_record_ids(pd.DataFrame()) == []
+
+
+def test_server_now_uses_the_server_timezone() -> None:
+    behind = timezone(timedelta(hours=-14))
+    expected = datetime.now(behind).replace(tzinfo=None)
+    assert abs(server_now(behind) - expected) < timedelta(seconds=5)
+    assert abs(server_now("UTC") - datetime.now(timezone.utc).replace(tzinfo=None)) < timedelta(seconds=5)
+    assert server_now(behind).tzinfo is None
+    with pytest.raises(ValueError, match="Unknown server timezone"):
+        server_now("Not/AZone")
+
+
+def test_snapshot_plan_takes_the_watermark_on_the_server_clock(tmp_path) -> None:
+    path = tmp_path / "snapshot.sqlite"
+    ahead = timezone(timedelta(hours=14))
+    RecordSnapshot(path).apply(_frame([{"record_id": "1"}]), [], datetime(2026, 1, 1, 9, 0, 0), full=True)
+
+    plan = SnapshotPlan.start(path, False, timedelta(minutes=5), ahead)
+
+    assert plan.since == datetime(2026, 1, 1, 8, 55, 0)
+    assert abs(plan.started - datetime.now(ahead).replace(tzinfo=None)) < timedelta(seconds=5)
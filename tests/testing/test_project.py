@@ -0,0 +1,102 @@
+from datetime import datetime
+
+import pytest
+
+from redcaplite.testing import FakeProject, FakeProjectError, compile_filter_logic
+
+
+def test_generate_is_deterministic_for_a_seed():
+    """Test that the same seed produces the same synthetic project"""
+    first = FakeProject.generate(records=5, fields=9, seed=7)
+    second = FakeProject.generate(records=5, fields=9, seed=7)
+    assert first.records == second.records
+    assert first.metadata == second.metadata
+    assert len(first.records) == 5
+    assert [meta["field_type"] for meta in first.metadata[1:]] == [
+        "text", "text", "text", "radio", "dropdown", "text", "checkbox", "notes", "yesno"]
+
+
+def test_generate_longitudinal_project_with_files():
+    """Test that events and file fields add one row per event and stored files"""
+    project = FakeProject.generate(records=3, fields=2, events=2, file_fields=1)
+    assert project.is_longitudinal
+    assert len(project.records) == 6
+    assert len(project.files) == 6
+    columns = project.record_columns()
+    assert columns[:2] == ["record_id", "redcap_event_name"]
+    assert "file_1" in columns
+
+
+def test_record_columns_expand_checkboxes_and_form_status():
+    """Test that the export header matches REDCap's flat layout"""
+    project = FakeProject.generate(records=1, fields=7, forms=1)
+    columns = project.record_columns()
+    assert columns[-4:] == ["field_7___1", "field_7___2", "field_7___3", "form_1_complete"]
+    assert project.record_columns(fields=["field_1"]) == ["record_id", "field_1"]
+    with pytest.raises(FakeProjectError):
+        project.record_columns(fields=["missing"])
+
+
+def test_import_records_merges_and_logs():
+    """Test that imports keep blank values unless overwriting and log each change"""
+    project = FakeProject.generate(records=1, fields=1, forms=1)
+    project.import_records([{"record_id": "1", "field_1": "new"}, {"record_id": "2", "field_1": "other"}])
+    project.import_records([{"record_id": "1", "field_1": ""}])
+    assert project.records[("1", "", "", "")]["field_1"] == "new"
+    project.import_records([{"record_id": "1", "field_1": ""}], overwrite=True)
+    assert project.records[("1", "", "", "")]["field_1"] == ""
+    assert [entry["action"] for entry in project.export_logs(logtype="record_add")] == [
+        "Created Record 2", "Created Record 1"]
+    with pytest.raises(FakeProjectError):
+        project.import_records([{"record_id": "3", "unknown": "x"}])
+
+
+def test_export_records_filters():
+    """Test record, date range and filterLogic filters on exports"""
+    project = FakeProject.generate(records=10, fields=2, forms=1, start=datetime(2024, 6, 1))
+    project.modified["4"] = datetime(2024, 6, 2)
+    _, rows = project.export_records(records=["1", "2"])
+    assert [row["record_id"] for row in rows] == ["1", "2"]
+    _, rows = project.export_records(date_range_begin=datetime(2024, 6, 1, 12))
+    assert [row["record_id"] for row in rows] == ["4"]
+    _, rows = project.export_records(filter_logic="[field_2] >= 50")
+    assert rows and all(float(row["field_2"]) >= 50 for row in rows)
+
+
+def test_delete_and_rename_records():
+    """Test that deletes and renames move rows and files and are logged"""
+    project = FakeProject.generate(records=3, fields=1, forms=1, file_fields=1)
+    assert project.delete_records(["1"]) == 1
+    project.rename_record("2", "20")
+    assert {key[0] for key in project.records} == {"3", "20"}
+    assert ("20", "file_1", "", "") in project.files
+    assert project.next_record_name() == "21"
+    assert project.export_logs(logtype="record_delete")[0]["record"] == "1"
+    with pytest.raises(FakeProjectError):
+        project.delete_records(["1"])
+
+
+@pytest.mark.parametrize("logic, expected", [
+    ("[age] > 30", ["2", "3"]),
+    ("[age] = '30'", ["1"]),
+    ("[name] <> 'bob' and [age] < 45", ["1"]),
+    ("([name] = 'bob' or [name] = '') and [age] >= 40", ["2", "3"]),
+    ("[visit_arm_1][age] = 40", ["2"]),
+    ("[age] < 100 AND [name] = \"\"", ["3"]),
+])
+def test_compile_filter_logic(logic, expected):
+    """Test the supported subset of REDCap filterLogic"""
+    rows = [
+        {"record_id": "1", "name": "al", "age": "30"},
+        {"record_id": "2", "name": "bob", "age": "40"},
+        {"record_id": "3", "name": "", "age": "50"},
+    ]
+    matches = compile_filter_logic(logic)
+    assert [row["record_id"] for row in rows if matches(row)] == expected
+
+
+def test_compile_filter_logic_rejects_unsupported_expressions():
+    """Test that functions and malformed logic are reported as bad requests"""
+    for logic in ["datediff([dob], 'today', 'y') > 18", "[age] >", "([age] = 1"]:
+        with pytest.raises(FakeProjectError):
+            compile_filter_logic(logic)
@@ -0,0 +1,134 @@
+import io
+import json
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from redcaplite import RedcapClient
+from redcaplite.http import RetryPolicy
+from redcaplite.http.error import APIException
+from redcaplite.testing import FakeProject, FakeRedcapServer
+
+
+@pytest.fixture
+def server():
+    project = FakeProject.generate(records=12, fields=9, file_fields=1, repository_files=1)
+    with FakeRedcapServer(project) as fake:
+        yield fake
+
+
+@pytest.fixture
+def client(server):
+    with RedcapClient(server.url, server.token) as redcap:
+        yield redcap
+
+
+def test_fake_server_exports_project_structure(client):
+    """Test version, project, metadata, instrument and field name exports"""
+    assert client.get_version() == '14.0.0'
+    assert client.get_project()['is_longitudinal'] == 0
+    metadata = client.get_metadata()
+    assert list(metadata['field_name'][:2]) == ['record_id', 'field_1']
+    assert [row['instrument_name'] for row in client.get_instruments()] == ['form_1', 'form_2']
+    checkbox = [row for row in client.get_field_names() if row['original_field_name'] == 'field_7']
+    assert [row['export_field_name'] for row in checkbox] == ['field_7___1', 'field_7___2', 'field_7___3']
+    with pytest.raises(APIException, match='classic projects'):
+        client.get_events()
+
+
+def test_fake_server_record_round_trip(client):
+    """Test filtered exports, imports, renames and deletes through the client"""
+    records = client.export_records(pd_read_csv_kwargs={'dtype': str, 'keep_default_na': False})
+    assert len(records) == 12
+    subset = client.export_records(records=['1', '2'], fields=['field_2'])
+    assert list(subset.columns) == ['record_id', 'field_2']
+    assert list(subset['record_id']) == [1, 2]
+    filtered = client.export_records(fields=['field_2'], filterLogic='[field_2] > 50')
+    assert (filtered['field_2'] > 50).all()
+
+    assert client.import_records([{'record_id': '13', 'field_1': 'new'}]) == ['13']
+    assert client.import_records(pd.DataFrame({'record_id': ['13'], 'field_1': ['newer']}), returnContent='count') == '1'
+    assert client.import_records([{'record_id': '13'}], returnContent='count') == {'count': 1}
+    assert client.export_records(records=['13'], fields=['field_1'], format='json') == [{'record_id': '13', 'field_1': 'newer'}]
+    assert client.rename_record('13', '30') == 1
+    assert client.generate_next_record_name() == 31
+    assert client.delete_records(['30']) == 1
+    logs = client.get_logs(logtype='record_delete', pd_read_csv_kwargs={'dtype': str})
+    assert list(logs['record']) == ['30']
+    with pytest.raises(APIException, match='not found in the project'):
+        client.import_records([{'record_id': '1', 'nope': 'x'}])
+
+
+def test_fake_server_files_and_repository(client, tmp_path):
+    """Test File Upload fields and the File Repository"""
+    buffer = io.BytesIO()
+    client.get_file('1', 'file_1', file_obj=buffer)
+    assert buffer.getvalue() == b'file_1 for record 1\n'
+    client.import_file(b'replacement', record='2', field='file_1', file_name='new.txt')
+    client.get_file('2', 'file_1', file_dictionary=str(tmp_path))
+    assert (tmp_path / 'new.txt').read_bytes() == b'replacement'
+    assert client.delete_file('2', 'file_1') == 1
+    with pytest.raises(APIException, match='no file'):
+        client.get_file('2', 'file_1', file_obj=io.BytesIO())
+
+    folder = client.create_folder_file_repository('reports')[0]['folder_id']
+    client.import_file_repository(b'summary', folder_id=folder, file_name='summary.txt')
+    entries = client.list_file_repository(folder_id=folder)
+    assert [entry['name'] for entry in entries] == ['summary.txt']
+    buffer = io.BytesIO()
+    client.export_file_repository(entries[0]['doc_id'], file_obj=buffer)
+    assert buffer.getvalue() == b'summary'
+
+
+def test_fake_server_supports_snapshots_and_bulk_downloads(client, tmp_path):
+    """Test that higher-level client features run against the fake server"""
+    result = client.sync_snapshot(tmp_path / 'snapshot.sqlite')
+    assert result.full and result.updated_records == 12
+    files = client.export_files(['file_1'], tmp_path / 'files')
+    assert len(files.downloaded) == 12 and files.ok
+
+
+def test_fake_server_rejects_bad_tokens(server):
+    """Test that an unknown token is answered with 403"""
+    with RedcapClient(server.url, 'wrong') as redcap:
+        with pytest.raises(APIException, match='Forbidden'):
+            redcap.get_version()
+
+
+def test_fake_server_injects_failures_and_latency(server):
+    """Test queued failures, random errors and added latency"""
+    server.fail_next(2, status=503, retry_after=0)
+    with RedcapClient(server.url, server.token, retry_policy=RetryPolicy(max_retries=2)) as redcap:
+        assert redcap.get_version() == '14.0.0'
+    assert server.request_log == [('version', None)]
+
+    status, headers, body = server.handle({'token': server.token, 'content': 'version'})
+    assert (status, body) == (200, b'14.0.0')
+    server.error_rate = 1.0
+    server.error_status = 500
+    status, _, body = server.handle({'token': server.token, 'content': 'version'})
+    assert status == 500 and 'Injected' in json.loads(body)['error']
+
+    server.error_rate = 0.0
+    server.latency = 0.25
+    with patch('redcaplite.testing.server.time.sleep') as mock_sleep:
+        server.handle({'token': server.token, 'content': 'version'})
+    mock_sleep.assert_called_once_with(0.25)
+
+
+def test_fake_server_unsupported_endpoint(server):
+    """Test that endpoints the fake does not implement answer 400"""
+    status, _, body = server.handle({'token': server.token, 'content': 'userRole'})
+    assert status == 400
+    assert 'not supported' in json.loads(body)['error']
+
+
+def test_fake_server_exports_users_and_dags(server):
+    """Test the user and DAG exports used by the project mirror"""
+    status, _, body = server.handle({'token': server.token, 'content': 'user', 'format': 'json'})
+    assert status == 200
+    assert [user['username'] for user in json.loads(body)] == ['fake_api_user']
+    status, _, body = server.handle({'token': server.token, 'content': 'dag', 'format': 'json'})
+    assert status == 200
+    assert json.loads(body) == []